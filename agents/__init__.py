@@ -6,6 +6,7 @@ __all__ = [
     "master_workflow_agent",
     "human_in_loop_agent",
     "workflow_orchestrator",
+    "workflow_runtime",
     "email_agent",
     "alert_agent",
     "extraction_agent",
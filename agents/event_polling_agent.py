@@ -1,10 +1,22 @@
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
 
 from agents.factory import register_agent
 from agents.interfaces import BasePollingAgent
 from integration.google_calendar_integration import GoogleCalendarIntegration
 from integration.google_contacts_integration import GoogleContactsIntegration
+from integration.google_contacts_sync import (
+    Contact,
+    GoogleContactsDirectory,
+    shared_contacts_directory,
+)
+from utils.calendar_poll_state import CalendarPollState
+from utils.concurrency import LoggingSemaphore
+from utils.observability import record_calendar_poll
 from utils.pii import mask_pii
 
 logger = logging.getLogger(__name__)
@@ -18,11 +30,68 @@ class EventPollingAgent(BasePollingAgent):
         *,
         calendar_integration: Optional[GoogleCalendarIntegration] = None,
         contacts_integration: Optional[GoogleContactsIntegration] = None,
+        contact_directory: Optional[GoogleContactsDirectory] = None,
+        calendar_integrations: Optional[Mapping[str, GoogleCalendarIntegration]] = None,
     ):
         self.config = config
         self.calendar = calendar_integration or GoogleCalendarIntegration()
+        # One integration per polled calendar; they share the OAuth token,
+        # HTTP pool and response cache of the primary integration's process.
+        self.calendars: Dict[str, Any] = dict(calendar_integrations or {})
+        if not self.calendars:
+            self.calendars = self._build_calendars(config)
+        self._lookback_days: Dict[str, int] = {}
+        overrides = getattr(config, "google_calendar_lookback_days", None) or {}
+        for calendar_id, integration in self.calendars.items():
+            lookback = overrides.get(calendar_id)
+            if lookback is not None:
+                integration.cal_lookback_days = lookback
+            else:
+                lookback = getattr(integration, "cal_lookback_days", None)
+            if isinstance(lookback, int):
+                self._lookback_days[calendar_id] = lookback
+        self.poll_state = CalendarPollState(
+            getattr(config, "google_calendar_state_path", None)
+        )
         # Access token wird per Calendar-Integration gemanaged
         self.contacts = contacts_integration
+        self.contact_directory = contact_directory
+        if self.contact_directory is None and getattr(
+            config, "google_contacts_sync_enabled", False
+        ):
+            self.contact_directory = shared_contacts_directory(
+                config.google_contacts_directory_path
+            )
+
+    def _build_calendars(self, config: Any) -> Dict[str, Any]:
+        primary_id = getattr(self.calendar, "calendar_id", None)
+        if not isinstance(primary_id, str):
+            primary_id = "primary"
+        calendar_ids = list(getattr(config, "google_calendar_ids", None) or [])
+        calendars: Dict[str, Any] = {}
+        for calendar_id in calendar_ids or [primary_id]:
+            calendars[calendar_id] = (
+                self.calendar
+                if calendar_id == primary_id
+                else GoogleCalendarIntegration(calendar_id=calendar_id)
+            )
+        return calendars
+
+    @staticmethod
+    def _event_key(event: Dict[str, Any]) -> Tuple[Hashable, Hashable]:
+        """Return the key identifying *event* across calendars.
+
+        Instances of a recurring event share their ``iCalUID`` and are told
+        apart by their original start time.
+        """
+
+        uid = event.get("iCalUID") or event.get("id") or id(event)
+        if not (event.get("recurringEventId") or event.get("originalStartTime")):
+            return uid, None
+        start = event.get("originalStartTime") or event.get("start") or {}
+        if not isinstance(start, dict):
+            return uid, None
+        return uid, start.get("dateTime") or start.get("date")
 
     @staticmethod
     def _is_birthday_event(event: Dict[str, Any]) -> bool:
@@ -60,24 +129,148 @@ class EventPollingAgent(BasePollingAgent):
         return False
 
     async def poll(self) -> List[Dict[str, Any]]:
-        """Polls calendar events (read-only) and logs them, skipping birthday entries."""
-        try:
-            events = await self.calendar.list_events_async(max_results=100)
-            filtered: List[Dict[str, Any]] = []
-            for event in events:
-                if self._is_birthday_event(event):
+        """Polls calendar events (read-only) and logs them, skipping birthday entries.
+
+        All configured calendars are polled concurrently, bounded by
+        ``GOOGLE_CALENDAR_MAX_CONCURRENCY`` for the Google API host, and
+        merged into one stream de-duplicated by ``iCalUID``. A failing
+        calendar is skipped unless every calendar fails.
+        """
+        host = urlsplit(
+            getattr(self.config, "google_api_base_url", None)
+            or "https://www.googleapis.com"
+        ).hostname
+        semaphore = LoggingSemaphore(
+            f"google_calendar:{host}",
+            getattr(self.config, "google_calendar_max_concurrency", 4),
+        )
+        results = await asyncio.gather(
+            *(
+                self._poll_calendar(calendar_id, integration, semaphore)
+                for calendar_id, integration in self.calendars.items()
+            ),
+            return_exceptions=True,
+        )
+        self.poll_state.save()
+
+        failures: List[BaseException] = []
+        filtered: List[Dict[str, Any]] = []
+        seen = set()
+        for result in results:
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, BaseException):
+                failures.append(result)
+                continue
+            for event in result:
+                key = self._event_key(event)
+                if key in seen:
                     logger.debug(
-                        "Skipping birthday event: %s (%s)",
-                        event.get("summary", ""),
+                        "Skipping event %s already polled from another calendar",
                         event.get("id", ""),
                     )
                     continue
-                logger.info("Polled calendar event: %s", mask_pii(event))
-                filtered.append(event)
-            return filtered
+                seen.add(key)
+                if self._accept(event):
+                    filtered.append(event)
+        if failures and len(failures) == len(results):
+            raise failures[0]
+        return filtered
+
+    async def poll_changes(
+        self, calendar_id: str, updated_min: datetime
+    ) -> List[Dict[str, Any]]:
+        """Fetch only the events of *calendar_id* changed since *updated_min*.
+
+        Used for targeted fetches after a push notification; cancelled and
+        birthday events are skipped.
+        """
+
+        integration = self.calendars.get(calendar_id)
+        if integration is None:
+            raise KeyError(f"Calendar {calendar_id!r} is not configured for polling")
+        started = time.perf_counter()
+        try:
+            events = list(
+                await integration.list_events_async(
+                    max_results=250, updated_min=updated_min
+                )
+            )
         except Exception as e:
-            logger.error(f"Google Calendar polling failed: {e}")
+            record_calendar_poll(
+                calendar_id,
+                duration_ms=(time.perf_counter() - started) * 1000,
+                events=0,
+                outcome="error",
+            )
+            logger.error(f"Google Calendar change fetch failed for {calendar_id}: {e}")
             raise
+        record_calendar_poll(
+            calendar_id,
+            duration_ms=(time.perf_counter() - started) * 1000,
+            events=len(events),
+            outcome="incremental",
+        )
+        changed: List[Dict[str, Any]] = []
+        for event in events:
+            if not isinstance(event, dict) or event.get("status") == "cancelled":
+                continue
+            event.setdefault("calendarId", calendar_id)
+            if self._accept(event):
+                changed.append(event)
+        return changed
+
+    def _accept(self, event: Dict[str, Any]) -> bool:
+        """Annotate and log *event*; return ``False`` for birthday entries."""
+
+        if self._is_birthday_event(event):
+            logger.debug(
+                "Skipping birthday event: %s (%s)",
+                event.get("summary", ""),
+                event.get("id", ""),
+            )
+            return False
+        self._annotate_contacts(event)
+        logger.info("Polled calendar event: %s", mask_pii(event))
+        return True
+
+    async def _poll_calendar(
+        self, calendar_id: str, integration: Any, semaphore: LoggingSemaphore
+    ) -> List[Dict[str, Any]]:
+        async with semaphore:
+            polled_at = datetime.now(timezone.utc)
+            started = time.perf_counter()
+            kwargs: Dict[str, Any] = {"max_results": 100}
+            lookback = self._lookback_days.get(calendar_id)
+            if lookback is not None:
+                window_start = self.poll_state.window_start(
+                    calendar_id, lookback, now=polled_at
+                )
+                if window_start is not None:
+                    # Catch up on the cycles missed since the last success.
+                    kwargs["time_min"] = window_start
+            try:
+                events = list(await integration.list_events_async(**kwargs))
+            except Exception as e:
+                duration_ms = (time.perf_counter() - started) * 1000
+                record_calendar_poll(
+                    calendar_id, duration_ms=duration_ms, events=0, outcome="error"
+                )
+                self.poll_state.record_failure(calendar_id, e)
+                logger.error(f"Google Calendar polling failed for {calendar_id}: {e}")
+                raise
+        duration_ms = (time.perf_counter() - started) * 1000
+        record_calendar_poll(calendar_id, duration_ms=duration_ms, events=len(events))
+        self.poll_state.record_success(
+            calendar_id,
+            events=len(events),
+            duration_ms=duration_ms,
+            polled_at=polled_at,
+        )
+        for event in events:
+            if isinstance(event, dict):
+                event.setdefault("calendarId", calendar_id)
+        return events
 
     async def poll_events_async(
         self,
@@ -96,9 +289,41 @@ class EventPollingAgent(BasePollingAgent):
             query=query,
         )
 
+    def lookup_contact(self, email: Optional[str]) -> Optional[Contact]:
+        """Return the synced directory entry for *email* without an API call."""
+
+        if self.contact_directory is None:
+            return None
+        return self.contact_directory.lookup(email)
+
+    def _annotate_contacts(self, event: Dict[str, Any]) -> None:
+        """Attach directory entries for the organiser and attendees to *event*."""
+
+        if self.contact_directory is None:
+            return
+        organizer = event.get("organizer")
+        if isinstance(organizer, dict):
+            contact = self.lookup_contact(organizer.get("email"))
+            if contact is not None:
+                event["organizer_contact"] = contact.as_dict()
+        attendees = event.get("attendees")
+        if isinstance(attendees, list):
+            matches = [
+                contact.as_dict()
+                for attendee in attendees
+                if isinstance(attendee, dict) and not attendee.get("organizer")
+                for contact in (self.lookup_contact(attendee.get("email")),)
+                if contact is not None
+            ]
+            if matches:
+                event["attendee_contacts"] = matches
+
     async def poll_contacts(self) -> List[Dict[str, Any]]:
         """
         Polls contacts (read-only) and logs them.
+
+        With a contact directory, all connections are synced incrementally
+        and the added or changed directory entries are returned.
         """
         access_token = await self.calendar.get_access_token_async()
         if not self.contacts:
@@ -106,6 +331,14 @@ class EventPollingAgent(BasePollingAgent):
         else:
             self.contacts.access_token = access_token
         try:
+            if self.contact_directory is not None:
+                changed = await self.contact_directory.sync(self.contacts)
+                logger.info(
+                    "Synced %d Google contact entries (%d contacts indexed)",
+                    len(changed),
+                    len(self.contact_directory),
+                )
+                return [contact.as_dict() for contact in changed]
             contacts = await self.contacts.list_contacts_async(page_size=10)
             for contact in contacts:
                 logger.info("Polled contact: %s", mask_pii(contact))
@@ -117,9 +350,15 @@ class EventPollingAgent(BasePollingAgent):
     async def aclose(self) -> None:
         """Release underlying integration clients."""
 
-        calendar_close = getattr(self.calendar, "aclose", None)
-        if callable(calendar_close):
-            await calendar_close()
+        integrations = [self.calendar] + [
+            integration
+            for integration in self.calendars.values()
+            if integration is not self.calendar
+        ]
+        for integration in integrations:
+            calendar_close = getattr(integration, "aclose", None)
+            if callable(calendar_close):
+                await calendar_close()
 
         if self.contacts is not None:
             contacts_close = getattr(self.contacts, "aclose", None)
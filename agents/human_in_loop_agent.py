@@ -471,6 +471,8 @@ class HumanInLoopAgent(BaseHumanAgent):
         """
         organizer = event.get("organizer") or {}
         creator = event.get("creator") or {}
+        # Entry from the synced Google Contacts directory, if the poller found one.
+        directory_entry = event.get("organizer_contact") or {}
         email = (
             organizer.get("email")
             or event.get("organizer_email")
@@ -479,6 +481,7 @@ class HumanInLoopAgent(BaseHumanAgent):
         name = (
             organizer.get("displayName")
             or organizer.get("name")
+            or directory_entry.get("name")
             or creator.get("displayName")
             or creator.get("name")
         )
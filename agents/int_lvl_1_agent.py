@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+import heapq
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
@@ -22,6 +24,7 @@ from agents.factory import register_agent
 from agents.interfaces import BaseResearchAgent
 from config.config import settings
 from integration.hubspot_integration import HubSpotIntegration
+from integration.hubspot_mirror import HubSpotCompanyMirror
 from utils.datetime_formatting import format_report_datetime
 from utils.persistence import atomic_write_json
 from utils.text_normalization import normalize_text
@@ -80,6 +83,12 @@ class IntLvl1SimilarCompaniesAgent(BaseResearchAgent):
     #: Default limit applied to persisted level 1 results.
     DEFAULT_RESULT_LIMIT: int = 10
 
+    #: Number of BM25 candidates per requested result taken from the mirror.
+    MIRROR_CANDIDATE_FACTOR: int = 10
+
+    #: Weight of the normalised BM25 relevance added to the criteria score.
+    BM25_WEIGHT: float = 1.0
+
     def __init__(
         self,
         *,
@@ -87,6 +96,7 @@ class IntLvl1SimilarCompaniesAgent(BaseResearchAgent):
         hubspot_integration: Optional[HubSpotIntegration] = None,
         result_limit: Optional[int] = None,
         match_config: _MatchConfig = _MatchConfig(),
+        company_mirror: Optional[HubSpotCompanyMirror] = None,
         logger: Optional[logging.Logger] = None,
     ) -> None:
         self.config = config
@@ -95,6 +105,15 @@ class IntLvl1SimilarCompaniesAgent(BaseResearchAgent):
         )
         self._integration = hubspot_integration or HubSpotIntegration(settings=config)
         self._match_config = match_config
+        self._mirror = company_mirror
+        if self._mirror is None and getattr(config, "hubspot_mirror_enabled", False):
+            self._mirror = HubSpotCompanyMirror(
+                config.hubspot_mirror_path,
+                sync_interval_seconds=config.hubspot_mirror_sync_interval_seconds,
+                full_sync_interval_seconds=getattr(
+                    config, "hubspot_mirror_full_sync_interval_seconds", 86400.0
+                ),
+            )
 
         self._result_limit = max(1, result_limit or self.DEFAULT_RESULT_LIMIT)
 
@@ -124,7 +143,7 @@ class IntLvl1SimilarCompaniesAgent(BaseResearchAgent):
             or ""
         )
 
-        candidates = await self._fetch_candidates(company_name)
+        candidates = await self._fetch_candidates(company_name, target_context)
         ranked_results = self._rank_candidates(candidates, target_context)
 
         limited_results = ranked_results[: self._result_limit]
@@ -195,30 +214,81 @@ class IntLvl1SimilarCompaniesAgent(BaseResearchAgent):
         context["description_tokens"] = description_tokens
         return context
 
-    async def _fetch_candidates(self, company_name: str) -> List[Mapping[str, Any]]:
+    async def _fetch_candidates(
+        self,
+        company_name: str,
+        target_context: Optional[Mapping[str, Any]] = None,
+    ) -> List[Mapping[str, Any]]:
+        if self._mirror is not None:
+            candidates = await self._search_mirror(target_context or {})
+            if candidates is not None:
+                return candidates
+
         return await self._integration.list_similar_companies(
             company_name,
             limit=max(self._result_limit * 3, self._result_limit),
             properties=self.HUBSPOT_PROPERTIES,
         )
 
+    async def _search_mirror(
+        self, target_context: Mapping[str, Any]
+    ) -> Optional[List[Mapping[str, Any]]]:
+        """Return BM25-ranked candidates from the local mirror.
+
+        ``None`` means the mirror cannot answer yet (never synced and empty),
+        in which case the caller falls back to the HubSpot search API. Due
+        syncs run in a shared background task and never delay the event.
+        """
+
+        mirror = self._mirror
+        assert mirror is not None
+        mirror.sync_in_background(self._integration)
+        if not await asyncio.to_thread(len, mirror):
+            return None
+
+        texts = [target_context.get("company_name_normalised")]
+        texts.extend(
+            target_context.get(f"{criteria_field}_normalised")
+            for criteria_field in self._match_config.fields
+        )
+        hits = await asyncio.to_thread(
+            mirror.search,
+            texts,
+            weights=self._match_config.weights,
+            limit=self._result_limit * self.MIRROR_CANDIDATE_FACTOR,
+        )
+        best = max((relevance for _, relevance in hits), default=0.0)
+        candidates: List[Mapping[str, Any]] = []
+        for company, relevance in hits:
+            candidate = dict(company)
+            candidate["relevance"] = relevance / best if best > 0 else 0.0
+            candidates.append(candidate)
+        return candidates
+
     def _rank_candidates(
         self,
         candidates: Iterable[Mapping[str, Any]],
         target_context: Mapping[str, str],
     ) -> List[Dict[str, Any]]:
-        ranked: List[Dict[str, Any]] = []
+        prepared_candidates: List[Dict[str, Any]] = []
         for candidate in candidates:
             prepared = self._prepare_candidate(candidate, target_context)
             if prepared is None:
                 continue
-            ranked.append(prepared)
+            relevance = candidate.get("relevance")
+            if isinstance(relevance, (int, float)) and relevance > 0:
+                prepared["score"] = round(
+                    prepared["score"] + self.BM25_WEIGHT * float(relevance), 6
+                )
+            prepared_candidates.append(prepared)
 
-        ranked.sort(
+        ranked = heapq.nsmallest(
+            self._result_limit,
+            prepared_candidates,
             key=lambda item: (
                 -item["score"],
                 item["sort_key"],
-            )
+            ),
         )
 
         for item in ranked:
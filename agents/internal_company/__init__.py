@@ -1,3 +1,3 @@
-"""Internal company search stubs used for offline testing."""
+"""Internal company search over a local index of research artifacts."""
 
-__all__ = ["run"]
+__all__ = ["run", "search"]
@@ -1,17 +1,45 @@
-"""Stub implementation for internal company search lookups."""
+"""Internal company search lookups backed by the local artifact index."""
 
 from __future__ import annotations
 
-from typing import Any, Dict, Mapping
+from typing import Any, Dict, Mapping, Optional
 
+from agents.internal_company.search import (
+    InternalCompanyIndex,
+    shared_internal_company_index,
+)
+from config.config import settings
 
-def run(trigger: Mapping[str, Any]) -> Dict[str, Any]:
-    """Return a deterministic stub payload for internal research lookups."""
+
+def run(
+    trigger: Mapping[str, Any], *, index: Optional[InternalCompanyIndex] = None
+) -> Dict[str, Any]:
+    """Look up the trigger's company in the internal company index.
+
+    Only queries the index; artifacts are rescanned by the daemon (see
+    ``main._sync_internal_company_index``). When the index is disabled
+    (``INTERNAL_COMPANY_SEARCH_ENABLED=false``) a deterministic payload
+    without matches is returned.
+    """
 
     payload = dict(trigger.get("payload") or {})
-    payload.setdefault("exists", False)
-    payload.setdefault("last_report_date", None)
+    if index is None:
+        index = shared_internal_company_index(settings)
+    if index is None:
+        payload.setdefault("exists", False)
+        payload.setdefault("last_report_date", None)
+        return {
+            "payload": payload,
+            "neighbors": [],
+        }
+
+    payload.update(
+        index.lookup(
+            payload,
+            neighbor_limit=getattr(settings, "internal_company_neighbor_limit", 5),
+        )
+    )
     return {
         "payload": payload,
-        "neighbors": [],
+        "neighbors": payload["neighbors"],
     }
@@ -0,0 +1,679 @@
+"""Local search index over research, CRM match and dossier artifacts."""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from utils.observability import record_cache_event, record_cache_size
+from utils.research_cache import artifact_paths
+from utils.text_normalization import normalize_text
+from utils.validation import normalize_domain
+
+logger = logging.getLogger(__name__)
+
+
+INDEX_METRIC_NAME = "internal_company_index"
+INDEX_SCHEMA_VERSION = 1
+#: Columns indexed for full-text search, in ``bm25()`` weight order.
+SEARCH_COLUMNS: Tuple[str, ...] = ("name", "industry", "description")
+NEIGHBOR_WEIGHTS: Tuple[float, ...] = (1.0, 4.0, 2.0)
+DEFAULT_FUZZY_THRESHOLD = 0.75
+DEFAULT_NEIGHBOR_LIMIT = 5
+#: Documented p95 budget for :meth:`InternalCompanyIndex.lookup` with 50,000
+#: indexed companies, verified by
+#: ``scripts/perf/internal_company_search_benchmark.py``.
+P95_TARGET_MS = 10.0
+_MAX_QUERY_TERMS = 32
+_FUZZY_CANDIDATES = 50
+_FUZZY_PREFIXES = (3, 4)
+#: Query terms kept after pruning, rarest first.
+_SELECTIVE_TERMS = 4
+#: Terms found in more than this share of companies (and more than
+#: ``_MIN_TERM_DOC_LIMIT`` companies) are dropped from queries: their posting
+#: lists dominate query time while they hardly tell companies apart.
+_MAX_TERM_DOC_RATIO = 0.02
+_MIN_TERM_DOC_LIMIT = 50
+# Legal forms match large parts of the index without telling companies apart.
+_NAME_STOPWORDS = frozenset(
+    {
+        "ag", "co", "corp", "gmbh", "inc", "kg", "llc", "ltd", "mbh", "plc",
+        "sa", "sarl", "se", "ug", "the", "und", "and",
+    }
+)  # fmt: skip
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS companies (
+    rowid INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL DEFAULT '',
+    domain TEXT NOT NULL DEFAULT '',
+    industry TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    last_report_date TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS companies_domain ON companies(domain);
+CREATE VIRTUAL TABLE IF NOT EXISTS companies_fts USING fts5(
+    {", ".join(SEARCH_COLUMNS)},
+    content='companies',
+    content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='{" ".join(str(length) for length in _FUZZY_PREFIXES)}'
+);
+CREATE TRIGGER IF NOT EXISTS companies_ai AFTER INSERT ON companies BEGIN
+    INSERT INTO companies_fts(rowid, {", ".join(SEARCH_COLUMNS)})
+    VALUES (new.rowid, {", ".join(f"new.{column}" for column in SEARCH_COLUMNS)});
+END;
+CREATE TRIGGER IF NOT EXISTS companies_ad AFTER DELETE ON companies BEGIN
+    INSERT INTO companies_fts(companies_fts, rowid, {", ".join(SEARCH_COLUMNS)})
+    VALUES ('delete', old.rowid, {", ".join(f"old.{column}" for column in SEARCH_COLUMNS)});
+END;
+CREATE TRIGGER IF NOT EXISTS companies_au AFTER UPDATE ON companies BEGIN
+    INSERT INTO companies_fts(companies_fts, rowid, {", ".join(SEARCH_COLUMNS)})
+    VALUES ('delete', old.rowid, {", ".join(f"old.{column}" for column in SEARCH_COLUMNS)});
+    INSERT INTO companies_fts(rowid, {", ".join(SEARCH_COLUMNS)})
+    VALUES (new.rowid, {", ".join(f"new.{column}" for column in SEARCH_COLUMNS)});
+END;
+CREATE TABLE IF NOT EXISTS company_artifacts (
+    company_key TEXT NOT NULL,
+    path TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    PRIMARY KEY (company_key, path)
+);
+CREATE INDEX IF NOT EXISTS company_artifacts_path ON company_artifacts(path);
+CREATE TABLE IF NOT EXISTS indexed_files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS index_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _terms(
+    texts: Iterable[Optional[str]], *, stopwords: frozenset = frozenset()
+) -> List[str]:
+    terms: List[str] = []
+    seen = set(stopwords)
+    for text in texts:
+        normalised = normalize_text(text)
+        for token in "".join(
+            character if character.isalnum() else " " for character in normalised
+        ).split():
+            if len(token) < 2 or token in seen:
+                continue
+            seen.add(token)
+            terms.append(token)
+            if len(terms) >= _MAX_QUERY_TERMS:
+                return terms
+    return terms
+
+
+_ROW_COLUMNS: Tuple[str, ...] = (
+    "key",
+    "name",
+    "domain",
+    "industry",
+    "description",
+    "last_report_date",
+    "payload",
+)
+
+
+def _merge_rows(stored: Tuple[Any, ...], update: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    """Keep stored values the update leaves empty; the latest report wins."""
+
+    merged = [new or old for old, new in zip(stored[:5], update[:5])]
+    report_dates = [value for value in (stored[5], update[5]) if value]
+    merged.append(max(report_dates) if report_dates else None)
+    payload = json.loads(stored[6])
+    payload.update(
+        {key: value for key, value in json.loads(update[6]).items() if value}
+    )
+    merged.append(json.dumps(payload, ensure_ascii=False))
+    return tuple(merged)
+
+
+def _text(value: Any) -> str:
+    return str(value).strip() if value is not None else ""
+
+
+def extract_companies(data: Any) -> Iterator[Tuple[Dict[str, Any], str]]:
+    """Yield ``(company, kind)`` pairs described by an artifact's JSON content.
+
+    Recognises dossier outputs (``kind="dossier"``), CRM match artifacts
+    (``"crm_match"``), level 1 similar-company results (``"similar"``) and the
+    neighbour samples written by the internal research agent
+    (``"neighbor"``).
+    """
+
+    if isinstance(data, list):
+        for item in data:
+            if isinstance(item, Mapping):
+                yield {
+                    "name": item.get("company_name") or item.get("name"),
+                    "domain": item.get("domain") or item.get("company_domain"),
+                    "description": item.get("description"),
+                }, "neighbor"
+        return
+    if not isinstance(data, Mapping):
+        return
+    company = data.get("company")
+    if isinstance(company, Mapping) and "report_type" in data:
+        yield {
+            "name": company.get("name"),
+            "domain": company.get("domain"),
+            "industry": company.get("industry"),
+            "description": company.get("description") or data.get("summary"),
+            "last_report_date": data.get("generated_at"),
+        }, "dossier"
+        return
+    if isinstance(data.get("crm_lookup"), Mapping):
+        crm_company = data["crm_lookup"].get("company")
+        properties = (
+            crm_company.get("properties")
+            if isinstance(crm_company, Mapping)
+            else None
+        )
+        properties = properties if isinstance(properties, Mapping) else {}
+        yield {
+            "name": data.get("company_name") or properties.get("name"),
+            "domain": data.get("company_domain") or properties.get("domain"),
+            "industry": properties.get("industry"),
+            "description": properties.get("description"),
+        }, "crm_match"
+        return
+    if isinstance(data.get("results"), list):
+        for item in data["results"]:
+            if not isinstance(item, Mapping):
+                continue
+            properties = item.get("properties")
+            properties = properties if isinstance(properties, Mapping) else {}
+            yield {
+                "name": item.get("name") or properties.get("name"),
+                "domain": item.get("domain") or properties.get("domain"),
+                "industry": properties.get("industry"),
+                "description": properties.get("description"),
+            }, "similar"
+
+
+class InternalCompanyIndex:
+    """SQLite/FTS5 index of every company seen in earlier research.
+
+    Companies are keyed by normalised domain (or normalised name when no
+    domain is known) and indexed for exact-domain lookups (B-tree), fuzzy
+    name matching (FTS5 prefix candidates re-ranked by similarity) and
+    neighbour queries (weighted BM25 over name, industry and description).
+    Queries only use terms found in at most 2% of companies, so their cost
+    does not grow with the posting lists of common words.
+    :meth:`sync` only parses artifacts whose size or modification time
+    changed since they were last indexed; :meth:`index_artifact` adds a file
+    as soon as it has been written.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        artifact_root: Optional[Path] = None,
+        sync_interval_seconds: float = 300.0,
+    ) -> None:
+        self.path = Path(path)
+        self.artifact_root = Path(artifact_root) if artifact_root else None
+        self.sync_interval_seconds = max(0.0, float(sync_interval_seconds))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            str(self.path), check_same_thread=False, isolation_level=None
+        )
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._set_state("schema_version", str(INDEX_SCHEMA_VERSION))
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+    @property
+    def last_synced(self) -> float:
+        return float(self._get_state("last_synced") or 0.0)
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._connection.execute("SELECT COUNT(*) FROM companies").fetchone()
+        return int(row[0])
+
+    def needs_sync(self, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        return now - self.last_synced >= self.sync_interval_seconds
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+    def upsert(
+        self,
+        companies: Iterable[Mapping[str, Any]],
+        *,
+        source: Optional[str] = None,
+        kind: str = "manual",
+    ) -> int:
+        """Insert or merge *companies*; returns the number stored.
+
+        Non-empty fields replace stored ones and the latest report date wins.
+        When *source* is given, the companies are linked to that artifact.
+        """
+
+        rows = []
+        for company in companies:
+            name = _text(company.get("name"))
+            domain = normalize_domain(_text(company.get("domain")))
+            if not name and not domain:
+                continue
+            display = {
+                "name": name,
+                "domain": domain,
+                "industry": _text(company.get("industry")),
+                "description": _text(company.get("description")),
+            }
+            key = domain or f"name:{normalize_text(name)}"
+            rows.append(
+                (
+                    key,
+                    normalize_text(name),
+                    domain,
+                    normalize_text(display["industry"]),
+                    normalize_text(display["description"]),
+                    _text(company.get("last_report_date")) or None,
+                    json.dumps(display, ensure_ascii=False),
+                )
+            )
+        if not rows:
+            return 0
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN")
+            try:
+                self._upsert_locked(rows)
+                if source is not None:
+                    connection.executemany(
+                        "INSERT OR IGNORE INTO company_artifacts(company_key, path, kind) "
+                        "VALUES (?, ?, ?)",
+                        [(row[0], source, kind) for row in rows],
+                    )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def index_artifact(self, path: Path, *, force: bool = False) -> int:
+        """Index the artifact at *path* unless it is unchanged since last time."""
+
+        path = Path(path)
+        try:
+            stat = path.stat()
+        except OSError:
+            return 0
+        key = path.as_posix()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT mtime_ns, size FROM indexed_files WHERE path = ?", (key,)
+            ).fetchone()
+        if (
+            not force
+            and row is not None
+            and (row["mtime_ns"], row["size"]) == (stat.st_mtime_ns, stat.st_size)
+        ):
+            return 0
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            logger.debug("Skipping unreadable artifact %s", path)
+            data = None
+
+        by_kind: Dict[str, List[Dict[str, Any]]] = {}
+        for company, kind in extract_companies(data):
+            by_kind.setdefault(kind, []).append(company)
+
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM company_artifacts WHERE path = ?", (key,)
+            )
+        indexed = sum(
+            self.upsert(companies, source=key, kind=kind)
+            for kind, companies in by_kind.items()
+        )
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO indexed_files(path, mtime_ns, size) VALUES (?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET mtime_ns = excluded.mtime_ns, "
+                "size = excluded.size",
+                (key, stat.st_mtime_ns, stat.st_size),
+            )
+        return indexed
+
+    def index_result(self, result: Mapping[str, Any]) -> int:
+        """Index the artifacts referenced by a research agent result."""
+
+        return sum(self.index_artifact(Path(path)) for path in artifact_paths(result))
+
+    def sync(self, root: Optional[Path] = None) -> int:
+        """Index new or changed ``*.json`` artifacts below *root*."""
+
+        root = Path(root) if root is not None else self.artifact_root
+        indexed = 0
+        if root is not None and root.exists():
+            for path in sorted(root.rglob("*.json")):
+                indexed += self.index_artifact(path)
+        self._set_state("last_synced", repr(time.time()))
+        record_cache_event(INDEX_METRIC_NAME, "synced", indexed)
+        record_cache_size(INDEX_METRIC_NAME, entries=len(self))
+        return indexed
+
+    def sync_if_due(self) -> int:
+        return self.sync() if self.needs_sync() else 0
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def find_by_domain(self, domain: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return the company indexed under the exact normalised *domain*."""
+
+        normalised = normalize_domain(domain)
+        if not normalised:
+            return None
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT * FROM companies WHERE domain = ? LIMIT 1", (normalised,)
+            ).fetchone()
+            company = self._row_to_company_locked(row) if row else None
+        record_cache_event(INDEX_METRIC_NAME, "hit" if company else "miss")
+        return company
+
+    def search_name(
+        self,
+        name: Optional[str],
+        *,
+        limit: int = 5,
+        threshold: float = DEFAULT_FUZZY_THRESHOLD,
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Return ``(company, similarity)`` pairs for names close to *name*.
+
+        Candidates share a token, or the first three or four characters of a
+        longer token, with the query (legal forms such as "GmbH" are ignored), so
+        small typos and suffix variants still match; they are ranked by
+        :class:`difflib.SequenceMatcher` ratio.
+        """
+
+        target = normalize_text(name)
+        terms = _terms([name], stopwords=_NAME_STOPWORDS)
+        if not terms or limit <= 0:
+            return []
+        with self._lock:
+            # Prefixes tolerate typos; the exact token stays available for
+            # when a prefix is too common to be worth expanding.
+            candidates = [(term, False) for term in terms]
+            candidates.extend(
+                (term[:length], True)
+                for term in terms
+                for length in _FUZZY_PREFIXES
+                if len(term) > length
+            )
+            selected = self._selective_terms_locked(candidates, column="name")
+            if not selected:
+                record_cache_event(INDEX_METRIC_NAME, "miss")
+                return []
+            query = " OR ".join(selected)
+            rows = self._ranked_rows_locked(query, None, _FUZZY_CANDIDATES)
+            # As in difflib.get_close_matches: the target is analysed once and
+            # the cheap upper bounds reject most candidates before ratio().
+            matcher = SequenceMatcher()
+            matcher.set_seq2(target)
+            scored = []
+            for row in rows:
+                matcher.set_seq1(row["name"])
+                if (
+                    matcher.real_quick_ratio() >= threshold
+                    and matcher.quick_ratio() >= threshold
+                    and matcher.ratio() >= threshold
+                ):
+                    scored.append(
+                        (self._row_to_company_locked(row), matcher.ratio())
+                    )
+        scored.sort(key=lambda pair: -pair[1])
+        record_cache_event(INDEX_METRIC_NAME, "hit" if scored else "miss")
+        return scored[:limit]
+
+    def neighbors(
+        self,
+        company: Mapping[str, Any],
+        *,
+        limit: int = DEFAULT_NEIGHBOR_LIMIT,
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Return companies similar to *company* ranked by weighted BM25."""
+
+        terms = _terms(
+            [
+                company.get("industry"),
+                company.get("description"),
+                company.get("company_name") or company.get("name"),
+            ],
+            stopwords=_NAME_STOPWORDS,
+        )
+        if not terms or limit <= 0:
+            return []
+        exclude_domain = normalize_domain(
+            company.get("company_domain") or company.get("domain")
+        )
+        exclude_name = normalize_text(company.get("company_name") or company.get("name"))
+        with self._lock:
+            selected = self._selective_terms_locked([(term, False) for term in terms])
+            if not selected:
+                return []
+            # Over-fetch so the company itself can be dropped from its neighbours.
+            rows = self._ranked_rows_locked(
+                " OR ".join(selected), NEIGHBOR_WEIGHTS, int(limit) + 2
+            )
+            return [
+                (self._row_to_company_locked(row), -float(row["relevance"]))
+                for row in rows
+                if not (exclude_domain and row["domain"] == exclude_domain)
+                and not (exclude_name and row["name"] == exclude_name)
+            ][: int(limit)]
+
+    def lookup(
+        self,
+        payload: Mapping[str, Any],
+        *,
+        neighbor_limit: int = DEFAULT_NEIGHBOR_LIMIT,
+    ) -> Dict[str, Any]:
+        """Run the per-event lookup for a research trigger *payload*.
+
+        The company is matched by exact domain first and by fuzzy name
+        second; neighbours are ranked against the payload's industry,
+        description and name.
+        """
+
+        company = self.find_by_domain(
+            payload.get("company_domain") or payload.get("web_domain")
+        )
+        match = "domain" if company else None
+        if company is None:
+            candidates = self.search_name(payload.get("company_name"), limit=1)
+            if candidates:
+                company, _ = candidates[0]
+                match = "name"
+        neighbors = [
+            {
+                "company_name": neighbor.get("name"),
+                "domain": neighbor.get("domain"),
+                "industry": neighbor.get("industry"),
+                "description": neighbor.get("description"),
+                "relevance": round(relevance, 6),
+            }
+            for neighbor, relevance in self.neighbors(payload, limit=neighbor_limit)
+        ]
+        return {
+            "exists": company is not None,
+            "last_report_date": company.get("last_report_date") if company else None,
+            "internal_match": {"match": match, "company": company},
+            "neighbors": neighbors,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _upsert_locked(self, rows: List[Tuple[Any, ...]]) -> None:
+        merged: Dict[str, Tuple[Any, ...]] = {}
+        for row in rows:
+            key = row[0]
+            existing = merged.get(key)
+            if existing is None:
+                stored = self._connection.execute(
+                    "SELECT * FROM companies WHERE key = ?", (key,)
+                ).fetchone()
+                if stored is not None:
+                    existing = tuple(stored[column] for column in _ROW_COLUMNS)
+            merged[key] = row if existing is None else _merge_rows(existing, row)
+        self._connection.executemany(
+            f"""
+            INSERT INTO companies ({", ".join(_ROW_COLUMNS)})
+            VALUES ({", ".join("?" for _ in _ROW_COLUMNS)})
+            ON CONFLICT(key) DO UPDATE SET
+                {", ".join(f"{column} = excluded.{column}" for column in _ROW_COLUMNS[1:])}
+            """,
+            list(merged.values()),
+        )
+
+    def _selective_terms_locked(
+        self, terms: List[Tuple[str, bool]], *, column: Optional[str] = None
+    ) -> List[str]:
+        """Return FTS5 expressions for the rarest of *terms* (``(term, prefix)``).
+
+        Matches are counted only up to the frequency limit, so a common term
+        costs no more to reject than a rare one costs to accept.
+        """
+
+        total = self._connection.execute(
+            "SELECT MAX(rowid) FROM companies"
+        ).fetchone()[0] or 0
+        limit = int(max(_MIN_TERM_DOC_LIMIT, _MAX_TERM_DOC_RATIO * total))
+        scope = f"{column} : " if column else ""
+        frequencies: List[Tuple[int, str]] = []
+        for term, prefix in terms:
+            expression = f'{scope}"{term}"{"*" if prefix else ""}'
+            frequency = self._connection.execute(
+                "SELECT COUNT(*) FROM (SELECT rowid FROM companies_fts "
+                "WHERE companies_fts MATCH ? LIMIT ?)",
+                (expression, limit + 1),
+            ).fetchone()[0]
+            if 0 < frequency <= limit:
+                frequencies.append((frequency, expression))
+        frequencies.sort()
+        return [expression for _, expression in frequencies[:_SELECTIVE_TERMS]]
+
+    def _ranked_rows_locked(
+        self, query: str, weights: Optional[Tuple[float, ...]], limit: int
+    ) -> List[sqlite3.Row]:
+        """Rank FTS matches by BM25 and join the company rows of the best ones."""
+
+        rank = (
+            f"bm25(companies_fts, {', '.join(repr(weight) for weight in weights)})"
+            if weights
+            else "rank"
+        )
+        return self._connection.execute(
+            "SELECT c.*, top.relevance AS relevance FROM ("
+            f"SELECT rowid, {rank} AS relevance FROM companies_fts "
+            "WHERE companies_fts MATCH ? ORDER BY relevance LIMIT ?"
+            ") AS top JOIN companies c ON c.rowid = top.rowid "
+            "ORDER BY top.relevance",
+            (query, limit),
+        ).fetchall()
+
+    def _row_to_company_locked(self, row: sqlite3.Row) -> Dict[str, Any]:
+        company = json.loads(row["payload"])
+        company["last_report_date"] = row["last_report_date"]
+        artifacts = self._connection.execute(
+            "SELECT path, kind FROM company_artifacts WHERE company_key = ? "
+            "ORDER BY path",
+            (row["key"],),
+        ).fetchall()
+        company["artifacts"] = [artifact["path"] for artifact in artifacts]
+        company["report_count"] = sum(
+            1 for artifact in artifacts if artifact["kind"] == "dossier"
+        )
+        return company
+
+    def _get_state(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM index_state WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, key: str, value: str) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO index_state(key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, value),
+            )
+
+
+_SHARED_INDEXES: Dict[str, InternalCompanyIndex] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_internal_company_index(config: Any) -> Optional[InternalCompanyIndex]:
+    """Return the process-wide index configured by *config* (or ``None``)."""
+
+    if not getattr(config, "internal_company_search_enabled", False):
+        return None
+    path = Path(config.internal_company_index_path)
+    with _SHARED_LOCK:
+        index = _SHARED_INDEXES.get(path.as_posix())
+        if index is None:
+            index = InternalCompanyIndex(
+                path,
+                artifact_root=Path(config.research_artifact_dir),
+                sync_interval_seconds=getattr(
+                    config, "internal_company_index_sync_interval_seconds", 300.0
+                ),
+            )
+            _SHARED_INDEXES[path.as_posix()] = index
+        return index
+
+
+def reset_shared_internal_company_indexes() -> None:
+    """Close and forget all process-wide indexes (used by tests)."""
+
+    with _SHARED_LOCK:
+        indexes = list(_SHARED_INDEXES.values())
+        _SHARED_INDEXES.clear()
+    for index in indexes:
+        index.close()
+
+
+__all__ = [
+    "InternalCompanyIndex",
+    "P95_TARGET_MS",
+    "extract_companies",
+    "reset_shared_internal_company_indexes",
+    "shared_internal_company_index",
+]
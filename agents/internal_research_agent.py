@@ -2,11 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Mapping, MutableMapping, Optional, Sequence
+from typing import (
+    Any,
+    Awaitable,
+    Dict,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
 from agents.factory import register_agent
 from agents.interfaces import BaseResearchAgent
@@ -16,10 +29,12 @@ from integration.hubspot_integration import HubSpotIntegration
 from config.config import settings
 from logs.workflow_log_manager import WorkflowLogManager
 from reminders.reminder_escalation import ReminderEscalation
+from utils.circuit_breaker import CircuitOpenError
 from utils.crm_artifacts import build_crm_match_payload, persist_crm_match
 from utils.persistence import atomic_write_json
 
 NormalizedPayload = Dict[str, Any]
+_T = TypeVar("_T")
 
 
 @register_agent(BaseResearchAgent, "internal_research", "default", is_default=True)
@@ -108,38 +123,73 @@ class InternalResearchAgent(BaseResearchAgent):
             event_id,
         )
 
-        research_result = self._run_internal_lookup(trigger, run_id, event_id)
-        payload_result = research_result.get("payload") or {}
-
-        samples = self._collect_neighbor_samples(payload_result)
-        neighbor_artifact = self._write_artifact(run_id, "level1_samples.json", samples)
-        if samples and neighbor_artifact:
-            self._log_workflow(
-                run_id,
-                "neighbor_samples_recorded",
-                f"Captured {len(samples)} neighbor samples at {neighbor_artifact}.",
-                event_id,
+        # The internal search and the CRM lookup are independent; each branch
+        # writes its artifact as soon as its own lookup finished so the file
+        # I/O overlaps with the other branch instead of extending the run.
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
+
+        async def _internal_branch() -> Tuple[List[Dict[str, Any]], Optional[str]]:
+            research_result = await self._timed(
+                timings,
+                "internal_lookup",
+                self._run_internal_lookup(trigger, run_id, event_id),
             )
-
-        crm_summary = await self._lookup_crm_company(
-            payload,
-            run_id,
-            event_id,
+            samples = self._collect_neighbor_samples(
+                research_result.get("payload") or {}
+            )
+            artifact = await self._timed(
+                timings,
+                "neighbor_artifact",
+                asyncio.to_thread(
+                    self._write_artifact, run_id, "level1_samples.json", samples
+                ),
+            )
+            if samples and artifact:
+                self._log_workflow(
+                    run_id,
+                    "neighbor_samples_recorded",
+                    f"Captured {len(samples)} neighbor samples at {artifact}.",
+                    event_id,
+                )
+            return samples, artifact
+
+        async def _crm_branch() -> Tuple[Dict[str, Any], Optional[str]]:
+            summary = await self._timed(
+                timings,
+                "crm_lookup",
+                self._lookup_crm_company(payload, run_id, event_id),
+            )
+            artifact = await self._timed(
+                timings,
+                "crm_artifact",
+                asyncio.to_thread(
+                    self._persist_crm_match_artifact,
+                    run_id,
+                    event_id,
+                    payload,
+                    summary,
+                ),
+            )
+            if artifact:
+                self._log_workflow(
+                    run_id,
+                    "crm_matching_recorded",
+                    f"Stored CRM matching details at {artifact}.",
+                    event_id,
+                )
+            return summary, artifact
+
+        (samples, neighbor_artifact), (crm_summary, crm_artifact) = (
+            await self._join(_internal_branch(), _crm_branch())
         )
-
-        crm_artifact = self._persist_crm_match_artifact(
+        timings["total"] = round((time.perf_counter() - started) * 1000, 3)
+        self.logger.info(
+            "Internal research sub-step timings for run %s event %s: %s",
             run_id,
-            event_id,
-            payload,
-            crm_summary,
+            event_id or "<missing>",
+            json.dumps(timings, sort_keys=True),
         )
-        if crm_artifact:
-            self._log_workflow(
-                run_id,
-                "crm_matching_recorded",
-                f"Stored CRM matching details at {crm_artifact}.",
-                event_id,
-            )
 
         action = "COMPANY_LOOKUP_COMPLETED"
         self._log_workflow(
@@ -163,6 +213,7 @@ class InternalResearchAgent(BaseResearchAgent):
                     "neighbor_samples": neighbor_artifact,
                     "crm_match": crm_artifact,
                 },
+                "timings_ms": timings,
             },
         }
 
@@ -393,11 +444,35 @@ class InternalResearchAgent(BaseResearchAgent):
             )
             return False
 
-    def _run_internal_lookup(
+    @staticmethod
+    async def _timed(
+        timings: Dict[str, float], step: str, awaitable: Awaitable[_T]
+    ) -> _T:
+        started = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            timings[step] = round((time.perf_counter() - started) * 1000, 3)
+
+    @staticmethod
+    async def _join(*coroutines: Awaitable[Any]) -> List[Any]:
+        """Await *coroutines* concurrently, cancelling the rest on failure."""
+
+        tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def _run_internal_lookup(
         self, trigger: Mapping[str, Any], run_id: str, event_id: Optional[str]
     ) -> Mapping[str, Any]:
         try:
-            result = self._internal_search_runner(trigger)
+            # The runner is synchronous (SQLite index); keep the loop free.
+            result = await asyncio.to_thread(self._internal_search_runner, trigger)
             self._log_workflow(
                 run_id,
                 "internal_lookup_completed",
@@ -516,16 +591,21 @@ class InternalResearchAgent(BaseResearchAgent):
                 event_id,
                 error="integration_unavailable",
             )
+            # ``error`` marks the result as degraded so it is never cached.
             return {
                 "company_in_crm": False,
                 "attachments_in_crm": False,
                 "requires_dossier": True,
                 "attachments": [],
                 "company": None,
+                "error": "integration_unavailable",
             }
 
         try:
             lookup = await integration.lookup_company_with_attachments(domain)
+        except CircuitOpenError:
+            # Reporting "not in CRM" would request a needless dossier.
+            raise
         except Exception as exc:  # pragma: no cover - defensive logging
             self._log_workflow(
                 run_id,
@@ -541,6 +621,7 @@ class InternalResearchAgent(BaseResearchAgent):
                 "requires_dossier": True,
                 "attachments": [],
                 "company": None,
+                "error": "lookup_failed",
             }
 
         company = lookup.get("company") if isinstance(lookup, Mapping) else None
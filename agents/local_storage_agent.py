@@ -4,8 +4,9 @@ from __future__ import annotations
 
 import json
 import logging
+import time
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional, Set
 
 from utils.datetime_formatting import now_cet_timestamp
 from utils.persistence import RunsIndexEntry, atomic_write_json, load_json_or_default
@@ -13,6 +14,9 @@ from utils.persistence import RunsIndexEntry, atomic_write_json, load_json_or_de
 
 Metadata = Dict[str, object]
 
+#: Audit logs untouched for longer than this are ignored for pending audits.
+PENDING_AUDIT_MAX_AGE_SECONDS = 7 * 24 * 3600.0
+
 
 class LocalStorageAgent:
     """Persist generated artefacts in a structured local directory."""
@@ -43,25 +47,52 @@ class LocalStorageAgent:
     def load_audit_entries(self, run_id: str) -> list[Dict[str, object]]:
         """Load audit log entries for a run as structured dictionaries."""
 
-        path = self.get_audit_log_path(run_id)
-        if not path.exists():
-            return []
+        return list(self._iter_audit_file(self.get_audit_log_path(run_id)))
+
+    def pending_audit_ids(
+        self, *, max_age_seconds: float = PENDING_AUDIT_MAX_AGE_SECONDS
+    ) -> Set[str]:
+        """Return ids of HITL requests that have no response entry yet.
 
-        entries = []
+        Replies are logged in the run that received them, which may be later
+        than the run that sent the request, so every audit log modified in
+        the last *max_age_seconds* is read.
+        """
+
+        cutoff = time.time() - max(0.0, max_age_seconds)
+        requested: Set[str] = set()
+        answered: Set[str] = set()
+        for path in self.base_dir.glob("*/audit_log.jsonl"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    continue
+            except OSError:
+                continue
+            for entry in self._iter_audit_file(path):
+                audit_id = entry.get("audit_id")
+                if not isinstance(audit_id, str) or not audit_id:
+                    continue
+                if entry.get("stage") == "response":
+                    answered.add(audit_id)
+                elif entry.get("stage") == "request":
+                    requested.add(audit_id)
+        return requested - answered
+
+    def _iter_audit_file(self, path: Path) -> Iterator[Dict[str, object]]:
+        if not path.exists():
+            return
         with path.open("r", encoding="utf-8") as handle:
             for line in handle:
                 line = line.strip()
                 if not line:
                     continue
                 try:
-                    entries.append(json.loads(line))
+                    yield json.loads(line)
                 except json.JSONDecodeError:
                     self.logger.warning(
                         "Skipping invalid audit log line in %s: %s", path, line
                     )
 
-        return entries
-
     def record_run(
         self,
         run_id: str,
@@ -6,10 +6,22 @@ import json
 import logging
 import time
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Mapping, MutableMapping, Optional, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from agents.factory import create_agent
 from agents.human_in_loop_agent import DossierConfirmationBackendUnavailable
+from agents.internal_company.search import shared_internal_company_index
 
 # Ensure default agent implementations register themselves with the factory.
 from agents import (  # noqa: F401  # pylint: disable=unused-import
@@ -31,20 +43,41 @@ from agents.interfaces import (
     BaseTriggerAgent,
 )
 from agents.local_storage_agent import LocalStorageAgent
+from agents.soft_trigger_validator import load_synonym_phrases
 from config.config import settings
 from config.watcher import LlmConfigurationWatcher
 from logs.workflow_log_manager import WorkflowLogManager
 from utils import concurrency
 from utils.audit_log import AuditLog
+from utils.circuit_breaker import CircuitOpenError
+from utils.deadline import (
+    DeadlineExceeded,
+    deadline_scope,
+    expired as deadline_expired,
+    run_with_deadline,
+)
 from utils.observability import (
     observe_operation,
     record_hitl_outcome,
     record_trigger_match,
 )
 from utils.domain_resolution import resolve_company_domain
-from utils.negative_cache import NegativeEventCache
-from utils.processed_event_cache import ProcessedEventCache
+from utils.event_fingerprint import EventFingerprint, fingerprint_event
+from utils.negative_cache import BinaryNegativeEventCache, NegativeEventCache
+from utils.processed_event_cache import (
+    BinaryProcessedEventCache,
+    ProcessedEventCache,
+)
 from utils.pii import mask_pii
+from utils.research_cache import ResearchCache
+from utils.research_dag import ResearchDAG, ResearchNode
+from utils.stage_checkpoints import (
+    DEFAULT_CHECKPOINT_TTL_SECONDS,
+    STAGE_EXTRACTION,
+    STAGE_TRIGGER,
+    StageCheckpointStore,
+    inputs_digest,
+)
 from utils.trigger_loader import load_trigger_words
 from utils.validation import (
     InvalidExtractionError,
@@ -58,6 +91,21 @@ from utils.workflow_steps import workflow_step_recorder  # NEU
 
 logger = logging.getLogger("MasterWorkflowAgent")
 
+#: Outcomes after which an event is never resumed, so its stage checkpoints
+#: can go. Pending, deferred and failed events keep them until the TTL.
+FINAL_EVENT_STATUSES = frozenset(
+    {
+        "skipped_processed_event",
+        "skipped_negative_cache",
+        "skipped_trigger_threshold",
+        "skipped_extraction_threshold",
+        "no_trigger",
+        "dossier_declined",
+        "attachments_review_declined",
+        "dispatched_to_crm",
+    }
+)
+
 
 class MasterWorkflowAgent:
     def __init__(
@@ -74,6 +122,7 @@ class MasterWorkflowAgent:
         if agent_overrides:
             resolved_overrides.update({k: v for k, v in agent_overrides.items() if v})
 
+        self._resolved_overrides: Dict[str, str] = dict(resolved_overrides)
         self.communication_backend = communication_backend
         self.telemetry = getattr(communication_backend, "telemetry", None)
 
@@ -82,15 +131,19 @@ class MasterWorkflowAgent:
             resolved_overrides.get("polling"),
             config=settings,
         )
-        trigger_words_file = (
+        self._trigger_words_file = (
             Path(__file__).resolve().parents[1] / "config" / "trigger_words.txt"
         )
+        self._rule_sources_signature = self._rule_sources_state()
         self.trigger_words = load_trigger_words(
-            settings.trigger_words, triggers_file=trigger_words_file, logger=logger
+            settings.trigger_words,
+            triggers_file=self._trigger_words_file,
+            logger=logger,
         )
         self._rule_hash = hashlib.sha256(
             "\n".join(sorted(self.trigger_words)).encode("utf-8")
         ).hexdigest()
+        self._owns_trigger_agent = trigger_agent is None
         self.trigger_agent = trigger_agent or create_agent(
             BaseTriggerAgent,
             resolved_overrides.get("trigger"),
@@ -134,11 +187,33 @@ class MasterWorkflowAgent:
         self._negative_cache_path = (
             self.storage_agent.base_dir / "state" / "negative_cache.json"
         )
-        self._negative_cache: Optional[NegativeEventCache] = None
+        self._negative_cache: Optional[
+            Union[NegativeEventCache, BinaryNegativeEventCache]
+        ] = None
         self._processed_cache_path = (
             self.storage_agent.base_dir / "state" / "processed_events.json"
         )
-        self._processed_event_cache: Optional[ProcessedEventCache] = None
+        self._processed_event_cache: Optional[
+            Union[ProcessedEventCache, BinaryProcessedEventCache]
+        ] = None
+        self._event_fingerprints: Dict[int, Tuple[Dict[str, Any], EventFingerprint]] = {}
+        self._checkpoint_dir = self.storage_agent.base_dir / "state" / "checkpoints"
+        self._checkpoints: Optional[StageCheckpointStore] = None
+        self.research_cache: Optional[ResearchCache] = None
+        if getattr(settings, "research_cache_enabled", False):
+            self.research_cache = ResearchCache(
+                ttl_seconds=getattr(settings, "research_cache_ttl_seconds", {}),
+                default_ttl=getattr(
+                    settings, "research_cache_default_ttl_seconds", 24 * 3600.0
+                ),
+                max_entries=getattr(settings, "research_cache_max_entries", 1024),
+                path=self.storage_agent.base_dir / "state" / "research_cache.json",
+            )
+        # Shared by all events so per-agent limits hold across the whole run.
+        self.research_dag = ResearchDAG(
+            limits=getattr(settings, "research_agent_concurrency", {}),
+            propagate=(CircuitOpenError, DeadlineExceeded),
+        )
 
         self.run_id: str = ""
         self.run_directory: Path = self.storage_agent.base_dir
@@ -152,11 +227,73 @@ class MasterWorkflowAgent:
         self.llm_retry_budgets: Dict[str, int] = {}
         self._apply_llm_settings(settings)
 
+        # Set by WorkflowRuntime: keep the watcher running between runs.
+        self.reuse_across_runs = False
         self._config_watcher = LlmConfigurationWatcher(
             settings, on_update=self._apply_llm_settings
         )
         self._config_watcher.start()
 
+    def _rule_sources_state(self) -> Tuple[Tuple[str, int, int], ...]:
+        """Return ``(path, mtime_ns, size)`` of the trigger rule files."""
+
+        paths = [self._trigger_words_file]
+        synonyms = getattr(settings, "synonym_trigger_path", None)
+        if synonyms:
+            paths.append(Path(synonyms))
+        state = []
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                state.append((str(path), -1, -1))
+            else:
+                state.append((str(path), stat.st_mtime_ns, stat.st_size))
+        return tuple(state)
+
+    async def reload_changed_rules(self) -> bool:
+        """Reload trigger words and synonyms if their files changed on disk.
+
+        Used between runs of a long-lived agent. Returns ``True`` when the
+        rules were reloaded.
+        """
+
+        signature = self._rule_sources_state()
+        if signature == self._rule_sources_signature:
+            return False
+        self._rule_sources_signature = signature
+        self.trigger_words = load_trigger_words(
+            settings.trigger_words,
+            triggers_file=self._trigger_words_file,
+            logger=logger,
+        )
+        self._rule_hash = hashlib.sha256(
+            "\n".join(sorted(self.trigger_words)).encode("utf-8")
+        ).hexdigest()
+        if self._owns_trigger_agent:
+            previous = self.trigger_agent
+            self.trigger_agent = create_agent(
+                BaseTriggerAgent,
+                self._resolved_overrides.get("trigger"),
+                trigger_words=self.trigger_words,
+            )
+            closer = getattr(previous, "aclose", None)
+            if callable(closer):
+                await closer()
+        if self._negative_cache is not None:
+            self._negative_cache.reconcile_rules(
+                self._rule_hash,
+                self.trigger_words,
+                synonyms=self._load_trigger_synonyms(),
+            )
+        # The rule hash is part of the checkpoint configuration hash.
+        self._checkpoints = None
+        logger.info(
+            "Reloaded %d trigger words after rule files changed",
+            len(self.trigger_words),
+        )
+        return True
+
     def attach_run(self, run_id: str, workflow_log_manager: WorkflowLogManager) -> None:
         if not run_id:
             raise ValueError("attach_run requires a non-empty run_id")
@@ -328,105 +465,191 @@ class MasterWorkflowAgent:
     async def process_all_events(self) -> List[Dict[str, Any]]:
         logger.info("MasterWorkflowAgent: Processing events...")
 
+        with deadline_scope(getattr(settings, "run_deadline_seconds", 0), stage="run"):
+            events = await self.event_agent.poll()
+            return await self.process_events(events)
+
+    async def process_events(
+        self, events: Iterable[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Run the workflow for already fetched *events*.
+
+        Used by :meth:`process_all_events` after a poll and by push ingestion
+        for the events of a targeted incremental fetch. Up to
+        ``MAX_CONCURRENT_EVENTS`` events are processed at once (so the
+        per-agent limits of :attr:`research_dag` apply across them); results
+        keep the order of *events*. An unexpected failure cancels the other
+        events and is re-raised.
+        """
+
         processed_results: List[Dict[str, Any]] = []
-        if self._negative_cache is None:
-            self._negative_cache = NegativeEventCache.load(
-                self._negative_cache_path,
-                rule_hash=self._rule_hash,
-                now=time.time(),
-            )
-        if self._processed_event_cache is None:
-            self._processed_event_cache = ProcessedEventCache.load(
-                self._processed_cache_path
-            )
-        events = await self.event_agent.poll()
-        for event in events:
-            masked_event = self._mask_for_logging(event)
-            logger.info("Polled event: %s", masked_event)
+        self._load_event_caches()
+        self._load_checkpoint_store()
+        semaphore = asyncio.Semaphore(
+            max(1, int(getattr(settings, "max_concurrent_events", 1)))
+        )
+
+        async def _run(
+            event: Dict[str, Any],
+            event_result: Dict[str, Any],
+            fingerprint: EventFingerprint,
+        ) -> None:
             event_id = event.get("id")
+            async with semaphore:
+                try:
+                    await run_with_deadline(
+                        self._process_event(event, event_result, fingerprint),
+                        getattr(settings, "event_deadline_seconds", 0),
+                        stage="event",
+                    )
+                except CircuitOpenError as exc:
+                    self._defer_event(
+                        event_result,
+                        event_id,
+                        exc,
+                        host=exc.host,
+                        retry_after=round(exc.retry_after, 3),
+                    )
+                except DeadlineExceeded as exc:
+                    self._defer_event(
+                        event_result,
+                        event_id,
+                        exc,
+                        reason="deadline_exceeded",
+                        stage=exc.stage,
+                    )
+                else:
+                    if (
+                        self._checkpoints is not None
+                        and event_result.get("status") in FINAL_EVENT_STATUSES
+                    ):
+                        self._checkpoints.discard(fingerprint.content_digest)
 
-            event_result: Dict[str, Any] = {
-                "event_id": event_id,
-                "research": {},
-                "research_errors": [],
-                "status": "received",
-            }
-            processed_results.append(event_result)
+        with deadline_scope(getattr(settings, "run_deadline_seconds", 0), stage="run"):
+            self._event_fingerprints.clear()
+            tasks: List[asyncio.Task[None]] = []
+            try:
+                for event in events:
+                    masked_event = self._mask_for_logging(event)
+                    logger.info("Polled event: %s", masked_event)
+                    fingerprint = self._fingerprint_for(event)
+
+                    event_result: Dict[str, Any] = {
+                        "event_id": event.get("id"),
+                        "fingerprint": fingerprint.content_digest,
+                        "research": {},
+                        "research_errors": [],
+                        "status": "received",
+                    }
+                    processed_results.append(event_result)
+                    tasks.append(
+                        asyncio.create_task(_run(event, event_result, fingerprint))
+                    )
+                await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
 
-            if self._processed_event_cache and self._processed_event_cache.is_processed(
-                event
-            ):
-                logger.info(
-                    "Prefilter skip (processed_cache) event_id=%s", event_id
-                )
-                workflow_step_recorder.record_step(
-                    self.run_id, event_id, "prefilter.processed_cache"
-                )
-                event_result["status"] = "skipped_processed_event"
-                continue
+        return processed_results
 
-            # Step: start
-            workflow_step_recorder.record_step(self.run_id, event_id, "start")
+    async def _process_event(
+        self,
+        event: Dict[str, Any],
+        event_result: Dict[str, Any],
+        fingerprint: EventFingerprint,
+    ) -> None:
+        event_id = event.get("id")
 
-            if self._negative_cache and self._negative_cache.should_skip(
-                event, self._rule_hash
-            ):
-                decision = self._negative_cache.get_decision(
-                    event_id if isinstance(event_id, str) else None
-                )
-                logger.info(
-                    "Prefilter skip (negative_cache) event_id=%s decision=%s",
-                    event_id,
-                    decision,
-                )
-                workflow_step_recorder.record_step(
-                    self.run_id, event_id, "prefilter.negative_cache"
-                )
-                event_result["status"] = "skipped_negative_cache"
-                continue
+        if self._processed_event_cache and self._processed_event_cache.is_processed(
+            event, fingerprint=fingerprint
+        ):
+            logger.info(
+                "Prefilter skip (processed_cache) event_id=%s fingerprint=%s",
+                event_id,
+                fingerprint.content_digest,
+            )
+            workflow_step_recorder.record_step(
+                self.run_id, event_id, "prefilter.processed_cache"
+            )
+            event_result["status"] = "skipped_processed_event"
+            return
+
+        # Step: start
+        workflow_step_recorder.record_step(self.run_id, event_id, "start")
 
+        if self._negative_cache and self._negative_cache.should_skip(
+            event, self._rule_hash, fingerprint=fingerprint
+        ):
+            decision = self._negative_cache.get_decision(
+                event_id if isinstance(event_id, str) else None
+            )
+            logger.info(
+                "Prefilter skip (negative_cache) event_id=%s decision=%s",
+                event_id,
+                decision,
+            )
+            workflow_step_recorder.record_step(
+                self.run_id, event_id, "prefilter.negative_cache"
+            )
+            event_result["status"] = "skipped_negative_cache"
+            return
+
+        trigger_result = self._resume_stage(event, event_result, STAGE_TRIGGER)
+        trigger_resumed = trigger_result is not None
+        if trigger_result is None:
             with observe_operation(
-                "trigger_detection", {"event.id": str(event_id)} if event_id else None
+                "trigger_detection",
+                {"event.id": str(event_id)} if event_id else None,
             ):
                 trigger_result = await self._detect_trigger(event)
-            event_result["trigger"] = trigger_result
+        event_result["trigger"] = trigger_result
 
-            if not self._meets_confidence_threshold("trigger", trigger_result):
-                logger.info(
-                    "Skipping event %s due to trigger confidence %.3f below threshold %.3f",
-                    event_id,
-                    trigger_result.get("confidence", 0.0),
-                    self.llm_confidence_thresholds.get("trigger", 0.0),
-                )
-                event_result["status"] = "skipped_trigger_threshold"
-                if self._negative_cache:
-                    self._negative_cache.record_no_trigger(
-                        event,
-                        self._rule_hash,
-                        "skipped_trigger_threshold",
-                    )
-                continue
-            if not trigger_result.get("trigger"):
-                logger.info(f"No trigger detected for event {event_id}")
-                event_result["status"] = "no_trigger"
-                if self._negative_cache:
-                    self._negative_cache.record_no_trigger(
-                        event, self._rule_hash, "no_trigger"
-                    )
-                continue
-
-            record_trigger_match(trigger_result.get("type", "unknown"))
-            if self._negative_cache:
-                self._negative_cache.forget(event_id)
-            masked_trigger = self._mask_for_logging(trigger_result)
+        if not self._meets_confidence_threshold("trigger", trigger_result):
             logger.info(
-                "%s trigger detected in event %s (matched: %s in %s)",
-                masked_trigger.get("type", "").capitalize(),
+                "Skipping event %s due to trigger confidence %.3f below threshold %.3f",
                 event_id,
-                masked_trigger.get("matched_word"),
-                masked_trigger.get("matched_field"),
+                trigger_result.get("confidence", 0.0),
+                self.llm_confidence_thresholds.get("trigger", 0.0),
             )
+            event_result["status"] = "skipped_trigger_threshold"
+            if self._negative_cache:
+                self._negative_cache.record_no_trigger(
+                    event,
+                    self._rule_hash,
+                    "skipped_trigger_threshold",
+                    fingerprint=fingerprint,
+                )
+            return
+        if not trigger_result.get("trigger"):
+            logger.info(f"No trigger detected for event {event_id}")
+            event_result["status"] = "no_trigger"
+            if self._negative_cache:
+                self._negative_cache.record_no_trigger(
+                    event,
+                    self._rule_hash,
+                    "no_trigger",
+                    fingerprint=fingerprint,
+                )
+            return
 
+        record_trigger_match(trigger_result.get("type", "unknown"))
+        if self._negative_cache:
+            self._negative_cache.forget(event_id)
+        if not trigger_resumed:
+            self._checkpoint_stage(event, STAGE_TRIGGER, trigger_result)
+        masked_trigger = self._mask_for_logging(trigger_result)
+        logger.info(
+            "%s trigger detected in event %s (matched: %s in %s)",
+            masked_trigger.get("type", "").capitalize(),
+            event_id,
+            masked_trigger.get("matched_word"),
+            masked_trigger.get("matched_field"),
+        )
+
+        extracted = self._resume_stage(event, event_result, STAGE_EXTRACTION)
+        if extracted is None:
             with observe_operation(
                 "extraction", {"event.id": str(event_id)} if event_id else None
             ):
@@ -446,51 +669,116 @@ class MasterWorkflowAgent:
                         ):
                             extraction_input[field] = context.get(field)
                 extracted = await self.extraction_agent.extract(extraction_input)
-            event_result["extraction"] = extracted
+            self._checkpoint_stage(event, STAGE_EXTRACTION, extracted)
+        event_result["extraction"] = extracted
+
+        info = extracted.get("info", {}) or {}
+        normalised_info, domain_meta = self._normalise_info_for_research(
+            info, event=event
+        )
+        extracted.setdefault("info", {})
+        extracted["info"]["company_name"] = normalised_info.get("company_name")
+        extracted["info"]["web_domain"] = normalised_info.get("company_domain")
+        extracted["info"]["company_domain"] = normalised_info.get(
+            "company_domain"
+        )
+        is_complete = bool(
+            normalised_info.get("company_name")
+            and normalised_info.get("company_domain")
+        )
+        extracted["is_complete"] = is_complete
+        event_result["domain_resolution"] = domain_meta
 
-            info = extracted.get("info", {}) or {}
-            normalised_info, domain_meta = self._normalise_info_for_research(
-                info, event=event
+        if not self._meets_confidence_threshold("extraction", extracted):
+            logger.info(
+                "Extraction confidence %.3f below threshold %.3f for event %s",
+                extracted.get("confidence", 0.0),
+                self.llm_confidence_thresholds.get("extraction", 0.0),
+                event_id,
             )
-            extracted.setdefault("info", {})
-            extracted["info"]["company_name"] = normalised_info.get("company_name")
-            extracted["info"]["web_domain"] = normalised_info.get("company_domain")
-            extracted["info"]["company_domain"] = normalised_info.get(
-                "company_domain"
+            event_result["status"] = "skipped_extraction_threshold"
+            return
+
+        internal_status = None
+        internal_result: Optional[Dict[str, Any]] = None
+        crm_lookup: Dict[str, Any] = {
+            "company_in_crm": False,
+            "attachments_in_crm": False,
+            "requires_dossier": True,
+            "attachments": [],
+            "attachment_count": 0,
+            "company": None,
+        }
+
+        if not normalised_info.get("company_domain"):
+            event_result["status"] = "hitl_required"
+            self._record_domain_guardrail(
+                event_result, event_id, info, domain_meta
             )
-            is_complete = bool(
+            follow_up = await self._collect_missing_info_via_hitl(
+                event_result,
+                event,
+                extracted,
+                event_id,
+            )
+            if not follow_up:
+                return
+
+            normalised_info = follow_up["info"]
+            domain_meta = follow_up["domain_meta"]
+            event_result["domain_resolution"] = domain_meta
+
+            info_payload = extracted.setdefault("info", {})
+            info_payload.update(normalised_info)
+
+            extracted["is_complete"] = bool(
                 normalised_info.get("company_name")
                 and normalised_info.get("company_domain")
             )
-            extracted["is_complete"] = is_complete
-            event_result["domain_resolution"] = domain_meta
+            is_complete = extracted["is_complete"]
 
-            if not self._meets_confidence_threshold("extraction", extracted):
-                logger.info(
-                    "Extraction confidence %.3f below threshold %.3f for event %s",
-                    extracted.get("confidence", 0.0),
-                    self.llm_confidence_thresholds.get("extraction", 0.0),
-                    event_id,
+        has_research_inputs = self._has_research_inputs(normalised_info)
+        if has_research_inputs:
+            try:
+                self._validate_extraction_inputs(
+                    normalised_info, event_result, event_id
                 )
-                event_result["status"] = "skipped_extraction_threshold"
-                continue
+            except InvalidExtractionError:
+                return
 
-            internal_status = None
-            internal_result: Optional[Dict[str, Any]] = None
-            crm_lookup: Dict[str, Any] = {
-                "company_in_crm": False,
-                "attachments_in_crm": False,
-                "requires_dossier": True,
-                "attachments": [],
-                "attachment_count": 0,
-                "company": None,
-            }
+        if has_research_inputs:
+            internal_result = await self._run_internal_research(
+                event_result,
+                event,
+                normalised_info,
+                event_id,
+                force=False,
+            )
+            internal_status = self._extract_internal_status(internal_result)
+            crm_lookup = self._extract_crm_lookup(internal_result)
+            workflow_step_recorder.record_step(
+                self.run_id, event_id, "internal_lookup_completed"
+            )
+
+        if is_complete and internal_status == "AWAIT_REQUESTOR_DETAILS":
+            event_result["status"] = "awaiting_requestor_details"
+            return
+        if is_complete and internal_status == "AWAIT_REQUESTOR_DECISION":
+            event_result["status"] = "awaiting_requestor_decision"
+            return
 
-            if not normalised_info.get("company_domain"):
-                event_result["status"] = "hitl_required"
-                self._record_domain_guardrail(
-                    event_result, event_id, info, domain_meta
+        if trigger_result.get("type") == "hard":
+            if is_complete:
+                await self._handle_hard_trigger(
+                    event,
+                    normalised_info,
+                    event_result,
+                    event_id,
+                    internal_result=internal_result,
+                    crm_lookup=crm_lookup,
                 )
+                return
+            else:
                 follow_up = await self._collect_missing_info_via_hitl(
                     event_result,
                     event,
@@ -498,167 +786,243 @@ class MasterWorkflowAgent:
                     event_id,
                 )
                 if not follow_up:
-                    continue
-
-                normalised_info = follow_up["info"]
-                domain_meta = follow_up["domain_meta"]
-                event_result["domain_resolution"] = domain_meta
-
-                info_payload = extracted.setdefault("info", {})
-                info_payload.update(normalised_info)
-
-                extracted["is_complete"] = bool(
-                    normalised_info.get("company_name")
-                    and normalised_info.get("company_domain")
-                )
-                is_complete = extracted["is_complete"]
-
-            has_research_inputs = self._has_research_inputs(normalised_info)
-            if has_research_inputs:
-                try:
-                    self._validate_extraction_inputs(
-                        normalised_info, event_result, event_id
-                    )
-                except InvalidExtractionError:
-                    continue
+                    return
 
-            if has_research_inputs:
-                internal_result = await self._run_internal_research(
+                filled_info = follow_up["info"]
+                refreshed_internal = await self._run_internal_research(
                     event_result,
                     event,
-                    normalised_info,
+                    filled_info,
                     event_id,
-                    force=False,
+                    force=True,
                 )
-                internal_status = self._extract_internal_status(internal_result)
-                crm_lookup = self._extract_crm_lookup(internal_result)
+                refreshed_lookup = self._extract_crm_lookup(refreshed_internal)
                 workflow_step_recorder.record_step(
                     self.run_id, event_id, "internal_lookup_completed"
                 )
+                await self._handle_hard_trigger(
+                    event,
+                    filled_info,
+                    event_result,
+                    event_id,
+                    internal_result=refreshed_internal,
+                    crm_lookup=refreshed_lookup,
+                )
+            return
 
-            if is_complete and internal_status == "AWAIT_REQUESTOR_DETAILS":
-                event_result["status"] = "awaiting_requestor_details"
-                continue
-            if is_complete and internal_status == "AWAIT_REQUESTOR_DECISION":
-                event_result["status"] = "awaiting_requestor_decision"
-                continue
-
-            if trigger_result.get("type") == "hard":
-                if is_complete:
-                    await self._handle_hard_trigger(
-                        event,
-                        normalised_info,
-                        event_result,
-                        event_id,
-                        internal_result=internal_result,
-                        crm_lookup=crm_lookup,
-                    )
-                    continue
-                else:
-                    follow_up = await self._collect_missing_info_via_hitl(
-                        event_result,
-                        event,
-                        extracted,
-                        event_id,
-                    )
-                    if not follow_up:
-                        continue
+        if trigger_result.get("type") == "soft" and is_complete:
+            await self._handle_soft_trigger(
+                event,
+                normalised_info,
+                event_result,
+                event_id,
+                internal_result=internal_result,
+                crm_lookup=crm_lookup,
+            )
+            return
 
-                    filled_info = follow_up["info"]
-                    refreshed_internal = await self._run_internal_research(
-                        event_result,
+        if trigger_result.get("type") == "soft" and not is_complete:
+            with observe_operation(
+                "hitl_dossier", {"event.id": str(event_id)} if event_id else None
+            ):
+                try:
+                    response = self.request_dossier_confirmation(
                         event,
-                        filled_info,
-                        event_id,
-                        force=True,
-                    )
-                    refreshed_lookup = self._extract_crm_lookup(refreshed_internal)
-                    workflow_step_recorder.record_step(
-                        self.run_id, event_id, "internal_lookup_completed"
+                        info,
+                        event_id=event_id,
                     )
-                    await self._handle_hard_trigger(
-                        event,
-                        filled_info,
-                        event_result,
-                        event_id,
-                        internal_result=refreshed_internal,
-                        crm_lookup=refreshed_lookup,
+                except DossierConfirmationBackendUnavailable as exc:
+                    self._handle_missing_dossier_backend(
+                        event_result, event_id, str(exc)
                     )
-                continue
+                    return
+            event_result["hitl_dossier"] = response
+            audit_id = response.get("audit_id")
+            status = self._resolve_dossier_status(response)
+            if status == "pending":
+                self._log_dossier_pending(event_id, audit_id, response)
+                record_hitl_outcome("dossier", "pending")
+                event_result["status"] = "dossier_pending"
+            elif response.get("dossier_required") or status == "approved":
+                logger.info(
+                    "Organizer approved dossier for event %s [audit_id=%s]: %s",
+                    event_id,
+                    audit_id or "n/a",
+                    self._mask_for_logging(response.get("details")),
+                )
+                record_hitl_outcome("dossier", "approved")
+                follow_up = await self._collect_missing_info_via_hitl(
+                    event_result,
+                    event,
+                    extracted,
+                    event_id,
+                )
+                if not follow_up:
+                    return
 
-            if trigger_result.get("type") == "soft" and is_complete:
-                await self._handle_soft_trigger(
+                filled_info = follow_up["info"]
+                await self._process_crm_dispatch(
                     event,
-                    normalised_info,
+                    filled_info,
                     event_result,
                     event_id,
-                    internal_result=internal_result,
-                    crm_lookup=crm_lookup,
+                    force_internal=True,
                 )
-                continue
+            else:
+                logger.info(
+                    "Organizer declined dossier for event %s [audit_id=%s]: %s",
+                    event_id,
+                    audit_id or "n/a",
+                    self._mask_for_logging(response.get("details")),
+                )
+                record_hitl_outcome("dossier", "declined")
+                event_result["status"] = "dossier_declined"
+            return
 
-            if trigger_result.get("type") == "soft" and not is_complete:
-                with observe_operation(
-                    "hitl_dossier", {"event.id": str(event_id)} if event_id else None
-                ):
-                    try:
-                        response = self.request_dossier_confirmation(
-                            event,
-                            info,
-                            event_id=event_id,
-                        )
-                    except DossierConfirmationBackendUnavailable as exc:
-                        self._handle_missing_dossier_backend(
-                            event_result, event_id, str(exc)
-                        )
-                        continue
-                event_result["hitl_dossier"] = response
-                audit_id = response.get("audit_id")
-                status = self._resolve_dossier_status(response)
-                if status == "pending":
-                    self._log_dossier_pending(event_id, audit_id, response)
-                    record_hitl_outcome("dossier", "pending")
-                    event_result["status"] = "dossier_pending"
-                elif response.get("dossier_required") or status == "approved":
-                    logger.info(
-                        "Organizer approved dossier for event %s [audit_id=%s]: %s",
-                        event_id,
-                        audit_id or "n/a",
-                        self._mask_for_logging(response.get("details")),
-                    )
-                    record_hitl_outcome("dossier", "approved")
-                    follow_up = await self._collect_missing_info_via_hitl(
-                        event_result,
-                        event,
-                        extracted,
-                        event_id,
-                    )
-                    if not follow_up:
-                        continue
+        logger.warning(f"Unhandled trigger/info state for event {event_id}")
+        event_result["status"] = "unhandled_state"
 
-                    filled_info = follow_up["info"]
-                    await self._process_crm_dispatch(
-                        event,
-                        filled_info,
-                        event_result,
-                        event_id,
-                        force_internal=True,
-                    )
-                else:
-                    logger.info(
-                        "Organizer declined dossier for event %s [audit_id=%s]: %s",
-                        event_id,
-                        audit_id or "n/a",
-                        self._mask_for_logging(response.get("details")),
-                    )
-                    record_hitl_outcome("dossier", "declined")
-                    event_result["status"] = "dossier_declined"
-                continue
+    def _defer_event(
+        self,
+        event_result: Dict[str, Any],
+        event_id: Any,
+        error: Exception,
+        **details: Any,
+    ) -> None:
+        """Leave the event for the next cycle (open breaker or exhausted budget)."""
+
+        logger.warning("Deferring event %s to the next cycle: %s", event_id, error)
+        event_result["status"] = "deferred"
+        event_result["deferred"] = details
+        workflow_step_recorder.record_step(self.run_id, event_id, "deferred")
+
+    def _load_event_caches(self) -> None:
+        backend = str(getattr(settings, "event_cache_backend", "json")).lower()
+        if backend == "binary":
+            if self._negative_cache is None:
+                self._negative_cache = BinaryNegativeEventCache.load(
+                    self._negative_cache_path.with_suffix(".bin"),
+                    rule_hash=self._rule_hash,
+                    now=time.time(),
+                    json_path=self._negative_cache_path,
+                )
+            if self._processed_event_cache is None:
+                self._processed_event_cache = BinaryProcessedEventCache.load(
+                    self._processed_cache_path.with_suffix(".bin"),
+                    json_path=self._processed_cache_path,
+                )
+            return
 
-            logger.warning(f"Unhandled trigger/info state for event {event_id}")
-            event_result["status"] = "unhandled_state"
+        if self._negative_cache is None:
+            self._negative_cache = NegativeEventCache.load(
+                self._negative_cache_path,
+                rule_hash=self._rule_hash,
+                now=time.time(),
+                max_entries=getattr(settings, "negative_cache_max_entries", 0),
+                max_bytes=getattr(settings, "negative_cache_max_bytes", 0),
+            )
+            self._negative_cache.reconcile_rules(
+                self._rule_hash,
+                self.trigger_words,
+                synonyms=self._load_trigger_synonyms(),
+            )
+        if self._processed_event_cache is None:
+            self._processed_event_cache = ProcessedEventCache.load(
+                self._processed_cache_path
+            )
 
-        return processed_results
+    def _load_checkpoint_store(self) -> None:
+        if not getattr(settings, "stage_checkpoints_enabled", True):
+            self._checkpoints = None
+            return
+        if self._checkpoints is not None:
+            self._checkpoints.prune()
+            return
+        agent_types = {
+            name: type(agent).__qualname__
+            for name, agent in (
+                ("trigger", self.trigger_agent),
+                ("extraction", self.extraction_agent),
+                ("internal_research", self.internal_research_agent),
+                ("dossier_research", self.dossier_research_agent),
+                ("similar_companies", self.similar_companies_agent),
+            )
+        }
+        config_hash = inputs_digest(
+            {
+                "rules": self._rule_hash,
+                "thresholds": self.llm_confidence_thresholds,
+                "agents": self._resolved_overrides,
+                "agent_types": agent_types,
+            }
+        )
+        self._checkpoints = StageCheckpointStore(
+            self._checkpoint_dir,
+            config_hash=config_hash,
+            ttl_seconds=getattr(
+                settings,
+                "stage_checkpoint_ttl_seconds",
+                DEFAULT_CHECKPOINT_TTL_SECONDS,
+            ),
+        )
+        removed = self._checkpoints.prune()
+        if removed:
+            logger.info("Removed %d expired stage checkpoint(s)", removed)
+
+    def _resume_stage(
+        self,
+        event: Dict[str, Any],
+        event_result: Dict[str, Any],
+        stage: str,
+        *,
+        inputs: Optional[str] = None,
+    ) -> Optional[Any]:
+        if self._checkpoints is None:
+            return None
+        fingerprint = self._fingerprint_for(event).content_digest
+        payload = self._checkpoints.load(fingerprint, stage, inputs=inputs)
+        if payload is None:
+            return None
+        logger.info(
+            "Resuming event %s from checkpointed stage '%s'", event.get("id"), stage
+        )
+        event_result.setdefault("resumed_stages", []).append(stage)
+        return payload
+
+    def _checkpoint_stage(
+        self,
+        event: Dict[str, Any],
+        stage: str,
+        payload: Any,
+        *,
+        inputs: Optional[str] = None,
+    ) -> None:
+        if self._checkpoints is None:
+            return
+        event_id = event.get("id")
+        self._checkpoints.save(
+            self._fingerprint_for(event).content_digest,
+            stage,
+            payload,
+            event_id=str(event_id) if event_id is not None else None,
+            inputs=inputs,
+        )
+
+    def _load_trigger_synonyms(self) -> Tuple[str, ...]:
+        path = getattr(settings, "synonym_trigger_path", None)
+        if not path or not Path(path).exists():
+            return ()
+        return load_synonym_phrases(Path(path))
+
+    def _fingerprint_for(self, event: Dict[str, Any]) -> EventFingerprint:
+        """Return the fingerprint of *event*, computing it at most once per run."""
+
+        cached = self._event_fingerprints.get(id(event))
+        if cached is not None and cached[0] is event:
+            return cached[1]
+        fingerprint = fingerprint_event(event)
+        self._event_fingerprints[id(event)] = (event, fingerprint)
+        return fingerprint
 
     async def _detect_trigger(self, event: Dict[str, Any]) -> Dict[str, Any]:
         return await self.trigger_agent.check(event)
@@ -1195,13 +1559,51 @@ class MasterWorkflowAgent:
             # Kein zusätzlicher Step-Recorder-Eintrag → bereits geloggt
             return existing
 
+        stage_inputs = inputs_digest(info)
+        resumed = self._resume_stage(
+            event, event_result, agent_name, inputs=stage_inputs
+        )
+        if resumed is not None:
+            research_store[agent_name] = resumed
+            self._log_research_step(
+                agent_name,
+                event_id,
+                "checkpoint",
+                result=resumed if isinstance(resumed, dict) else None,
+            )
+            return resumed
+
         trigger = self._build_research_trigger(event, info, event_id)
         attributes = {"event.id": str(event_id)} if event_id is not None else None
+
+        async def invoke() -> Optional[Dict[str, Any]]:
+            async with concurrency.RESEARCH_TASK_SEMAPHORE:
+                return await run_with_deadline(
+                    agent.run(trigger),
+                    getattr(settings, "research_stage_timeout_seconds", 0),
+                    stage=agent_name,
+                )
+
+        # Results are shared across events for the same company; a hit keeps
+        # referencing the artifacts written by the run that computed it.
+        company_domain = normalize_domain(
+            info.get("company_domain") or info.get("web_domain")
+        )
+        origin = "computed"
         with observe_operation(agent_name, attributes):
             try:
-                async with concurrency.RESEARCH_TASK_SEMAPHORE:
-                    result = await agent.run(trigger)
+                if self.research_cache is not None and company_domain:
+                    result, origin = await self.research_cache.fetch(
+                        agent_name, company_domain, invoke
+                    )
+                else:
+                    result = await invoke()
+            except CircuitOpenError:
+                raise
             except Exception as exc:  # pragma: no cover
+                if isinstance(exc, DeadlineExceeded) and deadline_expired():
+                    # The event budget is spent, not just this stage's.
+                    raise
                 logger.exception(
                     "%s research agent failed for event %s", agent_name, event_id
                 )
@@ -1216,12 +1618,31 @@ class MasterWorkflowAgent:
                 )
                 return research_store.get(agent_name)
 
+        if origin != "computed" and isinstance(result, dict):
+            # The requester fields belong to the event, not the company.
+            for key in ("creator", "recipient"):
+                if key in result:
+                    result[key] = trigger.get(key)
         research_store[agent_name] = result
+        if result is not None:
+            self._checkpoint_stage(event, agent_name, result, inputs=stage_inputs)
+        if origin == "computed" and isinstance(result, dict):
+            # Parsing artifacts and writing SQLite must not block the loop.
+            await asyncio.to_thread(self._index_research_artifacts, result)
         self._log_research_step(
             agent_name,
             event_id,
-            "completed",
+            "completed" if origin == "computed" else "cached",
             result=result if isinstance(result, dict) else None,
+            details=(
+                None
+                if origin == "computed"
+                else {
+                    "source": "company_cache",
+                    "origin": origin,
+                    "company_domain": company_domain,
+                }
+            ),
         )
 
         # Zentrale Step-Namensgebung:
@@ -1237,6 +1658,17 @@ class MasterWorkflowAgent:
 
         return result
 
+    def _index_research_artifacts(self, result: Dict[str, Any]) -> None:
+        """Make freshly written artifacts searchable for later lookups."""
+
+        index = shared_internal_company_index(settings)
+        if index is None:
+            return
+        try:
+            index.index_result(result)
+        except Exception:
+            logger.warning("Failed to index research artifacts", exc_info=True)
+
     async def _run_internal_research(
         self,
         event_result: Dict[str, Any],
@@ -1556,63 +1988,128 @@ class MasterWorkflowAgent:
         info: Dict[str, Any],
         event_id: Optional[Any],
         *,
-        requires_dossier: bool,
+        requires_dossier: Optional[bool] = None,
+        internal_result: Optional[Dict[str, Any]] = None,
+        run_internal: bool = False,
+        force_internal: bool = False,
     ) -> None:
-        runners = []
-
-        if requires_dossier:
-            if self._can_run_dossier(info):
-
-                async def run_dossier() -> None:
-                    await self._run_research_agent(
-                        self.dossier_research_agent,
-                        "dossier_research",
-                        event_result,
-                        event,
-                        info,
-                        event_id,
-                        force=True,
-                    )
-
-                runners.append(run_dossier)
+        """Run the pre-CRM research graph for one event.
+
+        Internal research runs first (when *run_internal* is set); the
+        dossier and the similar companies search wait for its result and then
+        run together, and neither runs while the event awaits the requestor.
+        *requires_dossier*, when given, overrides the internal dossier
+        decision. Results land in ``event_result["research"]`` and the
+        critical path of the run in ``event_result["research_timings"]``.
+        """
+
+        def _awaiting_requestor(facts: Mapping[str, Any]) -> bool:
+            return self._extract_internal_status(
+                facts.get("internal_research")
+            ) in {"AWAIT_REQUESTOR_DETAILS", "AWAIT_REQUESTOR_DECISION"}
+
+        def _wants_dossier(facts: Mapping[str, Any]) -> bool:
+            if _awaiting_requestor(facts):
+                return False
+            if requires_dossier is not None:
+                wanted = bool(requires_dossier)
             else:
+                wanted = self._determine_requires_dossier(
+                    facts.get("internal_research")
+                )
+            if wanted and not self._can_run_dossier(info):
                 self._log_research_step(
                     "dossier_research",
                     event_id,
                     "skipped",
                     details={"reason": "missing_inputs"},
                 )
+                return False
+            return wanted
 
-        if self._can_run_similar(info):
-
-            async def run_similar() -> None:
-                await self._run_research_agent(
-                    self.similar_companies_agent,
+        def _wants_similar(facts: Mapping[str, Any]) -> bool:
+            if _awaiting_requestor(facts):
+                return False
+            if not self._can_run_similar(info):
+                self._log_research_step(
                     "similar_companies",
-                    event_result,
-                    event,
-                    info,
                     event_id,
-                    force=True,
+                    "skipped",
+                    details={"reason": "missing_inputs"},
                 )
+                return False
+            return True
 
-            runners.append(run_similar)
-        else:
-            self._log_research_step(
-                "similar_companies",
-                event_id,
-                "skipped",
-                details={"reason": "missing_inputs"},
+        async def run_internal_research(_: Mapping[str, Any]) -> Dict[str, Any]:
+            result = await self._run_internal_research(
+                event_result, event, info, event_id, force=force_internal
             )
+            return {"internal_research": result}
 
-        if not runners:
-            return
+        async def run_dossier(_: Mapping[str, Any]) -> Dict[str, Any]:
+            result = await self._run_research_agent(
+                self.dossier_research_agent,
+                "dossier_research",
+                event_result,
+                event,
+                info,
+                event_id,
+                force=True,
+            )
+            return {"dossier_research": result}
 
-        if len(runners) == 1:
-            await runners[0]()
-            return
+        async def run_similar(_: Mapping[str, Any]) -> Dict[str, Any]:
+            result = await self._run_research_agent(
+                self.similar_companies_agent,
+                "similar_companies",
+                event_result,
+                event,
+                info,
+                event_id,
+                force=True,
+            )
+            return {"similar_companies": result}
+
+        facts: Dict[str, Any] = {}
+        nodes = [
+            ResearchNode(
+                "dossier_research",
+                run_dossier,
+                inputs=("internal_research",),
+                outputs=("dossier_research",),
+                when=_wants_dossier,
+            ),
+            ResearchNode(
+                "similar_companies",
+                run_similar,
+                inputs=("internal_research",),
+                outputs=("similar_companies",),
+                when=_wants_similar,
+            ),
+        ]
+        if run_internal:
+            nodes.insert(
+                0,
+                ResearchNode(
+                    "internal_research",
+                    run_internal_research,
+                    outputs=("internal_research",),
+                ),
+            )
+        else:
+            facts["internal_research"] = internal_result
 
-        await concurrency.run_in_task_group(runners)
+        dag = getattr(self, "research_dag", None) or ResearchDAG(
+            propagate=(CircuitOpenError, DeadlineExceeded)
+        )
+        outcome = await dag.execute(nodes, facts)
+        event_result["research_timings"] = outcome.to_dict()
+        logger.info(
+            "Research critical path for event %s: %s (%.1f ms)",
+            event_id,
+            " -> ".join(outcome.critical_path) or "<none>",
+            outcome.duration_ms,
+        )
 
     def _can_run_dossier(self, info: Dict[str, Any]) -> bool:
         return bool(info.get("company_name")) and bool(info.get("company_domain"))
@@ -1641,15 +2138,19 @@ class MasterWorkflowAgent:
         except InvalidExtractionError:
             return
 
-        if internal_result is None:
-            internal_result = await self._run_internal_research(
-                event_result,
-                event,
-                prepared_info,
-                event_id,
-                force=force_internal,
-            )
+        await self._execute_precrm_research(
+            event_result,
+            event,
+            prepared_info,
+            event_id,
+            requires_dossier=requires_dossier_override,
+            internal_result=internal_result,
+            run_internal=internal_result is None,
+            force_internal=force_internal,
+        )
         research_store = event_result.setdefault("research", {})
+        if internal_result is None:
+            internal_result = research_store.get("internal_research")
         if internal_result is not None:
             research_store.setdefault("internal_research", internal_result)
         internal_status = self._extract_internal_status(internal_result)
@@ -1660,18 +2161,6 @@ class MasterWorkflowAgent:
             event_result["status"] = "awaiting_requestor_decision"
             return
 
-        if requires_dossier_override is not None:
-            requires_dossier = bool(requires_dossier_override)
-        else:
-            requires_dossier = self._determine_requires_dossier(internal_result)
-        await self._execute_precrm_research(
-            event_result,
-            event,
-            prepared_info,
-            event_id,
-            requires_dossier=requires_dossier,
-        )
-
         research_store = event_result.get("research")
         if isinstance(research_store, MutableMapping):
             self._guard_before_crm_dispatch(research_store)
@@ -1698,7 +2187,11 @@ class MasterWorkflowAgent:
         event_result["crm_payload"] = crm_payload
 
         if self._processed_event_cache:
-            self._processed_event_cache.mark_processed(event)
+            self._processed_event_cache.mark_processed(
+                event, fingerprint=self._fingerprint_for(event)
+            )
+        if self._checkpoints is not None:
+            self._checkpoints.discard(self._fingerprint_for(event).content_digest)
 
     def finalize_run_logs(self) -> None:
         log_size = 0
@@ -1731,6 +2224,8 @@ class MasterWorkflowAgent:
             self._negative_cache.flush()
         if self._processed_event_cache:
             self._processed_event_cache.flush()
+        if self.research_cache is not None:
+            self.research_cache.flush()
 
         if hasattr(self.human_agent, "shutdown"):
             try:
@@ -1738,7 +2233,7 @@ class MasterWorkflowAgent:
             except Exception:
                 logger.exception("Failed to shutdown human agent reminders")
 
-        if hasattr(self, "_config_watcher"):
+        if hasattr(self, "_config_watcher") and not self.reuse_across_runs:
             self._config_watcher.stop()
 
     def _log_research_step(
@@ -1895,6 +2390,17 @@ class MasterWorkflowAgent:
             return_exceptions=True,
         )
 
+        for cache in (
+            getattr(self, "_negative_cache", None),
+            getattr(self, "_processed_event_cache", None),
+        ):
+            closer = getattr(cache, "close", None)
+            if callable(closer):
+                try:
+                    closer()
+                except Exception:
+                    logger.exception("Failed to close event cache")
+
         watcher = getattr(self, "_config_watcher", None)
         if watcher is not None:
             try:
@@ -1908,6 +2414,8 @@ class MasterWorkflowAgent:
         )
         self.llm_cost_caps = dict(current_settings.llm_cost_caps)
         self.llm_retry_budgets = dict(current_settings.llm_retry_budgets)
+        # Thresholds are part of the checkpoint configuration hash.
+        self._checkpoints = None
         logger.debug(
             "Updated LLM thresholds: confidence=%s cost_caps=%s retry_budgets=%s",
             self.llm_confidence_thresholds,
@@ -6,6 +6,7 @@ import inspect
 import json
 import logging
 import os
+from dataclasses import replace
 from typing import (
     Any,
     Awaitable,
@@ -29,6 +30,8 @@ from agents.soft_trigger_validator import (
 )
 from config.config import settings
 from utils.async_http import AsyncHTTP
+from utils.circuit_breaker import CircuitOpenError
+from utils.retry import default_retry_policy
 from utils.text_normalization import normalize_text
 
 logger = logging.getLogger(__name__)
@@ -54,7 +57,16 @@ class _OpenAiSoftTriggerDetector:
         self.api_key = api_key
         self.model = model
         self.timeout = timeout
-        self._http = AsyncHTTP(base_url=self._DEFAULT_BASE, timeout=timeout)
+        # Chat completions have no side effects, so the POST is retried on
+        # server errors and read failures like an idempotent request.
+        policy = default_retry_policy()
+        self._http = AsyncHTTP(
+            base_url=self._DEFAULT_BASE,
+            timeout=timeout,
+            retry_policy=replace(
+                policy, idempotent_methods=policy.idempotent_methods | {"POST"}
+            ),
+        )
 
     async def __call__(
         self, summary: str, description: str, hard_triggers: Sequence[str]
@@ -350,6 +362,10 @@ Antworte ausschließlich mit der JSON-Struktur.
             raw_matches = detector(summary, description, self.original_trigger_words)
             if inspect.isawaitable(raw_matches):
                 raw_matches = await raw_matches
+        except CircuitOpenError:
+            # The LLM endpoint is degraded; defer the event instead of
+            # treating it as having no soft trigger.
+            raise
         except Exception as exc:  # pragma: no cover - defensive guard
             logger.exception(
                 "Event %s: Soft trigger detection failed: %s", event_id, exc
@@ -86,6 +86,7 @@ class WorkflowOrchestrator:
         alert_agent: Optional[AlertAgent] = None,
         master_agent: Optional[MasterWorkflowAgent] = None,
         failure_threshold: int = 3,
+        close_master_agent: bool = True,
     ):
         self._init_error: Optional[Exception] = None
         self.alert_agent = alert_agent
@@ -136,7 +137,8 @@ class WorkflowOrchestrator:
             self.log_filename = self.master_agent.log_filename
             self.storage_agent = getattr(self.master_agent, "storage_agent", None)
             closer = getattr(self.master_agent, "aclose", None)
-            if callable(closer):
+            # A master owned by WorkflowRuntime outlives this run.
+            if callable(closer) and close_master_agent:
                 self._register_async_cleanup("master_agent", closer)
             if hasattr(self.master_agent, "on_pending_audit"):
                 self.master_agent.on_pending_audit = self.on_pending
@@ -509,6 +511,7 @@ class WorkflowOrchestrator:
         run_context,
         events_processed: int,
         duration_seconds: float,
+        events_active: int = 0,
     ) -> None:
         if run_context is None:
             return
@@ -517,9 +520,32 @@ class WorkflowOrchestrator:
             "run_id": run_context.run_id,
             "status": run_context.status,
             "events_processed": events_processed,
+            "events_active": events_active,
             "duration_seconds": max(0.0, duration_seconds),
         }
 
+    def cycle_summary(self) -> Dict[str, Any]:
+        """Return the last run summary plus the number of pending HITL audits.
+
+        Pending audits are read from the persisted audit logs, so requests
+        sent in earlier cycles still count until a response is logged.
+        """
+
+        summary = dict(self._last_run_summary)
+        pending = {
+            audit_id
+            for audit_id, record in self._pending_audits.items()
+            if not record.get("resolved")
+        }
+        pending_audit_ids = getattr(self.storage_agent, "pending_audit_ids", None)
+        if callable(pending_audit_ids):
+            try:
+                pending |= pending_audit_ids()
+            except OSError:
+                logger.warning("Failed to read pending audits", exc_info=True)
+        summary["pending_audits"] = len(pending - self._resolved_audits)
+        return summary
+
     def _log_run_manifest(self) -> None:
         if not self._last_run_summary:
             return
@@ -622,9 +648,16 @@ class WorkflowOrchestrator:
             self._shutdown_complete = True
             event.set()
 
-    async def run(self) -> None:
+    async def run(self, events: Optional[Sequence[Dict[str, Any]]] = None) -> None:
+        """Execute one workflow run.
+
+        Without *events* the master agent polls the calendars; pushed events
+        (see :mod:`polling.push_ingestion`) are processed as given.
+        """
+
         run_id = self.run_id
         events_processed = 0
+        events_active = 0
         run_context = None
         start_time = time.perf_counter()
         self._current_run_started_at = start_time
@@ -651,8 +684,21 @@ class WorkflowOrchestrator:
                                 context.run_id, self.master_agent.workflow_log_manager
                             )
 
-                        results = await self.master_agent.process_all_events() or []
+                        if events is None:
+                            results = await self.master_agent.process_all_events()
+                        else:
+                            results = await self.master_agent.process_events(events)
+                        results = results or []
                         events_processed = len(results)
+                        # Events skipped (already processed, negative cache,
+                        # below thresholds) are not activity for the scheduler.
+                        events_active = sum(
+                            1
+                            for result in results
+                            if not str(result.get("status") or "").startswith(
+                                "skipped"
+                            )
+                        )
                         self._report_research_errors(context.run_id, results)
                         try:
                             self._store_research_outputs(context.run_id, results)
@@ -685,7 +731,9 @@ class WorkflowOrchestrator:
             self._finalize()
             duration = time.perf_counter() - start_time
             self._current_run_started_at = None
-            self._update_run_summary(run_context, events_processed, duration)
+            self._update_run_summary(
+                run_context, events_processed, duration, events_active
+            )
             # Manifest hier (einmalig) – Guard in _log_run_manifest verhindert Doppelausgabe
             self._log_run_manifest()
 
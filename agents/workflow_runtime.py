@@ -0,0 +1,110 @@
+"""Long-lived runtime that shares one master agent across daemon cycles."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from agents.alert_agent import AlertAgent
+from agents.master_workflow_agent import MasterWorkflowAgent
+from agents.workflow_orchestrator import WorkflowOrchestrator
+from utils.prompt_loader import reload_prompts_if_changed
+from utils.workflow_steps import workflow_step_recorder
+
+logger = logging.getLogger(__name__)
+
+
+class WorkflowRuntime:
+    """Own the resources that outlive a single workflow run.
+
+    The master agent (and with it the polling, trigger, extraction, CRM and
+    research agents, their HTTP clients, the event caches and the LLM
+    configuration watcher) is created once. Every cycle gets a fresh
+    :class:`WorkflowOrchestrator` carrying the per-run context: run id, run
+    directory, audit log and workflow step records. Before a cycle, only
+    trigger rule files and prompt templates that changed on disk are
+    reloaded.
+    """
+
+    def __init__(
+        self,
+        *,
+        communication_backend: Any = None,
+        alert_agent: Optional[AlertAgent] = None,
+        master_factory: Optional[Callable[[], MasterWorkflowAgent]] = None,
+    ) -> None:
+        self.communication_backend = communication_backend
+        self.alert_agent = alert_agent
+        self._master_factory = master_factory or (
+            lambda: MasterWorkflowAgent(communication_backend=communication_backend)
+        )
+        self._master: Optional[MasterWorkflowAgent] = None
+        self.cycles = 0
+
+    @property
+    def master(self) -> Optional[MasterWorkflowAgent]:
+        """Return the shared master agent, creating it on first use.
+
+        Returns ``None`` when the configuration is invalid; each cycle's
+        orchestrator then records the initialisation error itself.
+        """
+
+        if self._master is None:
+            try:
+                master = self._master_factory()
+            except EnvironmentError as exc:
+                logger.error("Failed to initialise MasterWorkflowAgent: %s", exc)
+                return None
+            master.reuse_across_runs = True
+            self._master = master
+        return self._master
+
+    async def start_cycle(self, run_id: str) -> WorkflowOrchestrator:
+        """Reload changed sources and return the orchestrator for *run_id*."""
+
+        master = self.master
+        if master is not None:
+            await master.reload_changed_rules()
+        if reload_prompts_if_changed():
+            logger.info("Prompt templates changed on disk; prompt index reloaded")
+        self.cycles += 1
+        return WorkflowOrchestrator(
+            run_id=run_id,
+            alert_agent=self.alert_agent,
+            master_agent=master,
+            communication_backend=self.communication_backend,
+            close_master_agent=master is None,
+        )
+
+    def end_cycle(self, run_id: str) -> None:
+        """Forget per-run bookkeeping once *run_id* has been shut down."""
+
+        workflow_step_recorder.clear_run(run_id)
+
+    async def run_cycle(
+        self, run_id: str, events: Optional[list] = None
+    ) -> Dict[str, Any]:
+        """Run one complete cycle and return its summary."""
+
+        orchestrator = await self.start_cycle(run_id)
+        try:
+            if events is None:
+                await orchestrator.run()
+            else:
+                await orchestrator.run(events=events)
+        finally:
+            await orchestrator.shutdown()
+            self.end_cycle(run_id)
+        return orchestrator.cycle_summary()
+
+    async def aclose(self) -> None:
+        """Close the shared master agent and stop its configuration watcher."""
+
+        master, self._master = self._master, None
+        if master is None:
+            return
+        master.reuse_across_runs = False
+        await master.aclose()
+
+
+__all__ = ["WorkflowRuntime"]
@@ -3,7 +3,7 @@ import json
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
 from dotenv import load_dotenv
 
@@ -98,6 +98,52 @@ def _get_bool_env(name: str, default: bool) -> bool:
     )
 
 
+def _get_host_limits_env(name: str) -> Dict[str, int]:
+    """Parse ``host=limit`` pairs separated by commas."""
+
+    limits: Dict[str, int] = {}
+    for item in (_get_env_var(name) or "").split(","):
+        host, _, value = item.partition("=")
+        host = host.strip().lower()
+        try:
+            limit = int(value)
+        except ValueError:
+            continue
+        if host and limit > 0:
+            limits[host] = limit
+    return limits
+
+
+def _get_int_mapping_env(name: str) -> Dict[str, int]:
+    """Parse ``key=value`` pairs with positive integer values separated by commas."""
+
+    mapping: Dict[str, int] = {}
+    for item in (_get_env_var(name) or "").split(","):
+        key, _, value = item.partition("=")
+        key = key.strip()
+        try:
+            number = int(value)
+        except ValueError:
+            continue
+        if key and number > 0:
+            mapping[key] = number
+    return mapping
+
+
+def _get_weekdays_env(name: str, default: str) -> frozenset:
+    """Parse comma-separated weekday numbers (``0`` = Monday … ``6`` = Sunday)."""
+
+    days = set()
+    for item in (_get_env_var(name) or default).split(","):
+        try:
+            day = int(item)
+        except ValueError:
+            continue
+        if 0 <= day <= 6:
+            days.add(day)
+    return frozenset(days)
+
+
 def _get_path_env(name: str, default: Path) -> Path:
     """Return the path from an environment variable or a default."""
 
@@ -299,6 +345,68 @@ class Settings:
         if not value:
             raise EnvironmentError("GOOGLE_CALENDAR_ID must be set")
         self.google_calendar_id: str = value
+        calendar_ids = [
+            item.strip()
+            for item in (_get_env_var("GOOGLE_CALENDAR_IDS") or "").split(",")
+            if item.strip()
+        ]
+        self.google_calendar_ids: List[str] = list(
+            dict.fromkeys(calendar_ids or [value])
+        )
+        self.google_calendar_lookback_days: Dict[str, int] = _get_int_mapping_env(
+            "GOOGLE_CALENDAR_LOOKBACK_DAYS"
+        )
+        self.google_calendar_max_concurrency: int = max(
+            1, _get_int_env("GOOGLE_CALENDAR_MAX_CONCURRENCY", 4)
+        )
+        self.push_ingestion_enabled: bool = _get_bool_env(
+            "PUSH_INGESTION_ENABLED", False
+        )
+        self.push_ingestion_host: str = (
+            _get_env_var("PUSH_INGESTION_HOST") or "127.0.0.1"
+        )
+        self.push_ingestion_port: int = _get_int_env("PUSH_INGESTION_PORT", 8080)
+        self.push_ingestion_token: Optional[str] = _get_env_var(
+            "PUSH_INGESTION_TOKEN"
+        )
+        self.push_debounce_seconds: float = max(
+            0.0, _get_float_env("PUSH_DEBOUNCE_SECONDS", 5.0)
+        )
+        self.push_max_delay_seconds: float = max(
+            self.push_debounce_seconds,
+            _get_float_env("PUSH_MAX_DELAY_SECONDS", 30.0),
+        )
+        self.push_safety_poll_interval_seconds: int = max(
+            60, _get_int_env("PUSH_SAFETY_POLL_INTERVAL_SECONDS", 21600)
+        )
+        self.daemon_persistent_runtime: bool = _get_bool_env(
+            "DAEMON_PERSISTENT_RUNTIME", True
+        )
+        self.daemon_adaptive_scheduling: bool = _get_bool_env(
+            "DAEMON_ADAPTIVE_SCHEDULING", True
+        )
+        self.daemon_min_interval_seconds: int = max(
+            1, _get_int_env("DAEMON_MIN_INTERVAL_SECONDS", 300)
+        )
+        self.daemon_max_interval_seconds: int = max(
+            self.daemon_min_interval_seconds,
+            _get_int_env("DAEMON_MAX_INTERVAL_SECONDS", 14400),
+        )
+        self.daemon_backoff_factor: float = max(
+            1.0, _get_float_env("DAEMON_BACKOFF_FACTOR", 2.0)
+        )
+        self.daemon_busy_event_threshold: int = max(
+            1, _get_int_env("DAEMON_BUSY_EVENT_THRESHOLD", 10)
+        )
+        self.daemon_business_hours_start: int = min(
+            23, max(0, _get_int_env("DAEMON_BUSINESS_HOURS_START", 7))
+        )
+        self.daemon_business_hours_end: int = min(
+            24, max(0, _get_int_env("DAEMON_BUSINESS_HOURS_END", 19))
+        )
+        self.daemon_business_days: frozenset = _get_weekdays_env(
+            "DAEMON_BUSINESS_DAYS", "0,1,2,3,4"
+        )
         self.google_oauth_credentials: Dict[str, str] = (
             self._load_google_oauth_credentials()
         )
@@ -319,6 +427,49 @@ class Settings:
         self.run_log_dir: Path = _get_path_env(
             "RUN_LOG_DIR", self.log_storage_dir / "runs"
         )
+        self.negative_cache_max_entries: int = max(
+            0, _get_int_env("NEGATIVE_CACHE_MAX_ENTRIES", 20000)
+        )
+        self.negative_cache_max_bytes: int = max(
+            0, _get_int_env("NEGATIVE_CACHE_MAX_BYTES", 0)
+        )
+        backend = (_get_env_var("EVENT_CACHE_BACKEND") or "json").strip().lower()
+        if backend not in {"json", "binary"}:
+            raise ValueError("EVENT_CACHE_BACKEND must be either 'json' or 'binary'.")
+        self.event_cache_backend: str = backend
+        self.stage_checkpoints_enabled: bool = _get_bool_env(
+            "STAGE_CHECKPOINTS_ENABLED", True
+        )
+        self.stage_checkpoint_ttl_seconds: float = max(
+            0.0, _get_float_env("STAGE_CHECKPOINT_TTL_HOURS", 24.0)
+        ) * 3600
+
+        self.research_cache_enabled: bool = _get_bool_env(
+            "RESEARCH_CACHE_ENABLED", True
+        )
+        self.research_cache_default_ttl_seconds: float = max(
+            0.0, _get_float_env("RESEARCH_CACHE_DEFAULT_TTL_HOURS", 24.0)
+        ) * 3600
+        research_cache_ttl_hours = {
+            "internal_research": 6,
+            "dossier_research": 168,
+            "similar_companies": 72,
+        }
+        research_cache_ttl_hours.update(
+            _get_int_mapping_env("RESEARCH_CACHE_TTL_HOURS")
+        )
+        self.research_cache_ttl_seconds: Dict[str, float] = {
+            agent: hours * 3600.0 for agent, hours in research_cache_ttl_hours.items()
+        }
+        self.research_cache_max_entries: int = max(
+            0, _get_int_env("RESEARCH_CACHE_MAX_ENTRIES", 1024)
+        )
+        self.research_agent_concurrency: Dict[str, int] = _get_int_mapping_env(
+            "RESEARCH_AGENT_CONCURRENCY"
+        )
+        self.max_concurrent_events: int = max(
+            1, _get_int_env("MAX_CONCURRENT_EVENTS", 4)
+        )
 
         self.hubspot_access_token: Optional[str] = _get_env_var("HUBSPOT_ACCESS_TOKEN")
         self.hubspot_client_secret: Optional[str] = _get_env_var(
@@ -332,6 +483,123 @@ class Settings:
         self.hubspot_retry_backoff_seconds: float = _get_float_env(
             "HUBSPOT_RETRY_BACKOFF_SECONDS", 1.0
         )
+        self.hubspot_lookup_cache_enabled: bool = _get_bool_env(
+            "HUBSPOT_LOOKUP_CACHE_ENABLED", True
+        )
+        self.hubspot_lookup_cache_ttl_seconds: float = _get_float_env(
+            "HUBSPOT_LOOKUP_CACHE_TTL_SECONDS", 3600.0
+        )
+        self.hubspot_lookup_cache_negative_ttl_seconds: float = _get_float_env(
+            "HUBSPOT_LOOKUP_CACHE_NEGATIVE_TTL_SECONDS", 600.0
+        )
+        self.hubspot_lookup_cache_max_entries: int = max(
+            0, _get_int_env("HUBSPOT_LOOKUP_CACHE_MAX_ENTRIES", 2048)
+        )
+        lookup_cache_path = _get_env_var("HUBSPOT_LOOKUP_CACHE_PATH")
+        self.hubspot_lookup_cache_path: Optional[Path] = (
+            Path(lookup_cache_path).expanduser() if lookup_cache_path else None
+        )
+        self.hubspot_rate_limit_enabled: bool = _get_bool_env(
+            "HUBSPOT_RATE_LIMIT_ENABLED", True
+        )
+        self.hubspot_rate_limit_per_second: float = max(
+            0.1, _get_float_env("HUBSPOT_RATE_LIMIT_PER_SECOND", 10.0)
+        )
+        self.hubspot_batch_window_ms: float = max(
+            0.0, _get_float_env("HUBSPOT_BATCH_WINDOW_MS", 20.0)
+        )
+        self.hubspot_mirror_enabled: bool = _get_bool_env(
+            "HUBSPOT_MIRROR_ENABLED", False
+        )
+        self.hubspot_mirror_sync_interval_seconds: float = max(
+            0.0, _get_float_env("HUBSPOT_MIRROR_SYNC_INTERVAL_SECONDS", 900.0)
+        )
+        self.hubspot_mirror_full_sync_interval_seconds: float = max(
+            0.0,
+            _get_float_env("HUBSPOT_MIRROR_FULL_SYNC_INTERVAL_SECONDS", 86400.0),
+        )
+        self.internal_company_search_enabled: bool = _get_bool_env(
+            "INTERNAL_COMPANY_SEARCH_ENABLED", True
+        )
+        self.internal_company_index_sync_interval_seconds: float = max(
+            0.0, _get_float_env("INTERNAL_COMPANY_INDEX_SYNC_INTERVAL_SECONDS", 300.0)
+        )
+        self.internal_company_neighbor_limit: int = max(
+            0, _get_int_env("INTERNAL_COMPANY_NEIGHBOR_LIMIT", 5)
+        )
+        self.http_pool_shared: bool = _get_bool_env("HTTP_POOL_SHARED", True)
+        self.http_pool_max_connections: int = max(
+            1, _get_int_env("HTTP_POOL_MAX_CONNECTIONS", 20)
+        )
+        self.http_pool_max_keepalive_connections: int = max(
+            0, _get_int_env("HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS", 10)
+        )
+        self.http_pool_keepalive_expiry_seconds: float = max(
+            0.0, _get_float_env("HTTP_POOL_KEEPALIVE_EXPIRY_SECONDS", 60.0)
+        )
+        self.http_pool_http2: bool = _get_bool_env("HTTP_POOL_HTTP2", False)
+        self.http_pool_host_limits: Dict[str, int] = _get_host_limits_env(
+            "HTTP_POOL_HOST_LIMITS"
+        )
+        self.http_pool_warmup: bool = _get_bool_env("HTTP_POOL_WARMUP", False)
+        self.http_retry_max_attempts: int = max(
+            1, _get_int_env("HTTP_RETRY_MAX_ATTEMPTS", 5)
+        )
+        self.http_request_deadline_seconds: float = max(
+            0.0, _get_float_env("HTTP_REQUEST_DEADLINE_SECONDS", 60.0)
+        )
+        self.http_retry_budget_tokens: float = max(
+            0.0, _get_float_env("HTTP_RETRY_BUDGET_TOKENS", 20.0)
+        )
+        self.http_retry_budget_ratio: float = max(
+            0.0, _get_float_env("HTTP_RETRY_BUDGET_RATIO", 0.2)
+        )
+        self.circuit_breaker_enabled: bool = _get_bool_env(
+            "CIRCUIT_BREAKER_ENABLED", True
+        )
+        self.circuit_breaker_window_seconds: float = max(
+            1.0, _get_float_env("CIRCUIT_BREAKER_WINDOW_SECONDS", 60.0)
+        )
+        self.circuit_breaker_min_requests: int = max(
+            1, _get_int_env("CIRCUIT_BREAKER_MIN_REQUESTS", 10)
+        )
+        self.circuit_breaker_failure_rate: float = min(
+            1.0, max(0.01, _get_float_env("CIRCUIT_BREAKER_FAILURE_RATE", 0.5))
+        )
+        self.circuit_breaker_slow_call_seconds: float = max(
+            0.0, _get_float_env("CIRCUIT_BREAKER_SLOW_CALL_SECONDS", 10.0)
+        )
+        self.circuit_breaker_llm_slow_call_seconds: float = max(
+            0.0, _get_float_env("CIRCUIT_BREAKER_LLM_SLOW_CALL_SECONDS", 30.0)
+        )
+        self.circuit_breaker_open_seconds: float = max(
+            0.0, _get_float_env("CIRCUIT_BREAKER_OPEN_SECONDS", 30.0)
+        )
+        self.run_deadline_seconds: float = max(
+            0.0, _get_float_env("RUN_DEADLINE_SECONDS", 3600.0)
+        )
+        self.event_deadline_seconds: float = max(
+            0.0, _get_float_env("EVENT_DEADLINE_SECONDS", 300.0)
+        )
+        self.research_stage_timeout_seconds: float = max(
+            0.0, _get_float_env("RESEARCH_STAGE_TIMEOUT_SECONDS", 120.0)
+        )
+        self.http_cache_enabled: bool = _get_bool_env("HTTP_CACHE_ENABLED", True)
+        self.http_cache_max_entries: int = max(
+            1, _get_int_env("HTTP_CACHE_MAX_ENTRIES", 256)
+        )
+        self.http_cache_max_bytes: int = max(
+            1, _get_int_env("HTTP_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+        )
+        self.google_token_cache_enabled: bool = _get_bool_env(
+            "GOOGLE_TOKEN_CACHE_ENABLED", True
+        )
+        self.google_token_refresh_margin_seconds: float = max(
+            0.0, _get_float_env("GOOGLE_TOKEN_REFRESH_MARGIN_SECONDS", 300.0)
+        )
+        self.google_contacts_sync_enabled: bool = _get_bool_env(
+            "GOOGLE_CONTACTS_SYNC_ENABLED", True
+        )
         self.max_concurrent_hubspot: int = max(
             1, _get_int_env("MAX_CONCURRENT_HUBSPOT", 5)
         )
@@ -541,6 +809,28 @@ class Settings:
         self.research_pdf_dir = _get_path_env(
             "RESEARCH_PDF_DIR", research_root / "pdfs"
         )
+        self.hubspot_mirror_path = _get_path_env(
+            "HUBSPOT_MIRROR_PATH", research_root / "hubspot_company_mirror.sqlite3"
+        )
+        self.internal_company_index_path = _get_path_env(
+            "INTERNAL_COMPANY_INDEX_PATH",
+            research_root / "internal_company_index.sqlite3",
+        )
+        self.http_cache_dir = _get_path_env(
+            "HTTP_CACHE_DIR", self.log_storage_dir / "cache" / "http"
+        )
+        self.google_token_cache_path = _get_path_env(
+            "GOOGLE_TOKEN_CACHE_PATH",
+            self.log_storage_dir / "state" / "google_oauth_token.json",
+        )
+        self.google_contacts_directory_path = _get_path_env(
+            "GOOGLE_CONTACTS_DIRECTORY_PATH",
+            self.log_storage_dir / "state" / "google_contacts.sqlite3",
+        )
+        self.google_calendar_state_path = _get_path_env(
+            "GOOGLE_CALENDAR_STATE_PATH",
+            self.log_storage_dir / "state" / "calendar_poll_state.json",
+        )
 
         self.crm_attachment_base_url = _get_env_var("CRM_ATTACHMENT_BASE_URL") or ""
 
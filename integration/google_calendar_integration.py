@@ -2,26 +2,20 @@
 
 from __future__ import annotations
 
-import asyncio
 import warnings
-from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Sequence, Union
+from typing import Any, Dict, List, Optional, Sequence, Union
 from urllib import parse
 
 from config.config import Settings
+from integration.google_token_manager import (
+    GoogleTokenManager,
+    OAuthCredentials,
+    shared_token_manager,
+)
 from utils.async_http import AsyncHTTP
-
-
-@dataclass
-class OAuthCredentials:
-    """Container for OAuth client configuration."""
-
-    client_id: str
-    client_secret: str
-    refresh_token: str
-    token_uri: str
-    token: Optional[str] = None
+from utils.http_cache import default_http_cache
+from utils.single_flight import SingleFlight, call_key
 
 
 TimeInput = Union[datetime, str]
@@ -31,6 +25,9 @@ class GoogleCalendarIntegration:
     """High-level Google Calendar integration with async HTTP support."""
 
     DEFAULT_SCOPE: str = "https://www.googleapis.com/auth/calendar.readonly"
+    #: Default list windows are aligned to this step so consecutive polls send
+    #: identical parameters and can be revalidated with the cached ``ETag``.
+    WINDOW_GRANULARITY: timedelta = timedelta(hours=1)
 
     def __init__(
         self,
@@ -48,16 +45,21 @@ class GoogleCalendarIntegration:
         self._credentials = self._prepare_credentials(credentials)
         self.request_timeout = request_timeout
         self.token_leeway = max(token_leeway, 0)
-        self._access_token: Optional[str] = self._credentials.token
-        self._token_expiry: Optional[datetime] = None
+        self._token_manager: GoogleTokenManager = shared_token_manager(
+            self._credentials,
+            self._settings,
+            leeway=self.token_leeway,
+            request_timeout=float(self.request_timeout),
+        )
         self.cal_lookahead_days = self._settings.cal_lookahead_days
         self.cal_lookback_days = self._settings.cal_lookback_days
 
         self._calendar_http = AsyncHTTP(
             base_url=self._settings.google_api_base_url,
             timeout=float(self.request_timeout),
+            cache=default_http_cache("google_calendar", self._settings),
         )
-        self._token_http = AsyncHTTP(timeout=float(self.request_timeout))
+        self._single_flight = SingleFlight("google_calendar")
 
     # ------------------------------------------------------------------
     # Credential helpers
@@ -107,44 +109,33 @@ class GoogleCalendarIntegration:
     # ------------------------------------------------------------------
     # Access token helpers
     # ------------------------------------------------------------------
-    async def _ensure_access_token_async(self) -> None:
-        token_expired = False
-        if self._token_expiry is not None:
-            token_expired = datetime.now(timezone.utc) >= self._token_expiry
+    # Token state lives in the process-wide ``GoogleTokenManager`` so every
+    # integration built from the same credentials reuses one token.
+    @property
+    def _access_token(self) -> Optional[str]:
+        return self._token_manager.token
 
-        if not self._access_token or token_expired:
-            await self._refresh_access_token_async()
+    @_access_token.setter
+    def _access_token(self, value: Optional[str]) -> None:
+        self._token_manager.token = value
 
-    async def _refresh_access_token_async(self) -> None:
-        payload = parse.urlencode(
-            {
-                "client_id": self._credentials.client_id,
-                "client_secret": self._credentials.client_secret,
-                "refresh_token": self._credentials.refresh_token,
-                "grant_type": "refresh_token",
-            }
-        )
+    @property
+    def _token_expiry(self) -> Optional[datetime]:
+        return self._token_manager.expiry
 
-        response = await self._token_http.post(
-            self._credentials.token_uri,
-            data=payload,
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
-        )
-        response.raise_for_status()
-        token_payload = response.json()
+    @_token_expiry.setter
+    def _token_expiry(self, value: Optional[datetime]) -> None:
+        self._token_manager.expiry = value
 
-        access_token = token_payload.get("access_token")
-        if not access_token:
-            raise RuntimeError("Google OAuth response did not include an access token")
+    @property
+    def _token_http(self) -> AsyncHTTP:
+        return self._token_manager.http
 
-        expires_in = token_payload.get("expires_in")
-        expiry: Optional[datetime] = None
-        if expires_in:
-            expiry = datetime.now(timezone.utc) + timedelta(seconds=int(expires_in))
-            expiry -= timedelta(seconds=self.token_leeway)
+    async def _ensure_access_token_async(self) -> None:
+        await self._token_manager.get_token()
 
-        self._access_token = access_token
-        self._token_expiry = expiry
+    async def _refresh_access_token_async(self) -> None:
+        await self._token_manager.refresh()
 
     # ------------------------------------------------------------------
     # Public API
@@ -193,16 +184,30 @@ class GoogleCalendarIntegration:
         query: Optional[str] = None,
         single_events: bool = True,
         order_by: str = "startTime",
+        updated_min: Optional[datetime] = None,
     ) -> List[dict]:
+        """List events in the lookback/lookahead window.
+
+        With ``updated_min`` only events changed since that moment are
+        returned, including cancelled ones (``status == "cancelled"``). The
+        default window is widened to whole :attr:`WINDOW_GRANULARITY` steps.
+        """
+
         await self._ensure_access_token_async()
 
         now_utc = datetime.now(timezone.utc)
+        step = self.WINDOW_GRANULARITY
+        window_start = now_utc - (now_utc - datetime.min.replace(tzinfo=timezone.utc)) % step
+        window_end = window_start if window_start == now_utc else window_start + step
         if time_min is None:
-            time_min = now_utc - timedelta(days=self.cal_lookback_days)
+            time_min = window_start - timedelta(days=self.cal_lookback_days)
 
         if time_max is None:
-            time_max = now_utc + timedelta(days=self.cal_lookahead_days)
+            time_max = window_end + timedelta(days=self.cal_lookahead_days)
 
+        kwargs: Dict[str, Any] = {}
+        if updated_min is not None:
+            kwargs["updated_min"] = updated_min
         return await self._list_events_async(
             start_time=time_min,
             end_time=time_max,
@@ -210,6 +215,7 @@ class GoogleCalendarIntegration:
             query=query,
             single_events=single_events,
             order_by=order_by,
+            **kwargs,
         )
 
     def list_events(
@@ -272,6 +278,31 @@ class GoogleCalendarIntegration:
         time_max: str,
         page_token: Optional[str] = None,
         max_results: int = 2500,
+    ) -> Dict[str, object]:
+        return await self._single_flight.do(
+            call_key(
+                "events_page",
+                self.calendar_id,
+                time_min,
+                time_max,
+                page_token=page_token,
+                max_results=max_results,
+            ),
+            lambda: self._fetch_events_page(
+                time_min=time_min,
+                time_max=time_max,
+                page_token=page_token,
+                max_results=max_results,
+            ),
+        )
+
+    async def _fetch_events_page(
+        self,
+        *,
+        time_min: str,
+        time_max: str,
+        page_token: Optional[str],
+        max_results: int,
     ) -> Dict[str, object]:
         token = await self.get_access_token_async()
         headers = {"Authorization": f"Bearer {token}"}
@@ -286,13 +317,11 @@ class GoogleCalendarIntegration:
             params["pageToken"] = page_token
 
         calendar_encoded = parse.quote(self.calendar_id, safe="@")
-        response = await self._calendar_http.get(
+        return await self._calendar_http.get_json(
             f"/calendar/v3/calendars/{calendar_encoded}/events",
             params=params,
             headers=headers,
         )
-        response.raise_for_status()
-        return response.json()
 
     async def _list_events_async(
         self,
@@ -303,6 +332,7 @@ class GoogleCalendarIntegration:
         query: Optional[str],
         single_events: bool,
         order_by: str,
+        updated_min: Optional[TimeInput] = None,
     ) -> List[dict]:
         parameters = {
             "singleEvents": "true" if single_events else "false",
@@ -321,25 +351,30 @@ class GoogleCalendarIntegration:
         if query:
             parameters["q"] = query
 
+        if updated_min is not None:
+            parameters["updatedMin"] = self._normalize_time_input(updated_min)
+
+        return await self._single_flight.do(
+            call_key("list_events", self.calendar_id, **parameters),
+            lambda: self._get_events(parameters),
+        )
+
+    async def _get_events(self, parameters: Dict[str, object]) -> List[dict]:
         token = await self.get_access_token_async()
         headers = {"Authorization": f"Bearer {token}"}
 
         calendar_encoded = parse.quote(self.calendar_id, safe="@")
-        response = await self._calendar_http.get(
+        payload = await self._calendar_http.get_json(
             f"/calendar/v3/calendars/{calendar_encoded}/events",
             params=parameters,
             headers=headers,
         )
-        response.raise_for_status()
-        payload = response.json()
         events = payload.get("items", [])
         return events
 
     async def aclose(self) -> None:
-        await asyncio.gather(
-            self._calendar_http.aclose(),
-            self._token_http.aclose(),
-        )
+        # The token manager is shared and keeps refreshing for later cycles.
+        await self._calendar_http.aclose()
 
     @staticmethod
     def _normalize_time_input(value: TimeInput) -> str:
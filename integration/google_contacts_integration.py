@@ -2,11 +2,23 @@
 
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 import warnings
 
 from utils.async_http import AsyncHTTP
+from utils.http_cache import default_http_cache
+from utils.single_flight import SingleFlight, call_key
+
+
+#: Fields requested when syncing the contacts directory; ``metadata`` carries
+#: the ``deleted`` flag of removed contacts in incremental responses.
+SYNC_PERSON_FIELDS = "names,emailAddresses,organizations,metadata"
+MAX_PAGE_SIZE = 1000
+
+
+class SyncTokenExpiredError(RuntimeError):
+    """Raised when the People API rejects an expired ``syncToken``."""
 
 
 class GoogleContactsIntegration:
@@ -14,13 +26,31 @@ class GoogleContactsIntegration:
 
     PEOPLE_API_URL = "https://people.googleapis.com"
 
-    def __init__(self, access_token: str, request_timeout: int = 10):
+    def __init__(
+        self,
+        access_token: Optional[str] = None,
+        request_timeout: int = 10,
+        *,
+        token_provider: Optional[Callable[[], Awaitable[str]]] = None,
+    ):
+        """Use a fixed ``access_token`` or ask ``token_provider`` per request.
+
+        ``token_provider`` is typically ``GoogleTokenManager.get_token`` (or
+        ``GoogleCalendarIntegration.get_access_token_async``) so Contacts
+        shares the refreshed token with the Calendar integration.
+        """
+
+        if access_token is None and token_provider is None:
+            raise ValueError("access_token or token_provider is required")
         self.access_token = access_token
+        self.token_provider = token_provider
         self.request_timeout = request_timeout
         self._http = AsyncHTTP(
             base_url=self.PEOPLE_API_URL,
             timeout=float(request_timeout),
+            cache=default_http_cache("google_contacts"),
         )
+        self._single_flight = SingleFlight("google_contacts")
 
     async def list_contacts_async(
         self,
@@ -33,13 +63,66 @@ class GoogleContactsIntegration:
         if page_token:
             params["pageToken"] = page_token
 
-        headers = {"Authorization": f"Bearer {self.access_token}"}
+        return await self._single_flight.do(
+            call_key("connections", **params),
+            lambda: self._list_connections(params),
+        )
+
+    async def _list_connections(
+        self, params: Dict[str, object]
+    ) -> List[Dict[str, object]]:
+        payload = await self._http.get_json(
+            "/v1/people/me/connections",
+            params=params,
+            headers=await self._auth_headers(),
+        )
+        return payload.get("connections", [])
+
+    async def list_connections_page_async(
+        self,
+        *,
+        page_size: int = MAX_PAGE_SIZE,
+        person_fields: str = SYNC_PERSON_FIELDS,
+        page_token: Optional[str] = None,
+        sync_token: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Return one raw connections page, requesting a ``nextSyncToken``.
+
+        With ``sync_token`` only contacts changed since that token are
+        returned; deleted ones carry ``metadata.deleted``. Raises
+        :class:`SyncTokenExpiredError` when the token is no longer valid.
+        """
+
+        params: Dict[str, object] = {
+            "pageSize": min(max(1, page_size), MAX_PAGE_SIZE),
+            "personFields": person_fields,
+            "requestSyncToken": "true",
+        }
+        if page_token:
+            params["pageToken"] = page_token
+        if sync_token:
+            params["syncToken"] = sync_token
+
         response = await self._http.get(
-            "/v1/people/me/connections", params=params, headers=headers
+            "/v1/people/me/connections",
+            params=params,
+            headers=await self._auth_headers(),
         )
+        if sync_token and (
+            response.status_code == 410
+            or (response.status_code == 400 and "EXPIRED_SYNC_TOKEN" in response.text)
+        ):
+            raise SyncTokenExpiredError("Google Contacts sync token expired")
         response.raise_for_status()
-        payload = response.json()
-        return payload.get("connections", [])
+        return response.json()
+
+    async def _auth_headers(self) -> Dict[str, str]:
+        token = (
+            await self.token_provider()
+            if self.token_provider is not None
+            else self.access_token
+        )
+        return {"Authorization": f"Bearer {token}"}
 
     def list_contacts(
         self,
@@ -0,0 +1,388 @@
+"""Incrementally synced local directory of Google Contacts keyed by email."""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Set,
+    Tuple,
+)
+
+from integration.google_contacts_integration import (
+    MAX_PAGE_SIZE,
+    SyncTokenExpiredError,
+)
+from utils.domain_resolution import business_domain_from_email
+from utils.observability import record_cache_event, record_cache_size
+from utils.validation import normalize_domain
+
+logger = logging.getLogger(__name__)
+
+DIRECTORY_METRIC_NAME = "google_contacts_directory"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    resource_name TEXT PRIMARY KEY,
+    emails TEXT NOT NULL,
+    name TEXT,
+    organization TEXT,
+    domain TEXT
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class ContactsSource(Protocol):
+    """Subset of :class:`GoogleContactsIntegration` used to sync the directory."""
+
+    async def list_connections_page_async(
+        self,
+        *,
+        page_size: int = MAX_PAGE_SIZE,
+        page_token: Optional[str] = None,
+        sync_token: Optional[str] = None,
+    ) -> Mapping[str, Any]: ...
+
+
+@dataclass(frozen=True)
+class Contact:
+    """Directory entry for one email address of a contact."""
+
+    email: str
+    resource_name: str
+    name: Optional[str] = None
+    organization: Optional[str] = None
+    domain: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Optional[str]]:
+        return asdict(self)
+
+
+def _first(values: Any, key: str) -> Optional[str]:
+    if not isinstance(values, list):
+        return None
+    primary = next(
+        (
+            item
+            for item in values
+            if isinstance(item, Mapping)
+            and (item.get("metadata") or {}).get("primary")
+            and item.get(key)
+        ),
+        None,
+    )
+    if primary is None:
+        primary = next(
+            (item for item in values if isinstance(item, Mapping) and item.get(key)),
+            None,
+        )
+    if primary is None:
+        return None
+    value = str(primary.get(key)).strip()
+    return value or None
+
+
+# (resource_name, emails, name, organization, domain)
+_Entry = Tuple[str, Tuple[str, ...], Optional[str], Optional[str], Optional[str]]
+
+
+def _parse_person(person: Mapping[str, Any]) -> Optional[Tuple[bool, _Entry]]:
+    """Return ``(deleted, entry)`` for a People API person resource."""
+
+    resource_name = person.get("resourceName")
+    if not resource_name:
+        return None
+    deleted = bool((person.get("metadata") or {}).get("deleted"))
+    emails: List[str] = []
+    for entry in person.get("emailAddresses") or []:
+        value = entry.get("value") if isinstance(entry, Mapping) else None
+        if isinstance(value, str) and "@" in value:
+            email = value.strip().lower()
+            if email not in emails:
+                emails.append(email)
+    name = _first(person.get("names"), "displayName")
+    organization = _first(person.get("organizations"), "name")
+    domain = normalize_domain(_first(person.get("organizations"), "domain"))
+    if not domain:
+        domain = next(filter(None, map(business_domain_from_email, emails)), None)
+    return deleted, (str(resource_name), tuple(emails), name, organization, domain)
+
+
+class GoogleContactsDirectory:
+    """Local email → contact index kept in sync with the People API.
+
+    Contacts are persisted in SQLite and mirrored in an in-memory dictionary
+    so :meth:`lookup` is a constant-time operation. :meth:`sync` pages
+    through all connections once, stores the ``nextSyncToken`` and from then
+    on applies only the changes since that token (including deletions).
+    An expired token triggers a full resync.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = Path(path) if path is not None else None
+        self._lock = threading.Lock()
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            str(self.path) if self.path is not None else ":memory:",
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        if self.path is not None:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+        self._by_email: Dict[str, Contact] = {}
+        self._emails_by_resource: Dict[str, Tuple[str, ...]] = {}
+        rows = self._connection.execute(
+            "SELECT resource_name, emails, name, organization, domain FROM contacts"
+        ).fetchall()
+        for resource_name, emails, name, organization, domain in rows:
+            self._index(
+                resource_name, tuple(json.loads(emails)), name, organization, domain
+            )
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+    def lookup(self, email: Optional[str]) -> Optional[Contact]:
+        """Return the contact owning *email* (case-insensitive), if known."""
+
+        if not isinstance(email, str):
+            return None
+        return self._by_email.get(email.strip().lower())
+
+    def __len__(self) -> int:
+        return len(self._emails_by_resource)
+
+    @property
+    def sync_token(self) -> Optional[str]:
+        return self._get_state("sync_token")
+
+    @property
+    def last_synced(self) -> float:
+        return float(self._get_state("last_synced") or 0.0)
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+    def apply(self, people: Iterable[Mapping[str, Any]]) -> List[Contact]:
+        """Apply a page of people (upserts and deletions).
+
+        Returns the directory entries added or changed by the page.
+        """
+
+        upserts: List[_Entry] = []
+        deletions: List[str] = []
+        for person in people:
+            parsed = _parse_person(person) if isinstance(person, Mapping) else None
+            if parsed is None:
+                continue
+            deleted, entry = parsed
+            if deleted or not entry[1]:
+                deletions.append(entry[0])
+            else:
+                upserts.append(entry)
+        if not upserts and not deletions:
+            return []
+
+        changed: List[Contact] = []
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN")
+            try:
+                connection.executemany(
+                    "DELETE FROM contacts WHERE resource_name = ?",
+                    [(resource_name,) for resource_name in deletions],
+                )
+                connection.executemany(
+                    """
+                    INSERT INTO contacts (
+                        resource_name, emails, name, organization, domain
+                    ) VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(resource_name) DO UPDATE SET
+                        emails = excluded.emails,
+                        name = excluded.name,
+                        organization = excluded.organization,
+                        domain = excluded.domain
+                    """,
+                    [
+                        (resource_name, json.dumps(emails), name, organization, domain)
+                        for resource_name, emails, name, organization, domain in upserts
+                    ],
+                )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+            for resource_name in deletions:
+                self._unindex(resource_name)
+            for entry in upserts:
+                changed.extend(self._index(*entry))
+        return changed
+
+    async def sync(
+        self, source: ContactsSource, *, page_size: int = MAX_PAGE_SIZE
+    ) -> List[Contact]:
+        """Pull changes since the stored sync token (or everything on first run).
+
+        Returns the directory entries added or changed by this sync.
+        """
+
+        token = self.sync_token
+        try:
+            changed, next_token = await self._pull(source, token, page_size)
+        except SyncTokenExpiredError:
+            logger.info("Google Contacts sync token expired; running a full sync")
+            token = None
+            changed, next_token = await self._pull(source, None, page_size)
+
+        if next_token:
+            self._set_state("sync_token", next_token)
+        self._set_state("last_synced", repr(time.time()))
+        record_cache_event(
+            DIRECTORY_METRIC_NAME, "full_sync" if token is None else "delta_sync"
+        )
+        record_cache_event(DIRECTORY_METRIC_NAME, "synced", len(changed))
+        record_cache_size(DIRECTORY_METRIC_NAME, entries=len(self._by_email))
+        return changed
+
+    async def _pull(
+        self, source: ContactsSource, sync_token: Optional[str], page_size: int
+    ) -> Tuple[List[Contact], Optional[str]]:
+        changed: List[Contact] = []
+        seen: Set[str] = set()
+        page_token: Optional[str] = None
+        next_sync_token: Optional[str] = None
+        while True:
+            payload = await source.list_connections_page_async(
+                page_size=page_size, page_token=page_token, sync_token=sync_token
+            )
+            people = payload.get("connections") or []
+            seen.update(
+                str(person.get("resourceName"))
+                for person in people
+                if isinstance(person, Mapping) and person.get("resourceName")
+            )
+            changed.extend(self.apply(people))
+            next_sync_token = payload.get("nextSyncToken") or next_sync_token
+            page_token = payload.get("nextPageToken")
+            if not page_token:
+                break
+        if sync_token is None:
+            # A full listing is authoritative: drop contacts it no longer has.
+            self._remove_missing(seen)
+        return changed, next_sync_token
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _index(
+        self,
+        resource_name: str,
+        emails: Tuple[str, ...],
+        name: Optional[str],
+        organization: Optional[str],
+        domain: Optional[str],
+    ) -> List[Contact]:
+        self._unindex(resource_name)
+        contacts = [
+            Contact(
+                email=email,
+                resource_name=resource_name,
+                name=name,
+                organization=organization,
+                domain=domain,
+            )
+            for email in emails
+        ]
+        for contact in contacts:
+            self._by_email[contact.email] = contact
+        self._emails_by_resource[resource_name] = emails
+        return contacts
+
+    def _unindex(self, resource_name: str) -> None:
+        for email in self._emails_by_resource.pop(resource_name, ()):
+            contact = self._by_email.get(email)
+            if contact is not None and contact.resource_name == resource_name:
+                del self._by_email[email]
+
+    def _remove_missing(self, seen: Set[str]) -> None:
+        missing = [name for name in self._emails_by_resource if name not in seen]
+        if not missing:
+            return
+        with self._lock:
+            self._connection.executemany(
+                "DELETE FROM contacts WHERE resource_name = ?",
+                [(resource_name,) for resource_name in missing],
+            )
+            for resource_name in missing:
+                self._unindex(resource_name)
+
+    def _get_state(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM sync_state WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, key: str, value: str) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO sync_state(key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, value),
+            )
+
+
+_SHARED_DIRECTORIES: Dict[str, GoogleContactsDirectory] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_contacts_directory(path: Optional[Path] = None) -> GoogleContactsDirectory:
+    """Return the process-wide directory stored at *path*, opening it on first use."""
+
+    key = str(path) if path is not None else ":memory:"
+    with _SHARED_LOCK:
+        directory = _SHARED_DIRECTORIES.get(key)
+        if directory is None:
+            directory = GoogleContactsDirectory(path)
+            _SHARED_DIRECTORIES[key] = directory
+        return directory
+
+
+def reset_shared_contacts_directories() -> None:
+    """Close and forget all process-wide directories (used by tests and reloads)."""
+
+    with _SHARED_LOCK:
+        directories = list(_SHARED_DIRECTORIES.values())
+        _SHARED_DIRECTORIES.clear()
+    for directory in directories:
+        directory.close()
+
+
+__all__ = [
+    "Contact",
+    "GoogleContactsDirectory",
+    "reset_shared_contacts_directories",
+    "shared_contacts_directory",
+]
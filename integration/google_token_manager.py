@@ -0,0 +1,293 @@
+"""Shared Google OAuth access tokens with on-disk persistence and background refresh."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib import parse
+
+from utils.async_http import AsyncHTTP
+from utils.persistence import atomic_write_json
+from utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_MARGIN_SECONDS = 300.0
+DEFAULT_TOKEN_LEEWAY_SECONDS = 60
+# Delay before the background refresher tries again after a failed refresh.
+FAILED_REFRESH_RETRY_SECONDS = 30.0
+_TOKEN_FILE_MODE = 0o600
+
+
+@dataclass
+class OAuthCredentials:
+    """Container for OAuth client configuration."""
+
+    client_id: str
+    client_secret: str
+    refresh_token: str
+    token_uri: str
+    token: Optional[str] = None
+
+    @property
+    def fingerprint(self) -> str:
+        """Stable identifier of the client/refresh token pair (never persisted raw)."""
+
+        material = "|".join((self.client_id, self.refresh_token, self.token_uri))
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class GoogleTokenManager:
+    """Hand out a valid access token without refreshing on the request path.
+
+    The token and its expiry are persisted to ``path`` (mode ``0600``) so a
+    new integration or process starts with the last token. Once a token is
+    known, a background task refreshes it ``refresh_margin`` seconds before
+    it expires; callers only wait for a refresh when no valid token exists
+    at all. Concurrent refreshes are coalesced into one token request.
+    """
+
+    def __init__(
+        self,
+        credentials: OAuthCredentials,
+        *,
+        path: Optional[Path] = None,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN_SECONDS,
+        leeway: int = DEFAULT_TOKEN_LEEWAY_SECONDS,
+        request_timeout: float = 10.0,
+        http: Optional[AsyncHTTP] = None,
+    ) -> None:
+        self.credentials = credentials
+        self.path = Path(path) if path is not None else None
+        self.refresh_margin = max(0.0, float(refresh_margin))
+        self.leeway = max(0, int(leeway))
+        self.http = http or AsyncHTTP(timeout=float(request_timeout))
+        self.token: Optional[str] = None
+        self.expiry: Optional[datetime] = None
+        self.refreshes = 0
+        self._single_flight = SingleFlight("google_oauth", copy_results=False)
+        self._refresher: Optional["asyncio.Task[None]"] = None
+        self._load()
+        if self.token is None and credentials.token:
+            self.token = credentials.token
+
+    # ------------------------------------------------------------------
+    # Token state
+    # ------------------------------------------------------------------
+    def valid(self, now: Optional[datetime] = None) -> bool:
+        """Return whether the current token can still be used."""
+
+        if not self.token:
+            return False
+        if self.expiry is None:
+            return True
+        return (now or datetime.now(timezone.utc)) < self.expiry
+
+    def seconds_until_refresh(self, now: Optional[datetime] = None) -> Optional[float]:
+        """Return when the background refresh is due (``None`` if never)."""
+
+        if self.expiry is None:
+            return None
+        due = self.expiry - timedelta(seconds=self.refresh_margin)
+        return max(0.0, (due - (now or datetime.now(timezone.utc))).total_seconds())
+
+    async def get_token(self) -> str:
+        """Return a valid access token, refreshing only if none is available."""
+
+        if not self.valid():
+            await self.refresh()
+        self._ensure_refresher()
+        if not self.token:
+            raise RuntimeError("Google OAuth access token is not available")
+        return self.token
+
+    async def refresh(self) -> str:
+        """Request a new access token; concurrent callers share one request."""
+
+        return await self._single_flight.do("refresh", self._refresh)
+
+    async def _refresh(self) -> str:
+        payload = parse.urlencode(
+            {
+                "client_id": self.credentials.client_id,
+                "client_secret": self.credentials.client_secret,
+                "refresh_token": self.credentials.refresh_token,
+                "grant_type": "refresh_token",
+            }
+        )
+
+        response = await self.http.post(
+            self.credentials.token_uri,
+            data=payload,
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        response.raise_for_status()
+        token_payload = response.json()
+
+        access_token = token_payload.get("access_token")
+        if not access_token:
+            raise RuntimeError("Google OAuth response did not include an access token")
+
+        expires_in = token_payload.get("expires_in")
+        expiry: Optional[datetime] = None
+        if expires_in:
+            expiry = datetime.now(timezone.utc) + timedelta(seconds=int(expires_in))
+            expiry -= timedelta(seconds=self.leeway)
+
+        self.token = access_token
+        self.expiry = expiry
+        self.refreshes += 1
+        self._save()
+        return access_token
+
+    # ------------------------------------------------------------------
+    # Background refresh
+    # ------------------------------------------------------------------
+    def _ensure_refresher(self) -> None:
+        loop = asyncio.get_running_loop()
+        task = self._refresher
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        if self.seconds_until_refresh() is None:
+            return
+        self._refresher = loop.create_task(self._refresh_loop())
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            delay = self.seconds_until_refresh()
+            if delay is None:
+                return
+            await asyncio.sleep(delay)
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Background Google OAuth token refresh failed: %s", exc)
+                if not self.valid():
+                    # Requests will refresh on demand and restart the refresher.
+                    return
+                await asyncio.sleep(FAILED_REFRESH_RETRY_SECONDS)
+
+    async def aclose(self) -> None:
+        """Stop the background refresher."""
+
+        task, self._refresher = self._refresher, None
+        if task is None or task.done() or task.get_loop().is_closed():
+            return
+        task.cancel()
+        if task.get_loop() is asyncio.get_running_loop():
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+            if payload.get("credentials") != self.credentials.fingerprint:
+                return
+            expiry = payload.get("expiry")
+            self.token = payload.get("access_token") or None
+            self.expiry = datetime.fromisoformat(expiry) if expiry else None
+        except (OSError, ValueError, AttributeError) as exc:
+            logger.warning("Ignoring unreadable Google token cache %s: %s", self.path, exc)
+            self.token = None
+            self.expiry = None
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        payload: Dict[str, Any] = {
+            "credentials": self.credentials.fingerprint,
+            "access_token": self.token,
+            "expiry": self.expiry.isoformat() if self.expiry else None,
+        }
+        try:
+            atomic_write_json(self.path, payload)
+            os.chmod(self.path, _TOKEN_FILE_MODE)
+        except OSError as exc:
+            logger.warning("Could not persist Google token cache %s: %s", self.path, exc)
+
+
+_SHARED_MANAGERS: Dict[str, GoogleTokenManager] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_token_manager(
+    credentials: OAuthCredentials,
+    settings: Optional[Any] = None,
+    *,
+    leeway: int = DEFAULT_TOKEN_LEEWAY_SECONDS,
+    request_timeout: float = 10.0,
+) -> GoogleTokenManager:
+    """Return the process-wide manager for *credentials*, creating it on first use.
+
+    The token is persisted to ``settings.google_token_cache_path`` when
+    ``settings.google_token_cache_enabled`` is set.
+    """
+
+    if settings is None:
+        try:
+            from config.config import settings as loaded
+        except Exception:  # pragma: no cover - configuration not importable
+            loaded = None
+        settings = loaded
+    key = credentials.fingerprint
+    with _SHARED_LOCK:
+        manager = _SHARED_MANAGERS.get(key)
+        if manager is None:
+            path = None
+            if getattr(settings, "google_token_cache_enabled", False):
+                path = getattr(settings, "google_token_cache_path", None)
+            manager = GoogleTokenManager(
+                credentials,
+                path=path,
+                refresh_margin=float(
+                    getattr(
+                        settings,
+                        "google_token_refresh_margin_seconds",
+                        DEFAULT_REFRESH_MARGIN_SECONDS,
+                    )
+                ),
+                leeway=leeway,
+                request_timeout=request_timeout,
+            )
+            _SHARED_MANAGERS[key] = manager
+        return manager
+
+
+def reset_shared_token_managers() -> None:
+    """Forget all process-wide managers (used by tests and reloads).
+
+    Background refreshers are cancelled; they are recreated on next use.
+    """
+
+    with _SHARED_LOCK:
+        managers = list(_SHARED_MANAGERS.values())
+        _SHARED_MANAGERS.clear()
+    for manager in managers:
+        task, manager._refresher = manager._refresher, None
+        if task is not None and not task.done() and not task.get_loop().is_closed():
+            task.cancel()
+
+
+__all__ = [
+    "GoogleTokenManager",
+    "OAuthCredentials",
+    "reset_shared_token_managers",
+    "shared_token_manager",
+]
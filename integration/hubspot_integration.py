@@ -3,16 +3,34 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+import logging
+from dataclasses import dataclass, replace
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+)
 
 from config.config import Settings
 import warnings
 
-from utils import concurrency
+from utils import concurrency, deadline
 from utils.async_http import AsyncHTTP
+from utils.company_lookup_cache import CompanyLookupCache, shared_company_cache
+from utils.micro_batch import MicroBatcher
+from utils.rate_limiter import AdaptiveRateLimiter, shared_rate_limiter
+from utils.retry import IDEMPOTENT_METHODS, default_retry_policy
+from utils.single_flight import SingleFlight, call_key
 from utils.text_normalization import normalize_text
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class HubSpotConfig:
@@ -30,6 +48,14 @@ class HubSpotIntegration:
     """Wrapper around HubSpot's CRM API for company discovery."""
 
     SEARCH_PATH: str = "/crm/v3/objects/companies/search"
+    FILE_ASSOCIATIONS_BATCH_PATH: str = (
+        "/crm/v4/associations/companies/files/batch/read"
+    )
+    # HubSpot search accepts at most five OR'ed filter groups per request.
+    MAX_SEARCH_FILTER_GROUPS: int = 5
+    MAX_SEARCH_RESULTS: int = 100
+    MAX_BATCH_READ_INPUTS: int = 1000
+    LOOKUP_BATCH_SIZE: int = 20
 
     def __init__(
         self,
@@ -41,6 +67,8 @@ class HubSpotIntegration:
         request_timeout: Optional[int] = None,
         max_retries: Optional[int] = None,
         retry_backoff_seconds: Optional[float] = None,
+        lookup_cache: Optional[CompanyLookupCache] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
     ) -> None:
         runtime_settings = settings or Settings()
 
@@ -66,6 +94,31 @@ class HubSpotIntegration:
             max_retries=max(1, resolved_retries),
             retry_backoff_seconds=max(0.0, resolved_backoff),
         )
+        self._rate_limiter: Optional[AdaptiveRateLimiter] = rate_limiter
+        if rate_limiter is None and getattr(
+            runtime_settings, "hubspot_rate_limit_enabled", False
+        ):
+            # HubSpot enforces its limits per app, so every integration
+            # instance using the same token shares one bucket.
+            self._rate_limiter = shared_rate_limiter(
+                f"{self._config.api_base_url}|{self._config.access_token}",
+                name="hubspot",
+                rate=runtime_settings.hubspot_rate_limit_per_second,
+            )
+
+        base_policy = default_retry_policy()
+        # Every POST this integration sends is a search or batch read, so it
+        # is safe to retry; 429s are left to the rate limiter when present.
+        retry_policy = replace(
+            base_policy,
+            deadline=min(base_policy.deadline, float(self._config.request_timeout)),
+            idempotent_methods=IDEMPOTENT_METHODS | {"POST"},
+            retry_statuses=(
+                base_policy.retry_statuses - {429}
+                if self._rate_limiter is not None
+                else base_policy.retry_statuses
+            ),
+        )
         self._http = AsyncHTTP(
             base_url=self._config.api_base_url,
             headers={
@@ -73,7 +126,36 @@ class HubSpotIntegration:
                 "Content-Type": "application/json",
             },
             timeout=float(self._config.request_timeout),
+            retry_policy=retry_policy,
         )
+        self._lookup_cache: Optional[CompanyLookupCache] = lookup_cache
+        self._single_flight = SingleFlight("hubspot")
+        if lookup_cache is None and getattr(
+            runtime_settings, "hubspot_lookup_cache_enabled", False
+        ):
+            # One cache per portal, shared across integration instances.
+            self._lookup_cache = shared_company_cache(
+                f"{self._config.api_base_url}|{self._config.access_token}",
+                positive_ttl=runtime_settings.hubspot_lookup_cache_ttl_seconds,
+                negative_ttl=runtime_settings.hubspot_lookup_cache_negative_ttl_seconds,
+                max_entries=runtime_settings.hubspot_lookup_cache_max_entries,
+                path=runtime_settings.hubspot_lookup_cache_path,
+            )
+
+        batch_window_ms = float(
+            getattr(runtime_settings, "hubspot_batch_window_ms", 0) or 0
+        )
+        self._lookup_batcher: Optional[
+            MicroBatcher[str, Dict[str, Any]]
+        ] = None
+        if batch_window_ms > 0:
+            self._lookup_batcher = MicroBatcher(
+                "hubspot_lookup",
+                self._resolve_lookup_batch,
+                max_batch_size=self.LOOKUP_BATCH_SIZE,
+                max_delay=batch_window_ms / 1000.0,
+                default={"company": None, "attachments": []},
+            )
 
     # ------------------------------------------------------------------
     # Public API
@@ -91,6 +173,31 @@ class HubSpotIntegration:
         if not normalised_domain:
             return None
 
+        cache = self._lookup_cache
+        if cache is not None:
+            cached = cache.get(normalised_domain, properties=properties)
+            if cached is not None:
+                return cached.company
+
+        async def search() -> Optional[Dict[str, object]]:
+            company = await self._search_company_by_domain(
+                normalised_domain, properties=properties
+            )
+            if cache is not None:
+                cache.put(normalised_domain, company, properties=properties)
+            return company
+
+        return await self._single_flight.do(
+            call_key("find_company", normalised_domain, properties=properties),
+            search,
+        )
+
+    async def _search_company_by_domain(
+        self,
+        normalised_domain: str,
+        *,
+        properties: Optional[Sequence[str]] = None,
+    ) -> Optional[Dict[str, object]]:
         payload = {
             "filterGroups": [
                 {
@@ -112,6 +219,7 @@ class HubSpotIntegration:
         response_payload = await self._post(self.SEARCH_PATH, payload)
         results: Iterable[Dict[str, object]] = response_payload.get("results", [])
 
+        # Same rule as the batch search: only an exact domain match counts.
         for company in results:
             domain_value = self._extract_domain(company)
             if (
@@ -120,7 +228,7 @@ class HubSpotIntegration:
             ):
                 return company
 
-        return next(iter(results), None)
+        return None
 
     def find_company_by_domain(
         self,
@@ -150,6 +258,25 @@ class HubSpotIntegration:
         if not normalised_name:
             return []
 
+        return await self._single_flight.do(
+            call_key(
+                "similar_companies",
+                normalised_name,
+                limit=limit,
+                properties=properties,
+            ),
+            lambda: self._search_similar_companies(
+                normalised_name, limit=limit, properties=properties
+            ),
+        )
+
+    async def _search_similar_companies(
+        self,
+        normalised_name: str,
+        *,
+        limit: int,
+        properties: Optional[Sequence[str]],
+    ) -> List[Dict[str, object]]:
         payload = {
             "filterGroups": [
                 {
@@ -172,24 +299,92 @@ class HubSpotIntegration:
         results: Iterable[Dict[str, object]] = response_payload.get("results", [])
         return list(results)
 
+    async def search_companies_modified_since(
+        self,
+        since_ms: int,
+        *,
+        properties: Sequence[str],
+        after: Optional[str] = None,
+        limit: int = 100,
+    ) -> Dict[str, object]:
+        """Return one page of companies modified at or after ``since_ms``.
+
+        Results are sorted by ``hs_lastmodifieddate`` so callers can use the
+        newest value seen as the watermark for the next incremental sync.
+        """
+
+        payload: Dict[str, object] = {
+            "filterGroups": [
+                {
+                    "filters": [
+                        {
+                            "propertyName": "hs_lastmodifieddate",
+                            "operator": "GTE",
+                            "value": str(int(since_ms)),
+                        }
+                    ]
+                }
+            ],
+            "sorts": [{"propertyName": "hs_lastmodifieddate", "direction": "ASCENDING"}],
+            "properties": list(properties),
+            "limit": max(1, min(int(limit), self.MAX_SEARCH_RESULTS)),
+        }
+        if after:
+            payload["after"] = after
+        return await self._post(self.SEARCH_PATH, payload)
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
     async def _post(self, path: str, payload: Dict[str, object]) -> Dict[str, object]:
-        timeout = float(self._config.request_timeout)
-        async with concurrency.HUBSPOT_SEMAPHORE:
-            try:
-                response = await asyncio.wait_for(
-                    self._http.post(path, json=payload, timeout=timeout),
-                    timeout=timeout,
-                )
-            except asyncio.TimeoutError as exc:
-                raise TimeoutError(
-                    f"HubSpot request to {path} timed out after {timeout:.2f} seconds"
-                ) from exc
+        response = await self._send(
+            path, lambda timeout: self._http.post(path, json=payload, timeout=timeout)
+        )
         response.raise_for_status()
         return response.json()
 
+    async def _send(
+        self,
+        path: str,
+        call: Callable[[float], Awaitable[Any]],
+    ) -> Any:
+        """Send a request within the rate limit, waiting out ``429`` responses."""
+
+        limiter = self._rate_limiter
+        attempts = max(1, self._config.max_retries) if limiter is not None else 1
+        for attempt in range(1, attempts + 1):
+            if limiter is not None:
+                await limiter.acquire()
+            async with concurrency.HUBSPOT_SEMAPHORE:
+                # Never wait longer than the enclosing run/event budget allows.
+                timeout = deadline.clamp_timeout(
+                    float(self._config.request_timeout), stage="hubspot"
+                )
+                try:
+                    response = await asyncio.wait_for(call(timeout), timeout=timeout)
+                except deadline.DeadlineExceeded:
+                    raise
+                except asyncio.TimeoutError as exc:
+                    if deadline.expired():
+                        raise deadline.DeadlineExceeded("hubspot") from exc
+                    raise TimeoutError(
+                        f"HubSpot request to {path} timed out after {timeout:.2f} seconds"
+                    ) from exc
+            status_code = getattr(response, "status_code", None)
+            if limiter is not None:
+                limiter.observe(
+                    getattr(response, "headers", None), status_code=status_code
+                )
+            if status_code != 429 or attempt == attempts:
+                return response
+            logger.warning(
+                "HubSpot rate limit hit for %s; retrying after pause (attempt %d/%d)",
+                path,
+                attempt,
+                attempts,
+            )
+        return response  # pragma: no cover - loop always returns
+
     async def lookup_company_with_attachments(
         self,
         domain: str,
@@ -214,6 +409,58 @@ class HubSpotIntegration:
             ``{"company": <company or None>, "attachments": [..]}``
         """
 
+        cache = self._lookup_cache
+        normalised_domain = self._normalise_domain(domain)
+        if cache is not None and normalised_domain:
+            cached = cache.get(
+                normalised_domain,
+                properties=properties,
+                require_attachments=True,
+                attachment_limit=attachment_limit,
+            )
+            if cached is not None:
+                return {
+                    "company": cached.company,
+                    "attachments": list(cached.attachments or [])[
+                        : max(1, attachment_limit)
+                    ],
+                }
+
+        if self._lookup_batcher is not None and normalised_domain and not properties:
+            # Concurrent callers within the batching window share one search
+            # and one association request.
+            lookup = await self._lookup_batcher.submit(normalised_domain)
+            return {
+                "company": lookup.get("company"),
+                "attachments": list(lookup.get("attachments") or [])[
+                    : max(1, attachment_limit)
+                ],
+            }
+
+        return await self._single_flight.do(
+            call_key(
+                "lookup_with_attachments",
+                normalised_domain or domain,
+                properties=properties,
+                attachment_limit=attachment_limit,
+            ),
+            lambda: self._lookup_company_with_attachments(
+                domain,
+                normalised_domain,
+                properties=properties,
+                attachment_limit=attachment_limit,
+            ),
+        )
+
+    async def _lookup_company_with_attachments(
+        self,
+        domain: str,
+        normalised_domain: Optional[str],
+        *,
+        properties: Optional[Sequence[str]],
+        attachment_limit: int,
+    ) -> Dict[str, Any]:
+        cache = self._lookup_cache
         company = await self.find_company_by_domain_async(domain, properties=properties)
         if not company:
             return {"company": None, "attachments": []}
@@ -223,22 +470,254 @@ class HubSpotIntegration:
             return {"company": company, "attachments": []}
 
         attachments = await self._list_company_files(company_id, limit=attachment_limit)
+        if cache is not None and normalised_domain:
+            cache.put(
+                normalised_domain,
+                company,
+                attachments=attachments,
+                attachment_limit=attachment_limit,
+                properties=properties,
+            )
         return {"company": company, "attachments": attachments}
 
+    # ------------------------------------------------------------------
+    # Batch API
+    # ------------------------------------------------------------------
+    async def find_companies_by_domains_async(
+        self,
+        domains: Iterable[str],
+        *,
+        properties: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Optional[Dict[str, object]]]:
+        """Resolve many domains with OR'ed search filter groups.
+
+        Returns a mapping of normalised domain to the matching company (or
+        ``None``). Companies carry the same ``properties`` (HubSpot's defaults
+        when omitted) and match by the same exact-domain rule as
+        :meth:`find_company_by_domain_async`; each search covers up to
+        :attr:`MAX_SEARCH_FILTER_GROUPS` domains.
+        """
+
+        cache = self._lookup_cache
+        results: Dict[str, Optional[Dict[str, object]]] = {}
+        pending: List[str] = []
+        for domain in domains:
+            normalised_domain = self._normalise_domain(domain)
+            if not normalised_domain or normalised_domain in results:
+                continue
+            if normalised_domain in pending:
+                continue
+            if cache is not None:
+                cached = cache.get(normalised_domain, properties=properties)
+                if cached is not None:
+                    results[normalised_domain] = cached.company
+                    continue
+            pending.append(normalised_domain)
+
+        chunks = [
+            pending[index : index + self.MAX_SEARCH_FILTER_GROUPS]
+            for index in range(0, len(pending), self.MAX_SEARCH_FILTER_GROUPS)
+        ]
+        matches = await asyncio.gather(
+            *(self._search_domain_chunk(chunk, properties) for chunk in chunks)
+        )
+        for chunk, found in zip(chunks, matches):
+            for normalised_domain in chunk:
+                company = found.get(normalised_domain)
+                results[normalised_domain] = company
+                if cache is not None:
+                    cache.put(normalised_domain, company, properties=properties)
+        return results
+
+    async def list_company_files_batch(
+        self,
+        company_ids: Iterable[str],
+        *,
+        limit: Optional[int] = 5,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Return file associations for many companies via the v4 batch API."""
+
+        unique_ids = list(dict.fromkeys(str(item) for item in company_ids if item))
+        attachments: Dict[str, List[Dict[str, Any]]] = {
+            company_id: [] for company_id in unique_ids
+        }
+        chunks = [
+            unique_ids[index : index + self.MAX_BATCH_READ_INPUTS]
+            for index in range(0, len(unique_ids), self.MAX_BATCH_READ_INPUTS)
+        ]
+        payloads = await asyncio.gather(
+            *(
+                self._post(
+                    self.FILE_ASSOCIATIONS_BATCH_PATH,
+                    {"inputs": [{"id": company_id} for company_id in chunk]},
+                )
+                for chunk in chunks
+            )
+        )
+        for payload in payloads:
+            for item in payload.get("results", []) or []:
+                if not isinstance(item, Mapping):
+                    continue
+                source = item.get("from")
+                company_id = (
+                    str(source.get("id")) if isinstance(source, Mapping) else None
+                )
+                if company_id not in attachments:
+                    continue
+                files = [
+                    self._attachment_from_association(target)
+                    for target in item.get("to", []) or []
+                    if isinstance(target, Mapping)
+                ]
+                attachments[company_id] = (
+                    files if limit is None else files[: max(1, limit)]
+                )
+        return attachments
+
+    async def lookup_companies_with_attachments(
+        self,
+        domains: Iterable[str],
+        *,
+        properties: Optional[Sequence[str]] = None,
+        attachment_limit: Optional[int] = 5,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Batch variant of :meth:`lookup_company_with_attachments`.
+
+        Resolves every domain with one search per five domains and fetches
+        all attachments with a single batch associations request. The result
+        is keyed by normalised domain.
+        """
+
+        cache = self._lookup_cache
+        results: Dict[str, Dict[str, Any]] = {}
+        remaining: List[str] = []
+        for domain in domains:
+            normalised_domain = self._normalise_domain(domain)
+            if not normalised_domain or normalised_domain in results:
+                continue
+            cached = (
+                cache.get(
+                    normalised_domain,
+                    properties=properties,
+                    require_attachments=True,
+                    attachment_limit=attachment_limit,
+                )
+                if cache is not None
+                else None
+            )
+            if cached is not None:
+                files = list(cached.attachments or [])
+                if attachment_limit is not None:
+                    files = files[: max(1, attachment_limit)]
+                results[normalised_domain] = {
+                    "company": cached.company,
+                    "attachments": files,
+                }
+            else:
+                remaining.append(normalised_domain)
+
+        if not remaining:
+            return results
+
+        companies = await self.find_companies_by_domains_async(
+            remaining, properties=properties
+        )
+        company_ids = {
+            domain: self._extract_company_id(company)
+            for domain, company in companies.items()
+            if company
+        }
+        files_by_company = await self.list_company_files_batch(
+            [company_id for company_id in company_ids.values() if company_id],
+            limit=attachment_limit,
+        )
+        for domain, company in companies.items():
+            company_id = company_ids.get(domain)
+            files = files_by_company.get(company_id, []) if company_id else []
+            if cache is not None and company_id:
+                cache.put(
+                    domain,
+                    company,
+                    attachments=files,
+                    attachment_limit=attachment_limit,
+                    properties=properties,
+                )
+            results[domain] = {"company": company, "attachments": files}
+        return results
+
+    async def _resolve_lookup_batch(
+        self, domains: Sequence[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        return await self.lookup_companies_with_attachments(
+            domains, attachment_limit=None
+        )
+
+    async def _search_domain_chunk(
+        self,
+        domains: Sequence[str],
+        properties: Optional[Sequence[str]],
+    ) -> Dict[str, Dict[str, object]]:
+        payload: Dict[str, Any] = {
+            "filterGroups": [
+                {
+                    "filters": [
+                        {"propertyName": "domain", "operator": "EQ", "value": domain}
+                    ]
+                }
+                for domain in domains
+            ],
+            "limit": self.MAX_SEARCH_RESULTS,
+        }
+        if properties:
+            # The domain is needed to attribute results to filter groups.
+            payload["properties"] = list(dict.fromkeys([*properties, "domain"]))
+        response_payload = await self._post(self.SEARCH_PATH, payload)
+        wanted = set(domains)
+        matches: Dict[str, Dict[str, object]] = {}
+        for company in response_payload.get("results", []) or []:
+            domain_value = self._extract_domain(company)
+            normalised_domain = (
+                self._normalise_domain(domain_value) if domain_value else ""
+            )
+            if normalised_domain in wanted and normalised_domain not in matches:
+                matches[normalised_domain] = company
+        return matches
+
+    @staticmethod
+    def _attachment_from_association(target: Mapping[str, Any]) -> Dict[str, Any]:
+        """Normalise v3 (``id``/``type``) and v4 (``toObjectId``) associations."""
+
+        return {
+            "id": str(target.get("toObjectId") or target.get("id") or ""),
+            "type": str(target.get("type") or "company_to_file"),
+        }
+
+    def invalidate_company_cache(
+        self,
+        *,
+        domain: Optional[str] = None,
+        company_id: Optional[str] = None,
+    ) -> int:
+        """Drop cached lookups after the company was created or changed in HubSpot."""
+
+        cache = self._lookup_cache
+        if cache is None:
+            return 0
+        removed = 0
+        if domain:
+            normalised_domain = self._normalise_domain(domain)
+            if normalised_domain:
+                removed += cache.invalidate(normalised_domain)
+        if company_id:
+            removed += cache.invalidate_company(str(company_id))
+        return removed
+
     async def _get(
         self, path: str, *, params: Optional[Mapping[str, Any]] = None
     ) -> Dict[str, Any]:
-        timeout = float(self._config.request_timeout)
-        async with concurrency.HUBSPOT_SEMAPHORE:
-            try:
-                response = await asyncio.wait_for(
-                    self._http.get(path, params=params, timeout=timeout),
-                    timeout=timeout,
-                )
-            except asyncio.TimeoutError as exc:
-                raise TimeoutError(
-                    f"HubSpot request to {path} timed out after {timeout:.2f} seconds"
-                ) from exc
+        response = await self._send(
+            path, lambda timeout: self._http.get(path, params=params, timeout=timeout)
+        )
         if response.status_code == 404:
             return {}
         response.raise_for_status()
@@ -253,7 +732,7 @@ class HubSpotIntegration:
         if isinstance(results, Iterable):
             for item in results:
                 if isinstance(item, Mapping):
-                    attachments.append(dict(item))
+                    attachments.append(self._attachment_from_association(item))
         return attachments
 
     @staticmethod
@@ -272,6 +751,10 @@ class HubSpotIntegration:
         return None
 
     async def aclose(self) -> None:
+        if self._lookup_batcher is not None:
+            await self._lookup_batcher.flush()
+        if self._lookup_cache is not None:
+            self._lookup_cache.flush()
         await self._http.aclose()
 
     @staticmethod
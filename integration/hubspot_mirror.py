@@ -0,0 +1,466 @@
+"""Local SQLite mirror of HubSpot companies for similar-company search."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from utils.observability import record_cache_event, record_cache_size
+from utils.text_normalization import normalize_text
+
+logger = logging.getLogger(__name__)
+
+
+MIRROR_METRIC_NAME = "hubspot_company_mirror"
+MIRROR_SCHEMA_VERSION = 1
+#: Property HubSpot updates on every company change; used as sync watermark.
+WATERMARK_PROPERTY = "hs_lastmodifieddate"
+#: Columns indexed for full-text search, in ``bm25()`` weight order.
+SEARCH_COLUMNS: Tuple[str, ...] = (
+    "name",
+    "segment",
+    "product",
+    "description",
+    "industry",
+)
+MIRROR_PROPERTIES: Tuple[str, ...] = (
+    "name",
+    "domain",
+    "website",
+    "segment",
+    "product",
+    "description",
+    "industry",
+    WATERMARK_PROPERTY,
+)
+# HubSpot's search endpoint refuses paging offsets beyond 10,000 results.
+_SEARCH_WINDOW = 10_000
+_MAX_QUERY_TERMS = 48
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS companies (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL DEFAULT '',
+    domain TEXT NOT NULL DEFAULT '',
+    segment TEXT NOT NULL DEFAULT '',
+    product TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    industry TEXT NOT NULL DEFAULT '',
+    modified_ms INTEGER NOT NULL DEFAULT 0,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS companies_industry ON companies(industry);
+CREATE INDEX IF NOT EXISTS companies_domain ON companies(domain);
+CREATE VIRTUAL TABLE IF NOT EXISTS companies_fts USING fts5(
+    {", ".join(SEARCH_COLUMNS)},
+    content='companies',
+    content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS companies_ai AFTER INSERT ON companies BEGIN
+    INSERT INTO companies_fts(rowid, {", ".join(SEARCH_COLUMNS)})
+    VALUES (new.rowid, {", ".join(f"new.{column}" for column in SEARCH_COLUMNS)});
+END;
+CREATE TRIGGER IF NOT EXISTS companies_ad AFTER DELETE ON companies BEGIN
+    INSERT INTO companies_fts(companies_fts, rowid, {", ".join(SEARCH_COLUMNS)})
+    VALUES ('delete', old.rowid, {", ".join(f"old.{column}" for column in SEARCH_COLUMNS)});
+END;
+CREATE TRIGGER IF NOT EXISTS companies_au AFTER UPDATE ON companies BEGIN
+    INSERT INTO companies_fts(companies_fts, rowid, {", ".join(SEARCH_COLUMNS)})
+    VALUES ('delete', old.rowid, {", ".join(f"old.{column}" for column in SEARCH_COLUMNS)});
+    INSERT INTO companies_fts(rowid, {", ".join(SEARCH_COLUMNS)})
+    VALUES (new.rowid, {", ".join(f"new.{column}" for column in SEARCH_COLUMNS)});
+END;
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class CompanySearchSource(Protocol):
+    """Subset of :class:`HubSpotIntegration` used to sync the mirror."""
+
+    async def search_companies_modified_since(
+        self,
+        since_ms: int,
+        *,
+        properties: Sequence[str],
+        after: Optional[str] = None,
+        limit: int = 100,
+    ) -> Mapping[str, Any]: ...
+
+
+def _modified_ms(properties: Mapping[str, Any]) -> int:
+    value = properties.get(WATERMARK_PROPERTY) or properties.get("lastmodifieddate")
+    if value is None:
+        return 0
+    text = str(value).strip()
+    if text.isdigit():
+        return int(text)
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        return 0
+    return int(parsed.timestamp() * 1000)
+
+
+def _fts_terms(texts: Iterable[Optional[str]]) -> List[str]:
+    terms: List[str] = []
+    seen = set()
+    for text in texts:
+        normalised = normalize_text(text)
+        for token in "".join(
+            character if character.isalnum() else " " for character in normalised
+        ).split():
+            if len(token) < 2 or token in seen:
+                continue
+            seen.add(token)
+            terms.append(token)
+            if len(terms) >= _MAX_QUERY_TERMS:
+                return terms
+    return terms
+
+
+class HubSpotCompanyMirror:
+    """Incrementally synced local copy of HubSpot companies.
+
+    Companies are stored in SQLite with an FTS5 index over name, segment,
+    product, description and industry (plus B-tree indexes on industry and
+    domain). :meth:`sync` pulls only companies modified since the stored
+    ``hs_lastmodifieddate`` watermark, so similar-company searches can run
+    against the full corpus without an API call per event. Every
+    ``full_sync_interval_seconds`` (and on first use) the whole portal is
+    re-read instead, and companies HubSpot no longer returns are pruned.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        sync_interval_seconds: float = 900.0,
+        full_sync_interval_seconds: float = 86400.0,
+    ) -> None:
+        self.path = Path(path)
+        self.sync_interval_seconds = max(0.0, float(sync_interval_seconds))
+        self.full_sync_interval_seconds = max(0.0, float(full_sync_interval_seconds))
+        self._sync_task: Optional[asyncio.Task[int]] = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            str(self.path), check_same_thread=False, isolation_level=None
+        )
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._set_state("schema_version", str(MIRROR_SCHEMA_VERSION))
+        self._last_synced = float(self._get_state("last_synced") or 0.0)
+        self._last_full_sync = float(self._get_state("last_full_sync") or 0.0)
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+    @property
+    def watermark(self) -> int:
+        return int(self._get_state("watermark_ms") or 0)
+
+    @property
+    def last_synced(self) -> float:
+        return self._last_synced
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._connection.execute("SELECT COUNT(*) FROM companies").fetchone()
+        return int(row[0])
+
+    def needs_sync(self, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        return now - self._last_synced >= self.sync_interval_seconds
+
+    def needs_full_sync(self, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        return now - self._last_full_sync >= self.full_sync_interval_seconds
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+    def upsert(self, companies: Iterable[Mapping[str, Any]]) -> int:
+        """Insert or update *companies*; returns the number stored."""
+
+        rows = []
+        for company in companies:
+            company_id = company.get("id") if isinstance(company, Mapping) else None
+            properties = company.get("properties") if company_id else None
+            if not isinstance(properties, Mapping):
+                continue
+            rows.append(
+                (
+                    str(company_id),
+                    normalize_text(properties.get("name")),
+                    normalize_text(
+                        properties.get("domain") or properties.get("website")
+                    ),
+                    normalize_text(properties.get("segment")),
+                    normalize_text(properties.get("product")),
+                    normalize_text(properties.get("description")),
+                    normalize_text(properties.get("industry")),
+                    _modified_ms(properties),
+                    json.dumps(
+                        {"id": str(company_id), "properties": dict(properties)},
+                        default=str,
+                        ensure_ascii=False,
+                    ),
+                )
+            )
+        if not rows:
+            return 0
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN")
+            try:
+                connection.executemany(
+                    """
+                    INSERT INTO companies (
+                        id, name, domain, segment, product, description,
+                        industry, modified_ms, payload
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        name = excluded.name,
+                        domain = excluded.domain,
+                        segment = excluded.segment,
+                        product = excluded.product,
+                        description = excluded.description,
+                        industry = excluded.industry,
+                        modified_ms = excluded.modified_ms,
+                        payload = excluded.payload
+                    """,
+                    rows,
+                )
+                newest = max(row[7] for row in rows)
+                if newest > int(self._get_state_locked("watermark_ms") or 0):
+                    self._set_state_locked("watermark_ms", str(newest))
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def delete(self, company_ids: Iterable[str]) -> int:
+        ids = [(str(company_id),) for company_id in company_ids]
+        with self._lock:
+            cursor = self._connection.executemany(
+                "DELETE FROM companies WHERE id = ?", ids
+            )
+        return cursor.rowcount
+
+    def prune(self, keep_ids: Iterable[str]) -> int:
+        """Delete every company whose id is not in *keep_ids*."""
+
+        keep = {str(company_id) for company_id in keep_ids}
+        with self._lock:
+            stored = [
+                row[0]
+                for row in self._connection.execute("SELECT id FROM companies")
+            ]
+        return self.delete(company_id for company_id in stored if company_id not in keep)
+
+    def sync_in_background(
+        self, source: CompanySearchSource
+    ) -> Optional[asyncio.Task[int]]:
+        """Start a sync task when one is due and return the running task.
+
+        Concurrent callers share the same task, so a burst of events triggers
+        at most one sync. Failures are logged; the next due call retries.
+        """
+
+        task = self._sync_task
+        if task is not None and not task.done():
+            return task
+        if not self.needs_sync():
+            return None
+        task = asyncio.get_running_loop().create_task(
+            self.sync(source, full=self.needs_full_sync())
+        )
+        task.add_done_callback(_log_sync_failure)
+        self._sync_task = task
+        return task
+
+    async def sync(
+        self,
+        source: CompanySearchSource,
+        *,
+        full: bool = False,
+        page_size: int = 100,
+        max_pages: Optional[int] = None,
+    ) -> int:
+        """Pull companies modified since the watermark from *source*.
+
+        With ``full`` (or an empty mirror) every company is read and the ones
+        HubSpot no longer returns are deleted once the pass completes. SQLite
+        writes run in a worker thread so the event loop is never blocked.
+        """
+
+        full = full or self.watermark == 0
+        since = 0 if full else self.watermark
+        newest = since
+        seen: Set[str] = set()
+        complete = False
+        after: Optional[str] = None
+        pages = 0
+        offset = 0
+        synced = 0
+        while max_pages is None or pages < max_pages:
+            payload = await source.search_companies_modified_since(
+                since,
+                properties=MIRROR_PROPERTIES,
+                after=after,
+                limit=page_size,
+            )
+            pages += 1
+            results = payload.get("results") or []
+            synced += await asyncio.to_thread(self.upsert, results)
+            for company in results:
+                properties = (
+                    company.get("properties") if isinstance(company, Mapping) else None
+                )
+                if isinstance(properties, Mapping) and company.get("id"):
+                    seen.add(str(company["id"]))
+                    newest = max(newest, _modified_ms(properties))
+            paging = payload.get("paging") or {}
+            next_page = (paging.get("next") or {}) if isinstance(paging, Mapping) else {}
+            after = next_page.get("after") if isinstance(next_page, Mapping) else None
+            if not after or not results:
+                complete = True
+                break
+            offset += len(results)
+            if offset + page_size >= _SEARCH_WINDOW:
+                # Restart the query from the newest modification seen in this
+                # pass instead of paging past the search window.
+                if newest == since:
+                    logger.warning(
+                        "HubSpot mirror sync stalled at watermark %s; "
+                        "more than %d companies share it.",
+                        since,
+                        _SEARCH_WINDOW,
+                    )
+                    break
+                since = newest
+                after = None
+                offset = 0
+
+        now = time.time()
+        if full and complete:
+            pruned = await asyncio.to_thread(self.prune, seen)
+            if pruned:
+                record_cache_event(MIRROR_METRIC_NAME, "pruned", pruned)
+            await asyncio.to_thread(self._set_state, "last_full_sync", repr(now))
+            self._last_full_sync = now
+        await asyncio.to_thread(self._set_state, "last_synced", repr(now))
+        self._last_synced = now
+        record_cache_event(MIRROR_METRIC_NAME, "synced", synced)
+        record_cache_size(MIRROR_METRIC_NAME, entries=await asyncio.to_thread(len, self))
+        return synced
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+    def search(
+        self,
+        texts: Iterable[Optional[str]],
+        *,
+        weights: Mapping[str, float],
+        limit: int = 50,
+        industry: Optional[str] = None,
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Return ``(company, relevance)`` pairs ranked by weighted BM25.
+
+        *texts* are tokenised into an OR query over the indexed columns and
+        ``weights`` (e.g. ``_MatchConfig.weights``) weight each column in
+        ``bm25()``. Relevance is positive; higher is better. When *industry*
+        is given, candidates are restricted to that industry.
+        """
+
+        terms = _fts_terms(texts)
+        if not terms or limit <= 0:
+            return []
+        query = " OR ".join(f'"{term}"' for term in terms)
+        column_weights = ", ".join(
+            repr(float(weights.get(column, 1.0))) for column in SEARCH_COLUMNS
+        )
+        sql = (
+            "SELECT c.payload AS payload, "
+            f"bm25(companies_fts, {column_weights}) AS rank "
+            "FROM companies_fts JOIN companies c ON c.rowid = companies_fts.rowid "
+            "WHERE companies_fts MATCH ?"
+        )
+        params: List[Any] = [query]
+        normalised_industry = normalize_text(industry)
+        if normalised_industry:
+            sql += " AND c.industry = ?"
+            params.append(normalised_industry)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(int(limit))
+
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+        record_cache_event(MIRROR_METRIC_NAME, "searched")
+        return [(json.loads(row["payload"]), -float(row["rank"])) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _get_state(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._get_state_locked(key)
+
+    def _get_state_locked(self, key: str) -> Optional[str]:
+        row = self._connection.execute(
+            "SELECT value FROM sync_state WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, key: str, value: str) -> None:
+        with self._lock:
+            self._set_state_locked(key, value)
+
+    def _set_state_locked(self, key: str, value: str) -> None:
+        self._connection.execute(
+            "INSERT INTO sync_state(key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+
+def _log_sync_failure(task: asyncio.Task[int]) -> None:
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        logger.warning("HubSpot mirror sync failed: %s", exc)
+
+
+__all__ = ["HubSpotCompanyMirror", "MIRROR_PROPERTIES", "WATERMARK_PROPERTY"]
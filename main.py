@@ -2,10 +2,11 @@ import asyncio
 import logging
 import os
 from datetime import datetime
-from typing import Callable
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
 
+from utils.adaptive_scheduler import AdaptiveScheduler, CycleOutcome
 from utils.datetime_formatting import CET_ZONE, LOG_TIMESTAMP_FORMAT
 from utils.observability import (
     current_run_id_var,
@@ -19,9 +20,15 @@ except ImportError:
     setup_telemetry = None  # type: ignore
 
 from utils.env_validation import validate_environment
+from utils.http_cache import shared_http_cache_stats
+from utils.http_pool import SHARED_POOL
 from utils.env_compat import apply_env_compat
 
 
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from agents.workflow_runtime import WorkflowRuntime
+
+
 class _RunIdLoggingFilter(logging.Filter):
     def filter(self, record: logging.LogRecord) -> bool:
         if getattr(record, "run_id", None) in {None, ""}:
@@ -71,11 +78,18 @@ def _assign_new_run_id() -> str:
     return run_id
 
 
-async def _run_once(run_id: str) -> None:
+async def _run_once(
+    run_id: str,
+    events: Optional[List[Dict[str, Any]]] = None,
+    runtime: Optional["WorkflowRuntime"] = None,
+) -> Dict[str, Any]:
     from agents.workflow_orchestrator import WorkflowOrchestrator
 
     current_run_id_var.set(run_id)
-    orchestrator = WorkflowOrchestrator(run_id=run_id)
+    if runtime is not None:
+        orchestrator = await runtime.start_cycle(run_id)
+    else:
+        orchestrator = WorkflowOrchestrator(run_id=run_id)
     logging.getLogger(__name__).info(
         "WorkflowOrchestrator instantiated for run.id=%s", run_id
     )
@@ -86,23 +100,224 @@ async def _run_once(run_id: str) -> None:
             "Signal handlers not supported on this platform."
         )
     try:
-        await orchestrator.run()
+        if events is None:
+            await orchestrator.run()
+        else:
+            await orchestrator.run(events=events)
     finally:
         await orchestrator.shutdown()
+        if runtime is not None:
+            runtime.end_cycle(run_id)
+        SHARED_POOL.stats()
+        for name, stats in shared_http_cache_stats().items():
+            logging.getLogger(__name__).info("HTTP cache %s: %s", name, stats)
+    cycle_summary = getattr(orchestrator, "cycle_summary", None)
+    return cycle_summary() if callable(cycle_summary) else {}
+
+
+async def _warm_up_http_pool() -> None:
+    from config.config import settings
+
+    if not (SHARED_POOL.enabled and getattr(settings, "http_pool_warmup", False)):
+        return
+    base_urls = [
+        settings.google_api_base_url,
+        (settings.hubspot_api_base_url or "").rstrip("/"),
+    ]
+    if os.getenv("OPENAI_API_KEY"):
+        base_urls.append(settings.openai_api_base)
+    results = await SHARED_POOL.warm_up(base_urls)
+    logging.getLogger(__name__).info("HTTP pool warm-up: %s", results)
+
+
+async def _sync_internal_company_index() -> int:
+    """Rescan research artifacts into the internal company index when due.
+
+    Runs outside event processing so lookups never wait for a scan; results
+    of research agents are indexed as soon as they are written.
+    """
+
+    from agents.internal_company.search import shared_internal_company_index
+    from config.config import settings
+
+    log = logging.getLogger(__name__)
+    try:
+        index = shared_internal_company_index(settings)
+        if index is None:
+            return 0
+        indexed = await asyncio.to_thread(index.sync_if_due)
+    except Exception:
+        log.warning("Internal company index sync failed", exc_info=True)
+        return 0
+    if indexed:
+        log.info("Internal company index sync added %d entries", indexed)
+    return indexed
+
+
+def _create_runtime() -> Optional["WorkflowRuntime"]:
+    """Return the long-lived daemon runtime unless it is disabled."""
+
+    from config.config import settings
+
+    if not getattr(settings, "daemon_persistent_runtime", False):
+        return None
+    from agents.workflow_runtime import WorkflowRuntime
+
+    return WorkflowRuntime()
+
+
+def _create_scheduler(
+    interval: int, *, push_active: bool = False
+) -> Optional[AdaptiveScheduler]:
+    """Return the adaptive daemon scheduler unless it is disabled."""
+
+    from config.config import settings
+
+    if not getattr(settings, "daemon_adaptive_scheduling", False):
+        return None
+    min_interval = settings.daemon_min_interval_seconds
+    if push_active:
+        # Pushes cover fresh changes; polls only need to catch missed ones.
+        min_interval = max(min_interval, interval)
+    business_hours = None
+    if settings.daemon_business_hours_start < settings.daemon_business_hours_end:
+        business_hours = (
+            settings.daemon_business_hours_start,
+            settings.daemon_business_hours_end,
+        )
+    return AdaptiveScheduler(
+        base_interval=interval,
+        min_interval=min_interval,
+        max_interval=max(settings.daemon_max_interval_seconds, min_interval),
+        backoff_factor=settings.daemon_backoff_factor,
+        busy_threshold=settings.daemon_busy_event_threshold,
+        business_hours=business_hours,
+        business_days=settings.daemon_business_days,
+    )
+
+
+async def _start_push_ingestion(
+    run_lock: asyncio.Lock, runtime: Optional["WorkflowRuntime"] = None
+) -> Optional[Tuple[Any, "asyncio.Task[None]", Any]]:
+    """Start the push ingestion endpoint when ``PUSH_INGESTION_ENABLED`` is set.
+
+    Returns ``(service, server_task, poller)`` or ``None`` when push ingestion
+    is disabled or its optional dependencies are missing.
+    """
+
+    from config.config import settings
+
+    if not getattr(settings, "push_ingestion_enabled", False):
+        return None
+    log = logging.getLogger(__name__)
+
+    from polling.push_ingestion import (
+        PushIngestionService,
+        push_endpoint_available,
+        serve_push_ingestion,
+    )
+
+    if not push_endpoint_available():
+        log.error(
+            "PUSH_INGESTION_ENABLED is set but fastapi/uvicorn are not installed; "
+            "falling back to interval polling."
+        )
+        return None
+    if not settings.push_ingestion_token:
+        log.warning(
+            "PUSH_INGESTION_TOKEN is not set; push notifications are not verified."
+        )
+
+    from agents.event_polling_agent import EventPollingAgent
+
+    master = runtime.master if runtime is not None else None
+    shared_poller = getattr(master, "event_agent", None)
+    if isinstance(shared_poller, EventPollingAgent):
+        poller, owns_poller = shared_poller, False
+    else:
+        poller, owns_poller = EventPollingAgent(config=settings), True
+
+    async def _process(events: List[Dict[str, Any]]) -> None:
+        # Pushed batches and safety-net polls never run concurrently.
+        async with run_lock:
+            run_id = _assign_new_run_id()
+            log.info(
+                "Push cycle start for run.id=%s (%d events)", run_id, len(events)
+            )
+            await _run_once(run_id, events=events, runtime=runtime)
+
+    service = PushIngestionService(
+        poller.poll_changes,
+        _process,
+        calendar_ids=poller.calendars,
+        token=settings.push_ingestion_token,
+        debounce_seconds=settings.push_debounce_seconds,
+        max_delay_seconds=settings.push_max_delay_seconds,
+    )
+    server = asyncio.create_task(
+        serve_push_ingestion(
+            service,
+            host=settings.push_ingestion_host,
+            port=settings.push_ingestion_port,
+        )
+    )
+    log.info(
+        "Push ingestion listening on %s:%s",
+        settings.push_ingestion_host,
+        settings.push_ingestion_port,
+    )
+    return service, server, poller if owns_poller else None
+
+
+async def _stop_push_ingestion(push: Tuple[Any, "asyncio.Task[None]", Any]) -> None:
+    service, server, poller = push
+    server.cancel()
+    try:
+        await server
+    except (asyncio.CancelledError, Exception):
+        pass
+    await service.aclose()
+    if poller is not None:
+        await poller.aclose()
 
 
 async def _daemon_loop(
-    *, interval: int = 3600, prepare_run: Callable[[], str], initial_run_id: str
+    *,
+    interval: int = 3600,
+    prepare_run: Callable[[], str],
+    initial_run_id: str,
+    run_lock: Optional[asyncio.Lock] = None,
+    scheduler: Optional[AdaptiveScheduler] = None,
+    runtime: Optional["WorkflowRuntime"] = None,
 ) -> None:
     log = logging.getLogger(__name__)
+    run_lock = run_lock or asyncio.Lock()
     run_id = initial_run_id
-    while True:
-        current_run_id_var.set(run_id)
-        log.info("Daemon cycle start for run.id=%s", run_id)
-        await _run_once(run_id)
-        log.info("Daemon cycle complete. Sleeping %ss.", interval)
-        await asyncio.sleep(interval)
-        run_id = prepare_run()
+    index_sync: Optional["asyncio.Task[int]"] = None
+    try:
+        while True:
+            if index_sync is None or index_sync.done():
+                # Rescans run beside the cycle instead of inside its events.
+                index_sync = asyncio.create_task(_sync_internal_company_index())
+            async with run_lock:
+                current_run_id_var.set(run_id)
+                log.info("Daemon cycle start for run.id=%s", run_id)
+                if runtime is None:
+                    summary = await _run_once(run_id)
+                else:
+                    summary = await _run_once(run_id, runtime=runtime)
+            delay: float = interval
+            if scheduler is not None:
+                delay = scheduler.record(
+                    CycleOutcome.from_summary(summary)
+                ).delay_seconds
+            log.info("Daemon cycle complete. Sleeping %ss.", delay)
+            await asyncio.sleep(delay)
+            run_id = prepare_run()
+    finally:
+        if index_sync is not None and not index_sync.done():
+            index_sync.cancel()
+            await asyncio.gather(index_sync, return_exceptions=True)
 
 
 async def _async_main() -> None:
@@ -135,14 +350,39 @@ async def _async_main() -> None:
                 exc_info=True,
             )
 
+    await _warm_up_http_pool()
+
     run_mode = os.getenv("LEADMI_RUN_MODE", "daemon").lower()
-    if run_mode == "oneshot":
-        await _run_once(run_id)
-    else:
-        interval = int(os.getenv("LEADMI_DAEMON_INTERVAL", "3600"))
-        await _daemon_loop(
-            interval=interval, prepare_run=_assign_new_run_id, initial_run_id=run_id
-        )
+    try:
+        if run_mode == "oneshot":
+            await _sync_internal_company_index()
+            await _run_once(run_id)
+        else:
+            interval = int(os.getenv("LEADMI_DAEMON_INTERVAL", "3600"))
+            run_lock = asyncio.Lock()
+            runtime = _create_runtime()
+            push = await _start_push_ingestion(run_lock, runtime)
+            if push is not None:
+                from config.config import settings
+
+                # Pushes drive ingestion; polling remains as a safety net.
+                interval = max(interval, settings.push_safety_poll_interval_seconds)
+            try:
+                await _daemon_loop(
+                    interval=interval,
+                    prepare_run=_assign_new_run_id,
+                    initial_run_id=run_id,
+                    run_lock=run_lock,
+                    scheduler=_create_scheduler(interval, push_active=push is not None),
+                    runtime=runtime,
+                )
+            finally:
+                if push is not None:
+                    await _stop_push_ingestion(push)
+                if runtime is not None:
+                    await runtime.aclose()
+    finally:
+        await SHARED_POOL.aclose()
 
 
 def main() -> None:
@@ -2,4 +2,4 @@
 
 from __future__ import annotations
 
-__all__ = ["inbox_agent"]
+__all__ = ["inbox_agent", "push_ingestion"]
@@ -0,0 +1,438 @@
+"""Push-based event ingestion for Google Calendar watch channels.
+
+Google Calendar ``events.watch`` channels POST a header-only notification
+whenever a watched calendar changes. :class:`PushIngestionService` validates
+those notifications, debounces bursts per calendar and then runs one targeted
+incremental fetch (``updatedMin``) per changed calendar. Other producers can
+push event payloads directly. The collected events are handed to a single
+``process`` callback, typically a workflow run over exactly those events.
+
+The HTTP endpoint (:func:`create_push_app`) needs the optional ``fastapi``
+dependency; the service itself is framework independent so it can be driven
+from tests or a simulated sender (:func:`google_notification_headers`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hmac
+import importlib.util
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+)
+from urllib.parse import quote, unquote, urlsplit
+
+try:  # pragma: no cover - optional dependency
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse
+except ImportError:  # pragma: no cover - optional dependency
+    FastAPI = None  # type: ignore[assignment]
+    Request = None  # type: ignore[assignment]
+    JSONResponse = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+FetchChanges = Callable[[str, datetime], Awaitable[List[Dict[str, Any]]]]
+ProcessEvents = Callable[[List[Dict[str, Any]]], Awaitable[Any]]
+
+#: Resource states sent by Google Calendar that signal changed events.
+CHANGE_STATES = frozenset({"exists", "not_exists"})
+
+#: Slack subtracted from ``updatedMin`` to tolerate clock skew with Google.
+DEFAULT_OVERLAP_SECONDS = 60.0
+
+
+class PushRejected(Exception):
+    """Raised for notifications the endpoint must refuse."""
+
+    def __init__(self, status_code: int, message: str) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass(frozen=True)
+class CalendarNotification:
+    """Headers of one Google Calendar watch-channel notification."""
+
+    channel_id: str
+    resource_state: str
+    calendar_id: Optional[str] = None
+    resource_id: Optional[str] = None
+    message_number: Optional[int] = None
+    token: Optional[str] = None
+
+    @classmethod
+    def from_headers(cls, headers: Mapping[str, str]) -> "CalendarNotification":
+        lowered = {str(key).lower(): value for key, value in headers.items()}
+        channel_id = lowered.get("x-goog-channel-id")
+        resource_state = lowered.get("x-goog-resource-state")
+        if not channel_id or not resource_state:
+            raise PushRejected(400, "Missing Google channel headers")
+        try:
+            message_number: Optional[int] = int(
+                lowered.get("x-goog-message-number", "")
+            )
+        except ValueError:
+            message_number = None
+        return cls(
+            channel_id=channel_id,
+            resource_state=resource_state.lower(),
+            calendar_id=calendar_id_from_resource_uri(
+                lowered.get("x-goog-resource-uri")
+            ),
+            resource_id=lowered.get("x-goog-resource-id"),
+            message_number=message_number,
+            token=lowered.get("x-goog-channel-token"),
+        )
+
+
+def calendar_id_from_resource_uri(uri: Optional[str]) -> Optional[str]:
+    """Extract the calendar ID from an ``X-Goog-Resource-URI`` header."""
+
+    if not uri:
+        return None
+    segments = urlsplit(uri).path.split("/")
+    try:
+        index = segments.index("calendars")
+    except ValueError:
+        return None
+    if index + 1 >= len(segments) or not segments[index + 1]:
+        return None
+    return unquote(segments[index + 1])
+
+
+def google_notification_headers(
+    calendar_id: str,
+    *,
+    channel_id: str = "leadmi-local",
+    token: Optional[str] = None,
+    resource_state: str = "exists",
+    message_number: int = 1,
+    base_url: str = "https://www.googleapis.com",
+) -> Dict[str, str]:
+    """Return the headers Google sends for a change on *calendar_id*.
+
+    Used by the simulated sender and tests to exercise the endpoint locally.
+    """
+
+    encoded = quote(calendar_id, safe="@")
+    headers = {
+        "X-Goog-Channel-ID": channel_id,
+        "X-Goog-Resource-State": resource_state,
+        "X-Goog-Resource-ID": f"resource-{encoded}",
+        "X-Goog-Resource-URI": (
+            f"{base_url.rstrip('/')}/calendar/v3/calendars/{encoded}/events?alt=json"
+        ),
+        "X-Goog-Message-Number": str(message_number),
+    }
+    if token:
+        headers["X-Goog-Channel-Token"] = token
+    return headers
+
+
+class PushIngestionService:
+    """Debounce push notifications into targeted incremental fetches.
+
+    Notifications mark their calendar as changed; once no further
+    notification arrived for ``debounce_seconds`` (but at the latest
+    ``max_delay_seconds`` after the first one) every changed calendar is
+    fetched once with ``updatedMin`` set to its previous fetch, and all
+    changed plus directly pushed events are processed as one batch. Batches
+    never overlap. Missed notifications are covered by the regular polling
+    cycle, which keeps running at a longer safety-net interval.
+    """
+
+    def __init__(
+        self,
+        fetch_changes: FetchChanges,
+        process: ProcessEvents,
+        *,
+        calendar_ids: Iterable[str],
+        token: Optional[str] = None,
+        debounce_seconds: float = 5.0,
+        max_delay_seconds: float = 30.0,
+        overlap_seconds: float = DEFAULT_OVERLAP_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._fetch_changes = fetch_changes
+        self._process = process
+        self.calendar_ids: Set[str] = set(calendar_ids)
+        self.token = token or None
+        self.debounce_seconds = max(0.0, float(debounce_seconds))
+        self.max_delay_seconds = max(self.debounce_seconds, float(max_delay_seconds))
+        self.overlap = timedelta(seconds=max(0.0, float(overlap_seconds)))
+        self._clock = clock
+
+        started_at = datetime.now(timezone.utc)
+        self._watermarks: Dict[str, datetime] = {
+            calendar_id: started_at for calendar_id in self.calendar_ids
+        }
+        self._pending_calendars: Set[str] = set()
+        self._pending_events: Dict[str, Dict[str, Any]] = {}
+        self._first_signal: Optional[float] = None
+        self._last_signal: Optional[float] = None
+        self._flush_task: Optional[asyncio.Task[None]] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self.stats: Dict[str, int] = {
+            "notifications": 0,
+            "ignored": 0,
+            "pushed_events": 0,
+            "fetches": 0,
+            "fetch_errors": 0,
+            "batches": 0,
+            "events_processed": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Inbound
+    # ------------------------------------------------------------------
+    def handle_calendar_notification(
+        self, headers: Mapping[str, str]
+    ) -> Dict[str, Any]:
+        """Accept one watch-channel notification and schedule a fetch."""
+
+        notification = CalendarNotification.from_headers(headers)
+        self._authorise(notification.token)
+        self.stats["notifications"] += 1
+
+        if notification.resource_state not in CHANGE_STATES:
+            # "sync" confirms a new channel and carries no changes.
+            self.stats["ignored"] += 1
+            return {"status": "ignored", "reason": notification.resource_state}
+        calendar_id = notification.calendar_id
+        if calendar_id not in self.calendar_ids:
+            self.stats["ignored"] += 1
+            logger.warning(
+                "Ignoring push notification for unknown calendar on channel %s",
+                notification.channel_id,
+            )
+            return {"status": "ignored", "reason": "unknown_calendar"}
+
+        self._pending_calendars.add(calendar_id)
+        self._signal()
+        return {"status": "accepted", "calendar_id": calendar_id}
+
+    def handle_event_push(
+        self, payload: Any, *, token: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Accept events pushed directly by another producer.
+
+        *payload* is one event object, a list of events or ``{"events": [...]}``;
+        every event needs an ``id``.
+        """
+
+        self._authorise(token)
+        if isinstance(payload, Mapping) and "events" in payload:
+            payload = payload["events"]
+        events = [payload] if isinstance(payload, Mapping) else payload
+        if not isinstance(events, list) or not events:
+            raise PushRejected(400, "Expected an event object or a list of events")
+        for event in events:
+            if not isinstance(event, Mapping) or not event.get("id"):
+                raise PushRejected(422, "Every pushed event needs an 'id'")
+
+        for event in events:
+            self._pending_events[str(event["id"])] = dict(event)
+        self.stats["pushed_events"] += len(events)
+        self._signal()
+        return {"status": "accepted", "events": len(events)}
+
+    def _authorise(self, token: Optional[str]) -> None:
+        if self.token is None:
+            return
+        if not token or not hmac.compare_digest(str(token), self.token):
+            raise PushRejected(403, "Invalid push token")
+
+    # ------------------------------------------------------------------
+    # Debounce and flush
+    # ------------------------------------------------------------------
+    @property
+    def pending(self) -> bool:
+        return bool(self._pending_calendars or self._pending_events)
+
+    def _signal(self) -> None:
+        now = self._clock()
+        if self._first_signal is None:
+            self._first_signal = now
+        self._last_signal = now
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(
+                self._flush_when_quiet()
+            )
+
+    def _due(self) -> float:
+        assert self._first_signal is not None and self._last_signal is not None
+        return min(
+            self._last_signal + self.debounce_seconds,
+            self._first_signal + self.max_delay_seconds,
+        )
+
+    async def _flush_when_quiet(self) -> None:
+        while self.pending:
+            remaining = self._due() - self._clock()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+                continue
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Push ingestion batch failed")
+
+    async def flush(self) -> List[Dict[str, Any]]:
+        """Fetch changed calendars and process the batch immediately.
+
+        Returns the processed events.
+        """
+
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            calendars = sorted(self._pending_calendars)
+            batch: Dict[str, Dict[str, Any]] = dict(self._pending_events)
+            self._pending_calendars.clear()
+            self._pending_events.clear()
+            self._first_signal = self._last_signal = None
+
+            for calendar_id in calendars:
+                fetched_at = datetime.now(timezone.utc)
+                since = self._watermarks[calendar_id] - self.overlap
+                self.stats["fetches"] += 1
+                try:
+                    changes = await self._fetch_changes(calendar_id, since)
+                except Exception as exc:
+                    # The watermark stays put so the next fetch covers the gap.
+                    self.stats["fetch_errors"] += 1
+                    logger.warning(
+                        "Incremental fetch for pushed calendar %s failed: %s",
+                        calendar_id,
+                        exc,
+                    )
+                    continue
+                self._watermarks[calendar_id] = fetched_at
+                for event in changes:
+                    key = str(event.get("id") or id(event))
+                    batch.setdefault(key, event)
+
+            if not batch:
+                return []
+            events = list(batch.values())
+            self.stats["batches"] += 1
+            self.stats["events_processed"] += len(events)
+            logger.info(
+                "Processing %d pushed event(s) from %d changed calendar(s)",
+                len(events),
+                len(calendars),
+            )
+            await self._process(events)
+            return events
+
+    async def aclose(self) -> None:
+        """Cancel a pending debounce timer without processing its batch."""
+
+        task, self._flush_task = self._flush_task, None
+        if task is None or task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+def push_endpoint_available() -> bool:
+    """Return ``True`` when fastapi and uvicorn are installed."""
+
+    return FastAPI is not None and importlib.util.find_spec("uvicorn") is not None
+
+
+def create_push_app(service: PushIngestionService) -> Any:
+    """Return a FastAPI application exposing *service*.
+
+    Routes: ``POST /push/google-calendar`` for watch-channel notifications,
+    ``POST /push/events`` for direct event pushes (``Authorization: Bearer``
+    carries the token) and ``GET /healthz``.
+    """
+
+    if FastAPI is None:
+        raise RuntimeError(
+            "The push ingestion endpoint requires the 'fastapi' package"
+        )
+
+    app = FastAPI(title="Lead-Market-Insights push ingestion")
+
+    def _respond(handler: Callable[[], Dict[str, Any]]) -> Any:
+        try:
+            return JSONResponse(handler(), status_code=202)
+        except PushRejected as exc:
+            return JSONResponse({"error": str(exc)}, status_code=exc.status_code)
+
+    @app.post("/push/google-calendar")
+    async def google_calendar(request: Request) -> Any:
+        return _respond(
+            lambda: service.handle_calendar_notification(dict(request.headers))
+        )
+
+    @app.post("/push/events")
+    async def events(request: Request) -> Any:
+        try:
+            payload = await request.json()
+        except ValueError:
+            return JSONResponse({"error": "Invalid JSON body"}, status_code=400)
+        authorization = request.headers.get("authorization") or ""
+        scheme, _, token = authorization.partition(" ")
+        return _respond(
+            lambda: service.handle_event_push(
+                payload, token=token if scheme.lower() == "bearer" else None
+            )
+        )
+
+    @app.get("/healthz")
+    async def healthz() -> Dict[str, Any]:
+        return {"status": "ok", "pending": service.pending, **service.stats}
+
+    return app
+
+
+async def serve_push_ingestion(
+    service: PushIngestionService, *, host: str, port: int
+) -> None:
+    """Serve :func:`create_push_app` with uvicorn until cancelled."""
+
+    try:
+        import uvicorn
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError(
+            "The push ingestion endpoint requires the 'uvicorn' package"
+        ) from exc
+
+    config = uvicorn.Config(
+        create_push_app(service), host=host, port=port, log_level="warning"
+    )
+    server = uvicorn.Server(config)
+    # The daemon owns signal handling and shutdown.
+    server.install_signal_handlers = lambda: None  # type: ignore[method-assign]
+    await server.serve()
+
+
+__all__ = [
+    "CalendarNotification",
+    "PushIngestionService",
+    "PushRejected",
+    "calendar_id_from_resource_uri",
+    "create_push_app",
+    "google_notification_headers",
+    "push_endpoint_available",
+    "serve_push_ingestion",
+]
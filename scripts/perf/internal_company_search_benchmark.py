@@ -0,0 +1,165 @@
+"""Benchmark lookups against the internal company search index.
+
+Builds a synthetic index and measures the full per-event lookup performed for
+the internal research agent (``InternalCompanyIndex.lookup``: exact domain,
+fuzzy name fallback and neighbour query). The run fails when the 95th percentile exceeds the target
+documented in ``docs/performance.md``.
+
+Environment variables
+---------------------
+``BENCH_COMPANY_COUNT``
+    Number of indexed companies.  Default: ``50000``.
+``BENCH_QUERY_COUNT``
+    Number of measured lookups.  Default: ``2000``.
+``BENCH_P95_TARGET_MS``
+    Latency budget for the 95th percentile.  Default: ``P95_TARGET_MS``.
+``BENCH_INDEX_PATH``
+    Index database to (re)use.  Default: a temporary file.
+``BENCH_RESULTS_PATH``
+    File path where JSON encoded measurements are written.  Default:
+    ``logs/perf/internal_company_search.json``.
+``PERF_RANDOM_SEED``
+    Random seed for the synthetic corpus and queries.  Default: ``42``.
+
+Example usage::
+
+    BENCH_COMPANY_COUNT=50000 python -m scripts.perf.internal_company_search_benchmark
+
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from agents.internal_company.search import P95_TARGET_MS, InternalCompanyIndex
+
+INDUSTRIES = tuple(f"Industry {number}" for number in range(40))
+LEGAL_FORMS = ("GmbH", "AG", "SE", "GmbH & Co. KG", "Inc.", "Ltd.")
+SYLLABLES = (
+    "al", "be", "ca", "do", "el", "fa", "go", "ha", "in", "jo", "ka", "lu",
+    "ma", "no", "or", "pe", "qu", "ri", "sa", "te", "ul", "ve", "wi", "zo",
+)  # fmt: skip
+
+
+def _vocabulary(rng: random.Random, size: int) -> List[str]:
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    return sorted(words)
+
+
+def _company(
+    rng: random.Random,
+    number: int,
+    vocabulary: List[str],
+    weights: List[float],
+) -> Dict[str, Any]:
+    # Word frequencies follow Zipf's law like real names and descriptions.
+    words = rng.choices(vocabulary, cum_weights=weights, k=6)
+    name = f"{rng.choice(vocabulary).title()} {words[0].title()}"
+    return {
+        "name": f"{name} {rng.choice(LEGAL_FORMS)}",
+        "domain": f"{name.replace(' ', '-').lower()}-{number}.example",
+        "industry": rng.choice(INDUSTRIES),
+        "description": " ".join(words[1:]),
+    }
+
+
+def _trigger(
+    rng: random.Random, companies: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    company = rng.choice(companies)
+    kind = rng.random()
+    if kind < 0.6:  # known domain
+        payload = {"company_name": company["name"], "company_domain": company["domain"]}
+    elif kind < 0.9:  # new domain, slightly different name
+        name = company["name"]
+        payload = {
+            "company_name": name[:3] + name[4:],  # typo
+            "company_domain": f"new-{company['domain']}",
+        }
+    else:  # unknown company
+        payload = {"company_name": "Unbekannt Zzz", "company_domain": "unknown.example"}
+    payload["industry"] = company["industry"]
+    payload["description"] = company["description"]
+    return {"payload": payload}
+
+
+def main() -> int:
+    company_count = int(os.getenv("BENCH_COMPANY_COUNT", "50000"))
+    query_count = int(os.getenv("BENCH_QUERY_COUNT", "2000"))
+    target_ms = float(os.getenv("BENCH_P95_TARGET_MS", str(P95_TARGET_MS)))
+    results_path = Path(
+        os.getenv("BENCH_RESULTS_PATH", "logs/perf/internal_company_search.json")
+    )
+    rng = random.Random(int(os.getenv("PERF_RANDOM_SEED", "42")))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = Path(
+            os.getenv("BENCH_INDEX_PATH") or Path(tmp) / "internal_company.sqlite3"
+        )
+        # ``sync_interval_seconds`` is large so no artifact scan is measured.
+        index = InternalCompanyIndex(index_path, sync_interval_seconds=10**9)
+        index.sync(Path(tmp) / "artifacts")
+        vocabulary = _vocabulary(rng, 20000)
+        weights = list(
+            itertools.accumulate(1 / rank for rank in range(1, len(vocabulary) + 1))
+        )
+        companies = [
+            _company(rng, number, vocabulary, weights)
+            for number in range(company_count)
+        ]
+        started = time.perf_counter()
+        for offset in range(0, len(companies), 1000):
+            index.upsert(companies[offset : offset + 1000])
+        build_seconds = time.perf_counter() - started
+
+        latencies: List[float] = []
+        matches = {"domain": 0, "name": 0, None: 0}
+        for _ in range(query_count):
+            trigger = _trigger(rng, companies)
+            started = time.perf_counter()
+            result = index.lookup(trigger["payload"])
+            latencies.append((time.perf_counter() - started) * 1000)
+            matches[result["internal_match"]["match"]] += 1
+        index.close()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    metrics = {
+        "companies": company_count,
+        "queries": query_count,
+        "build_seconds": round(build_seconds, 3),
+        "p50_latency_ms": round(quantiles[49], 3),
+        "p95_latency_ms": round(quantiles[94], 3),
+        "p99_latency_ms": round(quantiles[98], 3),
+        "max_latency_ms": round(max(latencies), 3),
+        "p95_target_ms": target_ms,
+        "domain_matches": matches["domain"],
+        "name_matches": matches["name"],
+        "misses": matches[None],
+    }
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+    results_path.write_text(json.dumps(metrics, indent=2), encoding="utf-8")
+    print(json.dumps(metrics, indent=2))
+
+    if metrics["p95_latency_ms"] > target_ms:
+        print(
+            f"p95 latency {metrics['p95_latency_ms']} ms exceeds the "
+            f"{target_ms} ms target",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""Send simulated Google Calendar push notifications to a local endpoint.
+
+Exercises the push ingestion endpoint (``PUSH_INGESTION_ENABLED=true``)
+without a public HTTPS URL or a registered watch channel. The script can be
+configured via environment variables:
+
+* ``PUSH_URL`` – base URL of the endpoint (default: ``http://127.0.0.1:8080``)
+* ``PUSH_CALENDAR_ID`` – calendar reported as changed (default:
+  ``GOOGLE_CALENDAR_ID``)
+* ``PUSH_INGESTION_TOKEN`` – channel token expected by the endpoint
+* ``PUSH_COUNT`` – notifications sent in one burst (default: 3); the endpoint
+  debounces the burst into one incremental fetch
+* ``PUSH_INTERVAL_MS`` – delay between notifications (default: 200)
+* ``PUSH_EVENTS_PATH`` – optional JSON file with events posted to
+  ``/push/events`` instead (e.g. the output of ``generate_fake_events.py``)
+
+Example usage (from the repository root)::
+
+    PUSH_INGESTION_TOKEN=dev-secret python -m scripts.simulate_push_notification
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from pathlib import Path
+
+import httpx
+
+from polling.push_ingestion import google_notification_headers
+
+
+def load_config() -> dict:
+    return {
+        "url": os.getenv("PUSH_URL", "http://127.0.0.1:8080").rstrip("/"),
+        "calendar_id": os.getenv("PUSH_CALENDAR_ID")
+        or os.getenv("GOOGLE_CALENDAR_ID", "primary"),
+        "token": os.getenv("PUSH_INGESTION_TOKEN"),
+        "count": int(os.getenv("PUSH_COUNT", "3")),
+        "interval_ms": int(os.getenv("PUSH_INTERVAL_MS", "200")),
+        "events_path": os.getenv("PUSH_EVENTS_PATH"),
+    }
+
+
+async def send(config: dict) -> None:
+    async with httpx.AsyncClient(base_url=config["url"], timeout=10.0) as client:
+        if config["events_path"]:
+            events = json.loads(Path(config["events_path"]).read_text("utf-8"))
+            headers = {}
+            if config["token"]:
+                headers["Authorization"] = f"Bearer {config['token']}"
+            response = await client.post(
+                "/push/events", json={"events": events}, headers=headers
+            )
+            print(
+                f"Pushed {len(events)} events: "
+                f"{response.status_code} {response.text}"
+            )
+            return
+
+        for number in range(1, config["count"] + 1):
+            headers = google_notification_headers(
+                config["calendar_id"],
+                token=config["token"],
+                message_number=number,
+            )
+            response = await client.post("/push/google-calendar", headers=headers)
+            print(f"Notification {number}: {response.status_code} {response.text}")
+            await asyncio.sleep(config["interval_ms"] / 1000)
+
+
+def main() -> None:
+    asyncio.run(send(load_config()))
+
+
+if __name__ == "__main__":
+    main()
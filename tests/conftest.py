@@ -5,6 +5,7 @@ from __future__ import annotations
 import importlib
 import os
 import sys
+import tempfile
 from collections import defaultdict
 from pathlib import Path
 from typing import Any, Dict, Iterable, Optional
@@ -45,6 +46,59 @@ _DEFAULT_SMTP_ENV = {
 for _key, _value in _DEFAULT_SMTP_ENV.items():
     os.environ.setdefault(_key, _value)
 
+# Keep test runs from writing the on-disk HTTP response, OAuth token,
+# contacts and research caches and the internal company index; tests that
+# exercise them construct their own instances.
+os.environ.setdefault("HTTP_CACHE_ENABLED", "false")
+os.environ.setdefault("GOOGLE_TOKEN_CACHE_ENABLED", "false")
+os.environ.setdefault("GOOGLE_CONTACTS_SYNC_ENABLED", "false")
+os.environ.setdefault("RESEARCH_CACHE_ENABLED", "false")
+os.environ.setdefault("INTERNAL_COMPANY_SEARCH_ENABLED", "false")
+
+# Settings instances created at import time or by config reloads must not
+# default to ``log_storage/`` inside the repository either.
+os.environ.setdefault(
+    "LOG_STORAGE_DIR", tempfile.mkdtemp(prefix="lead-market-insights-tests-")
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_google_token_managers():
+    """Start every test without access tokens shared by earlier tests."""
+
+    from integration.google_token_manager import reset_shared_token_managers
+
+    reset_shared_token_managers()
+    yield
+    reset_shared_token_managers()
+
+
+@pytest.fixture(autouse=True)
+def _isolate_log_storage(monkeypatch, tmp_path):
+    """Write run logs, checkpoints and research artifacts below ``tmp_path``.
+
+    The default locations live inside the repository (``log_storage/``);
+    tests that need specific directories still override them explicitly.
+    """
+
+    from config.config import settings
+
+    root = tmp_path / "log_storage"
+    directories = {
+        "log_storage_dir": root,
+        "event_log_dir": root / "events",
+        "workflow_log_dir": root / "workflows",
+        "run_log_dir": root / "runs",
+        "agent_log_dir": root / "agents",
+        "research_artifact_dir": root / "research" / "artifacts",
+        "research_pdf_dir": root / "research" / "pdfs",
+    }
+    monkeypatch.setenv("LOG_STORAGE_DIR", str(root))
+    for name, directory in directories.items():
+        if hasattr(settings, name):
+            monkeypatch.setattr(settings, name, directory)
+    yield
+
 
 @pytest.fixture
 def isolated_agent_registry(monkeypatch):
@@ -10,6 +10,8 @@ import pytest
 
 from config.config import Settings
 from integration.hubspot_integration import HubSpotIntegration
+from utils.company_lookup_cache import reset_shared_company_caches
+from utils.rate_limiter import reset_shared_rate_limiters
 
 
 class DummyResponse:
@@ -33,6 +35,8 @@ def clear_settings_cache(monkeypatch):
     monkeypatch.delenv("HUBSPOT_RETRY_BACKOFF_SECONDS", raising=False)
     monkeypatch.delenv("MAX_CONCURRENT_HUBSPOT", raising=False)
     monkeypatch.delenv("MAX_CONCURRENT_RESEARCH", raising=False)
+    reset_shared_company_caches()
+    reset_shared_rate_limiters()
 
 
 @pytest.fixture
@@ -143,8 +147,9 @@ async def test_hubspot_requests_respect_concurrency_limit(
             start = time.perf_counter()
             await asyncio.gather(
                 *(
-                    integration.list_similar_companies("Acme")
-                    for _ in range(total_requests)
+                    # Distinct names so single-flight coalescing does not apply.
+                    integration.list_similar_companies(f"Acme {index}")
+                    for index in range(total_requests)
                 )
             )
             return time.perf_counter() - start
@@ -160,3 +165,158 @@ async def test_hubspot_requests_respect_concurrency_limit(
         )
     finally:
         concurrency.reload_limits(hubspot=previous_hubspot, research=previous_research)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_lookups_share_one_request(
+    monkeypatch, configured_settings
+):
+    integration = HubSpotIntegration(settings=configured_settings)
+    calls: List[str] = []
+
+    async def slow_post(path, json=None, timeout=None):
+        calls.append(path)
+        await asyncio.sleep(0.01)
+        return DummyResponse(
+            {"results": [{"id": "1", "properties": {"name": "Acme Corp"}}]}
+        )
+
+    monkeypatch.setattr(integration._http, "post", slow_post)
+
+    results = await asyncio.gather(
+        *(integration.list_similar_companies("Acme") for _ in range(5))
+    )
+
+    assert len(calls) == 1
+    assert all(result == results[0] for result in results)
+    # Every caller receives its own copy of the shared payload.
+    assert results[0] is not results[1]
+
+
+def _company(company_id: str, domain: str) -> Dict[str, object]:
+    return {"id": company_id, "properties": {"domain": domain, "name": domain}}
+
+
+@pytest.mark.asyncio
+async def test_find_companies_by_domains_uses_or_filter_groups(
+    monkeypatch, configured_settings
+):
+    integration = HubSpotIntegration(settings=configured_settings)
+    payloads: List[dict] = []
+
+    async def fake_post(path, json=None, timeout=None):
+        payloads.append(json)
+        domains = [group["filters"][0]["value"] for group in json["filterGroups"]]
+        return DummyResponse(
+            {
+                "results": [
+                    _company(str(index), domain)
+                    for index, domain in enumerate(domains)
+                    if domain != "missing.com"
+                ]
+            }
+        )
+
+    monkeypatch.setattr(integration._http, "post", fake_post)
+    domains = [f"https://www.d{index}.com/" for index in range(6)] + ["missing.com"]
+
+    results = await integration.find_companies_by_domains_async(domains)
+
+    assert [len(payload["filterGroups"]) for payload in payloads] == [5, 2]
+    # Same properties as single lookups: HubSpot's defaults unless requested.
+    assert "properties" not in payloads[0]
+    assert results["d0.com"]["properties"]["domain"] == "d0.com"
+    assert results["missing.com"] is None
+    assert len(results) == 7
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_search_and_association_batches(
+    monkeypatch, configured_settings
+):
+    integration = HubSpotIntegration(settings=configured_settings)
+    paths: List[str] = []
+
+    async def fake_post(path, json=None, timeout=None):
+        paths.append(path)
+        if path == integration.SEARCH_PATH:
+            domains = [group["filters"][0]["value"] for group in json["filterGroups"]]
+            return DummyResponse(
+                {"results": [_company(domain[0], domain) for domain in domains]}
+            )
+        assert path == integration.FILE_ASSOCIATIONS_BATCH_PATH
+        return DummyResponse(
+            {
+                "results": [
+                    {
+                        "from": {"id": item["id"]},
+                        "to": [
+                            {"toObjectId": 100 + index, "associationTypes": []}
+                            for index in range(3)
+                        ],
+                    }
+                    for item in json["inputs"]
+                ]
+            }
+        )
+
+    async def unexpected_get(*args, **kwargs):  # pragma: no cover - guard
+        raise AssertionError("per-company association request issued")
+
+    monkeypatch.setattr(integration._http, "post", fake_post)
+    monkeypatch.setattr(integration._http, "get", unexpected_get)
+
+    results = await asyncio.gather(
+        integration.lookup_company_with_attachments("a.com", attachment_limit=2),
+        integration.lookup_company_with_attachments("b.com"),
+        integration.lookup_company_with_attachments("c.com"),
+    )
+
+    assert paths == [integration.SEARCH_PATH, integration.FILE_ASSOCIATIONS_BATCH_PATH]
+    assert results[0]["company"]["id"] == "a"
+    assert [item["id"] for item in results[0]["attachments"]] == ["100", "101"]
+    assert len(results[1]["attachments"]) == 3
+    await integration.aclose()
+
+
+@pytest.mark.asyncio
+async def test_single_and_batched_lookups_return_the_same_shape(
+    monkeypatch, configured_settings
+):
+    company = {"id": "7", "properties": {"domain": "a.com", "name": "A"}}
+    stray = {"id": "8", "properties": {"domain": "other.com", "name": "Other"}}
+
+    async def fake_post(path, json=None, timeout=None):
+        if path == HubSpotIntegration.SEARCH_PATH:
+            return DummyResponse({"results": [stray, company]})
+        return DummyResponse(
+            {"results": [{"from": {"id": "7"}, "to": [{"toObjectId": 99}]}]}
+        )
+
+    async def fake_get(path, params=None, timeout=None):
+        response = DummyResponse({"results": [{"id": "99", "type": "company_to_file"}]})
+        response.status_code = 200
+        return response
+
+    single = HubSpotIntegration(settings=configured_settings)
+    monkeypatch.setattr(single, "_lookup_batcher", None)
+    monkeypatch.setattr(configured_settings, "hubspot_batch_window_ms", 1000.0)
+    batched = HubSpotIntegration(settings=configured_settings)
+    for integration in (single, batched):
+        monkeypatch.setattr(integration._http, "post", fake_post)
+        monkeypatch.setattr(integration._http, "get", fake_get)
+        monkeypatch.setattr(integration, "_lookup_cache", None)
+
+    started = time.perf_counter()
+    via_batch = await batched.lookup_company_with_attachments("a.com")
+    lone_latency = time.perf_counter() - started
+    via_single = await single.lookup_company_with_attachments("a.com")
+
+    assert batched._lookup_batcher is not None
+    assert via_single == via_batch
+    assert via_batch["attachments"] == [{"id": "99", "type": "company_to_file"}]
+    # A lone lookup does not wait for the batching window.
+    assert lone_latency < batched._lookup_batcher.max_delay
+    assert await single.find_company_by_domain_async("missing.com") is None
+    await single.aclose()
+    await batched.aclose()
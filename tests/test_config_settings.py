@@ -62,6 +62,7 @@ def test_log_storage_dir_respects_env(monkeypatch, tmp_path):
 def test_research_and_agent_paths_default(monkeypatch):
     ensure_base_env(monkeypatch)
     for key in [
+        "LOG_STORAGE_DIR",
         "AGENT_LOG_DIR",
         "RESEARCH_ARTIFACT_DIR",
         "RESEARCH_PDF_DIR",
@@ -2,9 +2,11 @@ from __future__ import annotations
 from datetime import datetime, timedelta, timezone
 from typing import Dict
 
+import httpx
 import pytest
 
 from integration.google_calendar_integration import GoogleCalendarIntegration
+from utils.http_cache import HttpResponseCache
 
 
 class DummyResponse:
@@ -114,14 +116,61 @@ async def test_list_events_async_uses_authorized_request(mocker, base_credential
     integration._calendar_http.get.assert_awaited_once()
     call_kwargs = integration._calendar_http.get.call_args.kwargs
     assert call_kwargs["params"]["maxResults"] == 5
-    expected_min = (frozen_now - timedelta(days=integration.cal_lookback_days)).isoformat()
-    expected_max = (frozen_now + timedelta(days=integration.cal_lookahead_days)).isoformat()
+    # The window is widened to whole hours around 12:30.
+    expected_min = (
+        frozen_now.replace(minute=0) - timedelta(days=integration.cal_lookback_days)
+    ).isoformat()
+    expected_max = (
+        frozen_now.replace(hour=13, minute=0)
+        + timedelta(days=integration.cal_lookahead_days)
+    ).isoformat()
     assert call_kwargs["params"]["timeMin"] == expected_min
     assert call_kwargs["params"]["timeMax"] == expected_max
     assert call_kwargs["headers"]["Authorization"] == "Bearer existing"
     assert events == [{"id": "1"}]
 
 
+@pytest.mark.anyio("asyncio")
+async def test_consecutive_polls_revalidate_the_cached_list(mocker, base_credentials):
+    credentials = {**base_credentials, "token": "existing"}
+    integration = GoogleCalendarIntegration(credentials=credentials)
+    integration._token_expiry = datetime.now(timezone.utc) + timedelta(hours=1)
+    integration._calendar_http._cache = HttpResponseCache(name="test")
+
+    class TickingDateTime(datetime):
+        current = None
+
+        @classmethod
+        def now(cls, tz=None):
+            return cls.current
+
+    TickingDateTime.current = TickingDateTime(
+        2024, 1, 10, 12, 30, 0, 123456, tzinfo=timezone.utc
+    )
+
+    seen = []
+
+    async def fake_request(method, url, **kwargs):
+        headers = kwargs.get("headers") or {}
+        seen.append(headers.get("If-None-Match"))
+        request = httpx.Request(method, url)
+        if headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, request=request)
+        return httpx.Response(
+            200, headers={"ETag": '"v1"'}, json={"items": [{"id": "1"}]}, request=request
+        )
+
+    mocker.patch("integration.google_calendar_integration.datetime", TickingDateTime)
+    mocker.patch.object(integration._calendar_http._client, "request", fake_request)
+
+    first = await integration.list_events_async()
+    TickingDateTime.current += timedelta(minutes=1, seconds=5, microseconds=531)
+    second = await integration.list_events_async()
+
+    assert seen == [None, '"v1"']
+    assert first == second == [{"id": "1"}]
+
+
 @pytest.mark.anyio("asyncio")
 async def test_list_events_async_uses_default_time_range(mocker, base_credentials):
     integration = GoogleCalendarIntegration(credentials=base_credentials)
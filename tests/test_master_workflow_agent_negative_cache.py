@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Any, Dict, Iterable, List
 
 import pytest
 
 from agents.master_workflow_agent import MasterWorkflowAgent
 from config.config import settings
+from utils.circuit_breaker import CircuitOpenError
 from utils.observability import current_run_id_var, generate_run_id
 
 
@@ -154,3 +156,77 @@ async def test_processed_event_cache_skips_repeat_dispatch(tmp_path, monkeypatch
     second_run = await _run_positive_agent(second_crm_agent)
     assert second_run[0]["status"] == "skipped_processed_event"
     assert second_crm_agent.sent == []
+
+
+async def test_open_circuit_defers_event_without_caching(tmp_path, monkeypatch):
+    run_dir = tmp_path / "runs"
+    workflow_dir = tmp_path / "workflow"
+    run_dir.mkdir(parents=True, exist_ok=True)
+    workflow_dir.mkdir(parents=True, exist_ok=True)
+
+    monkeypatch.setattr(settings, "run_log_dir", run_dir)
+    monkeypatch.setattr(settings, "workflow_log_dir", workflow_dir)
+
+    class DegradedTriggerAgent:
+        async def check(self, _event: Dict[str, Any]) -> Dict[str, Any]:
+            raise CircuitOpenError("api.openai.com", 12.5)
+
+    event = {"id": "evt-deferred", "summary": "Sync", "description": "Roadmap"}
+    agent = MasterWorkflowAgent(
+        event_agent=StubEventAgent([event, {**event, "id": "evt-other"}]),
+        trigger_agent=DegradedTriggerAgent(),
+        extraction_agent=StubExtractionAgent(),
+    )
+    run_id = generate_run_id()
+    current_run_id_var.set(run_id)
+    agent.attach_run(run_id, agent.workflow_log_manager)
+    try:
+        results = await agent.process_all_events()
+    finally:
+        agent.finalize_run_logs()
+
+    assert [result["status"] for result in results] == ["deferred", "deferred"]
+    assert results[0]["deferred"] == {"host": "api.openai.com", "retry_after": 12.5}
+
+    # The deferred event was not negatively cached and is processed next cycle.
+    next_run = await _run_agent(
+        [event], trigger_result={"trigger": False, "confidence": 0.99}
+    )
+    assert next_run[0]["status"] == "no_trigger"
+
+
+async def test_event_exceeding_its_budget_is_deferred(tmp_path, monkeypatch):
+    run_dir = tmp_path / "runs"
+    workflow_dir = tmp_path / "workflow"
+    run_dir.mkdir(parents=True, exist_ok=True)
+    workflow_dir.mkdir(parents=True, exist_ok=True)
+
+    monkeypatch.setattr(settings, "run_log_dir", run_dir)
+    monkeypatch.setattr(settings, "workflow_log_dir", workflow_dir)
+    monkeypatch.setattr(settings, "event_deadline_seconds", 0.05)
+
+    class SlowTriggerAgent:
+        async def check(self, event: Dict[str, Any]) -> Dict[str, Any]:
+            if event["id"] == "evt-slow":
+                await asyncio.sleep(5)
+            return {"trigger": False, "confidence": 0.99}
+
+    events = [
+        {"id": "evt-slow", "summary": "Sync", "description": "Roadmap"},
+        {"id": "evt-fast", "summary": "Lunch", "description": "Team"},
+    ]
+    agent = MasterWorkflowAgent(
+        event_agent=StubEventAgent(events),
+        trigger_agent=SlowTriggerAgent(),
+        extraction_agent=StubExtractionAgent(),
+    )
+    run_id = generate_run_id()
+    current_run_id_var.set(run_id)
+    agent.attach_run(run_id, agent.workflow_log_manager)
+    try:
+        results = await agent.process_all_events()
+    finally:
+        agent.finalize_run_logs()
+
+    assert [result["status"] for result in results] == ["deferred", "no_trigger"]
+    assert results[0]["deferred"] == {"reason": "deadline_exceeded", "stage": "event"}
@@ -2,10 +2,15 @@ from __future__ import annotations
 
 from typing import Iterable, Mapping, Sequence
 
+import httpx
 import pytest
 
 from agents.soft_trigger_validator import SoftTriggerValidator
-from agents.trigger_detection_agent import TriggerDetectionAgent
+from agents.trigger_detection_agent import (
+    TriggerDetectionAgent,
+    _OpenAiSoftTriggerDetector,
+)
+from utils import async_http
 from utils.text_normalization import normalize_text
 
 
@@ -188,3 +193,29 @@ async def test_agent_soft_validator_disabled_uses_llm_candidates(
     raw_match = result["soft_trigger_matches"][0]
     assert raw_match["soft_trigger"] == candidate["soft_trigger"]
     assert "validation" not in raw_match
+
+
+async def test_openai_detector_retries_server_errors_on_post(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    detector = _OpenAiSoftTriggerDetector("key")
+    statuses = [500, 502, 200]
+    calls = []
+
+    async def fake_request(method, url, **kwargs):
+        calls.append(method)
+        body = {"choices": [{"message": {"content": "[]"}}]}
+        return httpx.Response(
+            statuses[len(calls) - 1],
+            json=body,
+            request=httpx.Request(method, "https://api.openai.com" + url),
+        )
+
+    async def no_sleep(delay: float) -> None:
+        return None
+
+    monkeypatch.setattr(detector._http._client, "request", fake_request)
+    monkeypatch.setattr(async_http.asyncio, "sleep", no_sleep)
+
+    assert await detector("summary", "", ["briefing"]) == []
+    assert calls == ["POST", "POST", "POST"]
@@ -0,0 +1,123 @@
+"""Tests for the adaptive daemon scheduler."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+
+import pytest
+
+import main
+from utils.adaptive_scheduler import AdaptiveScheduler, CycleOutcome
+from utils.datetime_formatting import CET_ZONE
+
+# A Wednesday during business hours and the following night.
+WEDNESDAY_NOON = datetime(2025, 3, 5, 12, 0, tzinfo=CET_ZONE)
+WEDNESDAY_NIGHT = datetime(2025, 3, 5, 23, 0, tzinfo=CET_ZONE)
+SATURDAY = datetime(2025, 3, 8, 10, 0, tzinfo=CET_ZONE)
+
+
+def _scheduler(now=WEDNESDAY_NOON, **kwargs):
+    kwargs.setdefault("base_interval", 3600)
+    kwargs.setdefault("min_interval", 300)
+    kwargs.setdefault("max_interval", 14400)
+    return AdaptiveScheduler(clock=lambda: now, **kwargs)
+
+
+def test_quiet_cycles_back_off_exponentially_up_to_maximum():
+    scheduler = _scheduler()
+
+    delays = [scheduler.record(CycleOutcome()).delay_seconds for _ in range(4)]
+
+    assert delays == [7200, 14400, 14400, 14400]
+    assert "maximum" in scheduler.record(CycleOutcome()).reason
+
+
+def test_activity_and_pending_audits_tighten_polling():
+    scheduler = _scheduler()
+    scheduler.record(CycleOutcome())
+
+    tightened = scheduler.record(CycleOutcome(events=2))
+    busy = scheduler.record(CycleOutcome(events=40, duration_seconds=60))
+    audits = _scheduler(now=WEDNESDAY_NIGHT).record(CycleOutcome(pending_audits=1))
+
+    assert tightened.delay_seconds == 1800
+    assert "tightening" in tightened.reason
+    # The run duration is deducted, but the minimum interval still applies.
+    assert busy.delay_seconds == 300
+    assert "high activity" in busy.reason
+    # Pending audits override the night-time back-off.
+    assert audits.delay_seconds == 300
+    assert "audit" in audits.reason
+
+
+def test_run_duration_is_deducted_from_delay():
+    decision = _scheduler().record(CycleOutcome(events=1, duration_seconds=600))
+
+    assert decision.interval_seconds == 1800
+    assert decision.delay_seconds == 1200
+
+
+def test_outside_business_hours_waits_for_next_start(caplog):
+    caplog.set_level(logging.INFO, logger="utils.adaptive_scheduler")
+
+    night = _scheduler(now=WEDNESDAY_NIGHT, max_interval=43200).record(
+        CycleOutcome(events=3)
+    )
+    weekend = _scheduler(now=SATURDAY).record(CycleOutcome())
+    always_on = _scheduler(now=WEDNESDAY_NIGHT, business_hours=None).record(
+        CycleOutcome(events=3)
+    )
+
+    assert night.delay_seconds == 8 * 3600
+    assert night.reason == "outside business hours"
+    # Capped by the maximum interval.
+    assert weekend.delay_seconds == 14400
+    assert always_on.delay_seconds == 1800
+    assert "outside business hours" in caplog.text
+
+
+def test_failed_cycle_returns_to_base_interval():
+    scheduler = _scheduler()
+    for _ in range(3):
+        scheduler.record(CycleOutcome())
+
+    decision = scheduler.record(CycleOutcome.from_summary({"status": "failure"}))
+
+    assert decision.delay_seconds == 3600
+
+
+def test_only_events_that_were_not_skipped_count_as_activity():
+    outcome = CycleOutcome.from_summary(
+        {"events_processed": 12, "events_active": 2, "status": "success"}
+    )
+
+    assert outcome.events == 2
+
+
+@pytest.mark.asyncio
+async def test_daemon_loop_sleeps_scheduled_delay(monkeypatch):
+    sleeps = []
+    summaries = iter([{"events_processed": 0, "status": "success"}])
+
+    async def fake_run_once(run_id):
+        try:
+            return next(summaries)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(main, "_run_once", fake_run_once)
+    monkeypatch.setattr(main.asyncio, "sleep", fake_sleep)
+
+    with pytest.raises(StopAsyncIteration):
+        await main._daemon_loop(
+            interval=3600,
+            prepare_run=lambda: "run-next",
+            initial_run_id="run-first",
+            scheduler=_scheduler(),
+        )
+
+    assert sleeps == [7200]
@@ -4,19 +4,22 @@ from __future__ import annotations
 
 import httpx
 import pytest
-from tenacity import wait_fixed
 
 from types import SimpleNamespace
 
 from utils import async_http
 from utils.async_http import AsyncHTTP
+from utils.retry import RetryBudgets, RetryPolicy
+
+
+NO_WAIT = RetryPolicy(initial_backoff=0, max_backoff=0)
 
 
 pytestmark = pytest.mark.asyncio
 
 
 async def test_async_http_retries_on_http_error(monkeypatch, caplog):
-    client = AsyncHTTP()
+    client = AsyncHTTP(retry_policy=NO_WAIT)
     request = httpx.Request("GET", "https://example.com")
     failures = [
         httpx.RequestError("boom", request=request),
@@ -33,7 +36,6 @@ async def test_async_http_retries_on_http_error(monkeypatch, caplog):
         raise response
 
     monkeypatch.setattr(client._client, "request", fake_request)
-    monkeypatch.setattr(AsyncHTTP.request.retry, "wait", wait_fixed(0))
 
     with caplog.at_level("WARNING"):
         response = await client.get("/resource")
@@ -46,7 +48,7 @@ async def test_async_http_retries_on_http_error(monkeypatch, caplog):
 
 
 async def test_async_http_helper_methods_forward_to_request(monkeypatch):
-    client = AsyncHTTP()
+    client = AsyncHTTP(retry_policy=NO_WAIT)
     calls: list[tuple[str, bytes | None]] = []
 
     async def fake_request(method, url, **kwargs):
@@ -54,7 +56,6 @@ async def test_async_http_helper_methods_forward_to_request(monkeypatch):
         return httpx.Response(204, request=httpx.Request(method, url))
 
     monkeypatch.setattr(client._client, "request", fake_request)
-    monkeypatch.setattr(AsyncHTTP.request.retry, "wait", wait_fixed(0))
 
     post_response = await client.post("/resource", data=b"payload")
     patch_response = await client.patch("/resource")
@@ -85,3 +86,114 @@ async def test_async_http_log_retry_emits_warning_on_subsequent_attempts(caplog)
         async_http._log_retry(second_attempt)
 
     assert any("Retrying HTTP request" in rec.message for rec in caplog.records)
+
+
+def _scripted(monkeypatch, client, responses):
+    calls: list[str] = []
+
+    async def fake_request(method, url, **kwargs):
+        calls.append(method)
+        item = responses[min(len(calls), len(responses)) - 1]
+        if isinstance(item, Exception):
+            raise item
+        status, headers = item
+        return httpx.Response(
+            status, headers=headers, request=httpx.Request(method, url)
+        )
+
+    monkeypatch.setattr(client._client, "request", fake_request)
+    return calls
+
+
+async def test_async_http_retries_transient_status_then_succeeds(monkeypatch):
+    client = AsyncHTTP(retry_policy=NO_WAIT)
+    calls = _scripted(monkeypatch, client, [(503, {}), (502, {}), (200, {})])
+
+    response = await client.get("/resource")
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+
+
+async def test_async_http_does_not_retry_client_errors(monkeypatch):
+    client = AsyncHTTP(retry_policy=NO_WAIT)
+    calls = _scripted(monkeypatch, client, [(404, {}), (200, {})])
+
+    response = await client.get("/missing")
+
+    assert response.status_code == 404
+    assert calls == ["GET"]
+
+
+async def test_async_http_does_not_retry_non_idempotent_server_errors(monkeypatch):
+    client = AsyncHTTP(retry_policy=NO_WAIT)
+    request = httpx.Request("POST", "https://example.com")
+    calls = _scripted(
+        monkeypatch,
+        client,
+        [(500, {}), (200, {})],
+    )
+
+    assert (await client.post("/resource")).status_code == 500
+    assert calls == ["POST"]
+
+    calls.clear()
+    calls = _scripted(
+        monkeypatch,
+        client,
+        [httpx.ConnectError("refused", request=request), (200, {})],
+    )
+    assert (await client.post("/resource")).status_code == 200
+    assert len(calls) == 2
+
+
+async def test_async_http_honours_retry_after(monkeypatch):
+    client = AsyncHTTP(retry_policy=NO_WAIT)
+    _scripted(monkeypatch, client, [(429, {"Retry-After": "2"}), (200, {})])
+    delays: list[float] = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(async_http.asyncio, "sleep", fake_sleep)
+
+    response = await client.get("/resource")
+
+    assert response.status_code == 200
+    assert delays == [2.0]
+
+
+async def test_async_http_stops_when_retry_after_exceeds_deadline(monkeypatch):
+    client = AsyncHTTP(retry_policy=RetryPolicy(deadline=1.0))
+    calls = _scripted(monkeypatch, client, [(503, {"Retry-After": "30"}), (200, {})])
+
+    response = await client.get("/resource")
+
+    assert response.status_code == 503
+    assert len(calls) == 1
+
+
+async def test_async_http_retry_budget_limits_retries_per_run(monkeypatch):
+    budgets = RetryBudgets(max_tokens=1, ratio=0)
+    client = AsyncHTTP(
+        retry_policy=RetryPolicy(initial_backoff=0, max_backoff=0, budgets=budgets)
+    )
+    calls = _scripted(monkeypatch, client, [(503, {})])
+
+    assert (await client.get("/first")).status_code == 503
+    # One retry was allowed by the budget; the second request is not retried.
+    assert len(calls) == 2
+    assert (await client.get("/second")).status_code == 503
+    assert len(calls) == 3
+
+
+async def test_async_http_raises_last_exception_when_attempts_exhausted(monkeypatch):
+    client = AsyncHTTP(retry_policy=RetryPolicy(max_attempts=2, initial_backoff=0))
+    request = httpx.Request("GET", "https://example.com")
+    calls = _scripted(
+        monkeypatch, client, [httpx.ReadTimeout("slow", request=request)]
+    )
+
+    with pytest.raises(httpx.ReadTimeout):
+        await client.get("/resource")
+    assert len(calls) == 2
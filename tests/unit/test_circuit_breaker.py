@@ -0,0 +1,192 @@
+"""Tests for the per-host circuit breakers."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from utils.async_http import AsyncHTTP
+from utils.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    BreakerConfig,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+)
+from utils.retry import RetryPolicy
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+CONFIG = BreakerConfig(
+    window_seconds=60,
+    min_requests=4,
+    failure_rate=0.5,
+    slow_call_seconds=5,
+    open_seconds=30,
+)
+
+
+def _breaker(clock: FakeClock) -> CircuitBreaker:
+    return CircuitBreaker("api.example.com", CONFIG, clock=clock)
+
+
+def test_breaker_opens_on_error_rate_and_fails_fast():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+
+    for success in (True, False, True):
+        breaker.before_call()
+        breaker.record(success=success)
+    assert breaker.state == CLOSED
+
+    breaker.before_call()
+    breaker.record(success=False)
+    assert breaker.state == OPEN
+
+    clock.now += 10
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.before_call()
+    assert excinfo.value.host == "api.example.com"
+    assert excinfo.value.retry_after == pytest.approx(20)
+
+
+def test_slow_calls_count_as_failures():
+    breaker = _breaker(FakeClock())
+
+    for _ in range(4):
+        breaker.before_call()
+        breaker.record(success=True, latency=6.0)
+
+    assert breaker.state == OPEN
+
+
+def test_llm_host_uses_its_own_slow_call_threshold():
+    config = BreakerConfig.from_settings(
+        SimpleNamespace(
+            circuit_breaker_slow_call_seconds=5,
+            circuit_breaker_llm_slow_call_seconds=40,
+            circuit_breaker_min_requests=4,
+            openai_api_base="https://LLM.example.com/v1",
+        )
+    )
+    llm = CircuitBreaker("llm.example.com", config)
+    api = CircuitBreaker("api.example.com", config)
+
+    for _ in range(4):
+        llm.record(success=True, latency=20.0)
+        api.record(success=True, latency=20.0)
+
+    assert llm.slow_call_seconds == 40
+    assert llm.state == CLOSED
+    assert api.state == OPEN
+
+
+def test_failures_outside_the_window_are_forgotten():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+
+    for _ in range(3):
+        breaker.record(success=False)
+    clock.now += 61
+    breaker.record(success=False)
+
+    assert breaker.state == CLOSED
+
+
+def test_half_open_probe_closes_or_reopens():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(4):
+        breaker.record(success=False)
+
+    clock.now += 30
+    assert breaker.state == HALF_OPEN
+    breaker.before_call()
+    # Only one probe is admitted while it is in flight.
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record(success=False)
+    assert breaker.state == OPEN
+
+    clock.now += 30
+    breaker.before_call()
+    breaker.record(success=True)
+    assert breaker.state == CLOSED
+    breaker.before_call()
+
+
+def test_registry_shares_breakers_per_host_and_can_be_disabled():
+    registry = CircuitBreakerRegistry(CONFIG)
+    assert registry.get("api.example.com") is registry.get("api.example.com")
+    assert registry.get("other.example.com") is not registry.get("api.example.com")
+    assert registry.states() == {"api.example.com": CLOSED, "other.example.com": CLOSED}
+
+    registry.configure(BreakerConfig(enabled=False))
+    assert registry.get("api.example.com") is None
+
+
+@pytest.mark.asyncio
+async def test_async_http_fails_fast_once_breaker_opens(monkeypatch):
+    registry = CircuitBreakerRegistry(CONFIG)
+    client = AsyncHTTP(
+        base_url="https://api.example.com",
+        retry_policy=RetryPolicy(max_attempts=1),
+        breakers=registry,
+    )
+    calls = 0
+
+    async def fake_request(method, url, **kwargs):
+        nonlocal calls
+        calls += 1
+        return httpx.Response(503, request=httpx.Request(method, url))
+
+    monkeypatch.setattr(client._client, "request", fake_request)
+
+    for _ in range(4):
+        assert (await client.get("/status")).status_code == 503
+    with pytest.raises(CircuitOpenError):
+        await client.get("/status")
+
+    assert calls == 4
+    assert registry.states() == {"api.example.com": OPEN}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_calls_are_not_recorded(monkeypatch):
+    clock = FakeClock()
+    registry = CircuitBreakerRegistry(CONFIG)
+    breaker = registry.get("api.example.com")
+    breaker._clock = clock
+    for _ in range(4):
+        breaker.record(success=False)
+    clock.now += 30
+    client = AsyncHTTP(
+        base_url="https://api.example.com",
+        retry_policy=RetryPolicy(max_attempts=1),
+        breakers=registry,
+    )
+
+    async def hanging_request(method, url, **kwargs):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(client._client, "request", hanging_request)
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(client.get("/status"), 0.01)
+
+    # The cancelled probe neither closed the breaker nor kept its slot.
+    assert breaker.state == HALF_OPEN
+    breaker.before_call()
+    breaker.record(success=True)
+    assert breaker.state == CLOSED
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from config.config import Settings
+from integration.hubspot_integration import HubSpotIntegration
+from utils.company_lookup_cache import (
+    CompanyLookupCache,
+    reset_shared_company_caches,
+    shared_company_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_shared_caches():
+    reset_shared_company_caches()
+    yield
+    reset_shared_company_caches()
+
+
+COMPANY = {"id": "42", "properties": {"domain": "example.com", "name": "Example"}}
+
+
+def test_positive_and_negative_entries_use_their_own_ttl() -> None:
+    cache = CompanyLookupCache(positive_ttl=100, negative_ttl=10)
+    cache.put("example.com", COMPANY, now=0.0)
+    cache.put("unknown.com", None, now=0.0)
+
+    assert cache.get("example.com", now=50.0).company == COMPANY
+    negative = cache.get("unknown.com", now=5.0)
+    assert negative is not None and negative.is_negative
+
+    assert cache.get("unknown.com", now=11.0) is None
+    assert cache.get("example.com", now=101.0) is None
+    assert len(cache) == 0
+
+
+def test_properties_and_attachments_partition_entries() -> None:
+    cache = CompanyLookupCache()
+    cache.put("example.com", COMPANY, properties=["name", "domain"], now=0.0)
+
+    assert cache.get("example.com", now=1.0) is None
+    assert cache.get("example.com", properties=["domain", "name"], now=1.0)
+    assert (
+        cache.get(
+            "example.com",
+            properties=["domain", "name"],
+            require_attachments=True,
+            now=1.0,
+        )
+        is None
+    )
+
+
+def test_truncated_attachments_do_not_answer_larger_limits() -> None:
+    cache = CompanyLookupCache()
+    files = [{"id": "f1"}, {"id": "f2"}]
+    cache.put("example.com", COMPANY, attachments=files, attachment_limit=2, now=0.0)
+    cache.put("small.com", COMPANY, attachments=files[:1], attachment_limit=2, now=0.0)
+
+    def _get(domain: str, limit):
+        return cache.get(
+            domain, require_attachments=True, attachment_limit=limit, now=1.0
+        )
+
+    assert _get("example.com", 2) is not None
+    assert _get("example.com", 5) is None
+    assert _get("example.com", None) is None
+    # Fewer files than the limit means the list was already complete.
+    assert _get("small.com", 10) is not None
+
+
+def test_lru_eviction_and_invalidation() -> None:
+    cache = CompanyLookupCache(max_entries=2)
+    cache.put("a.com", {"id": "1"}, now=0.0)
+    cache.put("b.com", {"id": "2"}, now=0.0)
+    cache.get("a.com", now=1.0)
+    cache.put("c.com", {"id": "3"}, now=2.0)
+
+    assert cache.get("b.com", now=3.0) is None
+    assert cache.invalidate_company("1") == 1
+    assert cache.invalidate("c.com") == 1
+    assert len(cache) == 0
+
+
+def test_cache_round_trips_through_disk(tmp_path: Path) -> None:
+    path = tmp_path / "company_cache.json"
+    cache = CompanyLookupCache(path=path)
+    cache.put("example.com", COMPANY, attachments=[{"id": "f1"}])
+    cache.put("unknown.com", None)
+    cache.flush()
+
+    reloaded = CompanyLookupCache(path=path)
+    entry = reloaded.get("example.com", require_attachments=True)
+    assert entry is not None and entry.attachments == [{"id": "f1"}]
+    assert reloaded.get("unknown.com").is_negative
+
+
+def test_shared_cache_is_reused_per_namespace() -> None:
+    first = shared_company_cache("https://api.hubapi.com|token")
+    assert shared_company_cache("https://api.hubapi.com|token") is first
+    assert shared_company_cache("https://api.hubapi.com|other") is not first
+
+
+@pytest.mark.asyncio
+async def test_integration_serves_repeat_lookups_from_cache(monkeypatch) -> None:
+    monkeypatch.setenv("HUBSPOT_ACCESS_TOKEN", "token-123")
+    monkeypatch.setenv("HUBSPOT_API_BASE_URL", "https://api.test.local")
+    monkeypatch.delenv("HUBSPOT_LOOKUP_CACHE_ENABLED", raising=False)
+    settings = Settings()
+
+    calls: List[Dict[str, object]] = []
+
+    async def fake_post(path, payload):
+        calls.append(payload)
+        domain = payload["filterGroups"][0]["filters"][0]["value"]
+        results = [] if domain == "unknown.com" else [COMPANY]
+        return {"results": results}
+
+    first = HubSpotIntegration(settings=settings)
+    monkeypatch.setattr(first, "_post", fake_post)
+    company = await first.find_company_by_domain_async("https://Example.com")
+    assert company["id"] == "42"
+    assert await first.find_company_by_domain_async("unknown.com") is None
+    await first.aclose()
+
+    # A new instance (e.g. the next daemon cycle) reuses the shared cache.
+    second = HubSpotIntegration(settings=settings)
+    monkeypatch.setattr(second, "_post", fake_post)
+    assert (await second.find_company_by_domain_async("example.com"))["id"] == "42"
+    assert await second.find_company_by_domain_async("unknown.com") is None
+    assert len(calls) == 2
+
+    assert second.invalidate_company_cache(company_id="42") == 1
+    await second.find_company_by_domain_async("example.com")
+    assert len(calls) == 3
+    await second.aclose()
@@ -0,0 +1,109 @@
+"""Tests for context-variable deadline propagation."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from utils import concurrency, deadline
+from utils.async_http import AsyncHTTP
+from utils.circuit_breaker import BreakerConfig, CircuitBreakerRegistry
+from utils.retry import RetryPolicy
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_nested_scopes_only_shorten_the_deadline():
+    assert deadline.remaining() is None
+
+    with deadline.deadline_scope(10) as outer:
+        with deadline.deadline_scope(60) as inner:
+            assert inner == outer
+        with deadline.deadline_scope(1):
+            assert deadline.remaining() <= 1
+        with deadline.deadline_scope(0):
+            assert deadline.current_deadline() == outer
+
+    assert deadline.current_deadline() is None
+
+
+async def test_clamp_timeout_shrinks_and_raises_when_spent():
+    assert deadline.clamp_timeout(5.0) == 5.0
+
+    with deadline.deadline_scope(0.5):
+        assert deadline.clamp_timeout(5.0) <= 0.5
+        assert deadline.clamp_timeout(0.1) == 0.1
+
+    with deadline.deadline_scope(0.001, stage="event"):
+        await asyncio.sleep(0.01)
+        with pytest.raises(deadline.DeadlineExceeded) as excinfo:
+            deadline.clamp_timeout(5.0)
+    assert excinfo.value.stage == "event"
+
+
+async def test_run_with_deadline_cancels_work():
+    cancelled = asyncio.Event()
+
+    async def slow() -> None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(deadline.DeadlineExceeded) as excinfo:
+        await deadline.run_with_deadline(slow(), 0.05, stage="research")
+
+    assert excinfo.value.stage == "research"
+    assert cancelled.is_set()
+
+
+async def test_run_with_deadline_keeps_unrelated_timeouts():
+    async def failing() -> None:
+        raise asyncio.TimeoutError("per-call timeout")
+
+    with pytest.raises(asyncio.TimeoutError) as excinfo:
+        await deadline.run_with_deadline(failing(), 10, stage="event")
+
+    assert not isinstance(excinfo.value, deadline.DeadlineExceeded)
+
+
+async def test_semaphore_wait_is_bounded_by_deadline():
+    semaphore = concurrency.LoggingSemaphore("test", 1)
+
+    async with semaphore:
+        with deadline.deadline_scope(0.05):
+            with pytest.raises(deadline.DeadlineExceeded) as excinfo:
+                async with semaphore:
+                    pass
+
+    assert excinfo.value.stage == "test_semaphore"
+    assert semaphore.active == 0
+
+
+async def test_async_http_shrinks_timeout_and_stops_retrying(monkeypatch):
+    client = AsyncHTTP(
+        base_url="https://api.example.com",
+        retry_policy=RetryPolicy(),
+        breakers=CircuitBreakerRegistry(BreakerConfig(enabled=False)),
+    )
+    timeouts = []
+
+    async def fake_request(method, url, **kwargs):
+        timeouts.append(kwargs["timeout"])
+        return httpx.Response(
+            503, headers={"Retry-After": "1"}, request=httpx.Request(method, url)
+        )
+
+    monkeypatch.setattr(client._client, "request", fake_request)
+
+    with deadline.deadline_scope(0.5):
+        response = await client.get("/status")
+
+    # Waiting out Retry-After would overrun the budget, so no retry is made.
+    assert response.status_code == 503
+    assert len(timeouts) == 1
+    assert timeouts[0].read <= 0.5
+    assert timeouts[0].connect <= 0.5
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+from utils import event_fingerprint
+from utils.event_fingerprint import (
+    FINGERPRINT_VERSION,
+    canonical_dumps,
+    fingerprint_event,
+    legacy_content_digest,
+    legacy_trigger_digest,
+)
+from utils.negative_cache import NegativeEventCache
+from utils.processed_event_cache import ProcessedEventCache
+
+
+def _event(**overrides):
+    event = {
+        "id": "evt-1",
+        "updated": "2024-05-01T10:00:00Z",
+        "summary": "Kick-off",
+        "description": "Discuss roadmap",
+        "attendees": [{"email": "a@example.com"}, {"email": "b@example.com"}],
+    }
+    event.update(overrides)
+    return event
+
+
+def test_canonical_dumps_is_independent_of_key_order() -> None:
+    assert canonical_dumps({"b": 1, "a": {"y": 2, "x": 1}}) == canonical_dumps(
+        {"a": {"x": 1, "y": 2}, "b": 1}
+    )
+
+
+def test_canonical_dumps_falls_back_without_orjson(monkeypatch) -> None:
+    expected = canonical_dumps({"b": 1, "a": [1, 2]})
+    monkeypatch.setattr(event_fingerprint, "orjson", None)
+
+    assert canonical_dumps({"a": [1, 2], "b": 1}) == expected.replace(b" ", b"")
+
+
+def test_fingerprint_event_digests() -> None:
+    fingerprint = fingerprint_event(_event())
+
+    assert fingerprint.event_id == "evt-1"
+    assert fingerprint.updated == "2024-05-01 12:00:00"
+    assert len(fingerprint.content_digest) == 32
+    assert len(fingerprint.trigger_digest) == 32
+    assert fingerprint == fingerprint_event(_event())
+
+
+def test_trigger_digest_ignores_non_trigger_fields() -> None:
+    base = fingerprint_event(_event())
+    moved = fingerprint_event(_event(location="Room 2"))
+    retitled = fingerprint_event(_event(summary="Renewal"))
+
+    assert moved.trigger_digest == base.trigger_digest
+    assert moved.content_digest != base.content_digest
+    assert retitled.trigger_digest != base.trigger_digest
+
+
+def test_content_digest_ignores_attendee_order_and_case() -> None:
+    base = fingerprint_event(_event())
+    reordered = fingerprint_event(
+        _event(attendees=[{"email": "B@example.com "}, {"email": "a@example.com"}])
+    )
+    recased = fingerprint_event(_event(description="  DISCUSS roadmap"))
+
+    assert reordered.content_digest == base.content_digest
+    assert recased.content_digest == base.content_digest
+
+
+def test_processed_cache_reuses_supplied_fingerprint(tmp_path: Path, monkeypatch) -> None:
+    cache = ProcessedEventCache.load(tmp_path / "processed.json")
+    event = _event()
+    fingerprint = fingerprint_event(event)
+    cache.mark_processed(event, fingerprint=fingerprint)
+
+    def _fail(_event):
+        raise AssertionError("fingerprint should not be recomputed")
+
+    monkeypatch.setattr("utils.processed_event_cache.fingerprint_event", _fail)
+    assert cache.is_processed(event, fingerprint=fingerprint) is True
+
+
+def test_processed_cache_upgrades_legacy_entries(tmp_path: Path) -> None:
+    event = _event()
+    path = tmp_path / "processed.json"
+    path.write_text(
+        json.dumps(
+            {
+                "entries": {
+                    "evt-1": {
+                        "fingerprint": legacy_content_digest(event),
+                        "updated": "2024-05-01 12:00:00",
+                    }
+                }
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    cache = ProcessedEventCache.load(path)
+    assert cache.is_processed(event) is True
+    entry = cache.entries["evt-1"]
+    assert entry["fingerprint"] == fingerprint_event(event).content_digest
+    assert entry["fingerprint_version"] == FINGERPRINT_VERSION
+    assert cache.dirty is True
+
+
+def test_negative_cache_upgrades_legacy_entries(tmp_path: Path) -> None:
+    event = _event(updated=None)
+    now = time.time()
+    path = tmp_path / "negative.json"
+    path.write_text(
+        json.dumps(
+            {
+                "version": 1,
+                "entries": {
+                    "evt-1": {
+                        "fingerprint": legacy_trigger_digest(event),
+                        "updated": None,
+                        "rule_hash": "hash",
+                        "decision": "no_trigger",
+                        "first_seen": now,
+                        "last_seen": now,
+                    }
+                },
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    cache = NegativeEventCache.load(path, rule_hash="hash", now=now)
+    assert cache.should_skip(event, "hash") is True
+    assert (
+        cache.entries["evt-1"]["fingerprint"]
+        == fingerprint_event(event).trigger_digest
+    )
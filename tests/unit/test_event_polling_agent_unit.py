@@ -1,3 +1,7 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -123,3 +127,93 @@ async def test_aclose_closes_clients(calendar_mock, contacts_mock):
 )
 def test_is_birthday_event(event, expected):
     assert EventPollingAgent._is_birthday_event(event) is expected
+
+
+class _ScriptedCalendar:
+    """Calendar stub that tracks how many polls run at the same time."""
+
+    active = 0
+    peak = 0
+
+    def __init__(self, events=None, error=None):
+        self.events = events or []
+        self.error = error
+        self.cal_lookback_days = 1
+        self.calls = []
+
+    async def list_events_async(self, **kwargs):
+        self.calls.append(kwargs)
+        type(self).active += 1
+        type(self).peak = max(type(self).peak, type(self).active)
+        try:
+            await asyncio.sleep(0.01)
+            if self.error is not None:
+                raise self.error
+            return [dict(event) for event in self.events]
+        finally:
+            type(self).active -= 1
+
+
+@pytest.mark.asyncio
+async def test_poll_merges_calendars_and_deduplicates_by_ical_uid(tmp_path):
+    recurring = {"recurringEventId": "r", "iCalUID": "r@google.com"}
+    sales = _ScriptedCalendar(
+        [
+            {"id": "a", "iCalUID": "shared@google.com"},
+            {**recurring, "id": "r_1", "originalStartTime": {"date": "2025-01-01"}},
+            {**recurring, "id": "r_2", "originalStartTime": {"date": "2025-01-08"}},
+        ]
+    )
+    partners = _ScriptedCalendar([{"id": "b", "iCalUID": "shared@google.com"}])
+    failing = _ScriptedCalendar(error=RuntimeError("boom"))
+    config = SimpleNamespace(
+        google_calendar_max_concurrency=2,
+        google_calendar_lookback_days={"partners": 30},
+        google_calendar_state_path=tmp_path / "calendar_state.json",
+    )
+    agent = EventPollingAgent(
+        config,
+        calendar_integration=sales,
+        calendar_integrations={
+            "sales": sales,
+            "partners": partners,
+            "broken": failing,
+        },
+    )
+
+    events = await agent.poll()
+
+    assert [event["id"] for event in events] == ["a", "r_1", "r_2"]
+    assert events[0]["calendarId"] == "sales"
+    assert partners.cal_lookback_days == 30
+    assert _ScriptedCalendar.peak <= 2
+    state = json.loads((tmp_path / "calendar_state.json").read_text())
+    assert state["sales"]["events"] == 3
+    assert state["broken"]["last_error"] == "RuntimeError: boom"
+
+
+@pytest.mark.asyncio
+async def test_poll_raises_when_every_calendar_fails():
+    agent = EventPollingAgent(
+        calendar_integration=_ScriptedCalendar(error=RuntimeError("down")),
+    )
+
+    with pytest.raises(RuntimeError, match="down"):
+        await agent.poll()
+
+
+@pytest.mark.asyncio
+async def test_poll_widens_window_after_missed_cycles():
+    calendar = _ScriptedCalendar([{"id": "a"}])
+    agent = EventPollingAgent(calendar_integration=calendar)
+    last_success = datetime.now(timezone.utc) - timedelta(days=3)
+    agent.poll_state.record_success(
+        "primary", events=1, duration_ms=5.0, polled_at=last_success
+    )
+
+    await agent.poll()
+    await agent.poll()
+
+    assert calendar.calls[0]["time_min"] == last_success
+    # Once caught up the calendar's own lookback window applies again.
+    assert calendar.calls[1] == {"max_results": 100}
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from utils.event_fingerprint import fingerprint_event, legacy_content_digest
+from utils.fingerprint_store import (
+    FLAG_HAS_UPDATED,
+    FingerprintRecord,
+    FingerprintStore,
+)
+from utils.negative_cache import NEG_CACHE_MAX_AGE_SECONDS, BinaryNegativeEventCache
+from utils.processed_event_cache import BinaryProcessedEventCache
+
+
+def _record(byte: int, timestamp: float = 1.0) -> FingerprintRecord:
+    return FingerprintRecord(bytes([byte]) * 16, timestamp, 7, FLAG_HAS_UPDATED)
+
+
+def _event(**overrides):
+    event = {
+        "id": "evt-1",
+        "updated": "2024-05-01T10:00:00Z",
+        "summary": "Kick-off",
+        "description": "Discuss roadmap",
+    }
+    event.update(overrides)
+    return event
+
+
+def test_store_round_trips_through_journal_and_merge(tmp_path: Path) -> None:
+    path = tmp_path / "store.bin"
+    store = FingerprintStore(path, merge_threshold=1000)
+    for index in range(20):
+        store.put(f"evt-{index}", _record(index))
+    store.delete("evt-3")
+    store.close()
+
+    reopened = FingerprintStore(path)
+    assert reopened.pending == 21
+    assert reopened.get("evt-5") == _record(5)
+    assert reopened.get("evt-3") is None
+
+    assert reopened.merge() == 19
+    assert reopened.pending == 0
+    assert not reopened.log_path.exists()
+    assert reopened.get("evt-19") == _record(19)
+    assert reopened.get("missing") is None
+    reopened.close()
+
+    # Base file header + fixed-width records only.
+    assert path.stat().st_size == 16 + 19 * 48
+
+
+def test_store_merges_automatically_and_overlay_wins(tmp_path: Path) -> None:
+    store = FingerprintStore(tmp_path / "store.bin", merge_threshold=4)
+    for index in range(4):
+        store.put(f"evt-{index}", _record(index))
+    assert store.pending == 0
+
+    assert store.put("evt-1", _record(99)) is True
+    assert store.put("evt-1", _record(99)) is False
+    assert store.get("evt-1") == _record(99)
+    store.merge(drop=lambda record: record.digest == _record(2).digest)
+    assert store.get("evt-1") == _record(99)
+    assert store.get("evt-2") is None
+    store.close()
+
+
+def test_store_ignores_truncated_journal_record(tmp_path: Path) -> None:
+    path = tmp_path / "store.bin"
+    store = FingerprintStore(path)
+    store.put("evt-1", _record(1))
+    store.close()
+    with store.log_path.open("ab") as handle:
+        handle.write(b"partial")
+
+    reopened = FingerprintStore(path)
+    assert reopened.get("evt-1") == _record(1)
+    assert reopened.pending == 1
+    reopened.close()
+
+
+def test_binary_processed_cache_matches_json_semantics(tmp_path: Path) -> None:
+    path = tmp_path / "processed.bin"
+    cache = BinaryProcessedEventCache.load(path)
+    event = _event()
+    cache.mark_processed(event)
+    assert cache.is_processed(event) is True
+    cache.close()
+
+    reloaded = BinaryProcessedEventCache.load(path)
+    assert reloaded.is_processed(event) is True
+    assert reloaded.is_processed(_event(summary="Changed")) is False
+    assert reloaded.is_processed(event) is False
+    reloaded.close()
+
+
+def test_binary_processed_cache_imports_legacy_json(tmp_path: Path) -> None:
+    event = _event()
+    json_path = tmp_path / "processed_events.json"
+    json_path.write_text(
+        json.dumps(
+            {
+                "entries": {
+                    "evt-1": {
+                        "fingerprint": legacy_content_digest(event),
+                        "updated": "2024-05-01 12:00:00",
+                    }
+                }
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    cache = BinaryProcessedEventCache.load(
+        tmp_path / "processed.bin", json_path=json_path
+    )
+    assert cache.is_processed(event) is True
+    # The legacy record is rewritten with the current digest.
+    assert cache.is_processed(event, fingerprint=fingerprint_event(event)) is True
+    assert cache.store.get("evt-1").flags == FLAG_HAS_UPDATED
+    cache.close()
+
+
+def test_binary_negative_cache_skips_and_expires(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("utils.negative_cache.time.time", lambda: 100.0)
+    cache = BinaryNegativeEventCache.load(tmp_path / "negative.bin", rule_hash="hash")
+    event = {"id": "evt-1", "summary": "Lunch"}
+    cache.record_no_trigger(event, "hash", "skipped_trigger_threshold")
+
+    assert cache.should_skip(event, "hash") is True
+    assert cache.should_skip(event, "other") is False
+    assert cache.get_decision("evt-1") == "skipped_trigger_threshold"
+
+    monkeypatch.setattr(
+        "utils.negative_cache.time.time",
+        lambda: 101.0 + NEG_CACHE_MAX_AGE_SECONDS,
+    )
+    assert cache.should_skip(event, "hash") is False
+    assert cache.get_decision("evt-1") is None
+    cache.close()
@@ -0,0 +1,162 @@
+"""Tests for the incrementally synced Google Contacts directory."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from agents.event_polling_agent import EventPollingAgent
+from integration.google_contacts_integration import SyncTokenExpiredError
+from integration.google_contacts_sync import GoogleContactsDirectory
+
+
+def _person(
+    resource: str,
+    email: Optional[str] = None,
+    *,
+    name: Optional[str] = None,
+    organization: Optional[str] = None,
+    deleted: bool = False,
+) -> Dict[str, Any]:
+    person: Dict[str, Any] = {"resourceName": resource}
+    if email:
+        person["emailAddresses"] = [{"value": email}]
+    if name:
+        person["names"] = [{"displayName": name}]
+    if organization:
+        person["organizations"] = [{"name": organization}]
+    if deleted:
+        person["metadata"] = {"deleted": True}
+    return person
+
+
+class FakePeopleApi:
+    """Serves scripted connection pages keyed by sync token."""
+
+    def __init__(self, pages: Dict[Optional[str], List[Dict[str, Any]]]) -> None:
+        self.pages = pages
+        self.calls: List[Dict[str, Any]] = []
+        self.expired: set = set()
+
+    async def list_connections_page_async(
+        self, *, page_size=1000, page_token=None, sync_token=None
+    ):
+        self.calls.append({"page_token": page_token, "sync_token": sync_token})
+        if sync_token in self.expired:
+            raise SyncTokenExpiredError("expired")
+        index = int(page_token or 0)
+        return self.pages[sync_token][index]
+
+
+@pytest.mark.asyncio
+async def test_full_then_incremental_sync(tmp_path):
+    api = FakePeopleApi(
+        {
+            None: [
+                {
+                    "connections": [
+                        _person("people/1", "Ada@Acme.io", name="Ada", organization="Acme")
+                    ],
+                    "nextPageToken": "1",
+                },
+                {
+                    "connections": [_person("people/2", "bob@gmail.com", name="Bob")],
+                    "nextSyncToken": "sync-1",
+                },
+            ],
+            "sync-1": [
+                {
+                    "connections": [
+                        _person("people/1", deleted=True),
+                        _person("people/3", "cy@example.org", name="Cy"),
+                    ],
+                    "nextSyncToken": "sync-2",
+                }
+            ],
+        }
+    )
+    directory = GoogleContactsDirectory(tmp_path / "contacts.sqlite3")
+
+    changed = await directory.sync(api)
+
+    assert [contact.email for contact in changed] == ["ada@acme.io", "bob@gmail.com"]
+    ada = directory.lookup("ada@acme.io")
+    assert (ada.name, ada.organization, ada.domain) == ("Ada", "Acme", "acme.io")
+    # Freemail addresses do not imply a company domain.
+    assert directory.lookup("BOB@gmail.com").domain is None
+    assert directory.sync_token == "sync-1"
+
+    changed = await directory.sync(api)
+
+    assert api.calls[-1] == {"page_token": None, "sync_token": "sync-1"}
+    assert [contact.email for contact in changed] == ["cy@example.org"]
+    assert directory.lookup("ada@acme.io") is None
+    assert len(directory) == 2
+    directory.close()
+
+    reopened = GoogleContactsDirectory(tmp_path / "contacts.sqlite3")
+    assert reopened.sync_token == "sync-2"
+    assert reopened.lookup("cy@example.org").name == "Cy"
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_expired_sync_token_triggers_full_resync():
+    api = FakePeopleApi(
+        {
+            None: [
+                {
+                    "connections": [_person("people/2", "bob@acme.io")],
+                    "nextSyncToken": "fresh",
+                }
+            ]
+        }
+    )
+    api.expired.add("stale")
+    directory = GoogleContactsDirectory()
+    directory.apply([_person("people/1", "gone@acme.io")])
+    directory._set_state("sync_token", "stale")
+
+    await directory.sync(api)
+
+    assert directory.sync_token == "fresh"
+    # The full listing no longer contains people/1.
+    assert directory.lookup("gone@acme.io") is None
+    assert directory.lookup("bob@acme.io") is not None
+
+
+@pytest.mark.asyncio
+async def test_polling_agent_annotates_events_from_directory():
+    directory = GoogleContactsDirectory()
+    directory.apply(
+        [
+            _person("people/1", "host@acme.io", name="Host", organization="Acme"),
+            _person("people/2", "guest@globex.de", organization="Example"),
+        ]
+    )
+
+    class Calendar:
+        async def list_events_async(self, max_results=100):
+            return [
+                {
+                    "id": "evt",
+                    "organizer": {"email": "HOST@acme.io"},
+                    "attendees": [
+                        {"email": "host@acme.io", "organizer": True},
+                        {"email": "guest@globex.de"},
+                        {"email": "unknown@example.org"},
+                    ],
+                }
+            ]
+
+    agent = EventPollingAgent(
+        calendar_integration=Calendar(), contact_directory=directory
+    )
+    [event] = await agent.poll()
+
+    assert event["organizer_contact"]["organization"] == "Acme"
+    assert [entry["email"] for entry in event["attendee_contacts"]] == [
+        "guest@globex.de"
+    ]
+    assert agent.lookup_contact("guest@globex.de").domain == "globex.de"
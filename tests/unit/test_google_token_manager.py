@@ -0,0 +1,121 @@
+"""Tests for the shared, persisted Google OAuth token manager."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import stat
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from integration.google_token_manager import (
+    GoogleTokenManager,
+    OAuthCredentials,
+    shared_token_manager,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+class _Response:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def json(self):
+        return self._payload
+
+
+class _TokenEndpoint:
+    """Stand-in for ``AsyncHTTP`` that issues numbered tokens."""
+
+    def __init__(self, expires_in: int = 3600, delay: float = 0.0) -> None:
+        self.expires_in = expires_in
+        self.delay = delay
+        self.calls = 0
+
+    async def post(self, url, data=None, headers=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return _Response(
+            {"access_token": f"token-{self.calls}", "expires_in": self.expires_in}
+        )
+
+
+def _credentials(**overrides) -> OAuthCredentials:
+    values = {
+        "client_id": "client",
+        "client_secret": "secret",
+        "refresh_token": "refresh",
+        "token_uri": "https://oauth.example.com/token",
+    }
+    values.update(overrides)
+    return OAuthCredentials(**values)
+
+
+async def test_concurrent_callers_share_one_refresh():
+    endpoint = _TokenEndpoint(delay=0.01)
+    manager = GoogleTokenManager(_credentials(), http=endpoint)
+
+    tokens = await asyncio.gather(*(manager.get_token() for _ in range(5)))
+
+    assert tokens == ["token-1"] * 5
+    assert endpoint.calls == 1
+    await manager.aclose()
+
+
+async def test_token_is_persisted_with_restrictive_permissions(tmp_path):
+    path = tmp_path / "state" / "token.json"
+    endpoint = _TokenEndpoint()
+    manager = GoogleTokenManager(_credentials(), path=path, http=endpoint)
+    await manager.get_token()
+    await manager.aclose()
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    stored = json.loads(path.read_text())
+    assert stored["access_token"] == "token-1"
+    assert "refresh" not in json.dumps(stored)
+
+    restarted = GoogleTokenManager(_credentials(), path=path, http=endpoint)
+    assert await restarted.get_token() == "token-1"
+    assert endpoint.calls == 1
+    await restarted.aclose()
+
+    # A token persisted for other credentials is ignored.
+    other = GoogleTokenManager(
+        _credentials(refresh_token="rotated"), path=path, http=endpoint
+    )
+    assert other.token is None
+
+
+async def test_token_near_expiry_is_refreshed_in_background():
+    endpoint = _TokenEndpoint(delay=0.01)
+    manager = GoogleTokenManager(_credentials(), refresh_margin=300, http=endpoint)
+    manager.token = "current"
+    manager.expiry = datetime.now(timezone.utc) + timedelta(seconds=120)
+
+    # Still valid: returned immediately while the refresh runs in the background.
+    assert await manager.get_token() == "current"
+    for _ in range(20):
+        if manager.token != "current":
+            break
+        await asyncio.sleep(0.01)
+
+    assert manager.token == "token-1"
+    assert endpoint.calls == 1
+    assert manager.seconds_until_refresh() > 3000
+    await manager.aclose()
+
+
+async def test_shared_manager_is_reused_per_credentials():
+    settings = SimpleNamespace(google_token_cache_enabled=False)
+
+    first = shared_token_manager(_credentials(), settings)
+    assert shared_token_manager(_credentials(), settings) is first
+    assert shared_token_manager(_credentials(client_id="other"), settings) is not first
+    assert first.path is None
@@ -0,0 +1,122 @@
+"""Tests for the ETag response cache and conditional requests."""
+
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+
+from utils.async_http import AsyncHTTP
+from utils.http_cache import (
+    HttpResponseCache,
+    reset_shared_http_caches,
+    shared_http_cache,
+)
+
+
+def _body(payload) -> bytes:
+    return json.dumps(payload).encode("utf-8")
+
+
+def test_cache_round_trip_and_persistence(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    cache = HttpResponseCache(path, name="test")
+    key = cache.make_key("https://api.example.com/items", {"b": 2, "a": 1})
+    assert key == cache.make_key("https://api.example.com/items", {"a": 1, "b": 2})
+
+    cache.store(key, '"v1"', _body({"items": [1]}), {"items": [1]})
+    entry = cache.get(key)
+    assert entry is not None and entry.etag == '"v1"'
+    assert cache.revalidated(key, entry) == {"items": [1]}
+    cache.close()
+
+    reopened = HttpResponseCache(path, name="test")
+    entry = reopened.get(key)
+    # After a restart the body is parsed once from disk.
+    assert entry.body == _body({"items": [1]})
+    assert reopened.revalidated(key, entry) == {"items": [1]}
+    reopened.close()
+
+
+def test_responses_without_etag_are_not_cached():
+    cache = HttpResponseCache(name="test")
+    key = cache.make_key("/items")
+
+    cache.store(key, None, b"{}", {})
+
+    assert cache.get(key) is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_evicts_least_recently_used_entries():
+    cache = HttpResponseCache(name="test", max_entries=2, max_bytes=1024)
+    keys = [cache.make_key(f"/items/{index}") for index in range(3)]
+    for key in keys[:2]:
+        cache.store(key, '"e"', b"[]", [])
+    cache.revalidated(keys[0], cache.get(keys[0]))
+
+    cache.store(keys[2], '"e"', b"[]", [])
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert len(cache) == 2
+
+    cache.store(cache.make_key("/large"), '"e"', b"x" * 2048, None)
+    assert cache.get(cache.make_key("/large")) is None
+
+
+def test_shared_cache_is_reused_per_name(tmp_path):
+    try:
+        first = shared_http_cache("google_calendar", path=tmp_path)
+        assert shared_http_cache("google_calendar", path=tmp_path) is first
+        assert first.path == tmp_path / "google_calendar.sqlite3"
+    finally:
+        reset_shared_http_caches()
+
+
+@pytest.mark.asyncio
+async def test_get_json_revalidates_with_if_none_match(monkeypatch):
+    cache = HttpResponseCache(name="test")
+    client = AsyncHTTP(base_url="https://api.example.com", cache=cache)
+    payload = {"items": [{"id": "evt-1"}]}
+    seen_headers = []
+
+    async def fake_request(method, url, **kwargs):
+        headers = kwargs.get("headers") or {}
+        seen_headers.append(headers.get("If-None-Match"))
+        request = httpx.Request(method, url)
+        if headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, request=request)
+        return httpx.Response(
+            200, headers={"ETag": '"v1"'}, content=_body(payload), request=request
+        )
+
+    monkeypatch.setattr(client._client, "request", fake_request)
+
+    first = await client.get_json("/events", params={"q": "x"})
+    first["items"][0]["summary"] = "mutated by the caller"
+    second = await client.get_json("/events", params={"q": "x"})
+
+    # The 304 returns a private copy that earlier callers' edits do not reach.
+    assert second == payload
+    second["items"].clear()
+    assert await client.get_json("/events", params={"q": "x"}) == payload
+    assert seen_headers == [None, '"v1"', '"v1"']
+    stats = cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 1
+    assert stats["hit_ratio"] == pytest.approx(2 / 3)
+    assert stats["bytes_saved"] == 2 * len(_body(payload))
+
+
+@pytest.mark.asyncio
+async def test_get_json_without_cache_raises_for_errors(monkeypatch):
+    client = AsyncHTTP(base_url="https://api.example.com")
+
+    async def fake_request(method, url, **kwargs):
+        return httpx.Response(404, request=httpx.Request(method, url))
+
+    monkeypatch.setattr(client._client, "request", fake_request)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.get_json("/missing")
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from utils.async_http import AsyncHTTP
+from utils.http_pool import ClientPool, PoolConfig
+
+pytestmark = pytest.mark.asyncio
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"auth": request.headers.get("authorization")})
+
+
+async def test_clients_are_shared_per_base_url_and_survive_wrappers() -> None:
+    pool = ClientPool(PoolConfig(host_limits={"api.example.com": 3}))
+
+    first = AsyncHTTP(base_url="https://api.example.com", pool=pool)
+    second = AsyncHTTP(base_url="https://api.example.com", pool=pool)
+    other = AsyncHTTP(base_url="https://other.example.com", pool=pool)
+
+    assert first._client is second._client
+    assert first._client is not other._client
+
+    client = first._client
+    await first.aclose()
+    assert not client.is_closed
+
+    stats = {item["host"]: item for item in pool.stats()}
+    assert stats["api.example.com"]["limit"] == 3
+    assert stats["other.example.com"]["limit"] == 20
+
+    await pool.aclose()
+    assert client.is_closed
+
+
+async def test_shared_clients_send_per_wrapper_headers(monkeypatch) -> None:
+    pool = ClientPool(PoolConfig())
+    transport = httpx.MockTransport(_handler)
+    monkeypatch.setattr(
+        pool,
+        "_create_client",
+        lambda base_url, follow_redirects: httpx.AsyncClient(
+            base_url=base_url, transport=transport
+        ),
+    )
+
+    alpha = AsyncHTTP(
+        base_url="https://api.example.com",
+        headers={"Authorization": "Bearer alpha"},
+        pool=pool,
+    )
+    beta = AsyncHTTP(
+        base_url="https://api.example.com",
+        headers={"Authorization": "Bearer beta"},
+        pool=pool,
+    )
+
+    assert (await alpha.get("/me")).json() == {"auth": "Bearer alpha"}
+    assert (await beta.get("/me")).json() == {"auth": "Bearer beta"}
+    await pool.aclose()
+
+
+async def test_private_clients_are_closed_with_the_wrapper() -> None:
+    pool = ClientPool(PoolConfig(enabled=False))
+    http = AsyncHTTP(base_url="https://api.example.com", pool=pool)
+
+    client = http._client
+    await http.aclose()
+
+    assert client.is_closed
+    assert pool.stats() == []
+
+
+async def test_warm_up_reports_per_host_outcome(monkeypatch) -> None:
+    pool = ClientPool(PoolConfig(http2=True))
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append((request.method, request.url.host))
+        if request.url.host == "down.example.com":
+            raise httpx.ConnectError("unreachable", request=request)
+        return httpx.Response(405)
+
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(
+        pool,
+        "_create_client",
+        lambda base_url, follow_redirects: httpx.AsyncClient(
+            base_url=base_url, transport=transport
+        ),
+    )
+
+    results = await pool.warm_up(
+        ["https://up.example.com", "https://down.example.com", "https://up.example.com"]
+    )
+
+    assert results == {"https://up.example.com": True, "https://down.example.com": False}
+    assert sorted(requests) == [("HEAD", "down.example.com"), ("HEAD", "up.example.com")]
+    await pool.aclose()
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import pytest
+
+from agents.int_lvl_1_agent import IntLvl1SimilarCompaniesAgent
+from integration.hubspot_mirror import HubSpotCompanyMirror
+
+
+def _company(company_id: str, name: str, modified: int, **properties: str):
+    return {
+        "id": company_id,
+        "properties": {
+            "name": name,
+            "hs_lastmodifieddate": str(modified),
+            **properties,
+        },
+    }
+
+
+CORPUS = [
+    _company(
+        "1",
+        "Insight Analytics",
+        1000,
+        segment="Enterprise",
+        product="Insight Platform",
+        description="Predictive analytics for marketing teams",
+        industry="Software",
+    ),
+    _company(
+        "2",
+        "Harbor Logistics",
+        2000,
+        segment="SMB",
+        product="Freight",
+        description="Shipping and warehousing",
+        industry="Logistics",
+    ),
+    _company(
+        "3",
+        "Market Signals",
+        3000,
+        segment="Enterprise",
+        product="Dashboards",
+        description="Marketing analytics dashboards",
+        industry="Software",
+    ),
+]
+
+
+class _PagedSource:
+    def __init__(self, pages: List[Dict[str, Any]]) -> None:
+        self.pages = pages
+        self.calls: List[Dict[str, Any]] = []
+
+    async def search_companies_modified_since(
+        self,
+        since_ms: int,
+        *,
+        properties: Sequence[str],
+        after: Optional[str] = None,
+        limit: int = 100,
+    ) -> Mapping[str, Any]:
+        self.calls.append({"since": since_ms, "after": after})
+        return self.pages.pop(0) if self.pages else {"results": []}
+
+    async def list_similar_companies(self, *args, **kwargs):  # pragma: no cover
+        raise AssertionError("similar-company search should use the mirror")
+
+
+@pytest.fixture()
+def mirror(tmp_path: Path) -> HubSpotCompanyMirror:
+    store = HubSpotCompanyMirror(tmp_path / "mirror.sqlite3")
+    yield store
+    store.close()
+
+
+def test_search_ranks_with_weighted_bm25(mirror: HubSpotCompanyMirror) -> None:
+    mirror.upsert(CORPUS)
+
+    hits = mirror.search(
+        ["marketing analytics"],
+        weights={"name": 4.0, "description": 1.5},
+        limit=5,
+    )
+
+    assert [company["id"] for company, _ in hits][:2] == ["1", "3"]
+    assert all(relevance > 0 for _, relevance in hits)
+    assert mirror.search(["analytics"], weights={}, industry="logistics") == []
+
+
+def test_upsert_updates_index_and_watermark(mirror: HubSpotCompanyMirror) -> None:
+    mirror.upsert(CORPUS)
+    mirror.upsert([_company("2", "Harbor Analytics", 4000)])
+
+    assert len(mirror) == 3
+    assert mirror.watermark == 4000
+    hits = mirror.search(["harbor"], weights={})
+    assert [company["properties"]["name"] for company, _ in hits] == [
+        "Harbor Analytics"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sync_pages_from_watermark(mirror: HubSpotCompanyMirror) -> None:
+    mirror.upsert(CORPUS[:1])
+    source = _PagedSource(
+        [
+            {"results": CORPUS[1:2], "paging": {"next": {"after": "1"}}},
+            {"results": CORPUS[2:]},
+        ]
+    )
+
+    assert await mirror.sync(source) == 2
+    assert source.calls == [
+        {"since": 1000, "after": None},
+        {"since": 1000, "after": "1"},
+    ]
+    assert mirror.watermark == 3000
+    assert not mirror.needs_sync()
+
+
+@pytest.mark.asyncio
+async def test_full_sync_prunes_companies_missing_from_hubspot(
+    mirror: HubSpotCompanyMirror,
+) -> None:
+    mirror.upsert(CORPUS)
+    source = _PagedSource([{"results": [CORPUS[0], CORPUS[2]]}])
+
+    assert await mirror.sync(source, full=True) == 2
+    assert source.calls == [{"since": 0, "after": None}]
+    assert len(mirror) == 2
+    assert mirror.search(["harbor"], weights={}) == []
+    assert not mirror.needs_full_sync()
+
+
+@pytest.mark.asyncio
+async def test_background_sync_is_shared_by_concurrent_callers(
+    mirror: HubSpotCompanyMirror,
+) -> None:
+    release = asyncio.Event()
+
+    class _SlowSource(_PagedSource):
+        async def search_companies_modified_since(self, since_ms, **kwargs):
+            await release.wait()
+            return await super().search_companies_modified_since(since_ms, **kwargs)
+
+    source = _SlowSource([{"results": CORPUS}])
+    first = mirror.sync_in_background(source)
+    second = mirror.sync_in_background(source)
+    assert first is not None and first is second
+    release.set()
+
+    assert await first == 3
+    assert len(source.calls) == 1
+    assert mirror.sync_in_background(source) is None
+
+
+@pytest.mark.asyncio
+async def test_agent_ranks_against_mirror_without_api_calls(
+    tmp_path: Path, mirror: HubSpotCompanyMirror
+) -> None:
+    mirror.upsert(CORPUS)
+    mirror.sync_interval_seconds = 3600
+    await mirror.sync(_PagedSource([]))
+
+    config = type("Config", (), {"research_artifact_dir": tmp_path})()
+    agent = IntLvl1SimilarCompaniesAgent(
+        config=config,
+        hubspot_integration=_PagedSource([]),
+        company_mirror=mirror,
+        result_limit=2,
+    )
+    result = await agent.run(
+        {
+            "event_id": "evt-1",
+            "payload": {
+                "company_name": "Example Analytics",
+                "segment": "Enterprise",
+                "description": "Analytics for marketing teams",
+            },
+        }
+    )
+
+    ids = [item["id"] for item in result["payload"]["results"]]
+    assert ids == ["1", "3"]
@@ -0,0 +1,217 @@
+"""Tests for the internal company search index."""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import time
+from pathlib import Path
+
+import pytest
+
+import config.config
+import main
+from agents.internal_company.run import run
+from agents.internal_company.search import (
+    P95_TARGET_MS,
+    InternalCompanyIndex,
+    reset_shared_internal_company_indexes,
+    shared_internal_company_index,
+)
+
+
+def _write(path: Path, payload) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def artifact_root(tmp_path):
+    root = tmp_path / "artifacts"
+    _write(
+        root / "dossier_research" / "run-1" / "evt-1_company_detail_research.json",
+        {
+            "report_type": "Company Detail Research",
+            "generated_at": "2025-03-01 10:00 CET",
+            "company": {
+                "name": "Müller Robotics GmbH",
+                "domain": "https://mueller-robotics.de/",
+                "industry": "Industrial Automation",
+                "description": "Welding robots for automotive suppliers",
+            },
+        },
+    )
+    _write(
+        root / "internal_research" / "run-1" / "crm_match_evt-1.json",
+        {
+            "company_name": "Müller Robotics GmbH",
+            "company_domain": "mueller-robotics.de",
+            "crm_lookup": {"company_in_crm": True},
+        },
+    )
+    _write(
+        root / "similar_companies_level1" / "run-1" / "similar.json",
+        {
+            "company_name": "Müller Robotics GmbH",
+            "results": [
+                {
+                    "name": "Schweiss Automation AG",
+                    "domain": "schweiss-automation.ch",
+                    "properties": {
+                        "industry": "Industrial Automation",
+                        "description": "Welding cells and robot integration",
+                    },
+                },
+                {
+                    "name": "Bäckerei Sonne",
+                    "domain": "sonne-backt.de",
+                    "properties": {"industry": "Food", "description": "Bread"},
+                },
+            ],
+        },
+    )
+    return root
+
+
+def test_sync_indexes_artifacts_incrementally(tmp_path, artifact_root):
+    index = InternalCompanyIndex(tmp_path / "index.sqlite3", artifact_root=artifact_root)
+    try:
+        assert index.sync() == 4
+        assert index.sync() == 0
+        assert len(index) == 3
+
+        dossier = next(artifact_root.glob("dossier_research/*/*.json"))
+        payload = json.loads(dossier.read_text(encoding="utf-8"))
+        payload["generated_at"] = "2025-04-01 09:00 CET"
+        dossier.write_text(json.dumps(payload), encoding="utf-8")
+        os.utime(dossier, ns=(0, 10**9))
+
+        assert index.sync() == 1
+        company = index.find_by_domain("MUELLER-ROBOTICS.DE")
+        assert company["name"] == "Müller Robotics GmbH"
+        assert company["last_report_date"] == "2025-04-01 09:00 CET"
+        assert company["report_count"] == 1
+        assert len(company["artifacts"]) == 2
+    finally:
+        index.close()
+
+
+def test_lookup_matches_domain_fuzzy_name_and_neighbours(tmp_path, artifact_root):
+    index = InternalCompanyIndex(tmp_path / "index.sqlite3", artifact_root=artifact_root)
+    index.sync()
+    try:
+        exact = index.lookup(
+            {
+                "company_name": "Mueller Robotics",
+                "company_domain": "mueller-robotics.de",
+                "industry": "Industrial Automation",
+                "description": "welding robots",
+            }
+        )
+        typo = index.lookup(
+            {"company_name": "Muler Robotics GmbH", "company_domain": "other.de"}
+        )
+        unknown = index.lookup({"company_name": "Zeta Logistics"})
+    finally:
+        index.close()
+
+    assert exact["exists"] is True
+    assert exact["internal_match"]["match"] == "domain"
+    assert exact["last_report_date"] == "2025-03-01 10:00 CET"
+    # The company itself is never its own neighbour.
+    assert [n["domain"] for n in exact["neighbors"]] == ["schweiss-automation.ch"]
+    assert typo["internal_match"]["match"] == "name"
+    assert typo["internal_match"]["company"]["domain"] == "mueller-robotics.de"
+    assert unknown["exists"] is False
+    assert unknown["neighbors"] == []
+
+
+def test_run_returns_neighbours_in_payload(tmp_path, artifact_root):
+    index = InternalCompanyIndex(tmp_path / "index.sqlite3", artifact_root=artifact_root)
+    try:
+        index.sync()
+        result = run(
+            {
+                "payload": {
+                    "company_name": "Neue Schweisstechnik",
+                    "company_domain": "neu.example",
+                    "industry": "Industrial Automation",
+                }
+            },
+            index=index,
+        )
+    finally:
+        index.close()
+
+    assert result["payload"]["exists"] is False
+    assert result["neighbors"] == result["payload"]["neighbors"]
+    assert {n["domain"] for n in result["neighbors"]} == {
+        "mueller-robotics.de",
+        "schweiss-automation.ch",
+    }
+
+
+def test_run_only_queries_the_index(tmp_path, artifact_root):
+    index = InternalCompanyIndex(tmp_path / "index.sqlite3", artifact_root=artifact_root)
+    try:
+        result = run({"payload": {"company_domain": "mueller-robotics.de"}}, index=index)
+        assert index.last_synced == 0.0
+        assert len(index) == 0
+    finally:
+        index.close()
+
+    assert result["payload"]["exists"] is False
+
+
+@pytest.mark.asyncio
+async def test_daemon_sync_indexes_artifacts_when_due(monkeypatch, tmp_path, artifact_root):
+    # Other tests reload ``config.config``; patch the settings main will read.
+    settings = config.config.settings
+    monkeypatch.setattr(settings, "internal_company_search_enabled", True, raising=False)
+    monkeypatch.setattr(
+        settings, "internal_company_index_path", tmp_path / "shared.sqlite3", raising=False
+    )
+    monkeypatch.setattr(settings, "research_artifact_dir", artifact_root, raising=False)
+    reset_shared_internal_company_indexes()
+    try:
+        assert await main._sync_internal_company_index() == 4
+        assert await main._sync_internal_company_index() == 0
+        index = shared_internal_company_index(settings)
+        assert index.find_by_domain("mueller-robotics.de") is not None
+    finally:
+        reset_shared_internal_company_indexes()
+
+
+def test_lookup_latency_stays_within_target(tmp_path):
+    rng = random.Random(7)
+    words = [f"w{number}x" for number in range(3000)]
+    index = InternalCompanyIndex(tmp_path / "index.sqlite3")
+    index.upsert(
+        {
+            "name": f"{rng.choice(words)} {rng.choice(words)} GmbH",
+            "domain": f"company-{number}.example",
+            "industry": f"industry {number % 20}",
+            "description": " ".join(rng.sample(words, 5)),
+        }
+        for number in range(2000)
+    )
+    latencies = []
+    try:
+        for number in range(200):
+            started = time.perf_counter()
+            index.lookup(
+                {
+                    "company_name": f"{rng.choice(words)} GmbH",
+                    "company_domain": f"company-{number * 17}.example",
+                    "industry": f"industry {number % 20}",
+                    "description": " ".join(rng.sample(words, 5)),
+                }
+            )
+            latencies.append((time.perf_counter() - started) * 1000)
+    finally:
+        index.close()
+
+    latencies.sort()
+    assert latencies[int(len(latencies) * 0.95)] < P95_TARGET_MS
@@ -1,4 +1,6 @@
+import asyncio
 import json
+import threading
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
@@ -204,6 +206,7 @@ async def test_lookup_crm_company_handles_integration_failure(
     assert summary["company_in_crm"] is False
     assert summary["attachments_in_crm"] is False
     assert summary["requires_dossier"] is True
+    assert summary["error"] == "lookup_failed"
     assert any(entry["step"] == "crm_lookup_failed" for entry in workflow_logs.records)
 
 
@@ -326,3 +329,37 @@ async def test_run_handles_missing_fields_without_lookup(agent, monkeypatch):
 
     assert result["status"] == "AWAIT_REQUESTOR_DETAILS"
     lookup.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_run_overlaps_internal_and_crm_lookups(agent, hubspot_stub):
+    crm_started = threading.Event()
+
+    async def _crm_lookup(domain):
+        crm_started.set()
+        await asyncio.sleep(0.01)
+        return {"company": {"id": "1"}, "attachments": []}
+
+    def _internal_search(trigger):
+        # Only returns when the CRM lookup runs at the same time.
+        assert crm_started.wait(timeout=2)
+        return {"payload": {"neighbors": [{"name": "Peer", "domain": "peer.example"}]}}
+
+    hubspot_stub.lookup_company_with_attachments.side_effect = _crm_lookup
+    agent._internal_search_runner = _internal_search
+
+    result = await agent.run(
+        {"payload": {"company_name": "ACME", "company_domain": "acme.example"}}
+    )
+    payload = result["payload"]
+
+    assert payload["level1_samples"][0]["domain"] == "peer.example"
+    assert Path(payload["artifacts"]["neighbor_samples"]).exists()
+    assert Path(payload["artifacts"]["crm_match"]).exists()
+    assert set(payload["timings_ms"]) == {
+        "internal_lookup",
+        "neighbor_artifact",
+        "crm_lookup",
+        "crm_artifact",
+        "total",
+    }
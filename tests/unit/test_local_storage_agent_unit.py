@@ -40,6 +40,27 @@ def test_load_audit_entries_skips_invalid_lines(storage_agent, tmp_path):
     storage_agent.logger.warning.assert_called_once()
 
 
+def test_pending_audit_ids_span_runs_and_skip_stale_logs(storage_agent):
+    def _write(run_id, *entries):
+        path = storage_agent.get_audit_log_path(run_id)
+        path.write_text(
+            "\n".join(json.dumps(entry) for entry in entries), encoding="utf-8"
+        )
+        return path
+
+    _write(
+        "run-1",
+        {"audit_id": "a1", "stage": "request", "outcome": "pending"},
+        {"audit_id": "a2", "stage": "request", "outcome": "sent"},
+    )
+    # The reply to a1 arrives in a later run.
+    _write("run-2", {"audit_id": "a1", "stage": "response", "outcome": "completed"})
+    stale = _write("run-0", {"audit_id": "a0", "stage": "request", "outcome": "pending"})
+    os.utime(stale, (0, 0))
+
+    assert storage_agent.pending_audit_ids() == {"a2"}
+
+
 def test_record_run_writes_relative_path(storage_agent, tmp_path):
     run_dir = storage_agent.create_run_directory("run-1")
     log_path = run_dir / "audit_log.jsonl"
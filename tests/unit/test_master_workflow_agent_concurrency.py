@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import asyncio
+from types import SimpleNamespace
 from typing import Any, Dict, Optional
 
 import pytest
 
 from agents.master_workflow_agent import MasterWorkflowAgent
+from config.config import settings
 from utils.concurrency import ExceptionGroup
+from utils.research_dag import ResearchDAG, ResearchNode
 
 
 pytestmark = pytest.mark.asyncio
@@ -64,3 +67,149 @@ async def test_taskgroup_cancels_parallel_tasks_on_failure() -> None:
 
     assert any(isinstance(err, RuntimeError) for err in exc_info.value.exceptions)
     assert cancelled["similar"] is True
+
+
+def _fake_internal(order: list, status: str):
+    async def fake_internal(event_result, event, info, event_id, *, force):
+        order.append("internal:start")
+        await asyncio.sleep(0.02)
+        order.append("internal:end")
+        result = {"status": status, "payload": {"requires_dossier": True}}
+        event_result["research"]["internal_research"] = result
+        return result
+
+    return fake_internal
+
+
+def _fake_run(order: list):
+    async def fake_run(
+        _agent, agent_name, event_result, event, info, event_id, *, force
+    ):
+        order.append(f"{agent_name}:start")
+        await asyncio.sleep(0.01)
+        order.append(f"{agent_name}:end")
+        event_result["research"][agent_name] = {"status": "ok"}
+        return event_result["research"][agent_name]
+
+    return fake_run
+
+
+async def test_dossier_and_similar_run_together_after_internal_research() -> None:
+    agent = _build_synthetic_agent()
+    order: list = []
+    agent._run_internal_research = _fake_internal(  # type: ignore[assignment]
+        order, "COMPANY_LOOKUP_COMPLETED"
+    )
+    agent._run_research_agent = _fake_run(order)  # type: ignore[assignment]
+
+    event_result: Dict[str, Any] = {"research": {}}
+    await agent._execute_precrm_research(  # type: ignore[attr-defined]
+        event_result,
+        {"id": "evt-1"},
+        {"company_name": "Example", "company_domain": "example.ai"},
+        "evt-1",
+        run_internal=True,
+    )
+
+    assert order.index("internal:end") < order.index("similar_companies:start")
+    assert order.index("internal:end") < order.index("dossier_research:start")
+    assert order.index("similar_companies:start") < order.index(
+        "dossier_research:end"
+    )
+    timings = event_result["research_timings"]
+    assert timings["critical_path"][0] == "internal_research"
+    assert len(timings["critical_path"]) == 2
+
+
+async def test_awaiting_requestor_skips_dossier_and_similar() -> None:
+    agent = _build_synthetic_agent()
+    order: list = []
+    agent._run_internal_research = _fake_internal(  # type: ignore[assignment]
+        order, "AWAIT_REQUESTOR_DETAILS"
+    )
+    agent._run_research_agent = _fake_run(order)  # type: ignore[assignment]
+
+    event_result: Dict[str, Any] = {"research": {}}
+    await agent._execute_precrm_research(  # type: ignore[attr-defined]
+        event_result,
+        {"id": "evt-2"},
+        {"company_name": "Example", "company_domain": "example.ai"},
+        "evt-2",
+        run_internal=True,
+    )
+
+    assert order == ["internal:start", "internal:end"]
+    assert set(event_result["research"]) == {"internal_research"}
+    nodes = event_result["research_timings"]["nodes"]
+    assert nodes["similar_companies"]["status"] == "skipped"
+    assert nodes["dossier_research"]["status"] == "skipped"
+
+
+def _build_event_agent(dossier_limit: int) -> MasterWorkflowAgent:
+    agent = MasterWorkflowAgent.__new__(MasterWorkflowAgent)
+    agent._event_fingerprints = {}  # type: ignore[attr-defined]
+    agent._checkpoints = None  # type: ignore[attr-defined]
+    agent._load_event_caches = lambda: None  # type: ignore[assignment]
+    agent._load_checkpoint_store = lambda: None  # type: ignore[assignment]
+    agent._mask_for_logging = lambda event: event  # type: ignore[assignment]
+    agent._fingerprint_for = (  # type: ignore[assignment]
+        lambda event: SimpleNamespace(content_digest=f"digest-{event['id']}")
+    )
+    agent.research_dag = ResearchDAG(limits={"dossier_research": dossier_limit})
+    return agent  # type: ignore[return-value]
+
+
+async def test_events_overlap_while_per_agent_limits_hold(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "max_concurrent_events", 3, raising=False)
+    agent = _build_event_agent(dossier_limit=1)
+    active = {"events": 0, "dossier": 0}
+    peak = {"events": 0, "dossier": 0}
+
+    def _enter(key: str) -> None:
+        active[key] += 1
+        peak[key] = max(peak[key], active[key])
+
+    async def fake_dossier(_facts):
+        _enter("dossier")
+        await asyncio.sleep(0.02)
+        active["dossier"] -= 1
+        return {"dossier": True}
+
+    async def fake_process_event(event, event_result, _fingerprint):
+        _enter("events")
+        await asyncio.sleep(0.01)
+        await agent.research_dag.execute(
+            [ResearchNode("dossier_research", fake_dossier, outputs=("dossier",))]
+        )
+        active["events"] -= 1
+        event_result["status"] = f"done-{event['id']}"
+
+    agent._process_event = fake_process_event  # type: ignore[assignment]
+
+    results = await agent.process_events([{"id": str(i)} for i in range(6)])
+
+    assert [result["status"] for result in results] == [f"done-{i}" for i in range(6)]
+    assert peak == {"events": 3, "dossier": 1}
+
+
+async def test_failing_event_cancels_the_others_and_is_reraised(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "max_concurrent_events", 2, raising=False)
+    agent = _build_event_agent(dossier_limit=1)
+    cancelled: Dict[str, bool] = {"slow": False}
+
+    async def fake_process_event(event, _event_result, _fingerprint):
+        if event["id"] == "bad":
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+        try:
+            await asyncio.sleep(0.5)
+        except asyncio.CancelledError:
+            cancelled["slow"] = True
+            raise
+
+    agent._process_event = fake_process_event  # type: ignore[assignment]
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await agent.process_events([{"id": "slow"}, {"id": "bad"}])
+
+    assert cancelled["slow"] is True
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import asyncio
+from typing import List, Sequence
+
+import pytest
+
+from utils.micro_batch import MicroBatcher
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_keys_submitted_within_window_share_one_batch() -> None:
+    batches: List[List[str]] = []
+
+    async def handler(keys: Sequence[str]):
+        batches.append(list(keys))
+        return {key: key.upper() for key in keys if key != "missing"}
+
+    batcher = MicroBatcher("test", handler, max_batch_size=10, max_delay=0.01)
+    results = await asyncio.gather(
+        batcher.submit("a"),
+        batcher.submit("b"),
+        batcher.submit("a"),
+        batcher.submit("missing"),
+    )
+
+    assert results == ["A", "B", "A", None]
+    assert batches == [["a", "b", "missing"]]
+
+
+async def test_full_batches_dispatch_without_waiting() -> None:
+    batches: List[List[int]] = []
+
+    async def handler(keys: Sequence[int]):
+        batches.append(list(keys))
+        return {key: key * 2 for key in keys}
+
+    batcher = MicroBatcher("test", handler, max_batch_size=2, max_delay=10)
+    results = await asyncio.wait_for(
+        asyncio.gather(*(batcher.submit(key) for key in range(4))), timeout=1
+    )
+
+    assert results == [0, 2, 4, 6]
+    assert batches == [[0, 1], [2, 3]]
+
+
+async def test_handler_errors_reach_every_caller() -> None:
+    async def handler(keys: Sequence[str]):
+        raise RuntimeError("batch failed")
+
+    batcher = MicroBatcher("test", handler, max_batch_size=5, max_delay=0)
+    results = await asyncio.gather(
+        batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    await batcher.flush()
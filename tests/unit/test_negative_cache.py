@@ -6,7 +6,7 @@ from pathlib import Path
 
 import pytest
 
-from utils.negative_cache import NegativeEventCache
+from utils.negative_cache import NEG_CACHE_MAX_AGE_SECONDS, NegativeEventCache
 
 
 def _set_time(monkeypatch: pytest.MonkeyPatch, value: float) -> None:
@@ -113,3 +113,82 @@ def test_cache_persists_and_reloads(
 
     reloaded = NegativeEventCache.load(cache_path, rule_hash="hash", now=35.0)
     assert reloaded.should_skip(event, "hash") is True
+
+
+def test_max_entries_evicts_least_recently_used(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = NegativeEventCache.load(
+        tmp_path / "cache.json", rule_hash="hash", now=0, max_entries=2
+    )
+    _set_time(monkeypatch, 10.0)
+    first = {"id": "evt-1", "summary": "One"}
+    second = {"id": "evt-2", "summary": "Two"}
+    third = {"id": "evt-3", "summary": "Three"}
+    cache.record_no_trigger(first, "hash", "no_trigger")
+    cache.record_no_trigger(second, "hash", "no_trigger")
+
+    # Touch the first entry so the second becomes least recently used.
+    assert cache.should_skip(first, "hash") is True
+    cache.record_no_trigger(third, "hash", "no_trigger")
+
+    assert list(cache.entries) == ["evt-1", "evt-3"]
+    assert cache._pending_metrics["evicted"] == 1
+
+
+def test_max_bytes_budget_bounds_memory_estimate(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = NegativeEventCache.load(
+        tmp_path / "cache.json", rule_hash="hash", now=0, max_bytes=4096
+    )
+    _set_time(monkeypatch, 10.0)
+    for index in range(50):
+        cache.record_no_trigger(
+            {"id": f"evt-{index}", "summary": "x" * 64}, "hash", "no_trigger"
+        )
+
+    assert 0 < cache.memory_estimate <= 4096
+    assert "evt-49" in cache.entries
+    assert "evt-0" not in cache.entries
+
+
+def test_purge_only_pops_expired_heap_entries(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = NegativeEventCache.load(tmp_path / "cache.json", rule_hash="hash", now=0)
+    _set_time(monkeypatch, 100.0)
+    cache.record_no_trigger({"id": "evt-old"}, "hash", "no_trigger")
+    _set_time(monkeypatch, 100.0 + NEG_CACHE_MAX_AGE_SECONDS)
+    cache.record_no_trigger({"id": "evt-new"}, "hash", "no_trigger")
+
+    cache._purge_stale(100.0 + NEG_CACHE_MAX_AGE_SECONDS + 1)
+
+    assert list(cache.entries) == ["evt-new"]
+    assert [event_id for _, event_id in cache._expiry_heap] == ["evt-new"]
+
+
+def test_flush_publishes_cache_metrics(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    events: list[tuple[str, str, int]] = []
+    sizes: list[tuple[str, int]] = []
+    monkeypatch.setattr(
+        "utils.negative_cache.record_cache_event",
+        lambda cache, event, count=1: events.append((cache, event, count)),
+    )
+    monkeypatch.setattr(
+        "utils.negative_cache.record_cache_size",
+        lambda cache, *, entries, bytes_estimate=None: sizes.append((cache, entries)),
+    )
+    cache = NegativeEventCache.load(tmp_path / "cache.json", rule_hash="hash", now=0)
+    _set_time(monkeypatch, 10.0)
+    event = _make_event()
+    cache.record_no_trigger(event, "hash", "no_trigger")
+    cache.should_skip(event, "hash")
+    cache.should_skip({"id": "evt-unknown"}, "hash")
+    cache.flush()
+
+    assert ("negative_event_cache", "hit", 1) in events
+    assert ("negative_event_cache", "miss", 1) in events
+    assert sizes == [("negative_event_cache", 1)]
@@ -0,0 +1,181 @@
+"""Tests for debounced push ingestion of calendar notifications."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from agents.event_polling_agent import EventPollingAgent
+from polling.push_ingestion import (
+    PushIngestionService,
+    PushRejected,
+    calendar_id_from_resource_uri,
+    google_notification_headers,
+)
+
+
+class _Recorder:
+    def __init__(self, changes=None):
+        self.changes = changes or {}
+        self.fetches = []
+        self.batches = []
+
+    async def fetch(self, calendar_id, updated_min):
+        self.fetches.append((calendar_id, updated_min))
+        return [dict(event) for event in self.changes.get(calendar_id, [])]
+
+    async def process(self, events):
+        self.batches.append(events)
+
+
+def _service(recorder, **kwargs):
+    kwargs.setdefault("debounce_seconds", 0.02)
+    kwargs.setdefault("max_delay_seconds", 1.0)
+    return PushIngestionService(
+        recorder.fetch,
+        recorder.process,
+        calendar_ids=["sales@acme.io", "partners@acme.io"],
+        **kwargs,
+    )
+
+
+async def _drain(service):
+    for _ in range(100):
+        if not service.pending and (
+            service._flush_task is None or service._flush_task.done()
+        ):
+            return
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_burst_of_notifications_triggers_one_incremental_fetch():
+    recorder = _Recorder({"sales@acme.io": [{"id": "evt-1"}]})
+    service = _service(recorder, token="secret")
+    before = datetime.now(timezone.utc)
+
+    sync = service.handle_calendar_notification(
+        google_notification_headers(
+            "sales@acme.io", token="secret", resource_state="sync"
+        )
+    )
+    results = [
+        service.handle_calendar_notification(
+            google_notification_headers(
+                "sales@acme.io", token="secret", message_number=number
+            )
+        )
+        for number in range(2, 6)
+    ]
+    await _drain(service)
+
+    assert sync["status"] == "ignored"
+    assert {result["status"] for result in results} == {"accepted"}
+    assert len(recorder.fetches) == 1
+    calendar_id, updated_min = recorder.fetches[0]
+    assert calendar_id == "sales@acme.io"
+    assert updated_min <= before - timedelta(seconds=59)
+    assert recorder.batches == [[{"id": "evt-1"}]]
+
+    # The next fetch starts from the previous one.
+    service.handle_calendar_notification(
+        google_notification_headers("sales@acme.io", token="secret")
+    )
+    await _drain(service)
+    assert recorder.fetches[1][1] > updated_min
+
+
+@pytest.mark.asyncio
+async def test_notifications_are_validated():
+    service = _service(_Recorder(), token="secret")
+
+    with pytest.raises(PushRejected) as missing:
+        service.handle_calendar_notification({"X-Goog-Resource-State": "exists"})
+    with pytest.raises(PushRejected) as forbidden:
+        service.handle_calendar_notification(
+            google_notification_headers("sales@acme.io", token="wrong")
+        )
+    unknown = service.handle_calendar_notification(
+        google_notification_headers("other@acme.io", token="secret")
+    )
+
+    assert missing.value.status_code == 400
+    assert forbidden.value.status_code == 403
+    assert unknown == {"status": "ignored", "reason": "unknown_calendar"}
+    assert not service.pending
+
+
+@pytest.mark.asyncio
+async def test_pushed_events_are_batched_with_calendar_changes():
+    recorder = _Recorder(
+        {"partners@acme.io": [{"id": "evt-2", "summary": "fetched"}]}
+    )
+    service = _service(recorder)
+
+    service.handle_event_push({"events": [{"id": "evt-1"}, {"id": "evt-2"}]})
+    service.handle_calendar_notification(
+        google_notification_headers("partners@acme.io")
+    )
+    with pytest.raises(PushRejected) as invalid:
+        service.handle_event_push([{"summary": "no id"}])
+    await _drain(service)
+
+    assert invalid.value.status_code == 422
+    [batch] = recorder.batches
+    assert sorted(event["id"] for event in batch) == ["evt-1", "evt-2"]
+    assert service.stats["batches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_fetch_keeps_watermark():
+    recorder = _Recorder()
+    service = _service(recorder)
+    watermark = service._watermarks["sales@acme.io"]
+
+    async def failing(calendar_id, updated_min):
+        raise RuntimeError("unavailable")
+
+    service._fetch_changes = failing
+    service.handle_calendar_notification(google_notification_headers("sales@acme.io"))
+    await _drain(service)
+
+    assert service._watermarks["sales@acme.io"] == watermark
+    assert service.stats["fetch_errors"] == 1
+    assert recorder.batches == []
+
+
+@pytest.mark.asyncio
+async def test_polling_agent_fetches_changes_since_watermark():
+    class Calendar:
+        def __init__(self):
+            self.calls = []
+
+        async def list_events_async(self, **kwargs):
+            self.calls.append(kwargs)
+            return [
+                {"id": "keep", "summary": "Kick-off"},
+                {"id": "gone", "status": "cancelled"},
+                {"id": "bday", "eventType": "birthday"},
+            ]
+
+    calendar = Calendar()
+    agent = EventPollingAgent(calendar_integration=calendar)
+    since = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    [calendar_id] = agent.calendars
+    events = await agent.poll_changes(calendar_id, since)
+
+    assert calendar.calls == [{"max_results": 250, "updated_min": since}]
+    assert [event["id"] for event in events] == ["keep"]
+    assert events[0]["calendarId"] == calendar_id
+
+
+def test_calendar_id_from_resource_uri():
+    uri = (
+        "https://www.googleapis.com/calendar/v3/calendars/"
+        "team%40group.calendar.google.com/events?alt=json"
+    )
+    assert calendar_id_from_resource_uri(uri) == "team@group.calendar.google.com"
+    assert calendar_id_from_resource_uri("https://example.com/other") is None
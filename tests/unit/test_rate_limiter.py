@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Dict, List
+
+import pytest
+
+from integration.hubspot_integration import HubSpotIntegration
+from utils.rate_limiter import AdaptiveRateLimiter, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: List[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(round(seconds, 6))
+        self.now += seconds
+
+
+def _limiter(clock: FakeClock, **kwargs) -> AdaptiveRateLimiter:
+    return AdaptiveRateLimiter(
+        "test", clock=clock, sleep=clock.sleep, headroom=1.0, **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_bucket_allows_burst_then_paces_requests() -> None:
+    clock = FakeClock()
+    limiter = _limiter(clock, rate=2, capacity=2)
+
+    for _ in range(2):
+        assert await limiter.acquire() == 0
+    assert await limiter.acquire() == pytest.approx(0.5)
+    assert clock.sleeps == [0.5]
+
+
+@pytest.mark.asyncio
+async def test_headers_adjust_rate_and_remaining_tokens() -> None:
+    clock = FakeClock()
+    limiter = _limiter(clock, rate=100, capacity=100)
+
+    limiter.observe(
+        {
+            "X-HubSpot-RateLimit-Max": "10",
+            "X-HubSpot-RateLimit-Interval-Milliseconds": "10000",
+            "X-HubSpot-RateLimit-Remaining": "1",
+            "X-HubSpot-RateLimit-Daily-Remaining": "5000",
+        }
+    )
+
+    assert limiter.capacity == 10
+    assert limiter.rate == pytest.approx(1.0)
+    assert limiter.tokens == pytest.approx(1.0)
+    assert limiter.daily_remaining == 5000
+    await limiter.acquire()
+    assert await limiter.acquire() == pytest.approx(1.0)
+
+
+@pytest.mark.asyncio
+async def test_429_pauses_all_callers_until_retry_after() -> None:
+    clock = FakeClock()
+    limiter = _limiter(clock, rate=10, capacity=10)
+
+    limiter.observe({"Retry-After": "3"}, status_code=429)
+
+    assert await limiter.acquire() == pytest.approx(3.0)
+    assert clock.now == pytest.approx(3.0)
+
+
+def test_parse_retry_after_accepts_seconds_and_dates() -> None:
+    now = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after(format_datetime(now + timedelta(seconds=30)), now=now) == 30
+    assert parse_retry_after("soon") is None
+
+
+class _Response:
+    def __init__(self, status_code: int, headers: Dict[str, str]) -> None:
+        self.status_code = status_code
+        self.headers = headers
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+    def json(self) -> Dict[str, object]:
+        return {"results": []}
+
+
+@pytest.mark.asyncio
+async def test_integration_waits_out_429_and_retries(monkeypatch) -> None:
+    clock = FakeClock()
+    limiter = _limiter(clock, rate=10, capacity=10)
+    settings = type(
+        "S",
+        (),
+        {
+            "hubspot_access_token": "token",
+            "hubspot_client_secret": None,
+            "hubspot_api_base_url": "https://api.test.local",
+            "hubspot_request_timeout": 5,
+            "hubspot_max_retries": 3,
+            "hubspot_retry_backoff_seconds": 0.0,
+        },
+    )()
+    integration = HubSpotIntegration(settings=settings, rate_limiter=limiter)
+    responses = [
+        _Response(429, {"Retry-After": "2"}),
+        _Response(200, {"X-HubSpot-RateLimit-Remaining": "50"}),
+    ]
+
+    async def fake_post(path, json=None, timeout=None):
+        return responses.pop(0)
+
+    monkeypatch.setattr(integration._http, "post", fake_post)
+
+    assert await integration.list_similar_companies("Acme") == []
+    assert responses == []
+    assert clock.sleeps == [2.0]
+    await integration.aclose()
@@ -0,0 +1,152 @@
+"""Tests for the company-level research result cache."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict
+
+import pytest
+
+from agents.master_workflow_agent import MasterWorkflowAgent
+from config.config import settings
+from utils.research_cache import ResearchCache
+
+
+class _CountingResearchAgent:
+    def __init__(self, artifact_path: str) -> None:
+        self.artifact_path = artifact_path
+        self.calls = 0
+
+    async def run(self, trigger: Dict[str, Any]) -> Dict[str, Any]:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {
+            "agent": "dossier_research",
+            "status": "completed",
+            "creator": trigger.get("creator"),
+            "artifact_path": self.artifact_path,
+            "payload": {"company": trigger["payload"]["company_domain"]},
+        }
+
+
+def test_entries_expire_per_agent_and_with_their_artifacts(tmp_path):
+    artifact = tmp_path / "dossier.json"
+    artifact.write_text("{}", encoding="utf-8")
+    cache = ResearchCache(
+        ttl_seconds={"internal_research": 60, "similar_companies": 0},
+        default_ttl=3600,
+    )
+    dossier = {"status": "completed", "artifact_path": str(artifact)}
+
+    cache.put("internal_research", "Example.com", {"status": "done"}, now=0)
+    cache.put("dossier_research", "https://example.com/", dossier, now=0)
+    assert cache.put("similar_companies", "example.com", {}, now=0) is None
+    assert cache.put(
+        "internal_research", "other.com", {"status": "AWAIT_REQUESTOR_DETAILS"}
+    ) is None
+
+    assert cache.get("internal_research", "EXAMPLE.com", now=30) is not None
+    assert cache.get("internal_research", "example.com", now=61) is None
+    assert cache.get("dossier_research", "example.com", now=61) is not None
+
+    # A hit references the stored artifact; once it is gone the entry is stale.
+    artifact.unlink()
+    assert cache.get("dossier_research", "example.com", now=61) is None
+    assert len(cache) == 0
+
+
+def test_degraded_crm_lookups_are_not_cached():
+    cache = ResearchCache()
+    completed = {
+        "status": "COMPANY_LOOKUP_COMPLETED",
+        "payload": {"crm_lookup": {"company_in_crm": False}},
+    }
+    degraded = {
+        "status": "COMPANY_LOOKUP_COMPLETED",
+        "payload": {
+            "crm_lookup": {"company_in_crm": False, "error": "lookup_failed"}
+        },
+    }
+
+    assert cache.put("internal_research", "found.com", completed) is not None
+    assert cache.put("internal_research", "failed.com", degraded) is None
+    assert cache.get("internal_research", "failed.com") is None
+
+
+def test_cache_is_persisted_across_instances(tmp_path):
+    path = tmp_path / "research_cache.json"
+    cache = ResearchCache(path=path)
+    cache.put("internal_research", "example.com", {"status": "done"})
+    cache.flush()
+
+    restored = ResearchCache(path=path)
+
+    entry = restored.get("internal_research", "example.com")
+    assert entry is not None
+    assert entry.result == {"status": "done"}
+    assert restored.invalidate("example.com") == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_fetches_share_one_computation():
+    cache = ResearchCache()
+    calls = 0
+    release = asyncio.Event()
+
+    async def compute() -> Dict[str, Any]:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return {"status": "completed"}
+
+    first = asyncio.create_task(cache.fetch("dossier_research", "example.com", compute))
+    second = asyncio.create_task(
+        cache.fetch("dossier_research", "example.com", compute)
+    )
+    await asyncio.sleep(0)
+    release.set()
+
+    origins = sorted(origin for _, origin in await asyncio.gather(first, second))
+    _, later = await cache.fetch("dossier_research", "example.com", compute)
+
+    assert calls == 1
+    assert origins == ["computed", "shared"]
+    assert later == "hit"
+
+
+@pytest.mark.asyncio
+async def test_master_reuses_research_for_events_of_the_same_company(
+    monkeypatch, tmp_path
+):
+    for name in ("run_log_dir", "workflow_log_dir", "research_artifact_dir"):
+        monkeypatch.setattr(settings, name, tmp_path / name)
+    monkeypatch.setattr(settings, "research_cache_enabled", True, raising=False)
+    artifact = tmp_path / "dossier.json"
+    artifact.write_text("{}", encoding="utf-8")
+
+    master = MasterWorkflowAgent(event_agent=object())
+    agent = _CountingResearchAgent(str(artifact))
+    info = {"company_name": "Example", "company_domain": "example.com"}
+
+    async def research(event_id: str, creator: str) -> Dict[str, Any]:
+        event = {"id": event_id, "creator": {"email": creator}}
+        return await master._run_research_agent(
+            agent, "dossier_research", {}, event, info, event_id, force=True
+        )
+
+    try:
+        concurrent = await asyncio.gather(
+            research("evt-1", "a@example.com"), research("evt-2", "b@example.com")
+        )
+        later = await research("evt-3", "c@example.com")
+        master.research_cache.flush()
+    finally:
+        await master.aclose()
+
+    assert agent.calls == 1
+    assert [result["artifact_path"] for result in (*concurrent, later)] == [
+        str(artifact)
+    ] * 3
+    # Event-specific fields follow the event, not the cached computation.
+    assert later["creator"] == {"email": "c@example.com"}
+    assert (tmp_path / "run_log_dir" / "state" / "research_cache.json").exists()
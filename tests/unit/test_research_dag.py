@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Mapping
+
+import pytest
+
+from utils.concurrency import ExceptionGroup
+from utils.research_dag import ResearchDAG, ResearchNode
+
+pytestmark = pytest.mark.asyncio
+
+
+def _node(name: str, delay: float, log: List[str], **kwargs: Any) -> ResearchNode:
+    async def _run(facts: Mapping[str, Any]) -> Dict[str, Any]:
+        log.append(f"start:{name}")
+        await asyncio.sleep(delay)
+        log.append(f"end:{name}")
+        return {name: f"{name}-result"}
+
+    return ResearchNode(name, _run, outputs=(name,), **kwargs)
+
+
+async def test_independent_nodes_overlap_and_critical_path_follows_inputs() -> None:
+    log: List[str] = []
+    nodes = [
+        _node("internal", 0.02, log),
+        _node("similar", 0.01, log),
+        _node("dossier", 0.03, log, inputs=("internal",)),
+    ]
+
+    result = await ResearchDAG().execute(nodes)
+
+    assert log.index("start:similar") < log.index("end:internal")
+    assert log.index("end:internal") < log.index("start:dossier")
+    assert result.facts["dossier"] == "dossier-result"
+    assert result.critical_path == ["internal", "dossier"]
+    assert result.to_dict()["nodes"]["dossier"]["status"] == "completed"
+
+
+async def test_cached_outputs_and_false_conditions_skip_nodes() -> None:
+    log: List[str] = []
+    nodes = [
+        _node("internal", 0, log),
+        _node("dossier", 0, log, inputs=("internal",), when=lambda facts: False),
+        _node("similar", 0, log),
+    ]
+
+    result = await ResearchDAG().execute(nodes, {"internal": {"cached": True}})
+
+    assert log == ["start:similar", "end:similar"]
+    assert result.facts["internal"] == {"cached": True}
+    assert "dossier" not in result.facts
+    assert result.timings["internal"].status == "cached"
+    assert result.timings["dossier"].status == "skipped"
+
+
+async def test_limits_apply_across_concurrent_executions() -> None:
+    dag = ResearchDAG(limits={"dossier": 1})
+    running = 0
+    peak = 0
+
+    async def _dossier(facts: Mapping[str, Any]) -> Dict[str, Any]:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {"dossier": True}
+
+    node = ResearchNode("dossier", _dossier, outputs=("dossier",))
+    await asyncio.gather(*(dag.execute([node]) for _ in range(3)))
+
+    assert peak == 1
+
+
+async def test_failures_cancel_siblings_and_propagate_selected_types() -> None:
+    cancelled: List[str] = []
+
+    async def _fail(facts: Mapping[str, Any]) -> None:
+        await asyncio.sleep(0.01)
+        raise TimeoutError("circuit open")
+
+    async def _slow(facts: Mapping[str, Any]) -> None:
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append("slow")
+            raise
+
+    nodes = [ResearchNode("fail", _fail), ResearchNode("slow", _slow)]
+
+    with pytest.raises(ExceptionGroup):
+        await ResearchDAG().execute(nodes)
+    with pytest.raises(TimeoutError):
+        await ResearchDAG(propagate=(TimeoutError,)).execute(nodes)
+    assert cancelled == ["slow", "slow"]
+
+
+async def test_validate_rejects_cycles_and_unknown_inputs() -> None:
+    async def _noop(facts: Mapping[str, Any]) -> None:
+        return None
+
+    with pytest.raises(ValueError, match="cycle"):
+        ResearchDAG.validate(
+            [
+                ResearchNode("a", _noop, inputs=("b",), outputs=("a",)),
+                ResearchNode("b", _noop, inputs=("a",), outputs=("b",)),
+            ]
+        )
+    with pytest.raises(ValueError, match="unresolvable"):
+        ResearchDAG.validate([ResearchNode("a", _noop, inputs=("missing",))])
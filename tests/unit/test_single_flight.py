@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from utils.single_flight import SingleFlight, call_key
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_concurrent_calls_are_coalesced() -> None:
+    group = SingleFlight("test")
+    calls = 0
+    release = asyncio.Event()
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return {"value": calls}
+
+    waiters = [asyncio.create_task(group.do("key", fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert group.in_flight("key") == 1
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert calls == 1
+    assert results == [{"value": 1}] * 3
+    assert results[0] is not results[1]
+    assert group.in_flight() == 0
+
+    # Once finished, the next call for the key runs again.
+    assert await group.do("key", fetch) == {"value": 2}
+
+
+async def test_errors_propagate_to_every_waiter() -> None:
+    group = SingleFlight("test")
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        group.do("key", fail), group.do("key", fail), return_exceptions=True
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert group.in_flight() == 0
+
+
+async def test_cancelling_one_waiter_keeps_the_shared_call_running() -> None:
+    group = SingleFlight("test")
+    release = asyncio.Event()
+    started = 0
+
+    async def fetch():
+        nonlocal started
+        started += 1
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(group.do("key", fetch))
+    second = asyncio.create_task(group.do("key", fetch))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    release.set()
+    assert await second == "done"
+    assert started == 1
+
+
+async def test_last_waiter_cancellation_cancels_the_call() -> None:
+    group = SingleFlight("test")
+    cancelled = asyncio.Event()
+
+    async def fetch():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    waiter = asyncio.create_task(group.do("key", fetch))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+    await asyncio.sleep(0)
+    assert group.in_flight() == 0
+
+
+async def test_call_key_is_stable_for_keyword_order() -> None:
+    assert call_key("find", "a.com", limit=1, properties=None) == call_key(
+        "find", "a.com", properties=None, limit=1
+    )
+    assert call_key("find", "a.com") != call_key("find", "b.com")
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from utils.stage_checkpoints import (
+    STAGE_EXTRACTION,
+    STAGE_TRIGGER,
+    StageCheckpointStore,
+    inputs_digest,
+)
+
+
+def _store(tmp_path: Path, **overrides: Any) -> StageCheckpointStore:
+    options: Dict[str, Any] = {"config_hash": "cfg", "ttl_seconds": 60.0}
+    options.update(overrides)
+    return StageCheckpointStore(tmp_path / "checkpoints", **options)
+
+
+def test_saved_stage_survives_restart(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    store.save("fp", STAGE_TRIGGER, {"trigger": True}, event_id="evt-1", now=100.0)
+
+    restarted = _store(tmp_path)
+    assert restarted.load("fp", STAGE_TRIGGER, now=110.0) == {"trigger": True}
+    assert restarted.load("fp", STAGE_EXTRACTION, now=110.0) is None
+    assert restarted.saved_stages == {STAGE_TRIGGER: 1}
+
+
+def test_expired_and_foreign_config_checkpoints_are_ignored(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    store.save("fp", STAGE_TRIGGER, {"trigger": True}, now=100.0)
+
+    assert _store(tmp_path).load("fp", STAGE_TRIGGER, now=161.0) is None
+    assert _store(tmp_path, config_hash="other").load("fp", STAGE_TRIGGER) is None
+    # The invalidated document is removed from disk.
+    assert not (tmp_path / "checkpoints" / "fp.json").exists()
+
+
+def test_inputs_digest_must_match(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    digest = inputs_digest({"company_name": "ACME", "company_domain": "acme.com"})
+    store.save("fp", "internal_research", {"status": "ok"}, inputs=digest, now=1.0)
+
+    assert store.load("fp", "internal_research", inputs=digest, now=2.0) == {
+        "status": "ok"
+    }
+    other = inputs_digest({"company_name": "ACME", "company_domain": "acme.de"})
+    assert store.load("fp", "internal_research", inputs=other, now=2.0) is None
+
+
+def test_prune_discard_and_clear(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    store.save("old", STAGE_TRIGGER, {}, now=0.0)
+    store.save("new", STAGE_TRIGGER, {}, now=100.0)
+    store.save("done", STAGE_TRIGGER, {}, now=100.0)
+
+    assert store.prune(now=120.0) == 1
+    store.discard("done")
+    assert sorted(path.stem for path in store.directory.glob("*.json")) == ["new"]
+    assert store.clear() == 1
+
+
+class _Events:
+    def __init__(self, event: Dict[str, Any]) -> None:
+        self._event = event
+
+    async def poll(self) -> List[Dict[str, Any]]:
+        return [dict(self._event)]
+
+
+class _Trigger:
+    calls = 0
+
+    async def check(self, _event: Dict[str, Any]) -> Dict[str, Any]:
+        type(self).calls += 1
+        return {"trigger": True, "type": "hard"}
+
+
+class _Extraction:
+    calls = 0
+
+    async def extract(self, _event: Dict[str, Any]) -> Dict[str, Any]:
+        type(self).calls += 1
+        return {"info": {"company_name": "ACME"}, "is_complete": False}
+
+
+@pytest.mark.asyncio
+async def test_master_agent_resumes_from_checkpoints(
+    orchestrator_environment, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from agents.master_workflow_agent import MasterWorkflowAgent
+
+    event = {"id": "evt-ckpt", "summary": "Kick-off"}
+
+    async def _fail_after_extraction(*_args: Any, **_kwargs: Any) -> None:
+        raise RuntimeError("crash")
+
+    first = MasterWorkflowAgent(
+        event_agent=_Events(event),
+        trigger_agent=_Trigger(),
+        extraction_agent=_Extraction(),
+    )
+    monkeypatch.setattr(first, "_collect_missing_info_via_hitl", _fail_after_extraction)
+    with pytest.raises(RuntimeError):
+        await first.process_all_events()
+
+    second = MasterWorkflowAgent(
+        event_agent=_Events(event),
+        trigger_agent=_Trigger(),
+        extraction_agent=_Extraction(),
+    )
+
+    async def _no_follow_up(*_args: Any, **_kwargs: Any) -> None:
+        return None
+
+    monkeypatch.setattr(second, "_collect_missing_info_via_hitl", _no_follow_up)
+    results = await second.process_all_events()
+
+    assert _Trigger.calls == 1
+    assert _Extraction.calls == 1
+    assert results[0]["resumed_stages"] == [STAGE_TRIGGER, STAGE_EXTRACTION]
+
+
+@pytest.mark.asyncio
+async def test_checkpoints_survive_finalisation_of_a_failed_run(
+    orchestrator_environment, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from agents.master_workflow_agent import MasterWorkflowAgent
+    from agents.workflow_orchestrator import WorkflowOrchestrator
+
+    monkeypatch.setattr(WorkflowOrchestrator, "_create_inbox_agent", lambda self: None)
+    master = MasterWorkflowAgent(
+        event_agent=_Events({"id": "evt-final", "summary": "Kick-off"}),
+        trigger_agent=_Trigger(),
+        extraction_agent=_Extraction(),
+    )
+
+    async def _crash(*_args: Any, **_kwargs: Any) -> None:
+        raise RuntimeError("crash")
+
+    monkeypatch.setattr(master, "_collect_missing_info_via_hitl", _crash)
+    with pytest.raises(RuntimeError):
+        await master.process_all_events()
+
+    WorkflowOrchestrator(run_id="run-final", master_agent=master)._finalize()
+
+    assert [path.stem for path in master._checkpoint_dir.glob("*.json")]
+
+
+@pytest.mark.asyncio
+async def test_checkpoints_are_discarded_once_an_event_is_final(
+    orchestrator_environment,
+) -> None:
+    from agents.master_workflow_agent import MasterWorkflowAgent
+
+    class _NoTrigger:
+        async def check(self, _event: Dict[str, Any]) -> Dict[str, Any]:
+            return {"trigger": False}
+
+    event = {"id": "evt-quiet", "summary": "Lunch"}
+    master = MasterWorkflowAgent(
+        event_agent=_Events(event),
+        trigger_agent=_NoTrigger(),
+        extraction_agent=_Extraction(),
+    )
+    # Left behind by an earlier interrupted run of the same event.
+    master._load_checkpoint_store()
+    master._checkpoint_stage(event, STAGE_EXTRACTION, {"info": {}})
+    assert list(master._checkpoint_dir.glob("*.json"))
+
+    results = await master.process_all_events()
+
+    assert results[0]["status"] == "no_trigger"
+    assert list(master._checkpoint_dir.glob("*.json")) == []
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from utils.negative_cache import NegativeEventCache
+from utils.trigger_signature import may_contain, text_signature
+
+
+def test_signature_rules_out_absent_terms() -> None:
+    signature = text_signature("Quarterly Review", "Budget planning with Müller")
+
+    assert may_contain(signature, "quarterly")
+    assert may_contain(signature, "BUDGET PLANNING")
+    assert may_contain(signature, "muller")
+    assert not may_contain(signature, "recherche")
+    assert not may_contain(signature, "")
+
+
+def test_signature_grows_with_text_and_stays_bounded() -> None:
+    short = text_signature("Lunch")
+    varied = "".join(f"{index:05d}" for index in range(3000))
+    long = text_signature("word " * 2000 + varied)
+
+    assert len(short) == 16
+    assert len(long) <= 1024
+    assert may_contain(short, "ab") is True  # shorter than a trigram
+
+
+def _set_time(monkeypatch: pytest.MonkeyPatch, value: float) -> None:
+    monkeypatch.setattr("utils.negative_cache.time.time", lambda: value)
+
+
+def test_reconcile_rules_only_invalidates_possible_matches(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "negative.json"
+    cache = NegativeEventCache.load(path, rule_hash="old", now=0)
+    cache.reconcile_rules("old", ["Recherche"])
+    _set_time(monkeypatch, 10.0)
+    lunch = {"id": "evt-1", "summary": "Team lunch"}
+    audit = {"id": "evt-2", "summary": "Audit prep", "description": "Due diligence"}
+    cache.record_no_trigger(lunch, "old", "no_trigger")
+    cache.record_no_trigger(audit, "old", "no_trigger")
+    cache.flush()
+
+    reloaded = NegativeEventCache.load(path, rule_hash="new", now=10.0)
+    assert reloaded.rule_words == ["Recherche"]
+    kept, invalidated = reloaded.reconcile_rules(
+        "new", ["Recherche", "Due Diligence"]
+    )
+
+    assert (kept, invalidated) == (1, 1)
+    assert reloaded.should_skip(lunch, "new") is True
+    assert reloaded.should_skip(audit, "new") is False
+
+
+def test_reconcile_rules_checks_synonyms_and_keeps_on_removal(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = NegativeEventCache.load(tmp_path / "negative.json", rule_hash="a", now=0)
+    cache.reconcile_rules("a", ["Recherche", "Dossier"])
+    _set_time(monkeypatch, 10.0)
+    event = {"id": "evt-1", "summary": "Background analysis for ACME"}
+    cache.record_no_trigger(event, "a", "no_trigger")
+
+    assert cache.reconcile_rules("b", ["Recherche"]) == (1, 0)
+    assert cache.reconcile_rules(
+        "c", ["Recherche", "Profil"], synonyms=["background analysis"]
+    ) == (0, 1)
+
+
+def test_reconcile_rules_without_previous_words_keeps_full_invalidation(
+    tmp_path: Path,
+) -> None:
+    path = tmp_path / "negative.json"
+    path.write_text(
+        json.dumps(
+            {
+                "version": 1,
+                "entries": {
+                    "evt-1": {
+                        "fingerprint": "abc",
+                        "rule_hash": "old",
+                        "decision": "no_trigger",
+                        "last_seen": 10.0,
+                    }
+                },
+            }
+        ),
+        encoding="utf-8",
+    )
+    cache = NegativeEventCache.load(path, rule_hash="new", now=10.0)
+
+    assert cache.reconcile_rules("new", ["Recherche"]) == (0, 0)
+    assert cache.entries["evt-1"]["rule_hash"] == "old"
+    assert cache.rule_hash == "new"
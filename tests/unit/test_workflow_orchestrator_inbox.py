@@ -170,6 +170,19 @@ async def test_on_pending_records_context(orchestrator: WorkflowOrchestrator) ->
     assert orchestrator._pending_audits["audit-1"]["kind"] == "missing_info"
 
 
+def test_cycle_summary_counts_persisted_pending_audits(
+    orchestrator: WorkflowOrchestrator,
+) -> None:
+    class _Storage:
+        def pending_audit_ids(self) -> set[str]:
+            return {"audit-earlier-run", "audit-1"}
+
+    orchestrator.storage_agent = _Storage()
+    orchestrator._on_pending_audit("missing_info", "audit-1", {"event_id": "evt"})
+
+    assert orchestrator.cycle_summary()["pending_audits"] == 2
+
+
 @pytest.mark.asyncio
 async def test_on_pending_skips_without_inbox(orchestrator: WorkflowOrchestrator) -> None:
     orchestrator.inbox_agent = None
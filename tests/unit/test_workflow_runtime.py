@@ -0,0 +1,149 @@
+"""Tests for the long-lived daemon runtime, including a soak test."""
+
+from __future__ import annotations
+
+import gc
+import logging
+import os
+import threading
+import tracemalloc
+from typing import Any, Dict, List
+
+import pytest
+
+from agents.master_workflow_agent import MasterWorkflowAgent
+from agents.workflow_runtime import WorkflowRuntime
+from config.config import settings
+from utils.observability import current_run_id_var
+from utils.workflow_steps import workflow_step_recorder
+
+
+class _EventAgent:
+    def __init__(self) -> None:
+        self.polls = 0
+
+    async def poll(self) -> List[Dict[str, Any]]:
+        # A stable calendar: per-event state must not grow from cycle to cycle.
+        self.polls += 1
+        return [{"id": "evt-1", "summary": "Weekly sync"}]
+
+    async def aclose(self) -> None:
+        return None
+
+
+class _TriggerAgent:
+    async def check(self, _event: Dict[str, Any]) -> Dict[str, Any]:
+        return {"trigger": False}
+
+
+@pytest.fixture
+def isolated_dirs(monkeypatch, tmp_path):
+    for name in ("run_log_dir", "workflow_log_dir", "research_artifact_dir"):
+        monkeypatch.setattr(settings, name, tmp_path / name)
+    monkeypatch.setattr(settings, "hitl_inbox_enabled", False, raising=False)
+    return tmp_path
+
+
+def _open_fds() -> int:
+    fd_dir = "/proc/self/fd"
+    return len(os.listdir(fd_dir)) if os.path.isdir(fd_dir) else 0
+
+
+@pytest.mark.asyncio
+async def test_runtime_reuses_master_across_cycles(isolated_dirs):
+    created: List[MasterWorkflowAgent] = []
+
+    def factory() -> MasterWorkflowAgent:
+        master = MasterWorkflowAgent(
+            event_agent=_EventAgent(), trigger_agent=_TriggerAgent()
+        )
+        created.append(master)
+        return master
+
+    runtime = WorkflowRuntime(master_factory=factory)
+    try:
+        for index in range(3):
+            run_id = f"run-reuse-{index}"
+            current_run_id_var.set(run_id)
+            summary = await runtime.run_cycle(run_id)
+            assert summary["run_id"] == run_id
+            assert summary["events_processed"] == 1
+            # Re-polled events skipped as already processed are not activity.
+            assert summary["events_active"] == (1 if index == 0 else 0)
+            # Per-run step records are dropped after each cycle.
+            assert not any(
+                key[0] == run_id for key in workflow_step_recorder._seen_steps
+            )
+    finally:
+        await runtime.aclose()
+
+    [master] = created
+    assert master.event_agent.polls == 3
+    assert master.run_id == "run-reuse-2"
+    assert runtime.cycles == 3
+    current_run_id_var.set("")
+
+
+@pytest.mark.asyncio
+async def test_changed_trigger_words_are_reloaded(isolated_dirs, monkeypatch):
+    monkeypatch.setattr(settings, "trigger_words", [], raising=False)
+    master = MasterWorkflowAgent(event_agent=_EventAgent())
+    words_file = isolated_dirs / "trigger_words.txt"
+    words_file.write_text("alpha\n", encoding="utf-8")
+    master._trigger_words_file = words_file
+    master._rule_sources_signature = ()
+    try:
+        assert await master.reload_changed_rules() is True
+        assert master.trigger_words == ["alpha"]
+        first_agent, first_hash = master.trigger_agent, master._rule_hash
+
+        # Unchanged files are not reloaded.
+        assert await master.reload_changed_rules() is False
+
+        words_file.write_text("alpha\nbeta gamma\n", encoding="utf-8")
+        os.utime(words_file, ns=(0, 10**9))
+        assert await master.reload_changed_rules() is True
+        assert master.trigger_agent is not first_agent
+        assert master._rule_hash != first_hash
+        assert "beta gamma" in master.trigger_agent.original_trigger_words
+    finally:
+        await master.aclose()
+
+
+@pytest.mark.asyncio
+async def test_soak_memory_threads_and_fds_stay_flat(isolated_dirs):
+    runtime = WorkflowRuntime(
+        master_factory=lambda: MasterWorkflowAgent(
+            event_agent=_EventAgent(), trigger_agent=_TriggerAgent()
+        )
+    )
+
+    async def cycle(index: int) -> None:
+        run_id = f"run-soak-{index}"
+        current_run_id_var.set(run_id)
+        await runtime.run_cycle(run_id)
+
+    # pytest keeps every captured log record; measure the runtime instead.
+    logging.disable(logging.INFO)
+    tracemalloc.start()
+    try:
+        for index in range(10):  # warm-up: caches, loggers, lazy imports
+            await cycle(index)
+        gc.collect()
+        baseline_memory = tracemalloc.get_traced_memory()[0]
+        baseline_threads = threading.active_count()
+        baseline_fds = _open_fds()
+
+        for index in range(10, 60):
+            await cycle(index)
+        gc.collect()
+        growth = tracemalloc.get_traced_memory()[0] - baseline_memory
+    finally:
+        tracemalloc.stop()
+        logging.disable(logging.NOTSET)
+        await runtime.aclose()
+
+    assert growth < 256 * 1024, f"memory grew by {growth} bytes over 50 cycles"
+    assert threading.active_count() <= baseline_threads
+    assert _open_fds() <= baseline_fds
+    current_run_id_var.set("")
@@ -0,0 +1,175 @@
+"""Adaptive polling interval for the workflow daemon."""
+
+from __future__ import annotations
+
+import logging
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, tzinfo
+from typing import Any, Callable, Deque, Mapping, Optional
+
+from utils.datetime_formatting import CET_ZONE
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CycleOutcome:
+    """What one daemon cycle observed."""
+
+    events: int = 0
+    duration_seconds: float = 0.0
+    pending_audits: int = 0
+    failed: bool = False
+
+    @classmethod
+    def from_summary(cls, summary: Optional[Mapping[str, Any]]) -> "CycleOutcome":
+        """Build an outcome from :meth:`WorkflowOrchestrator.cycle_summary`.
+
+        Only events that were not skipped (``events_active``) count as
+        activity; re-polled, already processed events do not.
+        """
+
+        summary = summary or {}
+        return cls(
+            events=int(summary.get("events_active") or 0),
+            duration_seconds=float(summary.get("duration_seconds") or 0.0),
+            pending_audits=int(summary.get("pending_audits") or 0),
+            failed=summary.get("status") == "failure",
+        )
+
+
+@dataclass(frozen=True)
+class ScheduleDecision:
+    """Delay until the next cycle and why it was chosen."""
+
+    delay_seconds: float
+    interval_seconds: float
+    reason: str
+
+
+class AdaptiveScheduler:
+    """Choose the delay before the next daemon cycle from recent activity.
+
+    The target interval (start to start) tightens towards ``min_interval``
+    while cycles find events or HITL audits are pending and backs off
+    exponentially by ``backoff_factor`` for every quiet cycle, up to
+    ``max_interval``. Outside business hours the scheduler waits for the
+    next business start (capped by ``max_interval``) unless audits are
+    pending. The time spent in the last cycle is deducted from the delay.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_interval: float,
+        min_interval: float,
+        max_interval: float,
+        backoff_factor: float = 2.0,
+        busy_threshold: int = 10,
+        history: int = 6,
+        business_hours: Optional[tuple[int, int]] = (7, 19),
+        business_days: frozenset[int] = frozenset(range(5)),
+        timezone: tzinfo = CET_ZONE,
+        clock: Optional[Callable[[], datetime]] = None,
+    ) -> None:
+        self.min_interval = max(0.0, float(min_interval))
+        self.max_interval = max(self.min_interval, float(max_interval))
+        self.base_interval = min(
+            self.max_interval, max(self.min_interval, float(base_interval))
+        )
+        self.backoff_factor = max(1.0, float(backoff_factor))
+        self.busy_threshold = max(1, int(busy_threshold))
+        self.business_hours = business_hours
+        self.business_days = business_days
+        self.timezone = timezone
+        self._clock = clock or (lambda: datetime.now(self.timezone))
+        self._history: Deque[CycleOutcome] = deque(maxlen=max(1, int(history)))
+        self.interval = self.base_interval
+
+    @property
+    def change_rate(self) -> float:
+        """Average events per cycle over the recent history."""
+
+        if not self._history:
+            return 0.0
+        return sum(outcome.events for outcome in self._history) / len(self._history)
+
+    def record(self, outcome: CycleOutcome) -> ScheduleDecision:
+        """Record a finished cycle and return the decision for the next one."""
+
+        self._history.append(outcome)
+        interval, reason = self._next_interval(outcome)
+        self.interval = interval
+
+        delay = max(0.0, interval - outcome.duration_seconds)
+        if outcome.pending_audits == 0:
+            off_hours_delay = self._seconds_until_business_hours()
+            if off_hours_delay > delay:
+                delay = min(self.max_interval, off_hours_delay)
+                reason = "outside business hours"
+        delay = max(self.min_interval, delay)
+
+        decision = ScheduleDecision(
+            delay_seconds=round(delay, 3), interval_seconds=interval, reason=reason
+        )
+        logger.info(
+            "Next daemon cycle in %.0fs (interval %.0fs): %s "
+            "[events=%d rate=%.1f duration=%.1fs pending_audits=%d]",
+            decision.delay_seconds,
+            interval,
+            reason,
+            outcome.events,
+            self.change_rate,
+            outcome.duration_seconds,
+            outcome.pending_audits,
+        )
+        return decision
+
+    def _next_interval(self, outcome: CycleOutcome) -> tuple[float, str]:
+        if outcome.pending_audits:
+            return self.min_interval, f"{outcome.pending_audits} HITL audit(s) pending"
+        if outcome.failed:
+            return self.base_interval, "last cycle failed; using base interval"
+        if outcome.events >= self.busy_threshold or (
+            self.change_rate >= self.busy_threshold
+        ):
+            return self.min_interval, (
+                f"high activity ({outcome.events} events, "
+                f"{self.change_rate:.1f}/cycle recently)"
+            )
+        if outcome.events:
+            interval = max(
+                self.min_interval,
+                min(self.interval, self.base_interval) / self.backoff_factor,
+            )
+            return interval, f"{outcome.events} new event(s); tightening"
+        interval = min(
+            self.max_interval,
+            max(self.interval, self.base_interval / self.backoff_factor)
+            * self.backoff_factor,
+        )
+        if interval >= self.max_interval:
+            return interval, "quiet; at maximum interval"
+        return interval, "no new events; backing off"
+
+    def _seconds_until_business_hours(self) -> float:
+        """Return ``0`` during business hours, else the wait until they start."""
+
+        if self.business_hours is None:
+            return 0.0
+        start_hour, end_hour = self.business_hours
+        now = self._clock().astimezone(self.timezone)
+        if now.weekday() in self.business_days and start_hour <= now.hour < end_hour:
+            return 0.0
+        candidate = now.replace(hour=start_hour, minute=0, second=0, microsecond=0)
+        if candidate <= now:
+            candidate += timedelta(days=1)
+        for _ in range(7):
+            if candidate.weekday() in self.business_days:
+                break
+            candidate += timedelta(days=1)
+        return (candidate - now).total_seconds()
+
+
+__all__ = ["AdaptiveScheduler", "CycleOutcome", "ScheduleDecision"]
@@ -2,43 +2,63 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Mapping, Optional
+import time
+from types import SimpleNamespace
+from typing import Any, Mapping, Optional, Union
+from urllib.parse import urlsplit
 
 import httpx
 
-import tenacity
-from tenacity import retry, retry_if_exception_type, stop_after_attempt
-
-from .retry import DEFAULT_MAX_ATTEMPTS, INITIAL_BACKOFF_SECONDS, MAX_BACKOFF_SECONDS
-
-_wait_random_exponential = getattr(tenacity, "wait_random_exponential", None)
-if _wait_random_exponential is None:
-    from tenacity import wait_exponential_jitter
-
-    def wait_random_exponential(*, multiplier: float, max: float):
-        return wait_exponential_jitter(initial=multiplier, max=max)
-
-else:
-    wait_random_exponential = _wait_random_exponential
+from . import deadline as deadlines
+from .circuit_breaker import SHARED_BREAKERS, CircuitBreaker, CircuitBreakerRegistry
+from .http_cache import HttpResponseCache
+from .http_pool import SHARED_POOL, ClientPool, merge_headers
+from .observability import get_current_run_id, record_cache_event
+from .retry import RetryPolicy, default_retry_policy, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_CONNECT_TIMEOUT = 5.0
 DEFAULT_READ_TIMEOUT = 20.0
 DEFAULT_TOTAL_TIMEOUT = 30.0
+RETRY_METRIC = "http_retry"
 
 
 def _log_retry(retry_state) -> None:
     if retry_state.attempt_number > 1:
         logger.warning(
-            "Retrying HTTP request after exception",
+            "Retrying HTTP request after %s",
+            getattr(retry_state, "reason", "exception"),
             extra={"attempt": retry_state.attempt_number},
         )
 
 
+def _shorter(value: Optional[float], budget: float) -> float:
+    return budget if value is None else min(value, budget)
+
+
+def _record_outcome(
+    breaker: Optional[CircuitBreaker], started: float, *, success: bool
+) -> None:
+    if breaker is not None:
+        breaker.record(success=success, latency=time.monotonic() - started)
+
+
 class AsyncHTTP:
-    """Wrapper around :class:`httpx.AsyncClient` with shared retry policy."""
+    """Wrapper around :class:`httpx.AsyncClient` with shared retry policy.
+
+    By default the underlying client is borrowed from the process-wide
+    :data:`~utils.http_pool.SHARED_POOL`, so connections survive the
+    wrapper; pass ``shared=False`` for a private client closed by
+    :meth:`aclose`. Retries follow ``retry_policy`` (the configured
+    :func:`~utils.retry.default_retry_policy` unless given), and every
+    attempt passes through the target host's circuit breaker, raising
+    :class:`~utils.circuit_breaker.CircuitOpenError` while it is open.
+    Clients created with a ``cache`` revalidate :meth:`get_json` calls with
+    ``If-None-Match``.
+    """
 
     def __init__(
         self,
@@ -47,32 +67,48 @@ class AsyncHTTP:
         headers: Optional[Mapping[str, str]] = None,
         timeout: Optional[float] = None,
         follow_redirects: bool = True,
+        shared: Optional[bool] = None,
+        pool: Optional[ClientPool] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        breakers: Optional[CircuitBreakerRegistry] = None,
+        cache: Optional[HttpResponseCache] = None,
     ) -> None:
         total_timeout = timeout or DEFAULT_TOTAL_TIMEOUT
-        self._client = httpx.AsyncClient(
-            base_url=base_url or "",
-            headers=dict(headers or {}),
-            timeout=httpx.Timeout(
-                total_timeout,
-                connect=DEFAULT_CONNECT_TIMEOUT,
-                read=DEFAULT_READ_TIMEOUT,
-            ),
-            follow_redirects=follow_redirects,
+        self._base_url = base_url or ""
+        self._headers = dict(headers or {})
+        self._timeout = httpx.Timeout(
+            total_timeout,
+            connect=DEFAULT_CONNECT_TIMEOUT,
+            read=DEFAULT_READ_TIMEOUT,
+        )
+        self._follow_redirects = follow_redirects
+        self._pool = pool or SHARED_POOL
+        self._shared = self._pool.enabled if shared is None else shared
+        self._retry_policy = retry_policy or default_retry_policy()
+        self._breakers = breakers or SHARED_BREAKERS
+        self._cache = cache
+        self._own_client: Optional[httpx.AsyncClient] = None
+        if not self._shared:
+            self._own_client = httpx.AsyncClient(
+                base_url=self._base_url,
+                headers=self._headers,
+                timeout=self._timeout,
+                follow_redirects=follow_redirects,
+            )
+
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        if self._own_client is not None:
+            return self._own_client
+        return self._pool.get_client(
+            self._base_url, follow_redirects=self._follow_redirects
         )
 
     async def aclose(self) -> None:
-        await self._client.aclose()
-
-    @retry(
-        reraise=True,
-        stop=stop_after_attempt(DEFAULT_MAX_ATTEMPTS),
-        # Jittered exponential backoff using Tenacity's built-in helper
-        wait=wait_random_exponential(
-            multiplier=INITIAL_BACKOFF_SECONDS, max=MAX_BACKOFF_SECONDS
-        ),
-        retry=retry_if_exception_type(httpx.HTTPError),
-        before=_log_retry,
-    )
+        # Shared clients belong to the pool and stay open for other users.
+        if self._own_client is not None:
+            await self._own_client.aclose()
+
     async def request(
         self,
         method: str,
@@ -83,18 +119,162 @@ class AsyncHTTP:
         data: Optional[Any] = None,
         headers: Optional[Mapping[str, str]] = None,
         timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
     ) -> httpx.Response:
+        """Send a request, retrying transient failures per the retry policy.
+
+        ``deadline`` bounds the total time in seconds spent on retries
+        (defaults to the policy deadline); an enclosing
+        :func:`~utils.deadline.deadline_scope` shortens it and the per-attempt
+        timeouts further. When retries stop, the last response is returned
+        or the last exception re-raised.
+        """
+
         logger.debug("AsyncHTTP request", extra={"method": method, "url": url})
-        response = await self._client.request(
-            method,
-            url,
-            params=params,
-            json=json,
-            headers=headers,
-            timeout=timeout,
-            data=data,
+        if self._own_client is None:
+            headers = merge_headers(self._headers, headers)
+        policy = self._retry_policy
+        budget = (
+            policy.budgets.for_run(get_current_run_id())
+            if policy.budgets is not None
+            else None
+        )
+        if budget is not None:
+            budget.record_request()
+        expires = policy.deadline_from(time.monotonic(), deadline)
+        context_deadline = deadlines.current_deadline()
+        if context_deadline is not None:
+            expires = min(expires, context_deadline)
+        breaker = self._breakers.get(self._host_for(url))
+
+        attempt = 1
+        while True:
+            retry_after: Optional[float] = None
+            attempt_timeout = self._attempt_timeout(timeout)
+            if breaker is not None:
+                breaker.before_call()
+            started = time.monotonic()
+            try:
+                response = await self._client.request(
+                    method,
+                    url,
+                    params=params,
+                    json=json,
+                    headers=headers,
+                    timeout=attempt_timeout,
+                    data=data,
+                )
+            except httpx.HTTPError as exc:
+                _record_outcome(breaker, started, success=False)
+                if not policy.should_retry_exception(method, exc):
+                    raise
+                reason = type(exc).__name__
+                failure: Any = exc
+            except BaseException:
+                # Cancelled (e.g. by a caller's timeout): says nothing about
+                # the host, so the call is not counted either way.
+                if breaker is not None:
+                    breaker.release()
+                raise
+            else:
+                _record_outcome(breaker, started, success=response.status_code < 500)
+                if not policy.should_retry_status(method, response.status_code):
+                    return response
+                reason = f"HTTP {response.status_code}"
+                retry_after = parse_retry_after(response.headers.get("retry-after"))
+                failure = response
+
+            delay = policy.backoff(attempt, retry_after)
+            if attempt >= policy.max_attempts:
+                record_cache_event(RETRY_METRIC, "exhausted")
+                return self._give_up(failure)
+            if time.monotonic() + delay > expires:
+                record_cache_event(RETRY_METRIC, "deadline")
+                return self._give_up(failure)
+            if budget is not None and not budget.try_acquire():
+                record_cache_event(RETRY_METRIC, "budget_exhausted")
+                return self._give_up(failure)
+
+            if isinstance(failure, httpx.Response):
+                await failure.aclose()
+            attempt += 1
+            record_cache_event(RETRY_METRIC, "retry")
+            _log_retry(SimpleNamespace(attempt_number=attempt, reason=reason))
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    def _attempt_timeout(
+        self, timeout: Optional[float]
+    ) -> Union[float, httpx.Timeout]:
+        configured: Union[float, httpx.Timeout] = (
+            self._timeout if timeout is None else timeout
+        )
+        budget = deadlines.clamp_timeout(None, stage="http")
+        if budget is None:
+            return configured
+        if isinstance(configured, httpx.Timeout):
+            return httpx.Timeout(
+                connect=_shorter(configured.connect, budget),
+                read=_shorter(configured.read, budget),
+                write=_shorter(configured.write, budget),
+                pool=_shorter(configured.pool, budget),
+            )
+        return min(configured, budget)
+
+    def _host_for(self, url: str) -> str:
+        host = urlsplit(url).hostname or urlsplit(self._base_url).hostname
+        return (host or "").lower()
+
+    @staticmethod
+    def _give_up(failure: Any) -> httpx.Response:
+        if isinstance(failure, BaseException):
+            raise failure
+        return failure
+
+    async def get_json(
+        self,
+        url: str,
+        *,
+        params: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """``GET`` *url* and return its JSON body, revalidating cached copies.
+
+        With a response cache, a stored ``ETag`` is sent as ``If-None-Match``
+        and a ``304`` returns a copy of the previously parsed payload. Error
+        statuses raise
+        :class:`httpx.HTTPStatusError`.
+        """
+
+        cache = self._cache
+        if cache is None:
+            response = await self.get(
+                url, params=params, headers=headers, timeout=timeout
+            )
+            response.raise_for_status()
+            return response.json()
+
+        key = cache.make_key(f"{self._base_url}{url}", params)
+        entry = cache.get(key)
+        request_headers = dict(headers or {})
+        if entry is not None:
+            request_headers["If-None-Match"] = entry.etag
+        response = await self.get(
+            url, params=params, headers=request_headers, timeout=timeout
         )
-        return response
+        if response.status_code == 304 and entry is not None:
+            try:
+                return cache.revalidated(key, entry)
+            except KeyError:
+                # Evicted while the request was in flight; fetch it in full.
+                response = await self.get(
+                    url, params=params, headers=headers, timeout=timeout
+                )
+        response.raise_for_status()
+        payload = response.json()
+        cache.store(key, response.headers.get("etag"), response.content, payload)
+        return payload
 
     async def get(self, url: str, **kw: Any) -> httpx.Response:
         return await self.request("GET", url, **kw)
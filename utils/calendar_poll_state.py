@@ -0,0 +1,126 @@
+"""Per-calendar polling state persisted between daemon cycles."""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from utils.persistence import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+#: Upper bound for widening a calendar's lookback after missed poll cycles.
+MAX_CATCH_UP_DAYS = 30
+
+
+class CalendarPollState:
+    """Remember the outcome of the last poll of every calendar.
+
+    Each entry records when the calendar was last polled successfully, how
+    many events it returned, the poll latency and the last error. After an
+    outage the last successful poll time lets the next poll widen the
+    lookback window (up to :data:`MAX_CATCH_UP_DAYS`) so no events are
+    skipped. When ``path`` is ``None`` the state is kept in memory only.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = Path(path) if path is not None else None
+        self._lock = threading.Lock()
+        self._calendars: Dict[str, Dict[str, Any]] = self._load()
+
+    def get(self, calendar_id: str) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._calendars.get(calendar_id, {}))
+
+    def window_start(
+        self,
+        calendar_id: str,
+        lookback_days: int,
+        *,
+        now: Optional[datetime] = None,
+    ) -> Optional[datetime]:
+        """Return an earlier ``timeMin`` when polls were missed, else ``None``."""
+
+        now = now or datetime.now(timezone.utc)
+        last_success = self._parse(self.get(calendar_id).get("last_success"))
+        if last_success is None:
+            return None
+        default_start = now - timedelta(days=max(0, lookback_days))
+        if last_success >= default_start:
+            return None
+        return max(last_success, now - timedelta(days=MAX_CATCH_UP_DAYS))
+
+    def record_success(
+        self,
+        calendar_id: str,
+        *,
+        events: int,
+        duration_ms: float,
+        polled_at: Optional[datetime] = None,
+    ) -> None:
+        polled_at = polled_at or datetime.now(timezone.utc)
+        with self._lock:
+            entry = self._calendars.setdefault(calendar_id, {})
+            entry.update(
+                {
+                    "last_success": polled_at.isoformat(),
+                    "events": int(events),
+                    "duration_ms": round(float(duration_ms), 3),
+                    "last_error": None,
+                }
+            )
+
+    def record_failure(self, calendar_id: str, error: BaseException) -> None:
+        with self._lock:
+            entry = self._calendars.setdefault(calendar_id, {})
+            entry["last_error"] = f"{type(error).__name__}: {error}"
+            entry["last_failure"] = datetime.now(timezone.utc).isoformat()
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            payload = json.loads(json.dumps(self._calendars))
+        try:
+            atomic_write_json(self.path, payload)
+        except OSError as exc:
+            logger.warning(
+                "Could not persist calendar poll state %s: %s", self.path, exc
+            )
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self.path is None or not self.path.exists():
+            return {}
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            logger.warning(
+                "Ignoring unreadable calendar poll state %s: %s", self.path, exc
+            )
+            return {}
+        if not isinstance(payload, dict):
+            return {}
+        return {
+            str(calendar_id): dict(entry)
+            for calendar_id, entry in payload.items()
+            if isinstance(entry, dict)
+        }
+
+    @staticmethod
+    def _parse(value: Any) -> Optional[datetime]:
+        if not isinstance(value, str):
+            return None
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed
+
+
+__all__ = ["CalendarPollState", "MAX_CATCH_UP_DAYS"]
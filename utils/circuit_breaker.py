@@ -0,0 +1,274 @@
+"""Per-host circuit breakers that fail fast while an upstream is degraded."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from utils.observability import record_circuit_breaker_transition
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_WINDOW_SECONDS = 60.0
+DEFAULT_MIN_REQUESTS = 10
+DEFAULT_FAILURE_RATE = 0.5
+DEFAULT_SLOW_CALL_SECONDS = 10.0
+DEFAULT_LLM_SLOW_CALL_SECONDS = 30.0
+DEFAULT_OPEN_SECONDS = 30.0
+DEFAULT_HALF_OPEN_PROBES = 1
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request while the host's breaker is open."""
+
+    def __init__(self, host: str, retry_after: float) -> None:
+        super().__init__(
+            f"Circuit breaker for {host} is open; retry in {retry_after:.1f}s"
+        )
+        self.host = host
+        self.retry_after = retry_after
+
+
+@dataclass
+class BreakerConfig:
+    """Thresholds shared by every breaker of a registry.
+
+    A breaker opens once at least ``min_requests`` calls were recorded in
+    the last ``window_seconds`` and ``failure_rate`` of them failed or took
+    longer than ``slow_call_seconds``. ``slow_call_overrides`` sets the slow
+    threshold per host, e.g. for LLM endpoints that routinely take longer.
+    """
+
+    enabled: bool = True
+    window_seconds: float = DEFAULT_WINDOW_SECONDS
+    min_requests: int = DEFAULT_MIN_REQUESTS
+    failure_rate: float = DEFAULT_FAILURE_RATE
+    slow_call_seconds: float = DEFAULT_SLOW_CALL_SECONDS
+    open_seconds: float = DEFAULT_OPEN_SECONDS
+    half_open_probes: int = DEFAULT_HALF_OPEN_PROBES
+    slow_call_overrides: Dict[str, float] = field(default_factory=dict)
+
+    def slow_call_seconds_for(self, host: str) -> float:
+        return self.slow_call_overrides.get(host.lower(), self.slow_call_seconds)
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "BreakerConfig":
+        llm_host = (
+            urlsplit(
+                str(getattr(settings, "openai_api_base", "") or "https://api.openai.com")
+            ).hostname
+            or ""
+        ).lower()
+        return cls(
+            enabled=bool(getattr(settings, "circuit_breaker_enabled", True)),
+            window_seconds=float(
+                getattr(
+                    settings, "circuit_breaker_window_seconds", DEFAULT_WINDOW_SECONDS
+                )
+            ),
+            min_requests=int(
+                getattr(settings, "circuit_breaker_min_requests", DEFAULT_MIN_REQUESTS)
+            ),
+            failure_rate=float(
+                getattr(settings, "circuit_breaker_failure_rate", DEFAULT_FAILURE_RATE)
+            ),
+            slow_call_seconds=float(
+                getattr(
+                    settings,
+                    "circuit_breaker_slow_call_seconds",
+                    DEFAULT_SLOW_CALL_SECONDS,
+                )
+            ),
+            open_seconds=float(
+                getattr(settings, "circuit_breaker_open_seconds", DEFAULT_OPEN_SECONDS)
+            ),
+            slow_call_overrides={
+                llm_host: float(
+                    getattr(
+                        settings,
+                        "circuit_breaker_llm_slow_call_seconds",
+                        DEFAULT_LLM_SLOW_CALL_SECONDS,
+                    )
+                )
+            }
+            if llm_host
+            else {},
+        )
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker over a sliding time window.
+
+    Callers invoke :meth:`before_call` before sending a request (raising
+    :class:`CircuitOpenError` while open) and report the outcome with
+    :meth:`record`. After ``open_seconds`` the breaker lets
+    ``half_open_probes`` requests through; a successful probe closes it,
+    a failed one opens it again. Calls that end without an outcome (e.g.
+    cancelled by the caller) are handed back with :meth:`release`.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        config: Optional[BreakerConfig] = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.host = host
+        self.config = config or BreakerConfig()
+        self.slow_call_seconds = self.config.slow_call_seconds_for(host)
+        self._clock = clock
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._calls: Deque[Tuple[float, bool]] = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open(self._clock())
+            return self._state
+
+    def before_call(self) -> None:
+        """Admit a call or raise :class:`CircuitOpenError`."""
+
+        with self._lock:
+            now = self._clock()
+            self._maybe_half_open(now)
+            if self._state == CLOSED:
+                return
+            if self._state == HALF_OPEN and self._probes < max(
+                1, self.config.half_open_probes
+            ):
+                self._probes += 1
+                return
+            retry_after = max(0.0, self._opened_at + self.config.open_seconds - now)
+        raise CircuitOpenError(self.host, retry_after)
+
+    def record(self, *, success: bool, latency: float = 0.0) -> None:
+        """Report the outcome of an admitted call."""
+
+        failed = not success or latency >= self.slow_call_seconds
+        with self._lock:
+            now = self._clock()
+            if self._state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+                if failed:
+                    self._transition(OPEN, now)
+                else:
+                    self._calls.clear()
+                    self._transition(CLOSED, now)
+                return
+            if self._state == OPEN:
+                # A call admitted before the breaker opened finished late.
+                return
+            self._calls.append((now, failed))
+            self._trim(now)
+            total = len(self._calls)
+            if total < max(1, self.config.min_requests):
+                return
+            failures = sum(1 for _, call_failed in self._calls if call_failed)
+            if failures / total >= self.config.failure_rate:
+                self._transition(OPEN, now)
+
+    def release(self) -> None:
+        """Return an admitted call that finished without an outcome."""
+
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+
+    def _maybe_half_open(self, now: float) -> None:
+        if self._state == OPEN and now - self._opened_at >= self.config.open_seconds:
+            self._transition(HALF_OPEN, now)
+
+    def _trim(self, now: float) -> None:
+        horizon = now - self.config.window_seconds
+        while self._calls and self._calls[0][0] < horizon:
+            self._calls.popleft()
+
+    def _transition(self, state: str, now: float) -> None:
+        previous, self._state = self._state, state
+        if state == OPEN:
+            self._opened_at = now
+            self._probes = 0
+            self._calls.clear()
+        record_circuit_breaker_transition(
+            self.host, from_state=previous, to_state=state
+        )
+        log = logger.warning if state == OPEN else logger.info
+        log("Circuit breaker for %s: %s -> %s", self.host, previous, state)
+
+
+class CircuitBreakerRegistry:
+    """Hold one :class:`CircuitBreaker` per host for the whole process."""
+
+    def __init__(self, config: Optional[BreakerConfig] = None) -> None:
+        self._config = config
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def config(self) -> BreakerConfig:
+        if self._config is None:
+            try:
+                from config.config import settings
+            except Exception:  # pragma: no cover - configuration not importable
+                self._config = BreakerConfig()
+            else:
+                self._config = BreakerConfig.from_settings(settings)
+        return self._config
+
+    def configure(self, config: BreakerConfig) -> None:
+        """Replace the configuration and forget existing breakers."""
+
+        with self._lock:
+            self._config = config
+            self._breakers.clear()
+
+    def get(self, host: str) -> Optional[CircuitBreaker]:
+        """Return the breaker for *host*, or ``None`` when breakers are disabled."""
+
+        config = self.config
+        if not config.enabled or not host:
+            return None
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(host, config)
+                self._breakers[host] = breaker
+            return breaker
+
+    def states(self) -> Dict[str, str]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.host: breaker.state for breaker in breakers}
+
+    def reset(self) -> None:
+        """Forget all breakers (used by tests and configuration reloads)."""
+
+        with self._lock:
+            self._breakers.clear()
+
+
+#: Process-wide breakers used by :class:`utils.async_http.AsyncHTTP`.
+SHARED_BREAKERS = CircuitBreakerRegistry()
+
+
+__all__ = [
+    "BreakerConfig",
+    "CircuitBreaker",
+    "CircuitBreakerRegistry",
+    "CircuitOpenError",
+    "SHARED_BREAKERS",
+]
@@ -0,0 +1,329 @@
+"""TTL cache for HubSpot company lookups keyed by normalised domain."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from utils.observability import record_cache_event, record_cache_size
+from utils.persistence import atomic_write_json, load_json_or_default
+
+logger = logging.getLogger(__name__)
+
+
+COMPANY_CACHE_METRIC_NAME = "hubspot_company_lookup"
+COMPANY_CACHE_VERSION = 1
+DEFAULT_POSITIVE_TTL_SECONDS = 3600.0
+DEFAULT_NEGATIVE_TTL_SECONDS = 600.0
+DEFAULT_MAX_ENTRIES = 2048
+
+
+@dataclass
+class CompanyLookupEntry:
+    """Cached outcome of a company lookup.
+
+    ``company`` is ``None`` for negative results (no company owns the domain).
+    ``attachments`` is ``None`` until the file associations have been fetched.
+    ``attachment_limit`` is the limit they were fetched with (``None`` when
+    the list is complete).
+    """
+
+    company: Optional[Dict[str, Any]]
+    attachments: Optional[List[Dict[str, Any]]]
+    stored_at: float
+    expires_at: float
+    attachment_limit: Optional[int] = None
+
+    @property
+    def is_negative(self) -> bool:
+        return self.company is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "company": self.company,
+            "attachments": self.attachments,
+            "stored_at": self.stored_at,
+            "expires_at": self.expires_at,
+            "attachment_limit": self.attachment_limit,
+        }
+
+    def covers_attachments(self, limit: Optional[int]) -> bool:
+        """Return whether the cached attachments answer a request for *limit*."""
+
+        if self.attachments is None:
+            return False
+        limited = self.attachment_limit
+        if limited is None or len(self.attachments) < limited:
+            return True
+        return limit is not None and limit <= limited
+
+
+@dataclass
+class CompanyLookupCache:
+    """In-memory LRU of company lookups with optional JSON persistence.
+
+    Positive and negative results use separate TTLs so that newly created
+    companies are picked up quickly while known companies are not looked up
+    again for every event. Expired entries are reported as ``stale``.
+    """
+
+    positive_ttl: float = DEFAULT_POSITIVE_TTL_SECONDS
+    negative_ttl: float = DEFAULT_NEGATIVE_TTL_SECONDS
+    max_entries: int = DEFAULT_MAX_ENTRIES
+    path: Optional[Path] = None
+    _entries: "OrderedDict[str, CompanyLookupEntry]" = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _dirty: bool = field(default=False, init=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.path is not None:
+            self.path = Path(self.path)
+            self._load()
+
+    # ------------------------------------------------------------------
+    # Lookup API
+    # ------------------------------------------------------------------
+    @staticmethod
+    def make_key(domain: str, properties: Optional[Sequence[str]] = None) -> str:
+        if not properties:
+            return domain
+        return f"{domain}|{','.join(sorted(str(item) for item in properties))}"
+
+    def get(
+        self,
+        domain: str,
+        *,
+        properties: Optional[Sequence[str]] = None,
+        require_attachments: bool = False,
+        attachment_limit: Optional[int] = None,
+        now: Optional[float] = None,
+    ) -> Optional[CompanyLookupEntry]:
+        """Return the fresh entry for *domain* or ``None`` on a miss.
+
+        With ``require_attachments`` an entry only counts when its attachments
+        were fetched with at least ``attachment_limit`` (``None`` requests the
+        complete list).
+        """
+
+        key = self.make_key(domain, properties)
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                event = "miss"
+            elif entry.expires_at <= now:
+                del self._entries[key]
+                self._dirty = True
+                entry = None
+                event = "stale"
+            elif (
+                require_attachments
+                and entry.company is not None
+                and not entry.covers_attachments(attachment_limit)
+            ):
+                entry = None
+                event = "miss"
+            else:
+                self._entries.move_to_end(key)
+                event = "negative_hit" if entry.is_negative else "hit"
+        record_cache_event(COMPANY_CACHE_METRIC_NAME, event)
+        return entry
+
+    def put(
+        self,
+        domain: str,
+        company: Optional[Dict[str, Any]],
+        *,
+        attachments: Optional[List[Dict[str, Any]]] = None,
+        attachment_limit: Optional[int] = None,
+        properties: Optional[Sequence[str]] = None,
+        now: Optional[float] = None,
+    ) -> CompanyLookupEntry:
+        now = time.time() if now is None else now
+        ttl = self.negative_ttl if company is None else self.positive_ttl
+        entry = CompanyLookupEntry(
+            company=company,
+            attachments=attachments,
+            stored_at=now,
+            expires_at=now + max(0.0, ttl),
+            attachment_limit=attachment_limit,
+        )
+        key = self.make_key(domain, properties)
+        evicted = 0
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while self.max_entries and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            self._dirty = True
+        if evicted:
+            record_cache_event(COMPANY_CACHE_METRIC_NAME, "evicted", evicted)
+        return entry
+
+    # ------------------------------------------------------------------
+    # Invalidation hooks
+    # ------------------------------------------------------------------
+    def invalidate(self, domain: str) -> int:
+        """Drop every entry cached for *domain* (all property variants)."""
+
+        prefix = f"{domain}|"
+        with self._lock:
+            keys = [
+                key for key in self._entries if key == domain or key.startswith(prefix)
+            ]
+            for key in keys:
+                del self._entries[key]
+            if keys:
+                self._dirty = True
+        if keys:
+            record_cache_event(COMPANY_CACHE_METRIC_NAME, "invalidated", len(keys))
+        return len(keys)
+
+    def invalidate_company(self, company_id: str) -> int:
+        """Drop entries whose cached company has the given HubSpot id."""
+
+        target = str(company_id)
+        with self._lock:
+            keys = [
+                key
+                for key, entry in self._entries.items()
+                if entry.company is not None and str(entry.company.get("id")) == target
+            ]
+            for key in keys:
+                del self._entries[key]
+            if keys:
+                self._dirty = True
+        if keys:
+            record_cache_event(COMPANY_CACHE_METRIC_NAME, "invalidated", len(keys))
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            if self._entries:
+                self._dirty = True
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def flush(self, now: Optional[float] = None) -> None:
+        record_cache_size(COMPANY_CACHE_METRIC_NAME, entries=len(self._entries))
+        if self.path is None or not self._dirty:
+            return
+        now = time.time() if now is None else now
+        with self._lock:
+            payload = {
+                "version": COMPANY_CACHE_VERSION,
+                "entries": {
+                    key: entry.to_dict()
+                    for key, entry in self._entries.items()
+                    if entry.expires_at > now
+                },
+            }
+            self._dirty = False
+        try:
+            atomic_write_json(self.path, payload)
+        except Exception:
+            logger.warning(
+                "Failed to persist company lookup cache to %s", self.path, exc_info=True
+            )
+
+    def _load(self) -> None:
+        assert self.path is not None
+        raw, reason = load_json_or_default(
+            self.path,
+            default=lambda: {"version": COMPANY_CACHE_VERSION, "entries": {}},
+        )
+        if reason and reason != "missing":
+            logger.warning(
+                "Company lookup cache at %s was reset due to %s.", self.path, reason
+            )
+        entries = raw.get("entries") if isinstance(raw, dict) else None
+        if not isinstance(entries, dict):
+            return
+        now = time.time()
+        ordered: List[Tuple[str, CompanyLookupEntry]] = []
+        for key, item in entries.items():
+            if not isinstance(item, dict):
+                continue
+            try:
+                entry = CompanyLookupEntry(
+                    company=item.get("company"),
+                    attachments=item.get("attachments"),
+                    stored_at=float(item.get("stored_at", 0.0)),
+                    expires_at=float(item.get("expires_at", 0.0)),
+                    attachment_limit=(
+                        int(item["attachment_limit"])
+                        if item.get("attachment_limit") is not None
+                        else None
+                    ),
+                )
+            except (TypeError, ValueError):
+                continue
+            if entry.expires_at > now:
+                ordered.append((str(key), entry))
+        ordered.sort(key=lambda pair: pair[1].stored_at)
+        if self.max_entries:
+            ordered = ordered[-self.max_entries :]
+        self._entries.update(ordered)
+
+
+_SHARED_CACHES: Dict[str, CompanyLookupCache] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_company_cache(
+    namespace: str,
+    *,
+    positive_ttl: float = DEFAULT_POSITIVE_TTL_SECONDS,
+    negative_ttl: float = DEFAULT_NEGATIVE_TTL_SECONDS,
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+    path: Optional[Path] = None,
+) -> CompanyLookupCache:
+    """Return the process-wide cache for *namespace* (e.g. one HubSpot portal).
+
+    Sharing the cache lets short-lived integration instances, such as the ones
+    created for every daemon cycle, reuse lookups from earlier cycles.
+    """
+
+    key = hashlib.sha256(namespace.encode("utf-8")).hexdigest()
+    with _SHARED_LOCK:
+        cache = _SHARED_CACHES.get(key)
+        if cache is None:
+            cache = CompanyLookupCache(
+                positive_ttl=positive_ttl,
+                negative_ttl=negative_ttl,
+                max_entries=max_entries,
+                path=path,
+            )
+            _SHARED_CACHES[key] = cache
+        return cache
+
+
+def reset_shared_company_caches() -> None:
+    """Forget all process-wide caches (used by tests and configuration reloads)."""
+
+    with _SHARED_LOCK:
+        _SHARED_CACHES.clear()
+
+
+__all__ = [
+    "CompanyLookupCache",
+    "CompanyLookupEntry",
+    "reset_shared_company_caches",
+    "shared_company_cache",
+]
@@ -7,6 +7,8 @@ import logging
 import os
 from typing import Awaitable, Callable, Iterable, List, Optional
 
+from utils import deadline
+
 logger = logging.getLogger(__name__)
 
 try:  # Python 3.11+
@@ -38,7 +40,11 @@ _DEFAULT_RESEARCH_LIMIT = 3
 
 
 class LoggingSemaphore:
-    """Semaphore wrapper that logs concurrent acquisitions at debug level."""
+    """Semaphore wrapper that logs concurrent acquisitions at debug level.
+
+    Waiting for a slot is bounded by the current :mod:`utils.deadline`;
+    :class:`~utils.deadline.DeadlineExceeded` is raised once it passes.
+    """
 
     def __init__(self, name: str, limit: int) -> None:
         self._name = name
@@ -48,7 +54,14 @@ class LoggingSemaphore:
         self._active = 0
 
     async def __aenter__(self) -> "LoggingSemaphore":
-        await self._semaphore.acquire()
+        budget = deadline.clamp_timeout(None, stage=f"{self._name}_semaphore")
+        if budget is None:
+            await self._semaphore.acquire()
+        else:
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=budget)
+            except asyncio.TimeoutError as exc:
+                raise deadline.DeadlineExceeded(f"{self._name}_semaphore") from exc
         async with self._lock:
             self._active += 1
             logger.debug(
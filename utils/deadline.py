@@ -0,0 +1,145 @@
+"""Deadline propagation for runs, events and workflow stages.
+
+A deadline is an absolute :func:`time.monotonic` timestamp stored in a
+context variable, so it follows the current task and every task created
+from it. Nested scopes can only shorten the effective deadline. Consumers
+(``AsyncHTTP``, the concurrency semaphores, HubSpot calls and research
+agents) shrink their own timeouts to :func:`remaining`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import inspect
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Event loop timers may fire up to one clock tick early.
+_CLOCK_TOLERANCE = 0.05
+
+_deadline_var: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "workflow_deadline", default=None
+)
+_stage_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "workflow_deadline_stage", default=None
+)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when the time budget of the current scope has run out."""
+
+    def __init__(self, stage: Optional[str] = None) -> None:
+        self.stage = stage or "unknown"
+        super().__init__(f"Time budget exhausted during {self.stage}")
+
+
+def current_deadline() -> Optional[float]:
+    """Return the absolute monotonic deadline of the current context, if any."""
+
+    return _deadline_var.get()
+
+
+def remaining() -> Optional[float]:
+    """Return the seconds left before the current deadline (``None`` if unbounded)."""
+
+    deadline = _deadline_var.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def expired() -> bool:
+    budget = remaining()
+    return budget is not None and budget <= 0
+
+
+def check(stage: Optional[str] = None) -> None:
+    """Raise :class:`DeadlineExceeded` if the current deadline has passed."""
+
+    if expired():
+        raise DeadlineExceeded(stage or _stage_var.get())
+
+
+def clamp_timeout(
+    timeout: Optional[float], *, stage: Optional[str] = None
+) -> Optional[float]:
+    """Shrink *timeout* to the remaining budget, raising once it is spent."""
+
+    budget = remaining()
+    if budget is None:
+        return timeout
+    if budget <= 0:
+        raise DeadlineExceeded(stage or _stage_var.get())
+    return budget if timeout is None else min(timeout, budget)
+
+
+@contextmanager
+def deadline_scope(
+    seconds: Optional[float], *, stage: Optional[str] = None
+) -> Iterator[Optional[float]]:
+    """Bound the enclosed code to *seconds* (``None`` or ``<= 0`` adds no limit).
+
+    The effective deadline never extends an enclosing one. Yields the
+    absolute deadline in force inside the scope.
+    """
+
+    deadline = _deadline_var.get()
+    if seconds is not None and seconds > 0:
+        candidate = time.monotonic() + seconds
+        deadline = candidate if deadline is None else min(deadline, candidate)
+    deadline_token = _deadline_var.set(deadline)
+    stage_token = _stage_var.set(stage) if stage else None
+    try:
+        yield deadline
+    finally:
+        if stage_token is not None:
+            _stage_var.reset(stage_token)
+        _deadline_var.reset(deadline_token)
+
+
+async def run_with_deadline(
+    awaitable: Awaitable[T],
+    seconds: Optional[float] = None,
+    *,
+    stage: Optional[str] = None,
+) -> T:
+    """Await *awaitable* within *seconds* and the enclosing deadline.
+
+    The work is cancelled when the budget runs out and
+    :class:`DeadlineExceeded` is raised in its place.
+    """
+
+    with deadline_scope(seconds, stage=stage):
+        budget = remaining()
+        if budget is None:
+            return await awaitable
+        if budget <= 0:
+            if inspect.iscoroutine(awaitable):
+                awaitable.close()
+            raise DeadlineExceeded(_stage_var.get())
+        try:
+            return await asyncio.wait_for(awaitable, timeout=budget)
+        except asyncio.TimeoutError as exc:
+            budget = remaining()
+            if isinstance(exc, DeadlineExceeded) or (
+                budget is not None and budget > _CLOCK_TOLERANCE
+            ):
+                # Raised by the work itself (e.g. a per-call timeout).
+                raise
+            raise DeadlineExceeded(_stage_var.get()) from exc
+
+
+__all__ = [
+    "DeadlineExceeded",
+    "check",
+    "clamp_timeout",
+    "current_deadline",
+    "deadline_scope",
+    "expired",
+    "remaining",
+    "run_with_deadline",
+]
@@ -116,6 +116,12 @@ def _extract_email_domain(value: Any) -> str | None:
     return None
 
 
+def business_domain_from_email(value: Any) -> str | None:
+    """Return the company domain of an email address, ignoring freemail providers."""
+
+    return _extract_email_domain(value)
+
+
 def _resolve_from_mapping(company_name: str | None) -> Tuple[str | None, str | None]:
     if not company_name:
         return None, None
@@ -0,0 +1,219 @@
+"""Shared fingerprinting for calendar events used by the workflow caches."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+try:  # pragma: no cover - optional dependency import
+    import orjson
+except ImportError:  # pragma: no cover - fallback to the standard library
+    orjson = None  # type: ignore[assignment]
+
+from utils.datetime_formatting import format_cet_timestamp
+
+
+#: Bump when the digest layout changes so persisted caches can migrate entries.
+FINGERPRINT_VERSION = 2
+
+#: Digest size in bytes; the binary fingerprint store relies on this width.
+DIGEST_SIZE = 16
+
+SIGNIFICANT_EVENT_FIELDS = (
+    "summary",
+    "description",
+    "location",
+    "eventType",
+    "creator",
+    "organizer",
+    "conferenceData",
+    "attachments",
+    "attendees",
+    "extendedProperties",
+)
+
+
+@dataclass(frozen=True)
+class EventFingerprint:
+    """Digests describing one polled event payload.
+
+    ``content_digest`` covers every field that influences downstream processing
+    and is used by :class:`~utils.processed_event_cache.ProcessedEventCache`.
+    ``trigger_digest`` only covers the text the trigger detection looks at and
+    backs :class:`~utils.negative_cache.NegativeEventCache`.
+    """
+
+    event_id: str
+    updated: Optional[str]
+    content_digest: str
+    trigger_digest: str
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return str(value)
+
+
+def canonical_dumps(value: Any) -> bytes:
+    """Serialise *value* with sorted keys into a stable byte representation."""
+
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                value,
+                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+                default=_json_default,
+            )
+        except TypeError:
+            pass
+    return json.dumps(
+        value,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_json_default,
+    ).encode("utf-8")
+
+
+def _digest(payload: bytes) -> str:
+    return hashlib.blake2b(payload, digest_size=DIGEST_SIZE).hexdigest()
+
+
+@lru_cache(maxsize=4096)
+def _format_updated_cached(value: str) -> Optional[str]:
+    formatted = format_cet_timestamp(value)
+    if formatted is None:
+        return value
+    return formatted
+
+
+def normalise_updated(value: Any) -> Optional[str]:
+    """Return the CET formatted ``updated`` timestamp for *value*.
+
+    String inputs are memoised because the same timestamps are parsed for every
+    event in every polling cycle. Unparseable strings are returned unchanged.
+    """
+
+    if isinstance(value, str):
+        return _format_updated_cached(value)
+    if isinstance(value, (datetime, int, float)) and not isinstance(value, bool):
+        return format_cet_timestamp(value)
+    return None
+
+
+def _normalise_text(value: Any) -> str:
+    if value is None:
+        return ""
+    return str(value).strip().lower()
+
+
+def _normalise_content(value: Any) -> Any:
+    """Fold case, whitespace and list order like the legacy digest did.
+
+    Attendee lists, attachments and similar collections come back from the
+    Calendar API in no guaranteed order, and case-only edits do not change
+    what the workflow does with an event.
+    """
+
+    if isinstance(value, str):
+        return _normalise_text(value)
+    if isinstance(value, Mapping):
+        return {
+            _normalise_text(key): _normalise_content(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_normalise_content(item) for item in value]
+        return sorted(items, key=canonical_dumps)
+    return value
+
+
+def fingerprint_event(event: Mapping[str, Any]) -> EventFingerprint:
+    """Compute the :class:`EventFingerprint` for *event* in a single pass."""
+
+    raw_id = event.get("id")
+    event_id = str(raw_id) if raw_id is not None else ""
+    updated = normalise_updated(event.get("updated"))
+
+    content = {
+        key: _normalise_content(event.get(key)) for key in SIGNIFICANT_EVENT_FIELDS
+    }
+    content["id"] = event_id
+    content_digest = _digest(canonical_dumps(content))
+
+    summary = _normalise_text(event.get("summary"))
+    description = _normalise_text(event.get("description"))
+    trigger_base = f"{event_id}|{updated or '-'}|{summary}|{description}"
+    trigger_digest = _digest(trigger_base.encode("utf-8"))
+
+    return EventFingerprint(
+        event_id=event_id,
+        updated=updated,
+        content_digest=content_digest,
+        trigger_digest=trigger_digest,
+    )
+
+
+# ----------------------------------------------------------------------
+# Legacy digests (fingerprint version 1)
+# ----------------------------------------------------------------------
+def _legacy_normalise_structure(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return _normalise_text(value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, dict):
+        items = []
+        for key in sorted(value.keys(), key=str):
+            items.append(
+                f"{_normalise_text(key)}:{_legacy_normalise_structure(value[key])}"
+            )
+        return "{" + "|".join(items) + "}"
+    if isinstance(value, (list, tuple, set)):
+        parts = [_legacy_normalise_structure(item) for item in value]
+        parts.sort()
+        return "[" + "|".join(parts) + "]"
+    return _normalise_text(value)
+
+
+def legacy_content_digest(event: Mapping[str, Any]) -> str:
+    """Return the SHA-1 digest written by the pre-v2 processed event cache."""
+
+    event_id = str(event.get("id")) if event.get("id") is not None else ""
+    segments = [event_id]
+    for key in SIGNIFICANT_EVENT_FIELDS:
+        segments.append(f"{key}:{_legacy_normalise_structure(event.get(key))}")
+    return hashlib.sha1("|".join(segments).encode("utf-8")).hexdigest()
+
+
+def legacy_trigger_digest(event: Mapping[str, Any]) -> str:
+    """Return the SHA-1 digest written by the pre-v2 negative cache."""
+
+    event_id = str(event.get("id")) if event.get("id") is not None else ""
+    updated = normalise_updated(event.get("updated"))
+    summary = _normalise_text(event.get("summary"))
+    description = _normalise_text(event.get("description"))
+    base = f"{event_id}|{updated or '-'}|{summary}|{description}"
+    return hashlib.sha1(base.encode("utf-8")).hexdigest()
+
+
+__all__ = [
+    "DIGEST_SIZE",
+    "EventFingerprint",
+    "FINGERPRINT_VERSION",
+    "SIGNIFICANT_EVENT_FIELDS",
+    "canonical_dumps",
+    "fingerprint_event",
+    "legacy_content_digest",
+    "legacy_trigger_digest",
+    "normalise_updated",
+]
@@ -0,0 +1,371 @@
+"""Compact binary storage for event fingerprints.
+
+The store keeps fixed-width records in two files:
+
+``<path>``
+    A sorted, memory-mapped base file. Lookups binary search the mapping, so
+    opening the store does not depend on the number of stored entries.
+``<path>.log``
+    An append-only journal of updates and tombstones written since the last
+    merge. It is replayed into a small in-memory overlay on open and folded
+    into the base file once it grows beyond ``merge_threshold`` records.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import zlib
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import (
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from utils.event_fingerprint import DIGEST_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+STORE_MAGIC = b"LMFP"
+STORE_VERSION = 1
+KEY_SIZE = 16
+
+# magic, version, record size, record count
+_HEADER = struct.Struct("<4sHHQ")
+# event-id hash, fingerprint digest, epoch seconds, rule-hash id, flags
+_RECORD = struct.Struct(f"<{KEY_SIZE}s{DIGEST_SIZE}sdII")
+
+FLAG_DELETED = 0x01
+FLAG_HAS_UPDATED = 0x02
+FLAG_LEGACY = 0x04
+_DECISION_SHIFT = 8
+_DECISION_MASK = 0xFF << _DECISION_SHIFT
+
+DEFAULT_MERGE_THRESHOLD = 4096
+
+
+class FingerprintRecord(NamedTuple):
+    """Decoded fixed-width record stored for one event."""
+
+    digest: bytes
+    timestamp: float
+    rule_id: int = 0
+    flags: int = 0
+
+    @property
+    def decision_code(self) -> int:
+        return (self.flags & _DECISION_MASK) >> _DECISION_SHIFT
+
+
+def event_key(event_id: str) -> bytes:
+    """Return the fixed-width hash used to index *event_id*."""
+
+    return hashlib.blake2b(event_id.encode("utf-8"), digest_size=KEY_SIZE).digest()
+
+
+def rule_id_for(rule_hash: Optional[str]) -> int:
+    """Map a trigger rule hash onto the 32-bit identifier stored per record."""
+
+    if not rule_hash:
+        return 0
+    return zlib.crc32(rule_hash.encode("utf-8"))
+
+
+def digest_bytes(hex_digest: str) -> bytes:
+    """Convert a hex digest into the fixed-width bytes stored on disk."""
+
+    return bytes.fromhex(hex_digest)[:DIGEST_SIZE].ljust(DIGEST_SIZE, b"\0")
+
+
+def with_decision(flags: int, code: int) -> int:
+    return (flags & ~_DECISION_MASK) | ((code & 0xFF) << _DECISION_SHIFT)
+
+
+@lru_cache(maxsize=4096)
+def epoch_from_updated(value: Optional[str]) -> Optional[float]:
+    """Return epoch seconds for a normalised ``updated`` timestamp."""
+
+    if not value:
+        return None
+    try:
+        if value.endswith("Z"):
+            value = value[:-1] + "+00:00"
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class FingerprintStore:
+    """Sorted, memory-mapped fingerprint records with an append-only journal."""
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        merge_threshold: int = DEFAULT_MERGE_THRESHOLD,
+        drop: Optional[Callable[[FingerprintRecord], bool]] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.log_path = self.path.with_name(self.path.name + ".log")
+        self.merge_threshold = max(1, int(merge_threshold))
+        self._drop = drop
+        self._overlay: Dict[bytes, FingerprintRecord] = {}
+        self._base_file: Optional[BinaryIO] = None
+        self._base_map: Optional[mmap.mmap] = None
+        self._base_count = 0
+        self._log_file: Optional[BinaryIO] = None
+        self._log_records = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._open_base()
+        self._replay_log()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    @property
+    def exists(self) -> bool:
+        return self.path.exists() or self.log_path.exists()
+
+    def __len__(self) -> int:
+        """Approximate number of live records (tombstones are not subtracted)."""
+
+        return self._base_count + sum(
+            1 for record in self._overlay.values() if not record.flags & FLAG_DELETED
+        )
+
+    def get(self, event_id: str) -> Optional[FingerprintRecord]:
+        key = event_key(event_id)
+        record = self._overlay.get(key)
+        if record is None:
+            record = self._search_base(key)
+        if record is None or record.flags & FLAG_DELETED:
+            return None
+        return record
+
+    def put(self, event_id: str, record: FingerprintRecord) -> bool:
+        """Store *record* for *event_id*; returns ``False`` if nothing changed."""
+
+        key = event_key(event_id)
+        if self._lookup_key(key) == record:
+            return False
+        self._append(key, record)
+        return True
+
+    def delete(self, event_id: str) -> bool:
+        key = event_key(event_id)
+        existing = self._lookup_key(key)
+        if existing is None or existing.flags & FLAG_DELETED:
+            return False
+        self._append(key, FingerprintRecord(b"\0" * DIGEST_SIZE, 0.0, 0, FLAG_DELETED))
+        return True
+
+    @property
+    def pending(self) -> int:
+        """Number of journal records waiting to be merged."""
+
+        return self._log_records
+
+    def sync(self) -> None:
+        """Flush buffered journal writes to the operating system."""
+
+        if self._log_file is not None:
+            self._log_file.flush()
+
+    def merge(
+        self, *, drop: Optional[Callable[[FingerprintRecord], bool]] = None
+    ) -> int:
+        """Fold the journal into a new sorted base file.
+
+        *drop* (defaulting to the predicate given at construction) may reject
+        records, for example expired entries, while they are streamed into the
+        new file. Returns the number of records written.
+        """
+
+        drop = drop or self._drop
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        overlay = sorted(self._overlay.items())
+        written = 0
+        with tmp_path.open("wb") as handle:
+            handle.write(_HEADER.pack(STORE_MAGIC, STORE_VERSION, _RECORD.size, 0))
+            for key, record in self._merged(overlay):
+                if record.flags & FLAG_DELETED:
+                    continue
+                if drop is not None and drop(record):
+                    continue
+                handle.write(_RECORD.pack(key, *record))
+                written += 1
+            handle.seek(0)
+            handle.write(
+                _HEADER.pack(STORE_MAGIC, STORE_VERSION, _RECORD.size, written)
+            )
+            handle.flush()
+            os.fsync(handle.fileno())
+
+        self._close_base()
+        os.replace(tmp_path, self.path)
+        self._close_log()
+        self.log_path.unlink(missing_ok=True)
+        self._overlay.clear()
+        self._log_records = 0
+        self._open_base()
+        return written
+
+    def close(self) -> None:
+        self.sync()
+        self._close_log()
+        self._close_base()
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    def _lookup_key(self, key: bytes) -> Optional[FingerprintRecord]:
+        record = self._overlay.get(key)
+        if record is None:
+            record = self._search_base(key)
+        return record
+
+    def _append(self, key: bytes, record: FingerprintRecord) -> None:
+        if self._log_file is None:
+            self._log_file = self.log_path.open("ab")
+        self._log_file.write(_RECORD.pack(key, *record))
+        self._overlay[key] = record
+        self._log_records += 1
+        if self._log_records >= self.merge_threshold:
+            self.merge()
+
+    def _merged(
+        self, overlay: List[Tuple[bytes, FingerprintRecord]]
+    ) -> Iterator[Tuple[bytes, FingerprintRecord]]:
+        index = 0
+        for position in range(self._base_count):
+            key, record = self._read_base(position)
+            while index < len(overlay) and overlay[index][0] < key:
+                yield overlay[index]
+                index += 1
+            if index < len(overlay) and overlay[index][0] == key:
+                yield overlay[index]
+                index += 1
+                continue
+            yield key, record
+        yield from overlay[index:]
+
+    def _read_base(self, position: int) -> Tuple[bytes, FingerprintRecord]:
+        assert self._base_map is not None
+        offset = _HEADER.size + position * _RECORD.size
+        key, digest, timestamp, rule_id, flags = _RECORD.unpack_from(
+            self._base_map, offset
+        )
+        return key, FingerprintRecord(digest, timestamp, rule_id, flags)
+
+    def _search_base(self, key: bytes) -> Optional[FingerprintRecord]:
+        if self._base_map is None:
+            return None
+        lo, hi = 0, self._base_count
+        mapping = self._base_map
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = _HEADER.size + mid * _RECORD.size
+            candidate = mapping[offset : offset + KEY_SIZE]
+            if candidate < key:
+                lo = mid + 1
+            elif candidate > key:
+                hi = mid
+            else:
+                return self._read_base(mid)[1]
+        return None
+
+    def _open_base(self) -> None:
+        self._base_count = 0
+        if not self.path.exists():
+            return
+        handle = self.path.open("rb")
+        try:
+            header = handle.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError("truncated header")
+            magic, version, record_size, count = _HEADER.unpack(header)
+            if (
+                magic != STORE_MAGIC
+                or version != STORE_VERSION
+                or record_size != _RECORD.size
+            ):
+                raise ValueError("unsupported store format")
+            expected = _HEADER.size + count * _RECORD.size
+            if os.fstat(handle.fileno()).st_size < expected:
+                raise ValueError("truncated records")
+        except ValueError as exc:
+            handle.close()
+            logger.warning(
+                "Fingerprint store at %s is unreadable (%s); starting empty.",
+                self.path,
+                exc,
+            )
+            return
+        if count:
+            self._base_map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            self._base_file = handle
+        else:
+            handle.close()
+        self._base_count = count
+
+    def _close_base(self) -> None:
+        if self._base_map is not None:
+            self._base_map.close()
+            self._base_map = None
+        if self._base_file is not None:
+            self._base_file.close()
+            self._base_file = None
+        self._base_count = 0
+
+    def _replay_log(self) -> None:
+        if not self.log_path.exists():
+            return
+        data = self.log_path.read_bytes()
+        usable = len(data) - len(data) % _RECORD.size
+        if usable != len(data):
+            logger.warning(
+                "Ignoring truncated trailing record in fingerprint journal %s",
+                self.log_path,
+            )
+        for offset in range(0, usable, _RECORD.size):
+            key, digest, timestamp, rule_id, flags = _RECORD.unpack_from(data, offset)
+            self._overlay[key] = FingerprintRecord(digest, timestamp, rule_id, flags)
+        self._log_records = usable // _RECORD.size
+        if usable != len(data):
+            with self.log_path.open("r+b") as handle:
+                handle.truncate(usable)
+
+    def _close_log(self) -> None:
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+
+
+__all__ = [
+    "FLAG_DELETED",
+    "FLAG_HAS_UPDATED",
+    "FLAG_LEGACY",
+    "FingerprintRecord",
+    "FingerprintStore",
+    "digest_bytes",
+    "epoch_from_updated",
+    "event_key",
+    "rule_id_for",
+    "with_decision",
+]
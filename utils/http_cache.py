@@ -0,0 +1,316 @@
+"""Bounded ETag cache for conditional ``GET`` requests issued by ``AsyncHTTP``."""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+from utils.observability import record_cache_event, record_cache_size
+
+logger = logging.getLogger(__name__)
+
+HTTP_CACHE_METRIC_PREFIX = "http_cache"
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    etag TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed);
+"""
+
+
+@dataclass
+class CachedResponse:
+    """Validator of a cached response; ``body`` is loaded only when needed."""
+
+    etag: str
+    size: int
+    body: Optional[bytes] = None
+
+
+class HttpResponseCache:
+    """LRU store of ``ETag`` + body pairs bounded by entry count and bytes.
+
+    Bodies live in SQLite (in memory when ``path`` is ``None``); parsed JSON
+    of recently used entries is kept in memory so a ``304 Not Modified``
+    revalidation returns the previous payload without parsing it again.
+    Callers receive their own deep copies and may mutate them freely.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        *,
+        name: str = "default",
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.name = name
+        self.path = Path(path) if path is not None else None
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._parsed: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            str(self.path) if self.path is not None else ":memory:",
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        try:
+            if self.path is not None:
+                self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(_SCHEMA)
+        except sqlite3.DatabaseError:
+            logger.warning("Resetting unreadable HTTP cache at %s", self.path)
+            self._connection.close()
+            if self.path is not None:
+                self.path.unlink(missing_ok=True)
+            self._connection = sqlite3.connect(
+                str(self.path) if self.path is not None else ":memory:",
+                check_same_thread=False,
+                isolation_level=None,
+            )
+            self._connection.executescript(_SCHEMA)
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        """Return the cache key for a ``GET`` of *url* with query *params*."""
+
+        query = json.dumps(
+            sorted((str(key), str(value)) for key, value in (params or {}).items())
+        )
+        return hashlib.sha256(f"{url}?{query}".encode("utf-8")).hexdigest()
+
+    @property
+    def _metric(self) -> str:
+        return f"{HTTP_CACHE_METRIC_PREFIX}.{self.name}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Return the stored validator for *key* (used for ``If-None-Match``)."""
+
+        with self._lock:
+            if key in self._parsed:
+                row = self._connection.execute(
+                    "SELECT etag, size, NULL FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+            else:
+                row = self._connection.execute(
+                    "SELECT etag, size, body FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+        if row is None:
+            return None
+        body = bytes(row[2]) if row[2] is not None else None
+        return CachedResponse(etag=row[0], size=int(row[1]), body=body)
+
+    def revalidated(self, key: str, entry: CachedResponse) -> Any:
+        """Record a ``304`` for *key* and return the cached payload.
+
+        Raises :class:`KeyError` if the entry was evicted while the request
+        was in flight; the caller then has to fetch the full response.
+        """
+
+        with self._lock:
+            if key in self._parsed:
+                self._parsed.move_to_end(key)
+                payload = self._parsed[key]
+            else:
+                body = entry.body
+                if body is None:
+                    row = self._connection.execute(
+                        "SELECT body FROM responses WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is None:
+                        raise KeyError(key)
+                    body = bytes(row[0])
+                payload = json.loads(body)
+                self._remember(key, payload)
+            self.hits += 1
+            self.bytes_saved += entry.size
+            self._connection.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+        record_cache_event(self._metric, "hit")
+        record_cache_event(self._metric, "bytes_saved", entry.size)
+        return copy.deepcopy(payload)
+
+    def store(self, key: str, etag: Optional[str], body: bytes, payload: Any) -> None:
+        """Record a full response; it is cached only when it carries an ``ETag``."""
+
+        with self._lock:
+            self.misses += 1
+        record_cache_event(self._metric, "miss")
+        if not etag or len(body) > self.max_bytes:
+            self.invalidate(key)
+            return
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, etag, body, size, accessed) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, etag, sqlite3.Binary(body), len(body), time.time()),
+            )
+            self._remember(key, copy.deepcopy(payload))
+            evicted = self._evict()
+        if evicted:
+            record_cache_event(self._metric, "evicted", evicted)
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._parsed.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+            self._parsed.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(
+                self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit ratio and bytes saved, recording the cache size metric."""
+
+        with self._lock:
+            entries, size = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            stats = {
+                "entries": int(entries),
+                "bytes": int(size),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "bytes_saved": self.bytes_saved,
+            }
+        record_cache_size(self._metric, entries=stats["entries"], bytes_estimate=size)
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _remember(self, key: str, payload: Any) -> None:
+        self._parsed[key] = payload
+        self._parsed.move_to_end(key)
+        while len(self._parsed) > self.max_entries:
+            self._parsed.popitem(last=False)
+
+    def _evict(self) -> int:
+        evicted = 0
+        while True:
+            entries, size = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            if entries <= self.max_entries and size <= self.max_bytes:
+                return evicted
+            row = self._connection.execute(
+                "SELECT key FROM responses ORDER BY accessed ASC LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return evicted
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+            self._parsed.pop(row[0], None)
+            evicted += 1
+
+
+_SHARED_CACHES: Dict[str, HttpResponseCache] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_http_cache(
+    name: str,
+    *,
+    path: Optional[Path] = None,
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> HttpResponseCache:
+    """Return the process-wide cache for *name*, creating it on first use.
+
+    Caches with a ``path`` store their bodies in ``<path>/<name>.sqlite3``.
+    """
+
+    with _SHARED_LOCK:
+        cache = _SHARED_CACHES.get(name)
+        if cache is None:
+            cache = HttpResponseCache(
+                Path(path) / f"{name}.sqlite3" if path is not None else None,
+                name=name,
+                max_entries=max_entries,
+                max_bytes=max_bytes,
+            )
+            _SHARED_CACHES[name] = cache
+        return cache
+
+
+def default_http_cache(
+    name: str, settings: Optional[Any] = None
+) -> Optional[HttpResponseCache]:
+    """Return the shared cache for *name* if HTTP caching is enabled."""
+
+    if settings is None:
+        try:
+            from config.config import settings as loaded
+        except Exception:  # pragma: no cover - configuration not importable
+            return None
+        settings = loaded
+    if not getattr(settings, "http_cache_enabled", False):
+        return None
+    return shared_http_cache(
+        name,
+        path=getattr(settings, "http_cache_dir", None),
+        max_entries=int(
+            getattr(settings, "http_cache_max_entries", DEFAULT_MAX_ENTRIES)
+        ),
+        max_bytes=int(getattr(settings, "http_cache_max_bytes", DEFAULT_MAX_BYTES)),
+    )
+
+
+def shared_http_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Return :meth:`HttpResponseCache.stats` for every process-wide cache."""
+
+    with _SHARED_LOCK:
+        caches = list(_SHARED_CACHES.values())
+    return {cache.name: cache.stats() for cache in caches}
+
+
+def reset_shared_http_caches() -> None:
+    """Close and forget all process-wide caches (used by tests and reloads)."""
+
+    with _SHARED_LOCK:
+        caches = list(_SHARED_CACHES.values())
+        _SHARED_CACHES.clear()
+    for cache in caches:
+        cache.close()
+
+
+__all__ = [
+    "CachedResponse",
+    "HttpResponseCache",
+    "default_http_cache",
+    "reset_shared_http_caches",
+    "shared_http_cache",
+    "shared_http_cache_stats",
+]
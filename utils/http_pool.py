@@ -0,0 +1,261 @@
+"""Process-wide registry of shared :class:`httpx.AsyncClient` connection pools."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from utils.observability import record_http_pool_usage
+
+try:  # pragma: no cover - optional dependency import
+    import h2  # type: ignore[import-not-found]  # noqa: F401
+except ImportError:  # pragma: no cover - HTTP/2 requires the optional h2 package
+    h2 = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_EXPIRY_SECONDS = 60.0
+DEFAULT_WARMUP_TIMEOUT_SECONDS = 5.0
+
+
+@dataclass
+class PoolConfig:
+    """Connection limits applied to shared clients.
+
+    ``host_limits`` overrides ``max_connections`` for individual hosts, e.g.
+    ``{"api.hubapi.com": 10}``.
+    """
+
+    enabled: bool = True
+    max_connections: int = DEFAULT_MAX_CONNECTIONS
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY_SECONDS
+    http2: bool = False
+    host_limits: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "PoolConfig":
+        return cls(
+            enabled=bool(getattr(settings, "http_pool_shared", True)),
+            max_connections=int(
+                getattr(settings, "http_pool_max_connections", DEFAULT_MAX_CONNECTIONS)
+            ),
+            max_keepalive_connections=int(
+                getattr(
+                    settings,
+                    "http_pool_max_keepalive_connections",
+                    DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+                )
+            ),
+            keepalive_expiry=float(
+                getattr(
+                    settings,
+                    "http_pool_keepalive_expiry_seconds",
+                    DEFAULT_KEEPALIVE_EXPIRY_SECONDS,
+                )
+            ),
+            http2=bool(getattr(settings, "http_pool_http2", False)),
+            host_limits=dict(getattr(settings, "http_pool_host_limits", {}) or {}),
+        )
+
+    def limits_for(self, host: str) -> httpx.Limits:
+        max_connections = max(1, self.host_limits.get(host, self.max_connections))
+        return httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=min(
+                max_connections, max(0, self.max_keepalive_connections)
+            ),
+            keepalive_expiry=max(0.0, self.keepalive_expiry),
+        )
+
+
+def _host_of(base_url: str) -> str:
+    return (urlsplit(base_url).hostname or "").lower()
+
+
+_ClientKey = Tuple[int, str, bool]
+
+
+class ClientPool:
+    """Share one :class:`httpx.AsyncClient` per base URL and event loop.
+
+    Integrations are rebuilt on every daemon cycle; borrowing clients from
+    this registry keeps their keep-alive connections and TLS sessions
+    alive across cycles. Clients carry no default headers or auth; callers
+    pass those per request.
+    """
+
+    def __init__(self, config: Optional[PoolConfig] = None) -> None:
+        self._config = config
+        self._clients: Dict[
+            _ClientKey, Tuple[Optional[asyncio.AbstractEventLoop], httpx.AsyncClient]
+        ] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def config(self) -> PoolConfig:
+        if self._config is None:
+            try:
+                from config.config import settings
+            except Exception:  # pragma: no cover - configuration not importable
+                self._config = PoolConfig()
+            else:
+                self._config = PoolConfig.from_settings(settings)
+        return self._config
+
+    def configure(self, config: PoolConfig) -> None:
+        """Replace the pool configuration used for clients created later."""
+
+        self._config = config
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.enabled
+
+    def get_client(
+        self, base_url: str = "", *, follow_redirects: bool = True
+    ) -> httpx.AsyncClient:
+        """Return the shared client for *base_url* on the running event loop."""
+
+        try:
+            loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        key = (id(loop), base_url, follow_redirects)
+        with self._lock:
+            self._prune_closed_loops()
+            entry = self._clients.get(key)
+            if entry is not None and not entry[1].is_closed:
+                return entry[1]
+            client = self._create_client(base_url, follow_redirects=follow_redirects)
+            self._clients[key] = (loop, client)
+            return client
+
+    async def warm_up(
+        self,
+        base_urls: Iterable[str],
+        *,
+        timeout: float = DEFAULT_WARMUP_TIMEOUT_SECONDS,
+    ) -> Dict[str, bool]:
+        """Open connections (DNS, TCP and TLS) to *base_urls* concurrently.
+
+        A cheap ``HEAD /`` request is issued per base URL; the response status
+        is irrelevant. Returns whether each warm-up completed.
+        """
+
+        urls = [url for url in dict.fromkeys(base_urls) if url]
+
+        async def _warm(url: str) -> bool:
+            client = self.get_client(url)
+            try:
+                await client.request("HEAD", "/", timeout=timeout)
+            except httpx.HTTPError as exc:
+                logger.debug("HTTP warm-up for %s failed: %s", url, exc)
+                return False
+            return True
+
+        results = await asyncio.gather(*(_warm(url) for url in urls))
+        return dict(zip(urls, results))
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Return connection counts per shared client and record them as metrics."""
+
+        with self._lock:
+            entries = list(self._clients.items())
+        stats: List[Dict[str, Any]] = []
+        for (_, base_url, _), (_, client) in entries:
+            if client.is_closed:
+                continue
+            host = _host_of(base_url) or "default"
+            connections = _pool_connections(client)
+            active = sum(1 for connection in connections if not _is_idle(connection))
+            idle = len(connections) - active
+            limit = self.config.limits_for(host).max_connections
+            record_http_pool_usage(host, active=active, idle=idle, limit=limit)
+            stats.append(
+                {"host": host, "active": active, "idle": idle, "limit": limit}
+            )
+        return stats
+
+    async def aclose(self) -> None:
+        """Close every shared client owned by the running event loop."""
+
+        try:
+            loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        with self._lock:
+            keys = [key for key, (owner, _) in self._clients.items() if owner is loop]
+            clients = [self._clients.pop(key)[1] for key in keys]
+        for client in clients:
+            await client.aclose()
+
+    def _create_client(
+        self, base_url: str, *, follow_redirects: bool
+    ) -> httpx.AsyncClient:
+        config = self.config
+        http2 = config.http2
+        if http2 and h2 is None:
+            logger.warning(
+                "HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1."
+            )
+            http2 = False
+        return httpx.AsyncClient(
+            base_url=base_url,
+            limits=config.limits_for(_host_of(base_url)),
+            http2=http2,
+            follow_redirects=follow_redirects,
+        )
+
+    def _prune_closed_loops(self) -> None:
+        stale = [
+            key
+            for key, (loop, _) in self._clients.items()
+            if loop is not None and loop.is_closed()
+        ]
+        for key in stale:
+            # The transport cannot be closed without its loop; drop it.
+            del self._clients[key]
+
+
+def _pool_connections(client: httpx.AsyncClient) -> List[Any]:
+    transport = getattr(client, "_transport", None)
+    pool = getattr(transport, "_pool", None)
+    connections = getattr(pool, "connections", None)
+    return list(connections or [])
+
+
+def _is_idle(connection: Any) -> bool:
+    try:
+        return bool(connection.is_idle())
+    except Exception:  # pragma: no cover - defensive guard for custom transports
+        return False
+
+
+#: Process-wide client registry used by :class:`utils.async_http.AsyncHTTP`.
+SHARED_POOL = ClientPool()
+
+
+def merge_headers(
+    defaults: Mapping[str, str], overrides: Optional[Mapping[str, str]]
+) -> Dict[str, str]:
+    merged = dict(defaults)
+    if overrides:
+        merged.update(overrides)
+    return merged
+
+
+__all__ = [
+    "ClientPool",
+    "PoolConfig",
+    "SHARED_POOL",
+    "merge_headers",
+]
@@ -0,0 +1,125 @@
+"""Collect concurrent single-key requests into small batches."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+from utils.observability import record_cache_event
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+MICRO_BATCH_METRIC_PREFIX = "micro_batch"
+
+
+class MicroBatcher(Generic[K, V]):
+    """Group keys submitted within ``max_delay`` seconds into one handler call.
+
+    ``handler`` receives the distinct keys of a batch and returns a mapping of
+    key to result; keys missing from the mapping resolve to ``default``. A
+    batch is dispatched as soon as ``max_batch_size`` keys are queued or the
+    window since the first queued key elapses. While no batch is in flight
+    the window is skipped: the batch goes out on the next loop iteration, so
+    a lone caller does not wait while callers submitting in the same
+    iteration still share it. Handler exceptions are raised to every caller
+    of the failed batch.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Sequence[K]], Awaitable[Mapping[K, V]]],
+        *,
+        max_batch_size: int,
+        max_delay: float = 0.02,
+        default: Optional[V] = None,
+    ) -> None:
+        self.name = name
+        self._handler = handler
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_delay = max(0.0, float(max_delay))
+        self._default = default
+        self._pending: Dict[K, List["asyncio.Future[V]"]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: "set[asyncio.Task[None]]" = set()
+        self.batches_dispatched = 0
+
+    async def submit(self, key: K) -> V:
+        """Queue *key* and wait for the batch containing it to complete."""
+
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[V]" = loop.create_future()
+        waiters = self._pending.setdefault(key, [])
+        waiters.append(future)
+        if len(waiters) > 1:
+            record_cache_event(f"{MICRO_BATCH_METRIC_PREFIX}.{self.name}", "shared")
+
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif self._timer is None:
+            delay = self.max_delay if self._tasks else 0.0
+            self._timer = loop.call_later(delay, self._dispatch)
+        return await future
+
+    async def flush(self) -> None:
+        """Dispatch queued keys immediately and wait for in-flight batches."""
+
+        if self._pending:
+            self._dispatch()
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: Dict[K, List["asyncio.Future[V]"]]) -> None:
+        keys = list(batch)
+        self.batches_dispatched += 1
+        record_cache_event(
+            f"{MICRO_BATCH_METRIC_PREFIX}.{self.name}", "batch_keys", len(keys)
+        )
+        try:
+            results = await self._handler(keys)
+        except asyncio.CancelledError:
+            for waiters in batch.values():
+                for future in waiters:
+                    future.cancel()
+            raise
+        except Exception as exc:  # propagate to every caller of the batch
+            for waiters in batch.values():
+                for future in waiters:
+                    if not future.done():
+                        future.set_exception(exc)
+            return
+
+        for key, waiters in batch.items():
+            value = results.get(key, self._default)
+            for future in waiters:
+                if not future.done():
+                    future.set_result(value)
+
+
+__all__ = ["MicroBatcher"]
@@ -2,15 +2,37 @@
 
 from __future__ import annotations
 
-import hashlib
+import heapq
 import logging
+import math
+import sys
 import time
+from collections import Counter, OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
-
-from utils.datetime_formatting import format_cet_timestamp
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from utils.event_fingerprint import (
+    FINGERPRINT_VERSION,
+    EventFingerprint,
+    fingerprint_event,
+    legacy_trigger_digest,
+    normalise_updated,
+)
+from utils.fingerprint_store import (
+    FLAG_HAS_UPDATED,
+    FingerprintRecord,
+    FingerprintStore,
+    digest_bytes,
+    epoch_from_updated,
+    rule_id_for,
+    with_decision,
+)
+from utils.observability import record_cache_event, record_cache_size
+from utils.text_normalization import normalize_text
+from utils.trigger_signature import may_contain, text_signature
 from utils.persistence import (
     NegativeCacheState,
     atomic_write_json,
@@ -23,10 +45,14 @@ logger = logging.getLogger(__name__)
 NEG_CACHE_VERSION = 1
 NEG_CACHE_MAX_AGE_DAYS = 30
 NEG_CACHE_MAX_AGE_SECONDS = NEG_CACHE_MAX_AGE_DAYS * 24 * 60 * 60
+NEG_CACHE_METRIC_NAME = "negative_event_cache"
+_SKIP_DECISIONS = ("no_trigger", "skipped_trigger_threshold")
+_DECISION_CODES = {decision: code for code, decision in enumerate(_SKIP_DECISIONS, 1)}
 
 
+@lru_cache(maxsize=4096)
 def _parse_iso_timestamp(value: str) -> Optional[datetime]:
-    """Best effort ISO8601 parser supporting ``Z`` suffixes."""
+    """Best effort ISO8601 parser supporting ``Z`` suffixes (memoised)."""
 
     if not value:
         return None
@@ -40,14 +66,48 @@ def _parse_iso_timestamp(value: str) -> Optional[datetime]:
         return None
 
 
+def _estimate_entry_size(event_id: str, entry: Dict[str, Any]) -> int:
+    """Cheap approximation of the memory held by a single cache entry."""
+
+    size = sys.getsizeof(event_id) + sys.getsizeof(entry)
+    for value in entry.values():
+        if value is not None:
+            size += sys.getsizeof(value)
+    return size
+
+
 @dataclass
 class NegativeEventCache:
-    """Caches skip decisions for events without triggers."""
+    """Caches skip decisions for events without triggers.
+
+    Entries are kept in least-recently-used order. Expiry deadlines are indexed
+    in a min-heap so purging stale entries only touches expired items, and the
+    cache evicts the least recently used entries once ``max_entries`` or
+    ``max_bytes`` (``0`` disables either budget) is exceeded.
+    """
 
     path: Path
-    entries: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    entries: Dict[str, Dict[str, Any]] = field(default_factory=OrderedDict)
     dirty: bool = False
     classification_version: str = "v1"
+    max_entries: int = 0
+    max_bytes: int = 0
+    rule_hash: Optional[str] = None
+    rule_words: Optional[List[str]] = None
+    _expiry_heap: List[Tuple[float, str]] = field(
+        default_factory=list, init=False, repr=False
+    )
+    _expiry: Dict[str, float] = field(default_factory=dict, init=False, repr=False)
+    _sizes: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _bytes: int = field(default=0, init=False, repr=False)
+    _pending_metrics: Counter = field(default_factory=Counter, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.entries, OrderedDict):
+            self.entries = OrderedDict(self.entries)
+        for event_id, entry in self.entries.items():
+            self._index(event_id, entry)
+        self._enforce_budget()
 
     @classmethod
     def load(
@@ -56,8 +116,10 @@ class NegativeEventCache:
         *,
         rule_hash: str,
         now: Optional[float] = None,
+        max_entries: int = 0,
+        max_bytes: int = 0,
     ) -> "NegativeEventCache":
-        """Load cache from disk applying retention rules."""
+        """Load cache from disk applying retention rules and size budgets."""
 
         now = now or time.time()
         entries: Dict[str, Dict[str, Any]] = {}
@@ -86,9 +148,7 @@ class NegativeEventCache:
             updated = entry.get("updated")
             formatted_updated: Optional[str] = None
             if isinstance(updated, (str, datetime, int, float)):
-                formatted_updated = format_cet_timestamp(updated)
-            if formatted_updated is None and isinstance(updated, str):
-                formatted_updated = updated
+                formatted_updated = normalise_updated(updated)
             last_seen = entry.get("last_seen")
 
             if not cls._is_entry_fresh(updated, last_seen, now):
@@ -102,44 +162,85 @@ class NegativeEventCache:
                 "first_seen": entry.get("first_seen"),
                 "last_seen": last_seen if isinstance(last_seen, (int, float)) else None,
                 "classification_version": entry.get("classification_version", "v1"),
+                "fingerprint_version": entry.get("fingerprint_version"),
             }
-
-        cache = cls(path=path, entries=entries, dirty=False)
+            if isinstance(entry.get("trigger_signature"), str):
+                entries[str(event_id)]["trigger_signature"] = entry["trigger_signature"]
+
+        # Restore least-recently-used order so budget evictions survive restarts.
+        ordered = OrderedDict(
+            sorted(
+                entries.items(),
+                key=lambda item: item[1].get("last_seen")
+                or item[1].get("first_seen")
+                or 0.0,
+            )
+        )
+        stored_hash = raw.get("rule_hash")
+        stored_words = raw.get("rule_words")
+        cache = cls(
+            path=path,
+            entries=ordered,
+            dirty=False,
+            max_entries=max(0, int(max_entries or 0)),
+            max_bytes=max(0, int(max_bytes or 0)),
+            rule_hash=stored_hash if isinstance(stored_hash, str) else None,
+            rule_words=(
+                [str(word) for word in stored_words]
+                if isinstance(stored_words, list)
+                else None
+            ),
+        )
+        if len(cache.entries) != len(ordered):
+            cache.dirty = True
         cache._purge_stale(now)  # noqa: SLF001
         return cache
 
-    def should_skip(self, event: Dict[str, Any], rule_hash: str) -> bool:
+    def should_skip(
+        self,
+        event: Dict[str, Any],
+        rule_hash: str,
+        *,
+        fingerprint: Optional[EventFingerprint] = None,
+    ) -> bool:
         """Return ``True`` if the event can be skipped based on cached decision."""
 
         event_id = event.get("id")
         if not event_id or not isinstance(event_id, str):
             return False
 
-        fingerprint, _ = self._fingerprint(event)
         entry = self.entries.get(event_id)
         if not entry:
+            self._pending_metrics["miss"] += 1
             return False
 
         if entry.get("rule_hash") != rule_hash:
+            self._pending_metrics["miss"] += 1
             return False
 
-        if entry.get("fingerprint") != fingerprint:
+        resolved = fingerprint or fingerprint_event(event)
+        if not self._matches(entry, event, resolved):
+            self._pending_metrics["miss"] += 1
             return False
 
-        if entry.get("decision") not in {"no_trigger", "skipped_trigger_threshold"}:
+        if entry.get("decision") not in _SKIP_DECISIONS:
+            self._pending_metrics["miss"] += 1
             return False
 
-        last_seen = entry.get("last_seen")
         now = time.time()
-        if not self._is_entry_fresh(entry.get("updated"), last_seen, now):
+        if now > self._expiry_for(event_id, entry):
             # Entry is stale; purge and continue processing event.
             self.forget(event_id)
+            self._pending_metrics["expired"] += 1
             return False
 
         if not entry.get("updated"):
             entry["last_seen"] = now
+            self._index(event_id, entry)
             self.dirty = True
 
+        self.entries.move_to_end(event_id)  # type: ignore[attr-defined]
+        self._pending_metrics["hit"] += 1
         return True
 
     def get_decision(self, event_id: Optional[str]) -> Optional[str]:
@@ -151,50 +252,147 @@ class NegativeEventCache:
         return None
 
     def record_no_trigger(
-        self, event: Dict[str, Any], rule_hash: str, decision: str
+        self,
+        event: Dict[str, Any],
+        rule_hash: str,
+        decision: str,
+        *,
+        fingerprint: Optional[EventFingerprint] = None,
     ) -> None:
         event_id = event.get("id")
         if not event_id or not isinstance(event_id, str):
             return
 
-        fingerprint, updated = self._fingerprint(event)
+        resolved = fingerprint or fingerprint_event(event)
+        updated = resolved.updated
         now = time.time()
 
         entry = self.entries.get(event_id, {})
         first_seen = entry.get("first_seen", now)
+        signature = entry.get("trigger_signature")
+        if not signature or entry.get("fingerprint") != resolved.trigger_digest:
+            signature = text_signature(event.get("summary"), event.get("description"))
 
         new_entry = {
-            "fingerprint": fingerprint,
+            "fingerprint": resolved.trigger_digest,
             "updated": updated,
             "rule_hash": rule_hash,
             "decision": decision,
             "first_seen": first_seen,
             "last_seen": now if not updated else entry.get("last_seen", now),
             "classification_version": self.classification_version,
+            "fingerprint_version": FINGERPRINT_VERSION,
+            "trigger_signature": signature,
         }
 
         if self.entries.get(event_id) != new_entry:
             self.entries[event_id] = new_entry
+            self._index(event_id, new_entry)
             self.dirty = True
+        self.entries.move_to_end(event_id)  # type: ignore[attr-defined]
+        self._purge_stale(now)
+        self._enforce_budget()
+
+    def reconcile_rules(
+        self,
+        rule_hash: str,
+        trigger_words: Sequence[str],
+        *,
+        synonyms: Iterable[str] = (),
+    ) -> Tuple[int, int]:
+        """Carry cached decisions over to a changed trigger rule set.
+
+        The previous rule set is diffed against *trigger_words*. Removing words
+        cannot turn a negative decision into a match, so entries recorded under
+        the previous rule hash stay valid unless their text signature may
+        contain one of the added words or, when words were added, one of the
+        soft-trigger *synonyms*. Only those entries are dropped and therefore
+        re-evaluated. Returns ``(kept, invalidated)``.
+        """
+
+        previous_hash, previous_words = self.rule_hash, self.rule_words
+        self.rule_hash = rule_hash
+        self.rule_words = sorted(str(word) for word in trigger_words)
+        if previous_hash == rule_hash:
+            if previous_words != self.rule_words:
+                self.dirty = True
+            return 0, 0
+
+        self.dirty = True
+        if previous_hash is None or previous_words is None:
+            return 0, 0
+
+        previous = {normalize_text(word) for word in previous_words}
+        added = {normalize_text(word) for word in self.rule_words} - previous
+        added.discard("")
+        terms: Tuple[str, ...] = ()
+        if added:
+            terms = tuple(sorted(added)) + tuple(
+                normalize_text(phrase) for phrase in synonyms if str(phrase).strip()
+            )
+
+        kept = invalidated = 0
+        for event_id, entry in list(self.entries.items()):
+            if entry.get("rule_hash") != previous_hash:
+                continue
+            signature = entry.get("trigger_signature")
+            if signature and not any(may_contain(signature, term) for term in terms):
+                entry["rule_hash"] = rule_hash
+                kept += 1
+            else:
+                self._remove(event_id)
+                invalidated += 1
+
+        self._pending_metrics["revalidated"] += kept
+        self._pending_metrics["invalidated"] += invalidated
+        logger.info(
+            "Negative cache reconciled trigger rule change (added=%d): kept=%d invalidated=%d",
+            len(added),
+            kept,
+            invalidated,
+        )
+        return kept, invalidated
 
     def forget(self, event_id: Optional[str]) -> None:
         if not event_id or not isinstance(event_id, str):
             return
 
         if event_id in self.entries:
-            del self.entries[event_id]
-            self.dirty = True
+            self._remove(event_id)
+
+    @property
+    def memory_estimate(self) -> int:
+        """Approximate number of bytes held by the cached entries."""
+
+        return self._bytes
+
+    def publish_metrics(self) -> None:
+        """Emit accumulated hit/miss/eviction counts and the current cache size."""
+
+        pending, self._pending_metrics = self._pending_metrics, Counter()
+        for event, count in pending.items():
+            record_cache_event(NEG_CACHE_METRIC_NAME, event, count)
+        record_cache_size(
+            NEG_CACHE_METRIC_NAME,
+            entries=len(self.entries),
+            bytes_estimate=self._bytes,
+        )
 
     def flush(self) -> None:
+        self.publish_metrics()
         if not self.dirty:
             return
 
         try:
             self.path.parent.mkdir(parents=True, exist_ok=True)
-            payload = {
+            payload: Dict[str, Any] = {
                 "version": NEG_CACHE_VERSION,
                 "entries": self.entries,
             }
+            if self.rule_hash is not None:
+                payload["rule_hash"] = self.rule_hash
+            if self.rule_words is not None:
+                payload["rule_words"] = self.rule_words
             atomic_write_json(self.path, payload, model=NegativeCacheState)
             self.dirty = False
         except Exception:
@@ -202,40 +400,94 @@ class NegativeEventCache:
                 "Failed to flush negative cache to %s", self.path, exc_info=True
             )
 
-    def _fingerprint(self, event: Dict[str, Any]) -> tuple[str, Optional[str]]:
-        event_id = str(event.get("id")) if event.get("id") is not None else ""
-        updated = event.get("updated")
-        updated_str: Optional[str] = None
-        if isinstance(updated, (str, datetime, int, float)):
-            updated_str = format_cet_timestamp(updated)
-            if updated_str is None and isinstance(updated, str):
-                updated_str = updated
+    def _matches(
+        self,
+        entry: Dict[str, Any],
+        event: Dict[str, Any],
+        fingerprint: EventFingerprint,
+    ) -> bool:
+        stored = entry.get("fingerprint")
+        if entry.get("fingerprint_version") == FINGERPRINT_VERSION:
+            return stored == fingerprint.trigger_digest
 
-        summary = self._normalise_text(event.get("summary"))
-        description = self._normalise_text(event.get("description"))
+        # Upgrade entries written with the legacy SHA-1 digest in place.
+        if stored != legacy_trigger_digest(event):
+            return False
+        entry["fingerprint"] = fingerprint.trigger_digest
+        entry["fingerprint_version"] = FINGERPRINT_VERSION
+        self.dirty = True
+        return True
 
-        base = f"{event_id}|{updated_str or '-'}|{summary}|{description}"
-        fingerprint = hashlib.sha1(base.encode("utf-8")).hexdigest()
-        return fingerprint, updated_str
+    def _purge_stale(self, now: Optional[float] = None) -> None:
+        now = now or time.time()
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            expires_at, event_id = heapq.heappop(heap)
+            # Heap nodes are invalidated lazily when an entry is re-indexed.
+            if self._expiry.get(event_id) != expires_at:
+                continue
+            self._remove(event_id)
+            self._pending_metrics["expired"] += 1
+
+        if len(heap) > 2 * len(self._expiry) + 64:
+            self._expiry_heap = [
+                (expires_at, event_id)
+                for event_id, expires_at in self._expiry.items()
+                if expires_at != math.inf
+            ]
+            heapq.heapify(self._expiry_heap)
+
+    def _index(self, event_id: str, entry: Dict[str, Any]) -> None:
+        self._bytes -= self._sizes.get(event_id, 0)
+        size = _estimate_entry_size(event_id, entry)
+        self._sizes[event_id] = size
+        self._bytes += size
+
+        expires_at = self._compute_expiry(entry)
+        if self._expiry.get(event_id) != expires_at:
+            self._expiry[event_id] = expires_at
+            if expires_at != math.inf:
+                heapq.heappush(self._expiry_heap, (expires_at, event_id))
+
+    def _expiry_for(self, event_id: str, entry: Dict[str, Any]) -> float:
+        expires_at = self._expiry.get(event_id)
+        if expires_at is None:
+            self._index(event_id, entry)
+            expires_at = self._expiry[event_id]
+        return expires_at
+
+    def _remove(self, event_id: str) -> None:
+        self.entries.pop(event_id, None)
+        self._expiry.pop(event_id, None)
+        self._bytes -= self._sizes.pop(event_id, 0)
+        self.dirty = True
+
+    def _over_budget(self) -> bool:
+        if self.max_entries and len(self.entries) > self.max_entries:
+            return True
+        return bool(self.max_bytes and self._bytes > self.max_bytes)
+
+    def _enforce_budget(self) -> None:
+        while self.entries and self._over_budget():
+            oldest = next(iter(self.entries))
+            self._remove(oldest)
+            self._pending_metrics["evicted"] += 1
 
     @staticmethod
-    def _normalise_text(value: Any) -> str:
-        if value is None:
-            return ""
-        return str(value).strip().lower()
+    def _compute_expiry(entry: Dict[str, Any]) -> float:
+        updated = entry.get("updated")
+        if updated:
+            parsed = _parse_iso_timestamp(updated)
+            if parsed is not None:
+                if parsed.tzinfo is None:
+                    parsed = parsed.replace(tzinfo=timezone.utc)
+                return parsed.timestamp() + NEG_CACHE_MAX_AGE_SECONDS
 
-    def _purge_stale(self, now: Optional[float] = None) -> None:
-        now = now or time.time()
-        removed = [
-            event_id
-            for event_id, entry in list(self.entries.items())
-            if not self._is_entry_fresh(
-                entry.get("updated"), entry.get("last_seen"), now
-            )
-        ]
-        for event_id in removed:
-            del self.entries[event_id]
-            self.dirty = True
+        last_seen = entry.get("last_seen")
+        if last_seen is not None:
+            return float(last_seen) + NEG_CACHE_MAX_AGE_SECONDS
+
+        return math.inf
 
     @staticmethod
     def _is_entry_fresh(
@@ -254,3 +506,160 @@ class NegativeEventCache:
             return age <= NEG_CACHE_MAX_AGE_SECONDS
 
         return True
+
+
+def _is_record_expired(record: FingerprintRecord) -> bool:
+    return time.time() - record.timestamp > NEG_CACHE_MAX_AGE_SECONDS
+
+
+@dataclass
+class BinaryNegativeEventCache:
+    """:class:`NegativeEventCache` backed by a :class:`FingerprintStore`.
+
+    Each record stores the trigger digest, the rule hash id, the decision and
+    the timestamp used for retention (``updated`` when known, otherwise the
+    last time the event was seen). Expired records are dropped whenever the
+    journal is merged into the base file.
+    """
+
+    path: Path
+    store: FingerprintStore
+    dirty: bool = False
+
+    @classmethod
+    def load(
+        cls,
+        path: Path,
+        *,
+        rule_hash: str,
+        now: Optional[float] = None,
+        json_path: Optional[Path] = None,
+        merge_threshold: Optional[int] = None,
+    ) -> "BinaryNegativeEventCache":
+        options = {} if merge_threshold is None else {"merge_threshold": merge_threshold}
+        store = FingerprintStore(path, drop=_is_record_expired, **options)
+        cache = cls(path=path, store=store)
+        if not store.exists and json_path is not None and json_path.exists():
+            cache._import_json(json_path, rule_hash=rule_hash, now=now)  # noqa: SLF001
+        return cache
+
+    def should_skip(
+        self,
+        event: Dict[str, Any],
+        rule_hash: str,
+        *,
+        fingerprint: Optional[EventFingerprint] = None,
+    ) -> bool:
+        event_id = event.get("id")
+        if not event_id or not isinstance(event_id, str):
+            return False
+
+        record = self.store.get(event_id)
+        if record is None or record.rule_id != rule_id_for(rule_hash):
+            return False
+
+        resolved = fingerprint or fingerprint_event(event)
+        if record.digest != digest_bytes(resolved.trigger_digest):
+            return False
+        if record.decision_code not in _DECISION_CODES.values():
+            return False
+
+        now = time.time()
+        if now - record.timestamp > NEG_CACHE_MAX_AGE_SECONDS:
+            self.forget(event_id)
+            return False
+
+        if not record.flags & FLAG_HAS_UPDATED:
+            if self.store.put(event_id, record._replace(timestamp=now)):
+                self.dirty = True
+        return True
+
+    def get_decision(self, event_id: Optional[str]) -> Optional[str]:
+        if not event_id:
+            return None
+        record = self.store.get(event_id)
+        if record is None:
+            return None
+        code = record.decision_code
+        return _SKIP_DECISIONS[code - 1] if 0 < code <= len(_SKIP_DECISIONS) else None
+
+    def record_no_trigger(
+        self,
+        event: Dict[str, Any],
+        rule_hash: str,
+        decision: str,
+        *,
+        fingerprint: Optional[EventFingerprint] = None,
+    ) -> None:
+        event_id = event.get("id")
+        if not event_id or not isinstance(event_id, str):
+            return
+
+        resolved = fingerprint or fingerprint_event(event)
+        epoch = epoch_from_updated(resolved.updated)
+        flags = with_decision(
+            FLAG_HAS_UPDATED if epoch is not None else 0,
+            _DECISION_CODES.get(decision, 0),
+        )
+        if epoch is None:
+            existing = self.store.get(event_id)
+            epoch = existing.timestamp if existing is not None else time.time()
+        record = FingerprintRecord(
+            digest_bytes(resolved.trigger_digest), epoch, rule_id_for(rule_hash), flags
+        )
+        if self.store.put(event_id, record):
+            self.dirty = True
+
+    def reconcile_rules(
+        self,
+        rule_hash: str,
+        trigger_words: Sequence[str],
+        *,
+        synonyms: Iterable[str] = (),
+    ) -> Tuple[int, int]:
+        """Fixed-width records carry no text signature; rule changes invalidate."""
+
+        return 0, 0
+
+    def forget(self, event_id: Optional[str]) -> None:
+        if not event_id or not isinstance(event_id, str):
+            return
+        if self.store.delete(event_id):
+            self.dirty = True
+
+    def flush(self) -> None:
+        if not self.dirty:
+            return
+        try:
+            self.store.sync()
+            self.dirty = False
+        except Exception:
+            logger.warning(
+                "Failed to flush negative cache store at %s", self.path, exc_info=True
+            )
+
+    def close(self) -> None:
+        self.flush()
+        self.store.close()
+
+    def _import_json(
+        self, json_path: Path, *, rule_hash: str, now: Optional[float]
+    ) -> None:
+        legacy = NegativeEventCache.load(json_path, rule_hash=rule_hash, now=now)
+        for event_id, entry in legacy.entries.items():
+            if entry.get("fingerprint_version") != FINGERPRINT_VERSION:
+                # Legacy digests cannot be verified without the event payload;
+                # the event simply goes through trigger detection once more.
+                continue
+            epoch = epoch_from_updated(entry.get("updated"))
+            flags = FLAG_HAS_UPDATED if epoch is not None else 0
+            if epoch is None:
+                epoch = float(entry.get("last_seen") or time.time())
+            record = FingerprintRecord(
+                digest_bytes(entry["fingerprint"]),
+                epoch,
+                rule_id_for(entry.get("rule_hash")),
+                with_decision(flags, _DECISION_CODES.get(entry.get("decision"), 0)),
+            )
+            self.store.put(event_id, record)
+        self.store.merge()
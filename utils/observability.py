@@ -71,6 +71,12 @@ _hitl_counter = None
 _latency_histogram = None
 _cost_spend_counter = None
 _cost_event_counter = None
+_cache_event_counter = None
+_cache_size_histogram = None
+_http_pool_histogram = None
+_circuit_breaker_counter = None
+_calendar_poll_histogram = None
+_calendar_event_counter = None
 
 _current_log_record_factory = logging.getLogRecordFactory()
 _wrapped_log_factory = getattr(_current_log_record_factory, "__wrapped_factory__", None)
@@ -586,6 +592,106 @@ def record_cost_limit_event(
         _logger.exception("Failed to record cost limit event metric")
 
 
+def record_cache_event(cache: str, event: str, count: int = 1) -> None:
+    """Count cache activity such as ``hit``, ``miss``, ``expired`` or ``evicted``."""
+
+    if not _configured:
+        configure_observability()
+
+    if _cache_event_counter is None or count <= 0:
+        return
+
+    attributes = {"cache": cache or "unknown", "event": event}
+    try:
+        _cache_event_counter.add(int(count), attributes=attributes)
+    except Exception:  # pragma: no cover - defensive guard around metric emission
+        _logger.exception("Failed to record cache event metric")
+
+
+def record_cache_size(
+    cache: str, *, entries: int, bytes_estimate: Optional[int] = None
+) -> None:
+    """Record the current size of an in-memory cache."""
+
+    if not _configured:
+        configure_observability()
+
+    if _cache_size_histogram is None:
+        return
+
+    try:
+        _cache_size_histogram.record(
+            int(entries), attributes={"cache": cache or "unknown", "unit": "entries"}
+        )
+        if bytes_estimate is not None:
+            _cache_size_histogram.record(
+                int(bytes_estimate),
+                attributes={"cache": cache or "unknown", "unit": "bytes"},
+            )
+    except Exception:  # pragma: no cover - defensive guard around metric emission
+        _logger.exception("Failed to record cache size metric")
+
+
+def record_http_pool_usage(
+    host: str, *, active: int, idle: int, limit: Optional[int] = None
+) -> None:
+    """Record connection utilisation of a shared HTTP client pool."""
+
+    if not _configured:
+        configure_observability()
+
+    if _http_pool_histogram is None:
+        return
+
+    try:
+        for state, value in (("active", active), ("idle", idle), ("limit", limit)):
+            if value is None:
+                continue
+            _http_pool_histogram.record(
+                int(value), attributes={"host": host or "unknown", "state": state}
+            )
+    except Exception:  # pragma: no cover - defensive guard around metric emission
+        _logger.exception("Failed to record HTTP pool metric")
+
+
+def record_circuit_breaker_transition(
+    host: str, *, from_state: str, to_state: str
+) -> None:
+    """Count circuit breaker state transitions (``closed``/``open``/``half_open``)."""
+
+    if not _configured:
+        configure_observability()
+
+    if _circuit_breaker_counter is None:
+        return
+
+    attributes = {"host": host or "unknown", "from": from_state, "to": to_state}
+    try:
+        _circuit_breaker_counter.add(1, attributes=attributes)
+    except Exception:  # pragma: no cover - defensive guard around metric emission
+        _logger.exception("Failed to record circuit breaker metric")
+
+
+def record_calendar_poll(
+    calendar_id: str, *, duration_ms: float, events: int, outcome: str = "success"
+) -> None:
+    """Record poll latency and event count for one Google Calendar."""
+
+    if not _configured:
+        configure_observability()
+
+    attributes = {"calendar": calendar_id or "unknown", "outcome": outcome}
+    try:
+        if _calendar_poll_histogram is not None:
+            _calendar_poll_histogram.record(float(duration_ms), attributes=attributes)
+        if _calendar_event_counter is not None and events:
+            _calendar_event_counter.add(
+                int(events), attributes={"calendar": calendar_id or "unknown"}
+            )
+    except Exception:  # pragma: no cover - defensive guard around metric emission
+        _logger.exception("Failed to record calendar poll metric")
+
+
 def get_current_run_id() -> str:
     run_id = current_run_id_var.get()
     return run_id or "unassigned"
@@ -669,6 +775,8 @@ def _record_operation_latency(
 def _clear_instruments() -> None:
     global _run_counter, _trigger_counter, _hitl_counter, _latency_histogram
     global _cost_spend_counter, _cost_event_counter
+    global _cache_event_counter, _cache_size_histogram, _http_pool_histogram
+    global _circuit_breaker_counter, _calendar_poll_histogram, _calendar_event_counter
 
     _run_counter = None
     _trigger_counter = None
@@ -676,15 +784,26 @@ def _clear_instruments() -> None:
     _latency_histogram = None
     _cost_spend_counter = None
     _cost_event_counter = None
+    _cache_event_counter = None
+    _cache_size_histogram = None
+    _http_pool_histogram = None
+    _circuit_breaker_counter = None
+    _calendar_poll_histogram = None
+    _calendar_event_counter = None
 
 
 def _reset_instruments() -> None:
     global _run_counter, _trigger_counter, _hitl_counter, _latency_histogram
     global _cost_spend_counter, _cost_event_counter
+    global _cache_event_counter, _cache_size_histogram, _http_pool_histogram
+    global _circuit_breaker_counter, _calendar_poll_histogram, _calendar_event_counter
 
     if not _OTEL_AVAILABLE or metrics is None:
         _run_counter = _trigger_counter = _hitl_counter = _latency_histogram = None
         _cost_spend_counter = _cost_event_counter = None
+        _cache_event_counter = _cache_size_histogram = None
+        _http_pool_histogram = _circuit_breaker_counter = None
+        _calendar_poll_histogram = _calendar_event_counter = None
         return
 
     meter = metrics.get_meter(_TRACER_NAME)
@@ -713,6 +832,31 @@ def _reset_instruments() -> None:
         "workflow_cost_guard_events_total",
         description="Count of budget guard events (warnings, breaches, rate limits).",
     )
+    _cache_event_counter = meter.create_counter(
+        "workflow_cache_events_total",
+        description="Cache hits, misses, expirations and evictions by cache.",
+    )
+    _cache_size_histogram = meter.create_histogram(
+        "workflow_cache_size",
+        description="Entry count and estimated memory footprint of in-process caches.",
+    )
+    _http_pool_histogram = meter.create_histogram(
+        "workflow_http_pool_connections",
+        description="Active and idle connections of shared HTTP client pools by host.",
+    )
+    _circuit_breaker_counter = meter.create_counter(
+        "workflow_circuit_breaker_transitions_total",
+        description="Circuit breaker state transitions by host.",
+    )
+    _calendar_poll_histogram = meter.create_histogram(
+        "workflow_calendar_poll_duration_ms",
+        description="Latency of polling each Google Calendar.",
+        unit="ms",
+    )
+    _calendar_event_counter = meter.create_counter(
+        "workflow_calendar_events_polled_total",
+        description="Events returned by each polled Google Calendar.",
+    )
 
 
 def _install_log_record_factory() -> None:
@@ -15,6 +15,7 @@ from pydantic import BaseModel, ConfigDict, Field
 class ProcessedEventEntry(BaseModel):
     fingerprint: str
     updated: str | None = None
+    fingerprint_version: int | None = None
 
     model_config = ConfigDict(extra="allow")
 
@@ -33,6 +34,7 @@ class NegativeCacheEntry(BaseModel):
     first_seen: float | None = None
     last_seen: float | None = None
     classification_version: str | None = None
+    fingerprint_version: int | None = None
 
     model_config = ConfigDict(extra="allow")
 
@@ -44,6 +46,23 @@ class NegativeCacheState(BaseModel):
     model_config = ConfigDict(extra="allow")
 
 
+class StageCheckpointEntry(BaseModel):
+    payload: Any = None
+    recorded_at: float
+    inputs_digest: str | None = None
+
+    model_config = ConfigDict(extra="allow")
+
+
+class StageCheckpointState(BaseModel):
+    event_id: str | None = None
+    fingerprint: str
+    config_hash: str | None = None
+    stages: dict[str, StageCheckpointEntry] = Field(default_factory=dict)
+
+    model_config = ConfigDict(extra="allow")
+
+
 class RunsIndexEntry(BaseModel):
     run_id: str
     log_path: str
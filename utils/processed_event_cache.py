@@ -2,50 +2,49 @@
 
 from __future__ import annotations
 
-import hashlib
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from utils.event_fingerprint import (
+    FINGERPRINT_VERSION,
+    EventFingerprint,
+    fingerprint_event,
+    legacy_content_digest,
+    normalise_updated,
+)
+from utils.fingerprint_store import (
+    FLAG_HAS_UPDATED,
+    FLAG_LEGACY,
+    FingerprintRecord,
+    FingerprintStore,
+    digest_bytes,
+    epoch_from_updated,
+)
 from utils.persistence import (
     ProcessedEventsState,
     atomic_write_json,
     load_json_or_default,
 )
-from utils.datetime_formatting import format_cet_timestamp
 
 logger = logging.getLogger(__name__)
 
 
-SIGNIFICANT_EVENT_FIELDS = (
-    "summary",
-    "description",
-    "location",
-    "eventType",
-    "creator",
-    "organizer",
-    "conferenceData",
-    "attachments",
-    "attendees",
-    "extendedProperties",
-)
-
-
 @dataclass
 class ProcessedEventCache:
     """Stores fingerprints of events that have been dispatched."""
 
     path: Path
-    entries: Dict[str, Dict[str, Optional[str]]] = field(default_factory=dict)
+    entries: Dict[str, Dict[str, Any]] = field(default_factory=dict)
     dirty: bool = False
 
     @classmethod
     def load(cls, path: Path) -> "ProcessedEventCache":
         """Load cache entries from *path* if it exists."""
 
-        entries: Dict[str, Dict[str, Optional[str]]] = {}
+        entries: Dict[str, Dict[str, Any]] = {}
         raw, reason = load_json_or_default(
             path,
             default=lambda: {"entries": {}},
@@ -69,29 +68,38 @@ class ProcessedEventCache:
                 updated = entry.get("updated")
                 formatted_updated: Optional[str] = None
                 if isinstance(updated, (str, datetime, int, float)):
-                    formatted_updated = format_cet_timestamp(updated)
-                if formatted_updated is None and isinstance(updated, str):
-                    formatted_updated = updated
+                    formatted_updated = normalise_updated(updated)
                 entries[str(event_id)] = {
                     "fingerprint": fingerprint,
                     "updated": formatted_updated,
+                    "fingerprint_version": entry.get("fingerprint_version"),
                 }
 
         return cls(path=path, entries=entries, dirty=False)
 
-    def is_processed(self, event: Dict[str, Any]) -> bool:
-        """Return ``True`` if *event* matches a processed entry."""
+    def is_processed(
+        self,
+        event: Dict[str, Any],
+        *,
+        fingerprint: Optional[EventFingerprint] = None,
+    ) -> bool:
+        """Return ``True`` if *event* matches a processed entry.
+
+        Callers that already computed the :class:`EventFingerprint` for *event*
+        should pass it via *fingerprint* to avoid hashing the payload again.
+        """
 
         event_id = event.get("id")
         if not isinstance(event_id, str) or not event_id:
             return False
 
-        fingerprint, updated = self._fingerprint(event)
         entry = self.entries.get(event_id)
         if not entry:
             return False
 
-        if entry.get("fingerprint") == fingerprint:
+        resolved = fingerprint or fingerprint_event(event)
+        updated = resolved.updated
+        if self._matches(entry, event, resolved):
             if updated and entry.get("updated") != updated:
                 entry["updated"] = updated
                 self.dirty = True
@@ -102,20 +110,29 @@ class ProcessedEventCache:
         self.forget(event_id)
         return False
 
-    def mark_processed(self, event: Dict[str, Any]) -> None:
+    def mark_processed(
+        self,
+        event: Dict[str, Any],
+        *,
+        fingerprint: Optional[EventFingerprint] = None,
+    ) -> None:
         """Persist the fingerprint for a successfully dispatched *event*."""
 
         event_id = event.get("id")
         if not isinstance(event_id, str) or not event_id:
             return
 
-        fingerprint, updated = self._fingerprint(event)
-        if not updated:
+        resolved = fingerprint or fingerprint_event(event)
+        if not resolved.updated:
             # Without an ``updated`` timestamp we cannot reliably deduplicate.
             self.forget(event_id)
             return
 
-        entry = {"fingerprint": fingerprint, "updated": updated}
+        entry = {
+            "fingerprint": resolved.content_digest,
+            "updated": resolved.updated,
+            "fingerprint_version": FINGERPRINT_VERSION,
+        }
         if self.entries.get(event_id) != entry:
             self.entries[event_id] = entry
             self.dirty = True
@@ -142,50 +159,155 @@ class ProcessedEventCache:
                 "Failed to flush processed event cache to %s", self.path, exc_info=True
             )
 
-    def _fingerprint(self, event: Dict[str, Any]) -> tuple[str, Optional[str]]:
-        event_id = str(event.get("id")) if event.get("id") is not None else ""
-        updated = event.get("updated")
-        updated_str: Optional[str] = None
-        if isinstance(updated, (str, datetime, int, float)):
-            updated_str = format_cet_timestamp(updated)
-            if updated_str is None and isinstance(updated, str):
-                updated_str = updated
-
-        payload_segments = [event_id]
-        for key in SIGNIFICANT_EVENT_FIELDS:
-            payload_segments.append(
-                f"{key}:{self._normalise_structure(event.get(key))}"
-            )
+    def _matches(
+        self,
+        entry: Dict[str, Any],
+        event: Dict[str, Any],
+        fingerprint: EventFingerprint,
+    ) -> bool:
+        stored = entry.get("fingerprint")
+        if entry.get("fingerprint_version") == FINGERPRINT_VERSION:
+            return stored == fingerprint.content_digest
 
-        base = "|".join(payload_segments)
-        fingerprint = hashlib.sha1(base.encode("utf-8")).hexdigest()
-        return fingerprint, updated_str
+        # Entries written before the shared fingerprint service used SHA-1 over
+        # a normalised string. Upgrade them in place instead of re-dispatching.
+        if stored != legacy_content_digest(event):
+            return False
+        entry["fingerprint"] = fingerprint.content_digest
+        entry["fingerprint_version"] = FINGERPRINT_VERSION
+        self.dirty = True
+        return True
+
+
+@dataclass
+class BinaryProcessedEventCache:
+    """:class:`ProcessedEventCache` backed by a :class:`FingerprintStore`.
+
+    Records are fixed-width and looked up through a memory-mapped file, so the
+    cache opens in constant time regardless of the retention window. When the
+    binary store does not exist yet, entries are imported once from the JSON
+    cache at *json_path*.
+    """
 
-    @staticmethod
-    def _normalise_text(value: Any) -> str:
-        if value is None:
-            return ""
-        return str(value).strip().lower()
+    path: Path
+    store: FingerprintStore
+    dirty: bool = False
 
     @classmethod
-    def _normalise_structure(cls, value: Any) -> str:
-        if value is None:
-            return ""
-        if isinstance(value, str):
-            return cls._normalise_text(value)
-        if isinstance(value, bool):
-            return "true" if value else "false"
-        if isinstance(value, (int, float)):
-            return str(value)
-        if isinstance(value, dict):
-            items = []
-            for key in sorted(value.keys(), key=str):
-                items.append(
-                    f"{cls._normalise_text(key)}:{cls._normalise_structure(value[key])}"
-                )
-            return "{" + "|".join(items) + "}"
-        if isinstance(value, (list, tuple, set)):
-            parts = [cls._normalise_structure(item) for item in value]
-            parts.sort()
-            return "[" + "|".join(parts) + "]"
-        return cls._normalise_text(value)
+    def load(
+        cls,
+        path: Path,
+        *,
+        json_path: Optional[Path] = None,
+        merge_threshold: Optional[int] = None,
+    ) -> "BinaryProcessedEventCache":
+        options = {} if merge_threshold is None else {"merge_threshold": merge_threshold}
+        store = FingerprintStore(path, **options)
+        cache = cls(path=path, store=store)
+        if not store.exists and json_path is not None and json_path.exists():
+            cache._import_json(json_path)  # noqa: SLF001
+        return cache
+
+    def is_processed(
+        self,
+        event: Dict[str, Any],
+        *,
+        fingerprint: Optional[EventFingerprint] = None,
+    ) -> bool:
+        event_id = event.get("id")
+        if not isinstance(event_id, str) or not event_id:
+            return False
+
+        record = self.store.get(event_id)
+        if record is None:
+            return False
+
+        resolved = fingerprint or fingerprint_event(event)
+        if record.flags & FLAG_LEGACY:
+            matches = record.digest == digest_bytes(legacy_content_digest(event))
+        else:
+            matches = record.digest == digest_bytes(resolved.content_digest)
+        if not matches:
+            self.forget(event_id)
+            return False
+
+        if resolved.updated or record.flags & FLAG_LEGACY:
+            self._put(event_id, resolved, fallback=record)
+        return bool(record.flags & FLAG_HAS_UPDATED or resolved.updated)
+
+    def mark_processed(
+        self,
+        event: Dict[str, Any],
+        *,
+        fingerprint: Optional[EventFingerprint] = None,
+    ) -> None:
+        event_id = event.get("id")
+        if not isinstance(event_id, str) or not event_id:
+            return
+
+        resolved = fingerprint or fingerprint_event(event)
+        if not resolved.updated:
+            self.forget(event_id)
+            return
+        self._put(event_id, resolved)
+
+    def forget(self, event_id: Optional[str]) -> None:
+        if not isinstance(event_id, str) or not event_id:
+            return
+        if self.store.delete(event_id):
+            self.dirty = True
+
+    def flush(self) -> None:
+        if not self.dirty:
+            return
+        try:
+            self.store.sync()
+            self.dirty = False
+        except Exception:
+            logger.warning(
+                "Failed to flush processed event store at %s", self.path, exc_info=True
+            )
+
+    def close(self) -> None:
+        self.flush()
+        self.store.close()
+
+    def _put(
+        self,
+        event_id: str,
+        fingerprint: EventFingerprint,
+        *,
+        fallback: Optional[FingerprintRecord] = None,
+    ) -> None:
+        epoch = epoch_from_updated(fingerprint.updated)
+        if epoch is None and fallback is not None:
+            epoch = fallback.timestamp
+        flags = FLAG_HAS_UPDATED if fingerprint.updated else 0
+        if fallback is not None:
+            flags |= fallback.flags & FLAG_HAS_UPDATED
+        record = FingerprintRecord(
+            digest_bytes(fingerprint.content_digest), epoch or 0.0, 0, flags
+        )
+        if self.store.put(event_id, record):
+            self.dirty = True
+
+    def _import_json(self, json_path: Path) -> None:
+        legacy = ProcessedEventCache.load(json_path)
+        for event_id, entry in legacy.entries.items():
+            fingerprint = entry["fingerprint"]
+            flags = FLAG_HAS_UPDATED if entry.get("updated") else 0
+            if entry.get("fingerprint_version") != FINGERPRINT_VERSION:
+                flags |= FLAG_LEGACY
+            try:
+                digest = digest_bytes(fingerprint)
+            except ValueError:
+                continue
+            epoch = epoch_from_updated(entry.get("updated")) or 0.0
+            self.store.put(event_id, FingerprintRecord(digest, epoch, 0, flags))
+        self.store.merge()
+        logger.info(
+            "Imported %d processed event entries from %s into %s",
+            len(legacy.entries),
+            json_path,
+            self.path,
+        )
@@ -121,10 +121,42 @@ def _version_sort_key(version: str) -> tuple:
     return (prefix, numeric_parts, version)
 
 
+_prompt_signatures: Dict[Path, tuple] = {}
+
+
 def clear_prompt_cache() -> None:
     """Clear cached prompt indices, primarily for use in unit tests."""
 
     _prompt_index.cache_clear()
+    _prompt_signatures.clear()
+
+
+def _directory_signature(directory: Path) -> tuple:
+    entries = []
+    for path in directory.rglob("*"):
+        if path.is_file() and path.suffix.lower() in _PROMPT_FILE_SUFFIXES:
+            stat = path.stat()
+            entries.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(entries))
+
+
+def reload_prompts_if_changed(directory: Optional[Path] = None) -> bool:
+    """Drop the cached prompt index when template files changed on disk.
+
+    Long-lived processes call this between runs; the first call only records
+    the current state. Returns ``True`` when the cache was cleared.
+    """
+
+    directory = directory or settings.prompt_directory
+    if not directory.exists():
+        return False
+    signature = _directory_signature(directory)
+    previous = _prompt_signatures.get(directory)
+    _prompt_signatures[directory] = signature
+    if previous is None or previous == signature:
+        return False
+    _prompt_index.cache_clear()
+    return True
 
 
 def get_prompt(name: str, version: Optional[str] = None) -> PromptDefinition:
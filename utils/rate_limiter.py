@@ -0,0 +1,214 @@
+"""Token-bucket rate limiting that adapts to server-advertised quotas."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Mapping, Optional
+
+from utils.observability import record_cache_event
+from utils.retry import parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_METRIC_PREFIX = "rate_limit"
+# Stay slightly below the advertised limit so bursts from other clients of
+# the same app do not push us over it.
+DEFAULT_HEADROOM = 0.9
+DEFAULT_RETRY_AFTER_SECONDS = 1.0
+
+HEADER_MAX = "x-hubspot-ratelimit-max"
+HEADER_REMAINING = "x-hubspot-ratelimit-remaining"
+HEADER_INTERVAL_MS = "x-hubspot-ratelimit-interval-milliseconds"
+HEADER_DAILY_REMAINING = "x-hubspot-ratelimit-daily-remaining"
+
+
+def _header_number(headers: Mapping[str, str], name: str) -> Optional[float]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateLimiter:
+    """Token bucket whose fill rate follows rate-limit response headers.
+
+    Callers reserve a token with :meth:`acquire` before each request and feed
+    the response headers back through :meth:`observe`. The bucket capacity
+    and fill rate follow ``X-HubSpot-RateLimit-Max`` per
+    ``X-HubSpot-RateLimit-Interval-Milliseconds`` (minus a small headroom),
+    the token count never exceeds the advertised ``-Remaining`` value and a
+    ``429`` or an exhausted quota pauses every caller until the reset.
+
+    Reservations are computed without awaiting, so one limiter can be shared
+    by integrations running on different event loops.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        rate: float,
+        capacity: Optional[float] = None,
+        headroom: float = DEFAULT_HEADROOM,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self.name = name
+        self.headroom = min(1.0, max(0.1, headroom))
+        self.rate = max(0.001, float(rate))
+        self.capacity = max(1.0, float(capacity if capacity is not None else rate))
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+        self.daily_remaining: Optional[int] = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    @property
+    def tokens(self) -> float:
+        self._refill(self._clock())
+        return self._tokens
+
+    @property
+    def paused_until(self) -> float:
+        return self._paused_until
+
+    async def acquire(self) -> float:
+        """Wait until a request may be sent; returns the total time waited."""
+
+        waited = await self._wait_for_resume()
+        self._refill(self._clock())
+        self._tokens -= 1.0
+        delay = max(0.0, -self._tokens / self.rate)
+        if delay > 0:
+            # The token is reserved; wait for it to be refilled.
+            record_cache_event(self._metric, "throttled")
+            await self._sleep(delay)
+            waited += delay
+        # Honour a pause (e.g. a 429) that started while we were waiting.
+        return waited + await self._wait_for_resume()
+
+    def observe(
+        self,
+        headers: Optional[Mapping[str, str]],
+        *,
+        status_code: Optional[int] = None,
+    ) -> None:
+        """Update the bucket from the headers of a completed response."""
+
+        lowered: Dict[str, str] = {
+            str(key).lower(): value for key, value in (headers or {}).items()
+        }
+        now = self._clock()
+        self._refill(now)
+
+        maximum = _header_number(lowered, HEADER_MAX)
+        interval_ms = _header_number(lowered, HEADER_INTERVAL_MS)
+        if maximum and interval_ms:
+            self.capacity = max(1.0, maximum * self.headroom)
+            self.rate = max(0.001, self.capacity / (interval_ms / 1000.0))
+
+        remaining = _header_number(lowered, HEADER_REMAINING)
+        if remaining is not None:
+            self._tokens = min(self._tokens, remaining * self.headroom)
+            if remaining <= 0:
+                interval = (interval_ms or 1000.0) / 1000.0
+                self.pause(interval, now=now)
+
+        daily = _header_number(lowered, HEADER_DAILY_REMAINING)
+        if daily is not None:
+            self.daily_remaining = int(daily)
+            if daily <= 0:
+                self.pause(_seconds_until_utc_midnight(), now=now)
+                logger.warning(
+                    "%s daily API quota exhausted; pausing until UTC midnight.",
+                    self.name,
+                )
+
+        if status_code == 429:
+            delay = parse_retry_after(lowered.get("retry-after"))
+            if delay is None:
+                delay = (interval_ms or DEFAULT_RETRY_AFTER_SECONDS * 1000) / 1000.0
+            self._tokens = min(self._tokens, 0.0)
+            self.pause(delay, now=now)
+            record_cache_event(self._metric, "rejected")
+
+    def pause(self, seconds: float, *, now: Optional[float] = None) -> None:
+        """Block all callers for *seconds* (extending any existing pause)."""
+
+        now = self._clock() if now is None else now
+        self._paused_until = max(self._paused_until, now + max(0.0, seconds))
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+    @property
+    def _metric(self) -> str:
+        return f"{RATE_LIMIT_METRIC_PREFIX}.{self.name}"
+
+    async def _wait_for_resume(self) -> float:
+        waited = 0.0
+        while True:
+            delay = self._paused_until - self._clock()
+            if delay <= 0:
+                return waited
+            record_cache_event(self._metric, "paused")
+            await self._sleep(delay)
+            waited += delay
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        self._updated = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+
+def _seconds_until_utc_midnight() -> float:
+    now = datetime.now(timezone.utc)
+    tomorrow = (now + timedelta(days=1)).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    return (tomorrow - now).total_seconds()
+
+
+_SHARED_LIMITERS: Dict[str, AdaptiveRateLimiter] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_rate_limiter(
+    namespace: str, *, name: str, rate: float, capacity: Optional[float] = None
+) -> AdaptiveRateLimiter:
+    """Return the process-wide limiter for *namespace* (one per API account)."""
+
+    key = hashlib.sha256(namespace.encode("utf-8")).hexdigest()
+    with _SHARED_LOCK:
+        limiter = _SHARED_LIMITERS.get(key)
+        if limiter is None:
+            limiter = AdaptiveRateLimiter(name, rate=rate, capacity=capacity)
+            _SHARED_LIMITERS[key] = limiter
+        return limiter
+
+
+def reset_shared_rate_limiters() -> None:
+    """Forget all process-wide limiters (used by tests and configuration reloads)."""
+
+    with _SHARED_LOCK:
+        _SHARED_LIMITERS.clear()
+
+
+__all__ = [
+    "AdaptiveRateLimiter",
+    "parse_retry_after",
+    "reset_shared_rate_limiters",
+    "shared_rate_limiter",
+]
@@ -0,0 +1,320 @@
+"""Company-level cache for research agent results keyed by normalised domain."""
+
+from __future__ import annotations
+
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from utils.observability import record_cache_event, record_cache_size
+from utils.persistence import atomic_write_json, load_json_or_default
+from utils.single_flight import SingleFlight
+from utils.validation import normalize_domain
+
+logger = logging.getLogger(__name__)
+
+
+RESEARCH_CACHE_METRIC_NAME = "research_company"
+RESEARCH_CACHE_VERSION = 1
+DEFAULT_TTL_SECONDS = 24 * 3600.0
+DEFAULT_MAX_ENTRIES = 1024
+
+# Outcomes that depend on the individual event (reminders to its organiser,
+# a pending requestor decision) or on a failure are never shared.
+UNCACHEABLE_STATUSES = frozenset(
+    {
+        "AWAIT_REQUESTOR_DETAILS",
+        "AWAIT_REQUESTOR_DECISION",
+        "error",
+        "failed",
+        "skipped",
+    }
+)
+
+
+@dataclass
+class ResearchCacheEntry:
+    """Result of one research agent for one company."""
+
+    result: Dict[str, Any]
+    stored_at: float
+    expires_at: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "result": self.result,
+            "stored_at": self.stored_at,
+            "expires_at": self.expires_at,
+        }
+
+
+def artifact_paths(result: Mapping[str, Any]) -> Iterator[str]:
+    """Yield the artifact paths referenced by a research result."""
+
+    if isinstance(result.get("artifact_path"), str):
+        yield result["artifact_path"]
+    payload = result.get("payload")
+    if not isinstance(payload, Mapping):
+        return
+    if isinstance(payload.get("artifact_path"), str):
+        yield payload["artifact_path"]
+    artifacts = payload.get("artifacts")
+    if isinstance(artifacts, Mapping):
+        for value in artifacts.values():
+            if isinstance(value, str):
+                yield value
+
+
+@dataclass
+class ResearchCache:
+    """Share research results between events concerning the same company.
+
+    Entries are keyed by research agent and normalised company domain and
+    expire after the agent's freshness window (``ttl_seconds`` with the
+    ``default_ttl`` as fallback). A hit returns the stored result, whose
+    artifact paths still point to the files written by the run that computed
+    it; entries whose artifacts have since been removed count as ``stale``.
+    Concurrent :meth:`fetch` calls for the same key share one computation.
+    """
+
+    ttl_seconds: Mapping[str, float] = field(default_factory=dict)
+    default_ttl: float = DEFAULT_TTL_SECONDS
+    max_entries: int = DEFAULT_MAX_ENTRIES
+    path: Optional[Path] = None
+    _entries: "OrderedDict[str, ResearchCacheEntry]" = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _dirty: bool = field(default=False, init=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+    _single_flight: SingleFlight = field(
+        default_factory=lambda: SingleFlight("research_company"),
+        init=False,
+        repr=False,
+    )
+
+    def __post_init__(self) -> None:
+        if self.path is not None:
+            self.path = Path(self.path)
+            self._load()
+
+    @staticmethod
+    def make_key(agent_name: str, domain: str) -> str:
+        return f"{agent_name}|{normalize_domain(domain)}"
+
+    def ttl_for(self, agent_name: str) -> float:
+        return max(0.0, float(self.ttl_seconds.get(agent_name, self.default_ttl)))
+
+    @staticmethod
+    def is_cacheable(result: Any) -> bool:
+        """Return ``False`` for event-specific, failed or degraded results.
+
+        A CRM lookup that failed or could not run reports ``crm_lookup.error``;
+        caching it would record the company as "not in CRM" for the TTL.
+        """
+
+        if not isinstance(result, dict):
+            return False
+        if result.get("status") in UNCACHEABLE_STATUSES:
+            return False
+        payload = result.get("payload")
+        crm_lookup = payload.get("crm_lookup") if isinstance(payload, dict) else None
+        return not (isinstance(crm_lookup, dict) and crm_lookup.get("error"))
+
+    # ------------------------------------------------------------------
+    # Lookup API
+    # ------------------------------------------------------------------
+    def get(
+        self, agent_name: str, domain: str, *, now: Optional[float] = None
+    ) -> Optional[ResearchCacheEntry]:
+        """Return the fresh entry for *agent_name* and *domain* or ``None``."""
+
+        key = self.make_key(agent_name, domain)
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                event = "miss"
+            elif entry.expires_at <= now or not all(
+                Path(path).exists() for path in artifact_paths(entry.result)
+            ):
+                del self._entries[key]
+                self._dirty = True
+                entry = None
+                event = "stale"
+            else:
+                self._entries.move_to_end(key)
+                event = "hit"
+        record_cache_event(RESEARCH_CACHE_METRIC_NAME, event)
+        return entry
+
+    def put(
+        self,
+        agent_name: str,
+        domain: str,
+        result: Dict[str, Any],
+        *,
+        now: Optional[float] = None,
+    ) -> Optional[ResearchCacheEntry]:
+        """Store *result* unless it is event specific or caching is disabled."""
+
+        ttl = self.ttl_for(agent_name)
+        if ttl <= 0 or not self.is_cacheable(result):
+            return None
+        now = time.time() if now is None else now
+        entry = ResearchCacheEntry(
+            result=copy.deepcopy(result), stored_at=now, expires_at=now + ttl
+        )
+        key = self.make_key(agent_name, domain)
+        evicted = 0
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while self.max_entries and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            self._dirty = True
+        if evicted:
+            record_cache_event(RESEARCH_CACHE_METRIC_NAME, "evicted", evicted)
+        return entry
+
+    async def fetch(
+        self,
+        agent_name: str,
+        domain: str,
+        compute: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+    ) -> Tuple[Optional[Dict[str, Any]], str]:
+        """Return ``(result, origin)`` for *agent_name* and *domain*.
+
+        ``origin`` is ``"hit"`` for a cached result, ``"shared"`` when the
+        result of a computation started by a concurrent caller was reused and
+        ``"computed"`` when ``compute()`` ran for this caller. Exceptions of
+        ``compute()`` propagate to every caller sharing the computation.
+        """
+
+        entry = self.get(agent_name, domain)
+        if entry is not None:
+            return copy.deepcopy(entry.result), "hit"
+
+        ran = False
+
+        async def _compute() -> Optional[Dict[str, Any]]:
+            nonlocal ran
+            ran = True
+            result = await compute()
+            if result is not None:
+                self.put(agent_name, domain, result)
+            return result
+
+        result = await self._single_flight.do(
+            self.make_key(agent_name, domain), _compute
+        )
+        return result, "computed" if ran else "shared"
+
+    # ------------------------------------------------------------------
+    # Invalidation hooks
+    # ------------------------------------------------------------------
+    def invalidate(self, domain: str) -> int:
+        """Drop the results of every research agent for *domain*."""
+
+        suffix = f"|{normalize_domain(domain)}"
+        with self._lock:
+            keys = [key for key in self._entries if key.endswith(suffix)]
+            for key in keys:
+                del self._entries[key]
+            if keys:
+                self._dirty = True
+        if keys:
+            record_cache_event(RESEARCH_CACHE_METRIC_NAME, "invalidated", len(keys))
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            if self._entries:
+                self._dirty = True
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def flush(self, now: Optional[float] = None) -> None:
+        record_cache_size(RESEARCH_CACHE_METRIC_NAME, entries=len(self._entries))
+        if self.path is None or not self._dirty:
+            return
+        now = time.time() if now is None else now
+        with self._lock:
+            payload = {
+                "version": RESEARCH_CACHE_VERSION,
+                "entries": {
+                    key: entry.to_dict()
+                    for key, entry in self._entries.items()
+                    if entry.expires_at > now
+                },
+            }
+            self._dirty = False
+        try:
+            atomic_write_json(self.path, payload)
+        except Exception:
+            logger.warning(
+                "Failed to persist research cache to %s", self.path, exc_info=True
+            )
+
+    def _load(self) -> None:
+        assert self.path is not None
+        raw, reason = load_json_or_default(
+            self.path,
+            default=lambda: {"version": RESEARCH_CACHE_VERSION, "entries": {}},
+        )
+        if reason and reason != "missing":
+            logger.warning(
+                "Research cache at %s was reset due to %s.", self.path, reason
+            )
+        entries = raw.get("entries") if isinstance(raw, dict) else None
+        if not isinstance(entries, dict):
+            return
+        now = time.time()
+        ordered: List[Tuple[str, ResearchCacheEntry]] = []
+        for key, item in entries.items():
+            if not isinstance(item, dict) or not isinstance(item.get("result"), dict):
+                continue
+            try:
+                entry = ResearchCacheEntry(
+                    result=item["result"],
+                    stored_at=float(item.get("stored_at", 0.0)),
+                    expires_at=float(item.get("expires_at", 0.0)),
+                )
+            except (TypeError, ValueError):
+                continue
+            if entry.expires_at > now:
+                ordered.append((str(key), entry))
+        ordered.sort(key=lambda pair: pair[1].stored_at)
+        if self.max_entries:
+            ordered = ordered[-self.max_entries :]
+        self._entries.update(ordered)
+
+
+__all__ = [
+    "ResearchCache",
+    "ResearchCacheEntry",
+    "UNCACHEABLE_STATUSES",
+    "artifact_paths",
+]
@@ -0,0 +1,288 @@
+"""Dependency-driven executor for research agents with per-agent limits."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+from utils.concurrency import ExceptionGroup, run_in_task_group
+
+NodeRunner = Callable[[Mapping[str, Any]], Awaitable[Optional[Mapping[str, Any]]]]
+NodeCondition = Callable[[Mapping[str, Any]], bool]
+
+
+@dataclass(frozen=True)
+class ResearchNode:
+    """One research step declaring the facts it consumes and produces.
+
+    ``run`` receives the facts resolved so far and returns a mapping with
+    (a subset of) its ``outputs``. ``when`` is evaluated once all inputs are
+    resolved; returning ``False`` skips the node and leaves its outputs unset.
+    """
+
+    name: str
+    run: NodeRunner
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    when: Optional[NodeCondition] = None
+
+
+@dataclass
+class NodeTiming:
+    """Scheduling timeline of one node relative to the start of the run."""
+
+    status: str
+    ready_ms: float = 0.0
+    started_ms: float = 0.0
+    finished_ms: float = 0.0
+
+    @property
+    def queued_ms(self) -> float:
+        return self.started_ms - self.ready_ms
+
+    @property
+    def duration_ms(self) -> float:
+        return self.finished_ms - self.started_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "ready_ms": round(self.ready_ms, 3),
+            "queued_ms": round(self.queued_ms, 3),
+            "duration_ms": round(self.duration_ms, 3),
+            "finished_ms": round(self.finished_ms, 3),
+        }
+
+
+@dataclass
+class ResearchDAGResult:
+    """Facts produced by a run together with its timings and critical path."""
+
+    facts: Dict[str, Any]
+    timings: Dict[str, NodeTiming] = field(default_factory=dict)
+    critical_path: List[str] = field(default_factory=list)
+    duration_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "duration_ms": round(self.duration_ms, 3),
+            "critical_path": list(self.critical_path),
+            "nodes": {name: timing.to_dict() for name, timing in self.timings.items()},
+        }
+
+
+class ResearchDAG:
+    """Run research nodes as soon as their inputs are available.
+
+    Every node starts once the facts it declares as ``inputs`` are resolved,
+    so independent nodes run concurrently. Nodes whose ``outputs`` are all
+    present in the initial facts are reported as ``cached`` and not run.
+    ``limits`` caps how many runs of a node name may execute at once; the
+    semaphores belong to the executor, so one instance shared by the workflow
+    bounds an agent across all events it researches concurrently.
+
+    A failing node cancels the rest of the run and the failures are raised as
+    an :class:`ExceptionGroup`, except for ``propagate`` types, which are
+    re-raised unwrapped so callers can keep handling them directly.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Mapping[str, int]] = None,
+        *,
+        propagate: Tuple[Type[BaseException], ...] = (),
+    ) -> None:
+        self.limits: Dict[str, int] = {
+            name: int(limit) for name, limit in (limits or {}).items() if limit > 0
+        }
+        self.propagate = propagate
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _semaphore(self, name: str) -> Optional[asyncio.Semaphore]:
+        limit = self.limits.get(name)
+        if not limit:
+            return None
+        semaphore = self._semaphores.get(name)
+        if semaphore is None:
+            semaphore = self._semaphores[name] = asyncio.Semaphore(limit)
+        return semaphore
+
+    @staticmethod
+    def validate(
+        nodes: Sequence[ResearchNode], facts: Iterable[str] = ()
+    ) -> Dict[str, str]:
+        """Return the producer of every output; raise ``ValueError`` on bad graphs."""
+
+        producers: Dict[str, str] = {}
+        names = set()
+        for node in nodes:
+            if node.name in names:
+                raise ValueError(f"Duplicate research node {node.name!r}")
+            names.add(node.name)
+            for output in node.outputs:
+                if output in producers:
+                    raise ValueError(
+                        f"Output {output!r} produced by both "
+                        f"{producers[output]!r} and {node.name!r}"
+                    )
+                producers[output] = node.name
+
+        available = set(facts) | set(producers)
+        for node in nodes:
+            missing = [name for name in node.inputs if name not in available]
+            if missing:
+                raise ValueError(
+                    f"Research node {node.name!r} has unresolvable inputs: "
+                    f"{', '.join(missing)}"
+                )
+
+        # Kahn's algorithm over node -> producer edges detects cycles.
+        provided = set(facts)
+        remaining = list(nodes)
+        while remaining:
+            ready = [
+                node
+                for node in remaining
+                if all(
+                    name in provided or name not in producers for name in node.inputs
+                )
+            ]
+            if not ready:
+                cycle = ", ".join(node.name for node in remaining)
+                raise ValueError(f"Research nodes form a cycle: {cycle}")
+            for node in ready:
+                provided.update(node.outputs)
+                remaining.remove(node)
+        return producers
+
+    async def execute(
+        self,
+        nodes: Sequence[ResearchNode],
+        facts: Optional[Mapping[str, Any]] = None,
+    ) -> ResearchDAGResult:
+        """Run *nodes* against the initial *facts* and return the outcome."""
+
+        result = ResearchDAGResult(facts=dict(facts or {}))
+        producers = self.validate(nodes, result.facts)
+        resolved = {name: asyncio.Event() for name in producers}
+        for name in result.facts:
+            if name in resolved:
+                resolved[name].set()
+        started = time.perf_counter()
+
+        def _elapsed() -> float:
+            return (time.perf_counter() - started) * 1000
+
+        def _resolve(node: ResearchNode) -> None:
+            for output in node.outputs:
+                resolved[output].set()
+
+        def _runner(node: ResearchNode) -> Callable[[], Awaitable[None]]:
+            async def _run() -> None:
+                for name in node.inputs:
+                    if name in resolved:
+                        await resolved[name].wait()
+                timing = NodeTiming(status="pending", ready_ms=_elapsed())
+                result.timings[node.name] = timing
+
+                if node.outputs and all(
+                    name in result.facts for name in node.outputs
+                ):
+                    timing.status = "cached"
+                elif node.when is not None and not node.when(result.facts):
+                    timing.status = "skipped"
+                else:
+                    timing.status = "running"
+                    semaphore = self._semaphore(node.name)
+                    if semaphore is None:
+                        timing.started_ms = _elapsed()
+                        produced = await node.run(result.facts)
+                    else:
+                        async with semaphore:
+                            timing.started_ms = _elapsed()
+                            produced = await node.run(result.facts)
+                    for name in node.outputs:
+                        if isinstance(produced, Mapping) and name in produced:
+                            result.facts[name] = produced[name]
+                    timing.status = "completed"
+
+                if timing.status != "completed":
+                    timing.started_ms = timing.ready_ms
+                timing.finished_ms = _elapsed()
+                _resolve(node)
+
+            return _run
+
+        try:
+            await run_in_task_group(_runner(node) for node in nodes)
+        except ExceptionGroup as group:
+            for exc in _leaves(group):
+                if isinstance(exc, self.propagate):
+                    raise exc from group
+            raise
+        finally:
+            result.duration_ms = _elapsed()
+            for timing in result.timings.values():
+                if timing.status == "running":
+                    timing.status = "failed"
+
+        result.critical_path = _critical_path(nodes, producers, result.timings)
+        return result
+
+
+def _leaves(group: BaseException) -> Iterator[BaseException]:
+    for exc in getattr(group, "exceptions", ()):
+        if isinstance(exc, ExceptionGroup):
+            yield from _leaves(exc)
+        else:
+            yield exc
+
+
+def _critical_path(
+    nodes: Sequence[ResearchNode],
+    producers: Mapping[str, str],
+    timings: Mapping[str, NodeTiming],
+) -> List[str]:
+    """Walk back from the node that finished last through its latest input."""
+
+    by_name = {node.name: node for node in nodes}
+    finished = [name for name in by_name if name in timings]
+    if not finished:
+        return []
+    current: Optional[str] = max(finished, key=lambda name: timings[name].finished_ms)
+    path: List[str] = []
+    while current is not None:
+        path.append(current)
+        upstream = {
+            producers[name]
+            for name in by_name[current].inputs
+            if name in producers and producers[name] in timings
+        }
+        current = max(
+            upstream, key=lambda name: timings[name].finished_ms, default=None
+        )
+    path.reverse()
+    return path
+
+
+__all__ = [
+    "NodeTiming",
+    "ResearchDAG",
+    "ResearchDAGResult",
+    "ResearchNode",
+]
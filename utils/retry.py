@@ -1,5 +1,239 @@
 """Shared retry/backoff configuration utilities."""
 
+from __future__ import annotations
+
+import random
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, FrozenSet, Optional
+
 DEFAULT_MAX_ATTEMPTS: int = 5
 INITIAL_BACKOFF_SECONDS: float = 0.5
 MAX_BACKOFF_SECONDS: float = 8.0
+DEFAULT_REQUEST_DEADLINE_SECONDS: float = 60.0
+MAX_RETRY_AFTER_SECONDS: float = 60.0
+DEFAULT_RETRY_BUDGET_TOKENS: float = 20.0
+DEFAULT_RETRY_BUDGET_RATIO: float = 0.2
+
+#: Statuses that signal a transient condition worth retrying.
+RETRYABLE_STATUSES: FrozenSet[int] = frozenset({408, 425, 429, 500, 502, 503, 504})
+#: Statuses where the server did not process the request, so even
+#: non-idempotent requests can be retried safely.
+UNPROCESSED_STATUSES: FrozenSet[int] = frozenset({425, 429, 503})
+IDEMPOTENT_METHODS: FrozenSet[str] = frozenset(
+    {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+)
+
+
+def parse_retry_after(
+    value: Optional[str], *, now: Optional[datetime] = None
+) -> Optional[float]:
+    """Return the delay in seconds advertised by a ``Retry-After`` header."""
+
+    if value is None:
+        return None
+    text = str(value).strip()
+    if not text:
+        return None
+    try:
+        return max(0.0, float(text))
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(text)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    reference = now or datetime.now(timezone.utc)
+    return max(0.0, (moment - reference).total_seconds())
+
+
+class RetryBudget:
+    """Token bucket limiting retries to a fraction of regular requests.
+
+    Every request deposits ``ratio`` tokens (up to ``max_tokens``) and every
+    retry withdraws one. During an upstream incident the bucket drains and
+    further failures are returned immediately instead of multiplying load.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_tokens: float = DEFAULT_RETRY_BUDGET_TOKENS,
+        ratio: float = DEFAULT_RETRY_BUDGET_RATIO,
+    ) -> None:
+        self.max_tokens = max(0.0, float(max_tokens))
+        self.ratio = max(0.0, float(ratio))
+        self._tokens = self.max_tokens
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+
+class RetryBudgets:
+    """Per-run retry budgets; the most recent runs are kept."""
+
+    def __init__(
+        self,
+        *,
+        max_tokens: float = DEFAULT_RETRY_BUDGET_TOKENS,
+        ratio: float = DEFAULT_RETRY_BUDGET_RATIO,
+        max_runs: int = 8,
+    ) -> None:
+        self.max_tokens = max_tokens
+        self.ratio = ratio
+        self.max_runs = max(1, max_runs)
+        self._budgets: "OrderedDict[str, RetryBudget]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def for_run(self, run_id: str) -> RetryBudget:
+        with self._lock:
+            budget = self._budgets.get(run_id)
+            if budget is None:
+                budget = RetryBudget(max_tokens=self.max_tokens, ratio=self.ratio)
+                self._budgets[run_id] = budget
+                while len(self._budgets) > self.max_runs:
+                    self._budgets.popitem(last=False)
+            else:
+                self._budgets.move_to_end(run_id)
+            return budget
+
+    def reset(self) -> None:
+        with self._lock:
+            self._budgets.clear()
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Decide whether and when an HTTP request is retried.
+
+    Request errors and :data:`RETRYABLE_STATUSES` are retried for
+    idempotent methods; other methods are only retried when the request
+    cannot have been processed (connection failures and
+    :data:`UNPROCESSED_STATUSES`). Any other status is returned to the caller
+    at once. Delays use full-jitter exponential backoff, honour
+    ``Retry-After`` and never extend past the request deadline.
+    """
+
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    initial_backoff: float = INITIAL_BACKOFF_SECONDS
+    max_backoff: float = MAX_BACKOFF_SECONDS
+    deadline: float = DEFAULT_REQUEST_DEADLINE_SECONDS
+    max_retry_after: float = MAX_RETRY_AFTER_SECONDS
+    retry_statuses: FrozenSet[int] = RETRYABLE_STATUSES
+    idempotent_methods: FrozenSet[str] = IDEMPOTENT_METHODS
+    budgets: Optional[RetryBudgets] = field(default=None, compare=False)
+
+    def is_idempotent(self, method: str) -> bool:
+        return method.upper() in self.idempotent_methods
+
+    def should_retry_status(self, method: str, status_code: int) -> bool:
+        if status_code not in self.retry_statuses:
+            return False
+        return self.is_idempotent(method) or status_code in UNPROCESSED_STATUSES
+
+    def should_retry_exception(self, method: str, exc: BaseException) -> bool:
+        try:
+            import httpx
+        except ImportError:  # pragma: no cover - httpx is a core dependency
+            return False
+        if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+            return True
+        if self.is_idempotent(method):
+            return isinstance(exc, httpx.RequestError)
+        return False
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Return the delay before retry number *attempt* (1-based)."""
+
+        if retry_after is not None:
+            return min(max(0.0, retry_after), self.max_retry_after)
+        ceiling = min(self.max_backoff, self.initial_backoff * (2 ** (attempt - 1)))
+        return random.uniform(0.0, max(0.0, ceiling))
+
+    def deadline_from(self, start: float, deadline: Optional[float] = None) -> float:
+        return start + (self.deadline if deadline is None else max(0.0, deadline))
+
+
+_DEFAULT_POLICY: Optional[RetryPolicy] = None
+
+
+def default_retry_policy(settings: Optional[Any] = None) -> RetryPolicy:
+    """Return the process default policy built from configuration.
+
+    The policy (and therefore its retry budgets) is shared by every
+    :class:`~utils.async_http.AsyncHTTP` instance that does not pass its own.
+    """
+
+    global _DEFAULT_POLICY  # noqa: PLW0603
+    if settings is None and _DEFAULT_POLICY is not None:
+        return _DEFAULT_POLICY
+    cache = settings is None
+    if settings is None:
+        try:
+            from config.config import settings as loaded
+        except Exception:  # pragma: no cover - configuration not importable
+            loaded = None
+        settings = loaded
+    policy = RetryPolicy(
+        max_attempts=int(
+            getattr(settings, "http_retry_max_attempts", DEFAULT_MAX_ATTEMPTS)
+        ),
+        deadline=float(
+            getattr(
+                settings,
+                "http_request_deadline_seconds",
+                DEFAULT_REQUEST_DEADLINE_SECONDS,
+            )
+        ),
+        budgets=RetryBudgets(
+            max_tokens=float(
+                getattr(
+                    settings, "http_retry_budget_tokens", DEFAULT_RETRY_BUDGET_TOKENS
+                )
+            ),
+            ratio=float(
+                getattr(settings, "http_retry_budget_ratio", DEFAULT_RETRY_BUDGET_RATIO)
+            ),
+        ),
+    )
+    if cache:
+        _DEFAULT_POLICY = policy
+    return policy
+
+
+def reset_default_retry_policy() -> None:
+    """Forget the cached default policy (used by tests and configuration reloads)."""
+
+    global _DEFAULT_POLICY  # noqa: PLW0603
+    _DEFAULT_POLICY = None
+
+
+__all__ = [
+    "DEFAULT_MAX_ATTEMPTS",
+    "INITIAL_BACKOFF_SECONDS",
+    "MAX_BACKOFF_SECONDS",
+    "RetryBudget",
+    "RetryBudgets",
+    "RetryPolicy",
+    "default_retry_policy",
+    "parse_retry_after",
+    "reset_default_retry_policy",
+]
@@ -0,0 +1,112 @@
+"""Coalesce concurrent identical coroutine calls into a single in-flight call."""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+from utils.observability import record_cache_event
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SINGLE_FLIGHT_METRIC_PREFIX = "single_flight"
+
+
+def call_key(*parts: Any, **options: Any) -> str:
+    """Build a stable key from positional parts and keyword options.
+
+    Sequences such as requested HubSpot properties are order sensitive in the
+    key; callers should normalise them (e.g. sort) when order does not matter.
+    """
+
+    return json.dumps([parts, options], sort_keys=True, default=str)
+
+
+class _Call:
+    __slots__ = ("task", "waiters", "shared")
+
+    def __init__(self, task: "asyncio.Task[Any]") -> None:
+        self.task = task
+        self.waiters = 0
+        self.shared = False
+
+
+class SingleFlight:
+    """Deduplicate in-flight coroutine calls by key.
+
+    The first caller for a key (the leader) starts the coroutine as a task;
+    callers arriving while it runs await the same task instead of issuing
+    another request. Results and exceptions are delivered to every waiter.
+    Cancelling one waiter does not cancel the shared call unless it was the
+    last one still waiting. When a call was shared, every caller receives its
+    own deep copy of the result so mutating one payload cannot affect others.
+    """
+
+    def __init__(self, name: str, *, copy_results: bool = True) -> None:
+        self.name = name
+        self.copy_results = copy_results
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def in_flight(self, key: Optional[Hashable] = None) -> int:
+        """Return the number of running calls (or ``0``/``1`` for *key*)."""
+
+        if key is not None:
+            return 1 if key in self._calls else 0
+        return len(self._calls)
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        """Run ``factory()`` unless a call for *key* is already in flight."""
+
+        loop = asyncio.get_running_loop()
+        call = self._calls.get(key)
+        leader = call is None or call.task.get_loop() is not loop
+        if leader:
+            task = loop.create_task(self._run(factory))
+            call = _Call(task)
+            self._calls[key] = call
+            task.add_done_callback(lambda _task, key=key: self._forget(key, call))
+        else:
+            call.shared = True
+            record_cache_event(f"{SINGLE_FLIGHT_METRIC_PREFIX}.{self.name}", "coalesced")
+
+        call.waiters += 1
+        try:
+            result = await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.task.done() and call.task.cancelled():
+                raise
+            if call.waiters <= 1 and not call.task.done():
+                # Nobody else is interested in the outcome any more.
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+        if not (call.shared and self.copy_results):
+            return result
+        return copy.deepcopy(result)
+
+    @staticmethod
+    async def _run(factory: Callable[[], Awaitable[T]]) -> T:
+        return await factory()
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        task = call.task
+        if not task.cancelled() and task.exception() is not None and call.waiters == 0:
+            # Retrieve the exception so asyncio does not log it as unhandled
+            # when every waiter was cancelled before the call failed.
+            logger.debug(
+                "Single-flight call %s/%s failed after all waiters left",
+                self.name,
+                key,
+            )
+
+
+__all__ = ["SingleFlight", "call_key"]
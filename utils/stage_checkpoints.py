@@ -0,0 +1,206 @@
+"""Durable per-event stage checkpoints so interrupted runs can resume."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+from utils.observability import record_cache_event
+from utils.persistence import (
+    StageCheckpointState,
+    atomic_write_json,
+    load_json_or_default,
+)
+
+logger = logging.getLogger(__name__)
+
+
+STAGE_TRIGGER = "trigger"
+STAGE_EXTRACTION = "extraction"
+CHECKPOINT_METRIC_NAME = "stage_checkpoints"
+DEFAULT_CHECKPOINT_TTL_SECONDS = 24 * 60 * 60
+
+
+def inputs_digest(value: Any) -> str:
+    """Return a short digest of stage inputs (e.g. the research company info)."""
+
+    payload = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _json_safe(value: Any) -> Any:
+    return json.loads(json.dumps(value, default=str, ensure_ascii=False))
+
+
+@dataclass
+class StageCheckpointStore:
+    """Persist completed workflow stages keyed by event fingerprint.
+
+    Each event fingerprint maps to one JSON document under *directory* that
+    holds the outputs of completed stages. Documents written under another
+    ``config_hash`` (trigger rules, LLM thresholds or agent implementations
+    changed) or older than ``ttl_seconds`` are ignored and removed, so a
+    restarted run only reuses results that are still valid.
+    """
+
+    directory: Path
+    config_hash: str
+    ttl_seconds: float = DEFAULT_CHECKPOINT_TTL_SECONDS
+    saved_stages: Dict[str, int] = field(default_factory=dict)
+    _documents: Dict[str, Dict[str, Any]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def load(
+        self,
+        fingerprint: str,
+        stage: str,
+        *,
+        inputs: Optional[str] = None,
+        now: Optional[float] = None,
+    ) -> Optional[Any]:
+        """Return the payload checkpointed for *stage* or ``None``."""
+
+        document = self._document(fingerprint)
+        if document is None:
+            return None
+        entry = document.get("stages", {}).get(stage)
+        if not isinstance(entry, Mapping):
+            return None
+        now = time.time() if now is None else now
+        recorded_at = entry.get("recorded_at") or 0.0
+        if now - float(recorded_at) > self.ttl_seconds:
+            return None
+        if inputs is not None and entry.get("inputs_digest") != inputs:
+            return None
+
+        self.saved_stages[stage] = self.saved_stages.get(stage, 0) + 1
+        record_cache_event(CHECKPOINT_METRIC_NAME, f"resumed.{stage}")
+        return _json_safe(entry.get("payload"))
+
+    def save(
+        self,
+        fingerprint: str,
+        stage: str,
+        payload: Any,
+        *,
+        event_id: Optional[str] = None,
+        inputs: Optional[str] = None,
+        now: Optional[float] = None,
+    ) -> None:
+        """Durably record *payload* as the output of *stage*."""
+
+        document = self._document(fingerprint) or {
+            "event_id": event_id,
+            "fingerprint": fingerprint,
+            "config_hash": self.config_hash,
+            "stages": {},
+        }
+        try:
+            safe_payload = _json_safe(payload)
+        except (TypeError, ValueError):
+            logger.debug("Checkpoint payload for stage %s is not serialisable", stage)
+            return
+        document["stages"][stage] = {
+            "payload": safe_payload,
+            "recorded_at": time.time() if now is None else now,
+            "inputs_digest": inputs,
+        }
+        self._documents[fingerprint] = document
+        try:
+            atomic_write_json(
+                self._path(fingerprint), document, model=StageCheckpointState
+            )
+        except Exception:
+            logger.warning(
+                "Failed to write stage checkpoint %s/%s",
+                fingerprint,
+                stage,
+                exc_info=True,
+            )
+
+    def discard(self, fingerprint: str) -> None:
+        """Remove all checkpoints of an event, e.g. once it was dispatched."""
+
+        self._documents.pop(fingerprint, None)
+        try:
+            self._path(fingerprint).unlink(missing_ok=True)
+        except OSError:
+            logger.debug("Unable to remove checkpoint for %s", fingerprint)
+
+    def clear(self) -> int:
+        """Remove every checkpoint document; returns the number removed."""
+
+        self._documents.clear()
+        if not self.directory.exists():
+            return 0
+        removed = 0
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Delete expired or invalidated checkpoint documents; returns the count."""
+
+        self._documents.clear()
+        if not self.directory.exists():
+            return 0
+        now = time.time() if now is None else now
+        removed = 0
+        for path in self.directory.glob("*.json"):
+            document = self._read(path)
+            stages = (document or {}).get("stages") or {}
+            fresh = any(
+                now - float(entry.get("recorded_at") or 0.0) <= self.ttl_seconds
+                for entry in stages.values()
+                if isinstance(entry, Mapping)
+            )
+            if document is None or not fresh:
+                path.unlink(missing_ok=True)
+                removed += 1
+        if removed:
+            record_cache_event(CHECKPOINT_METRIC_NAME, "expired", removed)
+        return removed
+
+    def _document(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        if fingerprint in self._documents:
+            return self._documents[fingerprint]
+        path = self._path(fingerprint)
+        if not path.exists():
+            return None
+        document = self._read(path)
+        if document is None:
+            path.unlink(missing_ok=True)
+            return None
+        self._documents[fingerprint] = document
+        return document
+
+    def _read(self, path: Path) -> Optional[Dict[str, Any]]:
+        raw, reason = load_json_or_default(path, default=dict)
+        if reason or not isinstance(raw, dict):
+            return None
+        try:
+            document = StageCheckpointState.model_validate(raw).model_dump(mode="json")
+        except Exception:
+            return None
+        if document.get("config_hash") != self.config_hash:
+            return None
+        return document
+
+    def _path(self, fingerprint: str) -> Path:
+        return self.directory / f"{fingerprint}.json"
+
+
+__all__ = [
+    "DEFAULT_CHECKPOINT_TTL_SECONDS",
+    "STAGE_EXTRACTION",
+    "STAGE_TRIGGER",
+    "StageCheckpointStore",
+    "inputs_digest",
+]
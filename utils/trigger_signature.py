@@ -0,0 +1,88 @@
+"""Compact text signatures for re-checking cached trigger decisions locally.
+
+A signature is a Bloom filter over the character trigrams of an event's
+normalised summary and description. It answers "could this text contain the
+term?" without keeping the text itself: ``False`` is definitive, ``True`` may
+be a false positive. The negative event cache stores one signature per entry
+so that adding trigger words only invalidates entries that might match them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Iterable, Optional, Set
+
+from utils.text_normalization import normalize_text
+
+NGRAM_SIZE = 3
+MIN_SIGNATURE_BITS = 64
+MAX_SIGNATURE_BITS = 4096
+_BITS_PER_GRAM = 10
+_HASH_COUNT = 3
+
+
+def _ngrams(text: str) -> Set[str]:
+    if len(text) <= NGRAM_SIZE:
+        return {text} if text else set()
+    return {text[index : index + NGRAM_SIZE] for index in range(len(text) - 2)}
+
+
+def _positions(gram: str, bits: int) -> Iterable[int]:
+    digest = hashlib.blake2b(gram.encode("utf-8"), digest_size=4 * _HASH_COUNT).digest()
+    for index in range(_HASH_COUNT):
+        chunk = digest[index * 4 : index * 4 + 4]
+        yield int.from_bytes(chunk, "little") % bits
+
+
+def _signature_bits(gram_count: int) -> int:
+    bits = MIN_SIGNATURE_BITS
+    while bits < gram_count * _BITS_PER_GRAM and bits < MAX_SIGNATURE_BITS:
+        bits *= 2
+    return bits
+
+
+def text_signature(*texts: Optional[str]) -> str:
+    """Return the hex encoded trigram Bloom filter for *texts*.
+
+    Each text is normalised with :func:`~utils.text_normalization.normalize_text`
+    (the same normalisation the hard trigger check applies) and contributes its
+    own trigrams, so no grams span two fields. The filter width grows with the
+    amount of text and is implied by the length of the returned string.
+    """
+
+    grams: Set[str] = set()
+    for text in texts:
+        grams |= _ngrams(normalize_text(text))
+
+    bits = _signature_bits(len(grams))
+    value = 0
+    for gram in grams:
+        for position in _positions(gram, bits):
+            value |= 1 << position
+    return format(value, "x").zfill(bits // 4)
+
+
+def may_contain(signature: str, term: str) -> bool:
+    """Return ``False`` only if the signed text cannot contain *term*."""
+
+    normalised = normalize_text(term)
+    if not normalised:
+        return False
+    if len(normalised) < NGRAM_SIZE:
+        # Too short to be represented by trigrams; assume a potential match.
+        return True
+    try:
+        value = int(signature, 16)
+    except (TypeError, ValueError):
+        return True
+    bits = len(signature) * 4
+    if bits <= 0:
+        return True
+    for gram in _ngrams(normalised):
+        for position in _positions(gram, bits):
+            if not value >> position & 1:
+                return False
+    return True
+
+
+__all__ = ["may_contain", "text_signature"]